@@ -0,0 +1,6 @@
+"""
+Benchmarks package - Scripts de medición de rendimiento.
+
+Se ejecutan como módulos desde la raíz del proyecto, por ejemplo:
+    python -m benchmarks.bench_quote
+"""
@@ -0,0 +1,77 @@
+"""
+Benchmark del coste por petición de AccessLogMiddleware.
+
+Llama directamente a una app ASGI trivial (sin servidor ni HTTP) con y sin
+el middleware, con el hilo escritor volcando a /dev/null, y reporta la
+diferencia por petición para distintas tasas de muestreo.
+
+Uso:
+    python -m benchmarks.bench_access_log [--requests 50000]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+
+from middleware import AccessLogMiddleware, start_access_log, stop_access_log  # noqa: E402
+from middleware.access_log import JsonFormatter, access_log_overhead_seconds  # noqa: E402
+
+
+SCOPE = {
+    "type": "http",
+    "method": "GET",
+    "path": "/items/123e4567-e89b-12d3-a456-426614174000",
+    "path_params": {"item_id": "123e4567-e89b-12d3-a456-426614174000"},
+    "headers": [],
+}
+
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def run(asgi_app, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await asgi_app(dict(SCOPE), receive, send)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50_000)
+    args = parser.parse_args()
+
+    handler = logging.FileHandler(os.devnull)
+    handler.setFormatter(JsonFormatter())
+    start_access_log(handler)
+    try:
+        baseline = asyncio.run(run(app, args.requests))
+        print(f"sin middleware:      {baseline / args.requests * 1e6:7.2f} µs/petición")
+        for sample_rate in (0.0, 0.1, 1.0):
+            wrapped = AccessLogMiddleware(app, sample_rate=sample_rate)
+            elapsed = asyncio.run(run(wrapped, args.requests))
+            overhead = (elapsed - baseline) / args.requests * 1e6
+            print(f"sample_rate={sample_rate:<4}     {overhead:7.2f} µs/petición de overhead")
+    finally:
+        stop_access_log()
+    p99 = access_log_overhead_seconds.quantile(0.99) * 1e6
+    print(f"access_log_overhead_seconds p99: {p99:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark de GET /items/{item_id} con y sin lecturas con cobertura.
+
+Un backend en memoria inyecta latencia: la mayoría de las lecturas tardan
+unos milisegundos (log-normal) y una pequeña fracción sufre una pausa larga,
+como un GC o una conexión atascada en el upstream real. Se mide
+ItemService.get_item_by_id con N lecturas concurrentes contra:
+- el backend directo
+- HedgedItemRepository (percentil y presupuesto configurables)
+
+y se comparan los percentiles de latencia y la carga extra en el backend.
+
+Uso:
+    python -m benchmarks.bench_hedged_reads [--requests 4000] [--concurrency 32]
+        [--slow-fraction 0.02] [--slow-ms 120] [--percentile 95] [--budget 0.1]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+
+from repositories import HedgedItemRepository, MemoryItemRepository, ReadHedger  # noqa: E402
+from repositories.item_repository import factory  # noqa: E402
+from services import ItemService  # noqa: E402
+
+
+class LatencyInjectingRepository(MemoryItemRepository):
+    """Backend en memoria cuyas lecturas por id esperan una latencia aleatoria"""
+
+    def __init__(self, rng: random.Random, median_ms: float, slow_fraction: float, slow_ms: float):
+        super().__init__()
+        self._rng = rng
+        self._median = median_ms / 1000
+        self._slow_fraction = slow_fraction
+        self._slow = slow_ms / 1000
+        self.calls = 0
+
+    def _latency(self) -> float:
+        if self._rng.random() < self._slow_fraction:
+            return self._slow * self._rng.uniform(0.8, 1.2)
+        return self._median * self._rng.lognormvariate(0, 0.3)
+
+    async def get_by_id(self, item_id: uuid.UUID):
+        self.calls += 1
+        await asyncio.sleep(self._latency())
+        return await super().get_by_id(item_id)
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+async def run(repository, ids: list[uuid.UUID], requests: int, concurrency: int, rng: random.Random):
+    factory._item_repository = repository
+    latencies = []
+    queue = [rng.choice(ids) for _ in range(requests)]
+
+    async def worker():
+        while queue:
+            item_id = queue.pop()
+            start = time.perf_counter()
+            await ItemService.get_item_by_id(item_id)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sorted(latencies)
+
+
+async def benchmark(args) -> None:
+    backend = LatencyInjectingRepository(random.Random(1), args.median_ms, args.slow_fraction, args.slow_ms)
+    ids = [
+        uuid.UUID((await backend.create({"name": f"Item {i}", "description": "benchmark", "price": 1.0}))["id"])
+        for i in range(1000)
+    ]
+    hedger = ReadHedger(percentile=args.percentile, budget_ratio=args.budget, min_samples=100)
+    setups = [("directo", backend), ("hedging", HedgedItemRepository(backend, hedger))]
+
+    print(
+        f"{args.requests} lecturas, concurrencia {args.concurrency}, "
+        f"{args.slow_fraction:.1%} lentas de ~{args.slow_ms:.0f} ms"
+    )
+    print(f"  {'':10} {'p50':>8} {'p90':>8} {'p99':>8} {'p99.9':>8} {'max':>8}  llamadas")
+    for name, repository in setups:
+        backend.calls = 0
+        latencies = await run(repository, ids, args.requests, args.concurrency, random.Random(2))
+        columns = " ".join(
+            f"{percentile(latencies, p) * 1e3:8.2f}" for p in (50, 90, 99, 99.9, 100)
+        )
+        extra = backend.calls / args.requests - 1
+        print(f"  {name:10} {columns}  {backend.calls} (+{extra:.1%})")
+    print("  (ms; el hedging incluye las primeras lecturas sin umbral todavía)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--median-ms", type=float, default=4.0)
+    parser.add_argument("--slow-fraction", type=float, default=0.02)
+    parser.add_argument("--slow-ms", type=float, default=120.0)
+    parser.add_argument("--percentile", type=float, default=95.0)
+    parser.add_argument("--budget", type=float, default=0.1)
+    asyncio.run(benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
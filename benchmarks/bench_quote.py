@@ -0,0 +1,114 @@
+"""
+Benchmark de POST /items/quote: NumPy vectorizado vs loop por item.
+
+Compara, para una cesta de 10k líneas:
+- Solo aritmética: compute_quote() contra un loop Python con Decimal
+- Punta a punta sobre el backend en memoria: QuoteService.quote()
+  (una consulta get_many) contra get_by_id + aritmética por línea
+
+Uso:
+    python -m benchmarks.bench_quote [--lines 10000] [--repeat 20]
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+import argparse
+import asyncio
+import os
+import random
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+
+import numpy as np  # noqa: E402
+
+from models import QuoteRequest  # noqa: E402
+from repositories import MemoryItemRepository  # noqa: E402
+from repositories.item_repository import factory  # noqa: E402
+from services import QuoteService  # noqa: E402
+from services.quote_service.pricing import compute_quote  # noqa: E402
+
+
+CENT = Decimal("0.01")
+
+
+def python_loop(rows: list[dict], quantities: list[int]) -> tuple[Decimal, Decimal]:
+    """Cálculo línea por línea como lo hacía el cliente de checkout"""
+    net_total = tax_total = Decimal(0)
+    for row, quantity in zip(rows, quantities):
+        if row["price"] is None:
+            continue
+        net = Decimal(str(row["price"])) * quantity
+        tax = (net * Decimal(str(row["tax"] or 0)) / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+        net_total += net.quantize(CENT, rounding=ROUND_HALF_UP)
+        tax_total += tax
+    return net_total, tax_total
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def build_basket(repository: MemoryItemRepository, lines: int, rng: random.Random):
+    items = [
+        await repository.create({
+            "name": f"Item {i}",
+            "description": "benchmark",
+            "price": rng.randint(1, 100_000) / 100,
+            "tax": rng.choice([None, 10.0, 21.0]),
+        })
+        for i in range(lines)
+    ]
+    quantities = [rng.randint(1, 20) for _ in range(lines)]
+    return items, quantities
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    repository = MemoryItemRepository()
+    factory._item_repository = repository
+    loop = asyncio.new_event_loop()
+    items, quantities = loop.run_until_complete(build_basket(repository, args.lines, rng))
+
+    prices = np.array([row["price"] for row in items], dtype=np.float64)
+    taxes = np.array([np.nan if row["tax"] is None else row["tax"] for row in items], dtype=np.float64)
+    qty = np.array(quantities, dtype=np.int64)
+
+    vectorized = best_of(args.repeat, lambda: compute_quote(prices, taxes, qty))
+    looped = best_of(args.repeat, lambda: python_loop(items, quantities))
+
+    result = compute_quote(prices, taxes, qty)
+    net_total, tax_total = python_loop(items, quantities)
+    assert int(result.net.sum()) == int(net_total * 100)
+    assert int(result.tax.sum()) == int(tax_total * 100)
+
+    request = QuoteRequest(lines=[{"item_id": row["id"], "quantity": q} for row, q in zip(items, quantities)])
+
+    async def per_item_fetch():
+        rows = [await repository.get_by_id(line.item_id) for line in request.lines]
+        python_loop(rows, [line.quantity for line in request.lines])
+
+    endpoint = best_of(args.repeat, lambda: loop.run_until_complete(QuoteService.quote(request)))
+    per_item = best_of(args.repeat, lambda: loop.run_until_complete(per_item_fetch()))
+    loop.close()
+
+    print(f"Cesta de {args.lines} líneas (mejor de {args.repeat})")
+    print(f"  aritmética NumPy            {vectorized * 1e3:9.3f} ms")
+    print(f"  aritmética loop Decimal     {looped * 1e3:9.3f} ms  ({looped / vectorized:.0f}x)")
+    print(f"  QuoteService.quote (memory) {endpoint * 1e3:9.3f} ms")
+    print(f"  get_by_id + loop (memory)   {per_item * 1e3:9.3f} ms")
+    print("  Nota: con Supabase el loop por item además paga un round trip HTTP por línea.")
+
+
+if __name__ == "__main__":
+    main()
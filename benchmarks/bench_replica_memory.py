@@ -0,0 +1,98 @@
+"""
+Benchmark de memoria y latencia de la réplica columnar de items.
+
+Compara los bytes de ColumnarItemTable contra una lista de diccionarios con
+las mismas filas (la forma en que llegan desde Supabase) y mide lecturas
+por id y páginas con filtro de precio.
+
+Uso:
+    python -m benchmarks.bench_replica_memory [--rows 1000000]
+"""
+
+from datetime import datetime, timedelta, timezone
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+
+from services.replica_service import ColumnarItemTable  # noqa: E402
+
+
+def make_rows(count: int, rng: random.Random) -> list[dict]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    descriptions = [f"Descripción de la categoría {i}" for i in range(50)]
+    rows = []
+    for i in range(count):
+        created = (start + timedelta(seconds=i)).isoformat()
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "name": f"Producto {i}",
+            "description": rng.choice(descriptions),
+            "price": rng.randint(0, 100_000) / 100,
+            "tax": rng.choice([None, 10.0, 21.0]),
+            "created_at": created,
+            "updated_at": created,
+        })
+    return rows
+
+
+def deep_size(rows: list[dict]) -> int:
+    seen = set()
+    total = sys.getsizeof(rows)
+    for row in rows:
+        total += sys.getsizeof(row)
+        for value in row.values():
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rows = make_rows(args.rows, rng)
+
+    start = time.perf_counter()
+    table = ColumnarItemTable()
+    table.extend(rows)
+    table.finalize()
+    load_seconds = time.perf_counter() - start
+
+    dict_bytes = deep_size(rows)
+    table_bytes = table.memory_usage()
+    per_million = 1_000_000 / args.rows
+
+    sample = [uuid.UUID(row["id"]) for row in rng.sample(rows, 10_000)]
+    start = time.perf_counter()
+    for item_id in sample:
+        table.get(item_id)
+    get_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+    start = time.perf_counter()
+    table.page(50, args.rows // 2)
+    page_us = (time.perf_counter() - start) * 1e6
+
+    start = time.perf_counter()
+    table.page(50, 1_000, min_price=100.0, max_price=200.0)
+    filter_ms = (time.perf_counter() - start) * 1e3
+
+    print(f"{args.rows} filas (carga en {load_seconds:.2f} s)")
+    print(f"  lista de dicts        {dict_bytes / 2**20:9.1f} MiB  ({dict_bytes * per_million / 2**20:9.1f} MiB / 1M filas)")
+    print(f"  ColumnarItemTable     {table_bytes / 2**20:9.1f} MiB  ({table_bytes * per_million / 2**20:9.1f} MiB / 1M filas)")
+    print(f"  ahorro                {1 - table_bytes / dict_bytes:9.1%}")
+    print(f"  get por id            {get_us:9.2f} µs")
+    print(f"  página offset medio   {page_us:9.2f} µs")
+    print(f"  página con filtro     {filter_ms:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark de los formatos de respuesta de GET /items: JSON vs MessagePack vs Arrow.
+
+Para una página de N filas (default 10k) mide, con el mejor de R intentos:
+- Codificación en el servidor. JSON incluye la validación y el volcado de
+  response_model que hace FastAPI; los binarios codifican las filas tal
+  cual (ver serialization/item_formats.py)
+- Decodificación en el cliente: json.loads, msgpack.unpackb y lectura del
+  stream Arrow (tabla columnar y, aparte, conversión a dicts por fila)
+- Tamaño del payload
+
+Uso:
+    python -m benchmarks.bench_response_formats [--rows 10000] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+import uuid
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+
+import msgpack  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from models import ItemBase  # noqa: E402
+from serialization import decode_arrow, encode_arrow, encode_msgpack  # noqa: E402
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def make_rows(count: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "name": f"Item {i}",
+            "description": rng.choice(["Laptop de alta gama", "Monitor 27 pulgadas", "Teclado mecánico"]),
+            "price": None if i % 50 == 0 else round(rng.uniform(1, 5000), 2),
+            "tax": rng.choice([None, 10.0, 21.0]),
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, random.Random(0))
+    adapter = TypeAdapter(list[ItemBase])
+
+    def encode_json() -> bytes:
+        # Lo que hace FastAPI con response_model=list[ItemBase]
+        validated = adapter.validate_python(rows)
+        return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+    payloads = {
+        "JSON": encode_json(),
+        "MessagePack": encode_msgpack(rows),
+        "Arrow": encode_arrow(rows),
+    }
+    encode = {
+        "JSON": best_of(args.repeat, encode_json),
+        "MessagePack": best_of(args.repeat, lambda: encode_msgpack(rows)),
+        "Arrow": best_of(args.repeat, lambda: encode_arrow(rows)),
+    }
+    decode = {
+        "JSON": best_of(args.repeat, lambda: json.loads(payloads["JSON"])),
+        "MessagePack": best_of(args.repeat, lambda: msgpack.unpackb(payloads["MessagePack"])),
+        "Arrow": best_of(args.repeat, lambda: decode_arrow(payloads["Arrow"])),
+    }
+    to_rows = best_of(args.repeat, lambda: decode_arrow(payloads["Arrow"]).to_pylist())
+
+    print(f"{args.rows} filas (mejor de {args.repeat})")
+    print(f"  {'formato':12} {'codificar':>11} {'decodificar':>12} {'bytes':>10}")
+    for name, payload in payloads.items():
+        print(
+            f"  {name:12} {encode[name] * 1e3:8.2f} ms {decode[name] * 1e3:9.2f} ms "
+            f"{len(payload):10,} ({len(payload) / len(payloads['JSON']):.0%})"
+        )
+    print(f"  Arrow a dicts por fila: {to_rows * 1e3:.2f} ms (la lectura columnar no lo necesita)")
+
+
+if __name__ == "__main__":
+    main()
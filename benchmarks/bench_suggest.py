@@ -0,0 +1,121 @@
+"""
+Benchmark del índice de prefijos de GET /items/suggest.
+
+Con N nombres sintéticos (default 1M) mide:
+- Carga completa del índice y memoria ocupada (NamePrefixIndex.memory_usage)
+- Latencia de búsqueda top-k para prefijos de 1 a 4 caracteres, contra el
+  filtro lineal que hoy hace el cliente sobre la lista de nombres
+- Coste de las escrituras del listener y de los lotes del pull. El primer
+  lote con renombres incluye construir el índice por id de la base (una
+  vez por carga o compactación)
+
+Uso:
+    python -m benchmarks.bench_suggest [--rows 1000000] [--limit 10] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import time
+import uuid
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+
+from services.suggest_service import NamePrefixIndex, normalize_name  # noqa: E402
+
+
+_WORDS = [
+    "Laptop", "Monitor", "Teclado", "Ratón", "Cámara", "Auriculares", "Altavoz", "Impresora",
+    "Tablet", "Teléfono", "Cargador", "Cable", "Disco", "Memoria", "Router", "Micrófono",
+]
+_QUALIFIERS = ["Pro", "Air", "Mini", "Max", "Ultra", "Gaming", "Inalámbrico", "USB-C", "4K", "27 pulgadas"]
+
+
+def make_rows(count: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "name": f"{rng.choice(_WORDS)} {rng.choice(_QUALIFIERS)} {rng.randrange(10_000)}",
+        }
+        for _ in range(count)
+    ]
+
+
+def per_query(func, prefixes: list[str]) -> float:
+    start = time.perf_counter()
+    for prefix in prefixes:
+        func(prefix)
+    return (time.perf_counter() - start) / len(prefixes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rows = make_rows(args.rows, rng)
+
+    index = NamePrefixIndex()
+    start = time.perf_counter()
+    index.load(rows)
+    load_seconds = time.perf_counter() - start
+
+    names = [(row["id"], row["name"]) for row in rows]
+
+    def linear(prefix: str) -> list:
+        # Filtro del lado del cliente: recorre todos los nombres
+        prefix = normalize_name(prefix)
+        matches = []
+        for item_id, name in names:
+            if normalize_name(name).startswith(prefix):
+                matches.append((item_id, name))
+                if len(matches) == args.limit:
+                    break
+        return matches
+
+    print(f"{args.rows:,} nombres, top {args.limit}")
+    print(f"  carga completa       {load_seconds * 1e3:10.1f} ms")
+    print(f"  memoria              {index.memory_usage() / 2**20:10.1f} MiB")
+    print(f"  {'prefijo':20} {'índice':>10} {'lineal':>12}")
+    for length in (1, 2, 3, 4):
+        prefixes = [normalize_name(rng.choice(_WORDS))[:length] for _ in range(args.queries)]
+        # El filtro lineal sale en cuanto junta ``limit`` coincidencias: se
+        # mide también un prefijo raro que obliga a recorrer toda la lista
+        indexed = per_query(lambda prefix: index.search(prefix, args.limit), prefixes)
+        scanned = per_query(linear, prefixes[:20])
+        print(f"  {length} caracteres         {indexed * 1e6:7.1f} µs {scanned * 1e6:9.1f} µs")
+    rare = "zz"
+    print(f"  sin coincidencias    {per_query(lambda p: index.search(p, args.limit), [rare] * args.queries) * 1e6:7.1f} µs "
+          f"{per_query(linear, [rare]) * 1e3:9.1f} ms")
+
+    # Escrituras del listener (una fila, con nombre) y lotes del pull
+    def timed(func, ids: list[str]) -> float:
+        start = time.perf_counter()
+        for item_id in ids:
+            func(item_id)
+        return (time.perf_counter() - start) / len(ids)
+
+    name = "Laptop Pro Nuevo"
+    own = [str(uuid.uuid4()) for _ in range(200)]
+    print(f"  alta (listener)      {timed(lambda item_id: index.add(item_id, name), own) * 1e6:7.1f} µs")
+    print(f"  baja (listener)      {timed(lambda item_id: index.remove(item_id, name), own) * 1e6:7.1f} µs")
+
+    def pull(changed: list[dict], deleted: list[str] = ()) -> float:
+        start = time.perf_counter()
+        index.apply(changed, deleted)
+        return time.perf_counter() - start
+
+    for size in (100, 1000):
+        batch = [{"id": str(uuid.uuid4()), "name": name} for _ in range(size)]
+        renamed = [{"id": row["id"], "name": "Monitor Renombrado"} for row in rows[size:size * 2]]
+        print(f"  pull: {size} altas + {size} renombres {pull(batch + renamed) * 1e3:7.1f} ms")
+        print(f"  pull: {size} filas ya aplicadas     {pull(batch) * 1e3:7.1f} ms")
+        print(f"  pull: {size} lápidas                {pull((), [row['id'] for row in batch]) * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark del coste de obtener un cliente de Supabase por petición.
+
+Compara:
+- create_client() por petición (cliente completo con transporte propio)
+- SupabaseClientPool con un token nuevo (miss) y con uno ya cacheado (hit)
+- Una carga realista: N usuarios con peticiones repartidas según Zipf
+
+No hace peticiones HTTP: mide solo la construcción/obtención del cliente.
+
+Uso:
+    python -m benchmarks.bench_supabase_clients [--requests 2000] [--users 500]
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+
+from supabase import create_client  # noqa: E402
+
+from db import SupabaseClientPool  # noqa: E402
+
+
+URL = "https://example.supabase.co"
+
+
+def make_jwt(sub: str) -> str:
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    claims = {"sub": sub, "role": "authenticated", "exp": int(time.time()) + 3600}
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(claims)}.signature"
+
+
+def per_call(func, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=500)
+    args = parser.parse_args()
+
+    anon_key = make_jwt("anon")
+    tokens = [make_jwt(f"user-{i}") for i in range(max(args.requests, args.users))]
+
+    full = per_call(lambda i: create_client(URL, anon_key).postgrest, min(args.requests, 200))
+    print(f"create_client por petición: {full:9.1f} µs")
+
+    pool = SupabaseClientPool(URL, anon_key, max_size=len(tokens))
+    miss = per_call(lambda i: pool.get(tokens[i]), args.requests)
+    hit = per_call(lambda i: pool.get(tokens[i]), args.requests)
+    print(f"pool, token nuevo (miss):   {miss:9.1f} µs")
+    print(f"pool, token cacheado (hit): {hit:9.1f} µs")
+    pool.close()
+
+    pool = SupabaseClientPool(URL, anon_key, max_size=args.users // 2)
+    weights = [1 / (rank + 1) for rank in range(args.users)]
+    traffic = random.Random(42).choices(tokens[:args.users], weights, k=args.requests * 10)
+    mixed = per_call(lambda i: pool.get(traffic[i]), len(traffic))
+    print(f"Zipf {args.users} usuarios, LRU de {pool.max_size}: {mixed:6.1f} µs, hit rate {pool.hit_rate:.1%}")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
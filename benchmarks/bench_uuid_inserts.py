@@ -0,0 +1,117 @@
+"""
+Benchmark de inserciones con clave primaria UUID v4 (aleatoria) vs UUIDv7 (ordenada por tiempo).
+
+Contra un PostgreSQL local crea dos tablas con la forma de ``items``, inserta
+N filas en lotes (ids generados en Python, como ItemService con
+ITEM_ID_GENERATION="uuid7") y mide:
+- Filas por segundo de la carga completa
+- Tamaño del índice de la clave primaria y de la tabla
+- Páginas hoja del índice (pgstattuple, si la extensión está disponible)
+  y su densidad media: con v4 los page splits dejan hojas a medio llenar
+
+Uso:
+    python -m benchmarks.bench_uuid_inserts --dsn postgresql://localhost/bench [--rows 1000000] [--batch 1000]
+
+El DSN también puede venir de POSTGRES_DSN. Las tablas se crean y borran en
+cada ejecución (items_bench_v4 / items_bench_v7).
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+
+import asyncpg  # noqa: E402
+
+from repositories import uuid7  # noqa: E402
+
+
+_CREATE_SQL = """
+    DROP TABLE IF EXISTS {table};
+    CREATE TABLE {table} (
+        id UUID PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT NOT NULL,
+        price NUMERIC,
+        tax NUMERIC,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+    )
+"""
+_INSERT_SQL = "INSERT INTO {table} (id, name, description, price, tax) VALUES ($1, $2, $3, $4, $5)"
+
+
+async def load(pool: asyncpg.Pool, table: str, make_id, rows: int, batch: int) -> float:
+    async with pool.acquire() as connection:
+        await connection.execute(_CREATE_SQL.format(table=table))
+        insert = _INSERT_SQL.format(table=table)
+        start = time.perf_counter()
+        for first in range(0, rows, batch):
+            await connection.executemany(insert, [
+                (make_id(), f"Item {i}", "Laptop de alta gama", 999.99, 21.0)
+                for i in range(first, min(first + batch, rows))
+            ])
+        return time.perf_counter() - start
+
+
+async def index_stats(pool: asyncpg.Pool, table: str) -> dict:
+    async with pool.acquire() as connection:
+        stats = dict(await connection.fetchrow(
+            "SELECT pg_relation_size($1::regclass) AS index_bytes, pg_relation_size($2::regclass) AS table_bytes",
+            f"{table}_pkey", table,
+        ))
+        try:
+            await connection.execute("CREATE EXTENSION IF NOT EXISTS pgstattuple")
+            leaf = await connection.fetchrow(
+                "SELECT leaf_pages, avg_leaf_density FROM pgstatindex($1)", f"{table}_pkey"
+            )
+            stats.update(leaf)
+        except asyncpg.PostgresError:
+            pass
+        return stats
+
+
+async def run(args: argparse.Namespace) -> None:
+    pool = await asyncpg.create_pool(args.dsn, min_size=1, max_size=1)
+    try:
+        results = {}
+        for label, table, make_id in (
+            ("UUID v4", "items_bench_v4", uuid.uuid4),
+            ("UUIDv7", "items_bench_v7", uuid7),
+        ):
+            elapsed = await load(pool, table, make_id, args.rows, args.batch)
+            results[label] = (elapsed, await index_stats(pool, table))
+            if not args.keep:
+                async with pool.acquire() as connection:
+                    await connection.execute(f"DROP TABLE {table}")
+    finally:
+        await pool.close()
+
+    print(f"{args.rows:,} filas en lotes de {args.batch}")
+    print(f"  {'ids':8} {'filas/s':>10} {'índice pk':>12} {'tabla':>12} {'hojas':>9} {'densidad':>9}")
+    for label, (elapsed, stats) in results.items():
+        print(
+            f"  {label:8} {args.rows / elapsed:10,.0f} {stats['index_bytes'] / 2**20:9.1f} MiB "
+            f"{stats['table_bytes'] / 2**20:9.1f} MiB {stats.get('leaf_pages', '-'):>9} "
+            f"{stats.get('avg_leaf_density', '-'):>8}%"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=os.environ.get("POSTGRES_DSN"))
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--keep", action="store_true", help="no borrar las tablas al terminar")
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("hace falta --dsn o POSTGRES_DSN")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
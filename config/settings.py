@@ -4,6 +4,8 @@ Settings module - Configuración centralizada de la aplicación usando Pydantic
 Este módulo maneja todas las variables de entorno y configuraciones de la aplicación.
 """
 
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -23,9 +25,144 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_KEY: str
 
+    # Clientes por usuario (JWT del header Authorization) para aplicar RLS
+    SUPABASE_USER_CLIENTS_ENABLED: bool = False
+    SUPABASE_USER_CLIENT_POOL_SIZE: int = 1024
+    SUPABASE_USER_CLIENT_DEFAULT_TTL_SECONDS: float = 3600.0
+    SUPABASE_MAX_CONNECTIONS: int = 100
+
     # Configuración de la API
     API_PREFIX: str = "/api/v1"
 
+    # Backend de almacenamiento de items: "supabase", "postgres" o "memory"
+    ITEM_REPOSITORY_BACKEND: Literal["supabase", "postgres", "memory"] = "supabase"
+
+    # Ids de items nuevos: "database" (uuid v4 por defecto de la columna) o
+    # "uuid7" (generados en la API, ordenados por tiempo). ITEM_PAGE_ORDER="id"
+    # pagina por la clave primaria en lugar de (created_at, id); solo
+    # equivale al orden de creación si todos los ids son UUIDv7
+    ITEM_ID_GENERATION: Literal["database", "uuid7"] = "database"
+    ITEM_PAGE_ORDER: Literal["created_at", "id"] = "created_at"
+
+    # Configuración de PostgreSQL directo (backend "postgres")
+    POSTGRES_DSN: Optional[str] = None
+    POSTGRES_POOL_MIN_SIZE: int = 1
+    POSTGRES_POOL_MAX_SIZE: int = 10
+
+    # Réplicas de lectura del backend (URLs de Supabase o DSNs de PostgreSQL);
+    # el primario es SUPABASE_URL / POSTGRES_DSN y recibe todas las escrituras
+    ITEM_READ_ENDPOINTS: list[str] = []
+    ITEM_READ_HEALTH_INTERVAL_SECONDS: float = 2.0
+    ITEM_READ_HEALTH_TIMEOUT_SECONDS: float = 1.0
+    ITEM_READ_MAX_LAG_BYTES: Optional[int] = 16 * 1024 * 1024
+
+    # Lecturas con cobertura: si una lectura supera el percentil indicado de
+    # la latencia reciente se repite (en otra réplica si la hay); como mucho
+    # ITEM_HEDGE_BUDGET_RATIO de las lecturas se duplican
+    ITEM_HEDGING_ENABLED: bool = False
+    ITEM_HEDGE_PERCENTILE: float = 95.0
+    ITEM_HEDGE_BUDGET_RATIO: float = 0.1
+    ITEM_HEDGE_MIN_DELAY_SECONDS: float = 0.005
+    ITEM_HEDGE_MIN_SAMPLES: int = 100
+
+    # Límite adaptativo de llamadas concurrentes al backend (pools separados
+    # para lecturas y escrituras); el máximo no debería superar las conexiones
+    ITEM_UPSTREAM_LIMITER_ENABLED: bool = True
+    ITEM_UPSTREAM_READ_INITIAL_LIMIT: int = 20
+    ITEM_UPSTREAM_WRITE_INITIAL_LIMIT: int = 10
+    ITEM_UPSTREAM_MIN_LIMIT: int = 2
+    ITEM_UPSTREAM_MAX_LIMIT: int = 100
+    ITEM_UPSTREAM_MAX_QUEUE: int = 200
+    ITEM_UPSTREAM_QUEUE_TIMEOUT_SECONDS: float = 1.0
+
+    # Reparto de items entre varios backends por hash del id: lista de
+    # {"name", "url", "key"} (supabase) o {"name", "dsn"} (postgres). Durante
+    # un rebalanceo, ITEM_SHARDS_PREVIOUS tiene los nombres del anillo anterior
+    ITEM_SHARDS: list[dict[str, str]] = []
+    ITEM_SHARDS_PREVIOUS: list[str] = []
+    ITEM_SHARD_VNODES: int = 64
+
+    # Estadísticas incrementales de items (GET /items/stats)
+    ITEM_STATS_ENABLED: bool = False
+    ITEM_STATS_RECONCILE_SECONDS: float = 300.0
+    ITEM_STATS_PRICE_BUCKETS: list[float] = [0, 10, 50, 100, 500, 1000]
+    ITEM_STATS_TAX_BUCKETS: list[float] = [0, 5, 10, 15, 21, 30]
+
+    # Réplica de lectura columnar en memoria de cada worker
+    ITEM_REPLICA_ENABLED: bool = False
+    ITEM_REPLICA_SYNC_SECONDS: float = 5.0
+    ITEM_REPLICA_FULL_RELOAD_SECONDS: float = 3600.0
+    ITEM_REPLICA_SYNC_OVERLAP_SECONDS: float = 1.0
+    ITEM_REPLICA_BATCH_SIZE: int = 1000
+
+    # Índice de prefijos de nombres por worker para GET /items/suggest
+    ITEM_SUGGEST_ENABLED: bool = False
+    ITEM_SUGGEST_SYNC_SECONDS: float = 5.0
+    ITEM_SUGGEST_FULL_RELOAD_SECONDS: float = 3600.0
+    ITEM_SUGGEST_SYNC_OVERLAP_SECONDS: float = 1.0
+    ITEM_SUGGEST_BATCH_SIZE: int = 1000
+    ITEM_SUGGEST_MAX_LIMIT: int = 50
+
+    # Caché stale-while-revalidate de GET /items
+    ITEM_LIST_CACHE_ENABLED: bool = False
+    ITEM_LIST_CACHE_FRESH_SECONDS: float = 5.0
+    ITEM_LIST_CACHE_STALE_SECONDS: float = 30.0
+    ITEM_LIST_CACHE_MAX_ENTRIES: int = 1024
+    ITEM_LIST_CACHE_PREFETCH_CONCURRENCY: int = 4
+
+    # Caché stale-while-revalidate de GET /items/{item_id}
+    ITEM_CACHE_ENABLED: bool = False
+    ITEM_CACHE_FRESH_SECONDS: float = 5.0
+    ITEM_CACHE_STALE_SECONDS: float = 30.0
+    ITEM_CACHE_MAX_ENTRIES: int = 10000
+
+    # Warm-up de las cachés al arrancar: claves calientes grabadas al apagar
+    # el worker anterior (CACHE_WARMUP_FILE) más las primeras páginas
+    CACHE_WARMUP_FILE: Optional[str] = None
+    CACHE_WARMUP_TOP_ITEMS: int = 1000
+    CACHE_WARMUP_TOP_PAGES: int = 50
+    CACHE_WARMUP_FIRST_PAGES: int = 5
+    CACHE_WARMUP_PAGE_LIMIT: int = 10
+    CACHE_WARMUP_CONCURRENCY: int = 8
+    CACHE_WARMUP_TIMEOUT_SECONDS: float = 30.0
+
+    # Sincronización incremental (GET /items/changes)
+    ITEM_CHANGES_SETTLE_SECONDS: float = 2.0
+    ITEM_CHANGES_MAX_LIMIT: int = 1000
+    # Debe coincidir con la retención de prune_item_tombstones (migración 004)
+    ITEM_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Peticiones en lote (POST /batch)
+    BATCH_MAX_OPERATIONS: int = 50
+    BATCH_MAX_CONCURRENCY: int = 8
+
+    # Access log JSON (stdout o ACCESS_LOG_FILE), escrito desde un hilo aparte
+    ACCESS_LOG_ENABLED: bool = False
+    ACCESS_LOG_FILE: Optional[str] = None
+    ACCESS_LOG_SAMPLE_RATE: float = 0.1
+    ACCESS_LOG_SLOW_SECONDS: float = 0.5
+    ACCESS_LOG_QUEUE_SIZE: int = 10000
+
+    # Trazas distribuidas (W3C traceparent, spans con formato OTLP/JSON)
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 1.0
+    TRACING_EXPORTER: Literal["file", "memory"] = "file"
+    TRACING_FILE: str = "traces.jsonl"
+    TRACING_QUEUE_SIZE: int = 2048
+    TRACING_BATCH_SIZE: int = 512
+    TRACING_EXPORT_INTERVAL_SECONDS: float = 5.0
+
+    # Diagnóstico: lag del event loop y detección de callbacks bloqueantes
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+    LOOP_MONITOR_BLOCK_THRESHOLD_SECONDS: float = 0.1
+
+    # Profiler bajo demanda (GET /debug/profile), protegido por token
+    DEBUG_PROFILE_ENABLED: bool = False
+    DEBUG_PROFILE_TOKEN: Optional[str] = None
+    DEBUG_PROFILE_MAX_SECONDS: float = 60.0
+    DEBUG_PROFILE_INTERVAL_SECONDS: float = 0.005
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,3 +1,4 @@
+from .batch_controller.batch_controller import BatchController
 from .item_controller.item_controller import ItemController
 
-__all__ = ["ItemController"]
+__all__ = ["BatchController", "ItemController"]
@@ -0,0 +1,7 @@
+"""
+Batch controller module - Maneja las peticiones en lote.
+"""
+
+from .batch_controller import BatchController
+
+__all__ = ["BatchController"]
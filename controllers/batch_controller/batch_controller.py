@@ -0,0 +1,23 @@
+from typing import Optional
+from fastapi import Response
+from models import BatchRequest, BatchResponse
+from services import BatchService, ItemService
+from tracing import traced
+
+
+class BatchController:
+    """Controlador que maneja las peticiones en lote"""
+
+    @staticmethod
+    @traced("BatchController.execute")
+    async def execute(
+        app,
+        batch: BatchRequest,
+        headers: Optional[list[tuple[bytes, bytes]]] = None,
+        response: Optional[Response] = None,
+    ) -> BatchResponse:
+        """Endpoint para ejecutar un lote de operaciones de items (con token de consistencia si hay respuesta)"""
+        result = await BatchService.execute(app, batch, headers)
+        if response is not None:
+            response.headers.update(ItemService.consistency_headers())
+        return result
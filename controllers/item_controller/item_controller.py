@@ -1,5 +1,19 @@
-from models import Item, ItemBase, ItemCreate
-from services import ItemService
+from typing import Optional
+from fastapi import Response
+from models import (
+    Item,
+    ItemBase,
+    ItemChanges,
+    ItemCreate,
+    ItemLookupRequest,
+    ItemStats,
+    ItemSuggestion,
+    QuoteRequest,
+    QuoteResponse,
+)
+from serialization import JSON, encode_items
+from services import ItemService, ItemStatsService, ItemSuggestService, ItemSyncService, QuoteService
+from tracing import traced
 import uuid
 
 
@@ -7,26 +21,91 @@ class ItemController:
     """Controlador que maneja las peticiones HTTP para items"""
 
     @staticmethod
-    async def create_item(item: ItemCreate) -> ItemBase:
-        """Endpoint para crear un nuevo item"""
-        return ItemService.create_item(item)
+    @traced("ItemController.create_item")
+    async def create_item(item: ItemCreate, response: Optional[Response] = None) -> ItemBase:
+        """Endpoint para crear un nuevo item (con token de consistencia si hay respuesta)"""
+        created = await ItemService.create_item(item)
+        if response is not None:
+            response.headers.update(ItemService.consistency_headers())
+        return created
 
     @staticmethod
-    async def get_items(limit: int = 10, offset: int = 0) -> list[ItemBase]:
-        """Endpoint para obtener lista de items"""
-        return ItemService.get_items(limit, offset)
+    @traced("ItemController.get_items")
+    async def get_items(
+        limit: int = 10,
+        offset: int = 0,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        response: Optional[Response] = None,
+        media_type: str = JSON,
+    ) -> list[ItemBase]:
+        """Endpoint para obtener lista de items (con headers de caché HTTP si hay respuesta)"""
+        items, age = await ItemService.get_items_with_age(limit, offset, min_price, max_price)
+        if response is not None:
+            response.headers.update(ItemService.list_cache_headers(age))
+        return ItemController._encoded(items, media_type, response)
 
     @staticmethod
+    def _encoded(items: list, media_type: str, response: Optional[Response]):
+        """Las filas tal cual para JSON (las valida response_model) o ya codificadas en binario"""
+        if media_type == JSON:
+            return items
+        headers = dict(response.headers) if response is not None else None
+        return Response(encode_items(items, media_type), media_type=media_type, headers=headers)
+
+    @staticmethod
+    @traced("ItemController.get_stats")
+    async def get_stats() -> ItemStats:
+        """Endpoint para obtener estadísticas agregadas de items"""
+        return await ItemStatsService.get_stats()
+
+    @staticmethod
+    @traced("ItemController.suggest_items")
+    async def suggest_items(prefix: str, limit: int = 10) -> list[ItemSuggestion]:
+        """Endpoint para autocompletar nombres de items por prefijo"""
+        return await ItemSuggestService.suggest(prefix, limit)
+
+    @staticmethod
+    @traced("ItemController.get_changes")
+    async def get_changes(since: Optional[str] = None, limit: int = 100) -> ItemChanges:
+        """Endpoint para obtener los cambios de items desde un token de sincronización"""
+        return await ItemSyncService.get_changes(since, limit)
+
+    @staticmethod
+    @traced("ItemController.quote")
+    async def quote(request: QuoteRequest) -> QuoteResponse:
+        """Endpoint para cotizar una cesta de items"""
+        return await QuoteService.quote(request)
+
+    @staticmethod
+    @traced("ItemController.lookup_items")
+    async def lookup_items(
+        request: ItemLookupRequest, response: Optional[Response] = None, media_type: str = JSON
+    ) -> list[ItemBase]:
+        """Endpoint para obtener varios items por id en una consulta"""
+        items = await ItemService.get_items_by_ids(request.ids)
+        return ItemController._encoded(items, media_type, response)
+
+    @staticmethod
+    @traced("ItemController.get_item")
     async def get_item(item_id: uuid.UUID) -> ItemBase:
         """Endpoint para obtener un item específico"""
-        return ItemService.get_item_by_id(item_id)
+        return await ItemService.get_item_by_id(item_id)
 
     @staticmethod
-    async def update_item(item_id: uuid.UUID, item: ItemCreate) -> Item:
-        """Endpoint para actualizar un item"""
-        return ItemService.update_item(item_id, item)
+    @traced("ItemController.update_item")
+    async def update_item(item_id: uuid.UUID, item: ItemCreate, response: Optional[Response] = None) -> Item:
+        """Endpoint para actualizar un item (con token de consistencia si hay respuesta)"""
+        updated = await ItemService.update_item(item_id, item)
+        if response is not None:
+            response.headers.update(ItemService.consistency_headers())
+        return updated
 
     @staticmethod
-    async def delete_item(item_id: uuid.UUID) -> dict:
-        """Endpoint para eliminar un item"""
-        return ItemService.delete_item(item_id)
+    @traced("ItemController.delete_item")
+    async def delete_item(item_id: uuid.UUID, response: Optional[Response] = None) -> dict:
+        """Endpoint para eliminar un item (con token de consistencia si hay respuesta)"""
+        deleted = await ItemService.delete_item(item_id)
+        if response is not None:
+            response.headers.update(ItemService.consistency_headers())
+        return deleted
@@ -3,6 +3,9 @@ Database package - Maneja todas las conexiones a bases de datos.
 
 Actualmente soporta:
 - Supabase: Cliente y dependencias para PostgreSQL a través de Supabase
+  (incluye un pool de clientes por usuario para RLS)
+- PostgreSQL: Pools asyncpg para acceso directo (ver repositories/)
+- Tokens de consistencia read-your-writes para lecturas desde réplicas
 
 Para agregar más bases de datos en el futuro, crea módulos adicionales aquí:
 - mongodb.py
@@ -12,14 +15,45 @@ Para agregar más bases de datos en el futuro, crea módulos adicionales aquí:
 
 from .supabase import (
     get_supabase,
+    bind_user_supabase_client,
     get_supabase_client,
+    get_request_supabase_client,
+    get_request_user_client,
+    get_user_client_pool,
+    close_user_client_pool,
     SupabaseDependency,
     DbDependency
 )
+from .supabase_pool import SupabaseClientPool, UserSupabaseClient
+from .postgres import create_postgres_pool
+from .consistency import (
+    CONSISTENCY_TOKEN_HEADER,
+    bind_consistency_token,
+    format_lsn,
+    get_consistency_token,
+    get_read_position,
+    parse_lsn,
+    record_write_position,
+)
 
 __all__ = [
     "get_supabase",
+    "bind_user_supabase_client",
     "get_supabase_client",
+    "get_request_supabase_client",
+    "get_request_user_client",
+    "get_user_client_pool",
+    "close_user_client_pool",
+    "SupabaseClientPool",
+    "UserSupabaseClient",
     "SupabaseDependency",
     "DbDependency",
+    "create_postgres_pool",
+    "CONSISTENCY_TOKEN_HEADER",
+    "bind_consistency_token",
+    "format_lsn",
+    "get_consistency_token",
+    "get_read_position",
+    "parse_lsn",
+    "record_write_position",
 ]
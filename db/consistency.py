@@ -0,0 +1,71 @@
+"""
+Tokens de consistencia read-your-writes.
+
+Después de una escritura la respuesta incluye ``X-Consistency-Token`` con
+la posición del WAL del primario en formato pg_lsn (``16/B374D848``). El
+cliente lo reenvía en las lecturas siguientes y el repositorio solo las
+manda a una réplica que ya haya aplicado esa posición; si ninguna la
+alcanzó, lee del primario.
+"""
+
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Header
+
+
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+
+# Posición mínima que deben tener las lecturas de la petición en curso
+_read_position: ContextVar[Optional[int]] = ContextVar("consistency_read_position", default=None)
+
+# Posición del primario después de la última escritura de la petición en curso
+_write_position: ContextVar[Optional[int]] = ContextVar("consistency_write_position", default=None)
+
+
+def format_lsn(position: int) -> str:
+    """Formatea una posición en bytes como pg_lsn"""
+    return f"{position >> 32:X}/{position & 0xFFFFFFFF:X}"
+
+
+def parse_lsn(token: str) -> Optional[int]:
+    """Convierte un pg_lsn en bytes; None si el token no es válido"""
+    high, separator, low = token.strip().partition("/")
+    if not separator:
+        return None
+    try:
+        return (int(high, 16) << 32) | int(low, 16)
+    except ValueError:
+        return None
+
+
+async def bind_consistency_token(
+    x_consistency_token: Optional[str] = Header(None),
+) -> Optional[int]:
+    """
+    Dependencia que fija la posición mínima de lectura de la petición.
+
+    Es async para que la posición quede en el contexto de la petición,
+    donde la lee el repositorio. Los tokens inválidos se ignoran.
+
+    Returns:
+        int: Posición en bytes, o None si la petición no trae token
+    """
+    position = parse_lsn(x_consistency_token) if x_consistency_token else None
+    _read_position.set(position)
+    return position
+
+
+def get_read_position() -> Optional[int]:
+    """Posición mínima de lectura de la petición en curso (None sin token)"""
+    return _read_position.get()
+
+
+def record_write_position(position: int) -> None:
+    """Guarda la posición del primario tras una escritura de la petición"""
+    _write_position.set(position)
+
+
+def get_consistency_token() -> Optional[str]:
+    """Token a devolver al cliente si la petición escribió (None si no)"""
+    position = _write_position.get()
+    return None if position is None else format_lsn(position)
@@ -0,0 +1,44 @@
+-- Agregados de la tabla items calculados en la base de datos.
+--
+-- Usado por ItemStatsTracker (services/stats_service) para reconciliar
+-- periódicamente las estadísticas que mantiene de forma incremental.
+-- El backend "supabase" la invoca vía RPC: POST /rest/v1/rpc/item_stats
+--
+-- Histogramas: el bucket i cubre [edges[i], edges[i + 1]) y el último es
+-- abierto por arriba; los valores menores al primer borde caen en el primero.
+
+CREATE OR REPLACE FUNCTION item_stats(price_edges numeric[], tax_edges numeric[])
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+    WITH price_buckets AS (
+        SELECT greatest(width_bucket(price, price_edges), 1) AS i, count(*) AS n
+        FROM items WHERE price IS NOT NULL GROUP BY 1
+    ), tax_buckets AS (
+        SELECT greatest(width_bucket(tax, tax_edges), 1) AS i, count(*) AS n
+        FROM items WHERE tax IS NOT NULL GROUP BY 1
+    )
+    SELECT json_build_object(
+        'count', count(*),
+        'price', json_build_object(
+            'count', count(price), 'sum', coalesce(sum(price), 0),
+            'min', min(price), 'max', max(price)
+        ),
+        'tax', json_build_object(
+            'count', count(tax), 'sum', coalesce(sum(tax), 0),
+            'min', min(tax), 'max', max(tax)
+        ),
+        'price_histogram', (
+            SELECT coalesce(json_agg(coalesce(b.n, 0) ORDER BY s.i), '[]')
+            FROM generate_series(1, cardinality(price_edges)) AS s(i)
+            LEFT JOIN price_buckets b USING (i)
+        ),
+        'tax_histogram', (
+            SELECT coalesce(json_agg(coalesce(b.n, 0) ORDER BY s.i), '[]')
+            FROM generate_series(1, cardinality(tax_edges)) AS s(i)
+            LEFT JOIN tax_buckets b USING (i)
+        )
+    )
+    FROM items;
+$$;
@@ -0,0 +1,26 @@
+-- Columna updated_at para sincronización incremental de items.
+--
+-- Las réplicas en memoria (services/replica_service) piden periódicamente
+-- las filas con (updated_at, id) posterior a su watermark; el índice
+-- compuesto permite recorrer ese orden por keyset sin ordenar la tabla.
+
+ALTER TABLE items
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW();
+
+CREATE OR REPLACE FUNCTION items_set_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS items_set_updated_at ON items;
+CREATE TRIGGER items_set_updated_at
+    BEFORE UPDATE ON items
+    FOR EACH ROW
+    EXECUTE FUNCTION items_set_updated_at();
+
+CREATE INDEX IF NOT EXISTS items_updated_at_id_idx ON items (updated_at, id);
@@ -0,0 +1,22 @@
+-- Posición de replicación para el read/write splitting de items.
+--
+-- En el primario devuelve la posición actual del WAL; en una réplica, la
+-- última posición aplicada. Ambas en bytes desde 0/0, de modo que una
+-- réplica está al día respecto de una escritura cuando su posición es
+-- mayor o igual que la que devolvió el primario después de escribir
+-- (ver repositories/item_repository/routing_repository.py).
+
+CREATE OR REPLACE FUNCTION replication_position()
+RETURNS bigint
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT (
+        CASE WHEN pg_is_in_recovery()
+            THEN pg_last_wal_replay_lsn()
+            ELSE pg_current_wal_lsn()
+        END - '0/0'::pg_lsn
+    )::bigint;
+$$;
+
+GRANT EXECUTE ON FUNCTION replication_position() TO anon, authenticated;
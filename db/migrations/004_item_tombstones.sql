@@ -0,0 +1,80 @@
+-- Registro de borrados de items para la sincronización incremental.
+--
+-- GET /items/changes devuelve las filas con (updated_at, id) posterior al
+-- token del cliente (ver 002_items_updated_at.sql) y, de esta tabla, los
+-- ids borrados con (deleted_at, id) posterior. Un trigger guarda la lápida
+-- al borrar y otro la quita si el mismo id se vuelve a insertar (p. ej. al
+-- mover una fila entre shards).
+--
+-- Los triggers corren con la petición de cualquier rol, incluidos los
+-- clientes por usuario (RLS), que no pueden escribir en item_tombstones:
+-- las funciones son SECURITY DEFINER (corren como el dueño de la tabla) con
+-- search_path fijo, y los roles de la API no las pueden invocar directamente.
+
+CREATE TABLE IF NOT EXISTS item_tombstones (
+    id UUID PRIMARY KEY,
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS item_tombstones_deleted_at_id_idx ON item_tombstones (deleted_at, id);
+
+CREATE OR REPLACE FUNCTION items_record_tombstone()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    INSERT INTO item_tombstones (id) VALUES (OLD.id)
+    ON CONFLICT (id) DO UPDATE SET deleted_at = now();
+    RETURN OLD;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION items_record_tombstone() FROM PUBLIC, anon, authenticated;
+
+DROP TRIGGER IF EXISTS items_record_tombstone ON items;
+CREATE TRIGGER items_record_tombstone
+    AFTER DELETE ON items
+    FOR EACH ROW
+    EXECUTE FUNCTION items_record_tombstone();
+
+CREATE OR REPLACE FUNCTION items_clear_tombstone()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    DELETE FROM item_tombstones WHERE id = NEW.id;
+    RETURN NEW;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION items_clear_tombstone() FROM PUBLIC, anon, authenticated;
+
+DROP TRIGGER IF EXISTS items_clear_tombstone ON items;
+CREATE TRIGGER items_clear_tombstone
+    AFTER INSERT ON items
+    FOR EACH ROW
+    EXECUTE FUNCTION items_clear_tombstone();
+
+-- Las lápidas solo contienen ids: visibles para los mismos roles que items
+ALTER TABLE item_tombstones ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS item_tombstones_read ON item_tombstones;
+CREATE POLICY item_tombstones_read ON item_tombstones FOR SELECT TO anon, authenticated USING (true);
+
+-- Retención: los tokens más viejos que ITEM_TOMBSTONE_RETENTION_DAYS reciben
+-- 410 y deben resincronizar completo. Programar, p. ej. con pg_cron:
+--   SELECT cron.schedule('0 3 * * *', $$SELECT prune_item_tombstones(interval '30 days')$$);
+CREATE OR REPLACE FUNCTION prune_item_tombstones(retention interval)
+RETURNS bigint
+LANGUAGE sql
+AS $$
+    WITH pruned AS (
+        DELETE FROM item_tombstones WHERE deleted_at < now() - retention RETURNING 1
+    )
+    SELECT count(*) FROM pruned;
+$$;
+
+REVOKE EXECUTE ON FUNCTION prune_item_tombstones(interval) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,37 @@
+"""
+PostgreSQL client module - Maneja los pools de conexiones directos a PostgreSQL.
+
+Se usa asyncpg, que es una dependencia opcional: solo se importa cuando se
+crea un pool, es decir, cuando el backend configurado es "postgres".
+"""
+
+from typing import Any
+
+
+async def create_postgres_pool(dsn: str, min_size: int = 1, max_size: int = 10) -> Any:
+    """
+    Crea un pool de conexiones asyncpg.
+
+    asyncpg prepara y cachea cada sentencia por conexión
+    (``statement_cache_size``), por lo que las consultas repetidas del
+    repositorio no se vuelven a parsear ni planificar en el servidor.
+
+    Args:
+        dsn: Cadena de conexión de PostgreSQL
+        min_size: Número mínimo de conexiones abiertas
+        max_size: Número máximo de conexiones abiertas
+
+    Returns:
+        asyncpg.Pool: Pool de conexiones listo para usar
+    """
+    try:
+        import asyncpg
+    except ImportError as e:
+        raise RuntimeError(
+            "El backend 'postgres' requiere asyncpg: pip install asyncpg"
+        ) from e
+
+    if not dsn:
+        raise RuntimeError("POSTGRES_DSN no está configurado")
+
+    return await asyncpg.create_pool(dsn, min_size=min_size, max_size=max_size)
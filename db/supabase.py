@@ -3,17 +3,37 @@ Supabase client module - Maneja la conexión y dependencias de Supabase.
 
 Este módulo proporciona el cliente de Supabase y el tipo de dependencia
 para inyección en los endpoints de FastAPI.
+
+Con ``SUPABASE_USER_CLIENTS_ENABLED`` la dependencia entrega, para las
+peticiones con ``Authorization: Bearer <jwt>``, un cliente autenticado
+como ese usuario (sujeto a RLS) tomado de un pool LRU, y lo deja como
+cliente de la petición para los repositorios.
 """
 
-from typing import Annotated
-from fastapi import Depends
+from contextvars import ContextVar
+from typing import Annotated, Optional, Union
+from fastapi import Depends, Header
 from supabase import create_client, Client
 from config.settings import settings
+from metrics import registry
+from .supabase_pool import SupabaseClientPool, UserSupabaseClient
 
 
 # Cliente de Supabase (Singleton)
 _supabase_client: Client = None
 
+# Pool de clientes por usuario (Singleton, se crea al primer uso)
+_user_client_pool: Optional[SupabaseClientPool] = None
+
+# Cliente elegido por la dependencia para la petición en curso
+_request_client: ContextVar[Optional[UserSupabaseClient]] = ContextVar("supabase_request_client", default=None)
+
+registry.gauge(
+    "supabase_client_pool_size",
+    "Clientes por usuario en el pool",
+    function=lambda: len(_user_client_pool) if _user_client_pool is not None else 0,
+)
+
 
 def get_supabase_client() -> Client:
     """
@@ -35,21 +55,98 @@ def get_supabase_client() -> Client:
     return _supabase_client
 
 
-def get_supabase() -> Client:
+def get_user_client_pool() -> SupabaseClientPool:
+    """
+    Obtiene o crea el pool de clientes por usuario.
+
+    Returns:
+        SupabaseClientPool: Pool compartido por todas las peticiones del worker
+    """
+    global _user_client_pool
+
+    if _user_client_pool is None:
+        _user_client_pool = SupabaseClientPool(
+            settings.SUPABASE_URL,
+            settings.SUPABASE_KEY,
+            max_size=settings.SUPABASE_USER_CLIENT_POOL_SIZE,
+            default_ttl=settings.SUPABASE_USER_CLIENT_DEFAULT_TTL_SECONDS,
+            max_connections=settings.SUPABASE_MAX_CONNECTIONS,
+        )
+
+    return _user_client_pool
+
+
+def close_user_client_pool() -> None:
+    """Cierra el pool de clientes por usuario y sus conexiones"""
+    global _user_client_pool
+
+    if _user_client_pool is not None:
+        _user_client_pool.close()
+        _user_client_pool = None
+
+
+def get_request_user_client() -> Optional[UserSupabaseClient]:
+    """
+    Cliente del usuario fijado para la petición en curso.
+
+    Returns:
+        UserSupabaseClient: Cliente del usuario, o None si la petición usa el de servicio
+    """
+    return _request_client.get()
+
+
+def get_request_supabase_client() -> Union[Client, UserSupabaseClient]:
+    """
+    Cliente para la petición en curso.
+
+    Returns:
+        El cliente del usuario elegido por la dependencia o, fuera de una
+        petición autenticada, el cliente de servicio
+    """
+    return _request_client.get() or get_supabase_client()
+
+
+async def bind_user_supabase_client(
+    authorization: Optional[str] = Header(None),
+) -> Optional[UserSupabaseClient]:
+    """
+    Dependencia que fija el cliente del usuario para la petición en curso.
+
+    Solo actúa si los clientes por usuario están habilitados y la petición
+    trae ``Authorization: Bearer <jwt>``. Es async para que el cliente quede
+    en el contexto de la petición, donde lo leen los repositorios.
+
+    Returns:
+        UserSupabaseClient: Cliente del usuario, o None si no aplica
+    """
+    if not settings.SUPABASE_USER_CLIENTS_ENABLED or not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    client = get_user_client_pool().get(token)
+    _request_client.set(client)
+    return client
+
+
+async def get_supabase(
+    user_client: Optional[UserSupabaseClient] = Depends(bind_user_supabase_client),
+) -> Union[Client, UserSupabaseClient]:
     """
     Función de dependencia para FastAPI.
 
-    Retorna el cliente de Supabase para usar en los endpoints.
+    Retorna el cliente de Supabase para usar en los endpoints: el del
+    usuario autenticado (ver bind_user_supabase_client) o el de servicio.
 
     Returns:
         Client: Cliente de Supabase
     """
-    return get_supabase_client()
+    return user_client or get_supabase_client()
 
 
 # Tipo reutilizable para inyección de dependencias
 # Uso: db: SupabaseDependency
-SupabaseDependency = Annotated[Client, Depends(get_supabase)]
+SupabaseDependency = Annotated[Union[Client, UserSupabaseClient], Depends(get_supabase)]
 
 
 # Alias para mantener compatibilidad (puedes usar cualquiera de los dos)
@@ -0,0 +1,181 @@
+"""
+Pool LRU de clientes de Supabase por usuario final (RLS).
+
+Para que PostgREST aplique row-level security cada petición debe viajar con
+el JWT del usuario en ``Authorization``. Construir un cliente de Supabase
+completo por petición (GoTrue, storage, transporte HTTP propio) es caro,
+así que el pool entrega clientes PostgREST ligeros:
+
+- Uno por JWT, reutilizado mientras el token siga en el LRU.
+- Todos comparten un único ``httpx.HTTPTransport``, es decir, un único
+  pool de conexiones keep-alive hacia Supabase.
+- Cada entrada caduca con el ``exp`` del token; un token sin ``exp``
+  legible dura ``default_ttl`` segundos.
+
+Aciertos, fallos, expulsiones y el coste de crear clientes se publican en
+GET /metrics.
+"""
+
+from collections import OrderedDict
+from time import perf_counter
+from typing import Any, Optional
+import base64
+import heapq
+import json
+import threading
+import time
+
+import httpx
+from postgrest import SyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS, DEFAULT_POSTGREST_CLIENT_TIMEOUT
+from postgrest.utils import SyncClient
+
+from metrics import registry
+
+
+pool_requests_total = registry.counter(
+    "supabase_client_pool_requests_total",
+    "Peticiones de clientes por usuario al pool (result=hit|miss)",
+)
+pool_evictions_total = registry.counter(
+    "supabase_client_pool_evictions_total",
+    "Clientes expulsados del pool (reason=lru|expired)",
+)
+client_create_seconds = registry.summary(
+    "supabase_client_create_seconds",
+    "Tiempo de construcción de un cliente PostgREST por usuario",
+)
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """Claim ``exp`` de un JWT (sin verificar la firma: eso lo hace PostgREST)"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class _SharedTransportPostgrestClient(SyncPostgrestClient):
+    """SyncPostgrestClient cuya sesión HTTP usa un transporte compartido"""
+
+    def __init__(self, base_url: str, transport: httpx.BaseTransport, **kwargs):
+        self._transport = transport
+        super().__init__(base_url, **kwargs)
+
+    def create_session(self, base_url: str, headers: dict[str, str], timeout) -> SyncClient:
+        return SyncClient(base_url=base_url, headers=headers, timeout=timeout, transport=self._transport)
+
+
+class UserSupabaseClient:
+    """Cliente PostgREST autenticado con el JWT de un usuario final"""
+
+    def __init__(self, postgrest: SyncPostgrestClient):
+        self.postgrest = postgrest
+
+    def table(self, table_name: str):
+        return self.postgrest.from_(table_name)
+
+    def from_(self, table_name: str):
+        return self.postgrest.from_(table_name)
+
+    def rpc(self, fn: str, params: dict[Any, Any]):
+        return self.postgrest.rpc(fn, params)
+
+
+class SupabaseClientPool:
+    """LRU acotado de clientes por JWT que comparten transporte HTTP"""
+
+    def __init__(self, supabase_url: str, supabase_key: str, max_size: int = 1024,
+                 default_ttl: float = 3600.0, max_connections: int = 100):
+        self._rest_url = f"{supabase_url}/rest/v1"
+        self._key = supabase_key
+        self.max_size = max_size
+        self._default_ttl = default_ttl
+        self._transport = httpx.HTTPTransport(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self._clients: OrderedDict[str, tuple[UserSupabaseClient, float]] = OrderedDict()
+        self._expiries: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, token: str) -> UserSupabaseClient:
+        """Devuelve el cliente del JWT, creándolo si no está en el pool"""
+        now = time.time()
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._clients.get(token)
+            if entry is not None:
+                self._clients.move_to_end(token)
+                self.hits += 1
+                pool_requests_total.inc(labels={"result": "hit"})
+                return entry[0]
+            self.misses += 1
+        pool_requests_total.inc(labels={"result": "miss"})
+
+        client = self._create(token)
+        expires_at = token_expiry(token) or now + self._default_ttl
+        if expires_at <= now:
+            # Token ya caducado: PostgREST lo rechazará, no vale la pena cachearlo
+            return client
+
+        with self._lock:
+            entry = self._clients.get(token)
+            if entry is not None:
+                # Otro hilo lo creó mientras tanto
+                return entry[0]
+            self._clients[token] = (client, expires_at)
+            heapq.heappush(self._expiries, (expires_at, token))
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+                pool_evictions_total.inc(labels={"reason": "lru"})
+            if len(self._expiries) > 2 * self.max_size:
+                self._compact_expiries()
+        return client
+
+    def _create(self, token: str) -> UserSupabaseClient:
+        start = perf_counter()
+        postgrest = _SharedTransportPostgrestClient(
+            self._rest_url,
+            self._transport,
+            headers={
+                **DEFAULT_POSTGREST_CLIENT_HEADERS,
+                "apiKey": self._key,
+                "Authorization": f"Bearer {token}",
+            },
+            timeout=DEFAULT_POSTGREST_CLIENT_TIMEOUT,
+        )
+        client_create_seconds.observe(perf_counter() - start)
+        return UserSupabaseClient(postgrest)
+
+    def _evict_expired(self, now: float) -> None:
+        expiries = self._expiries
+        while expiries and expiries[0][0] <= now:
+            expires_at, token = heapq.heappop(expiries)
+            entry = self._clients.get(token)
+            if entry is not None and entry[1] == expires_at:
+                del self._clients[token]
+                pool_evictions_total.inc(labels={"reason": "expired"})
+
+    def _compact_expiries(self) -> None:
+        # Quita del heap los tokens que ya salieron del LRU
+        self._expiries = [(expires_at, token) for token, (_, expires_at) in self._clients.items()]
+        heapq.heapify(self._expiries)
+
+    def close(self) -> None:
+        """Vacía el pool y cierra las conexiones compartidas"""
+        with self._lock:
+            self._clients.clear()
+            self._expiries = []
+        self._transport.close()
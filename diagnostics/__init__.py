@@ -0,0 +1,17 @@
+"""
+Diagnostics package - Herramientas opcionales de diagnóstico en ejecución.
+"""
+
+from .loop_monitor import LoopMonitor, loop_monitor, start_loop_monitor, stop_loop_monitor
+from .request_context import RequestContext, record_upstream, request_context, set_request_item_id
+
+__all__ = [
+    "LoopMonitor",
+    "RequestContext",
+    "loop_monitor",
+    "record_upstream",
+    "request_context",
+    "set_request_item_id",
+    "start_loop_monitor",
+    "stop_loop_monitor",
+]
@@ -0,0 +1,138 @@
+"""
+Detector de lag del event loop y de llamadas bloqueantes.
+
+Dos piezas cooperan:
+- Una tarea del propio loop duerme ``interval`` segundos y mide cuánto
+  tarde despierta; ese retraso es el lag del loop y se publica como
+  summary (p50/p90/p99) en GET /metrics.
+- Un hilo watchdog vigila el último latido de esa tarea. Si el loop lleva
+  más de ``threshold`` segundos sin latir, hay un callback bloqueándolo:
+  el watchdog captura la pila del hilo del loop con ``sys._current_frames``
+  y la registra como warning, una vez por bloqueo.
+"""
+
+from typing import Optional
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from config.settings import settings
+from metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+loop_lag_seconds = registry.summary(
+    "event_loop_lag_seconds",
+    "Retraso con el que el event loop atiende un timer",
+    window=4096,
+    quantiles=(0.5, 0.9, 0.99, 1.0),
+)
+loop_blocked_total = registry.counter(
+    "event_loop_blocked_total",
+    "Callbacks que bloquearon el event loop más allá del umbral",
+)
+loop_blocked_seconds = registry.summary(
+    "event_loop_blocked_seconds",
+    "Duración de los bloqueos del event loop detectados",
+)
+
+
+class LoopMonitor:
+    """Mide el lag del loop actual y denuncia los callbacks que lo bloquean"""
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1):
+        self._interval = interval
+        self._threshold = threshold
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """Arranca la medición en el loop en ejecución y el hilo watchdog"""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._measure())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Detiene la tarea de medición y espera al watchdog"""
+        if not self.running:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog.join()
+        self._watchdog = None
+
+    async def _measure(self) -> None:
+        while True:
+            expected = time.monotonic() + self._interval
+            await asyncio.sleep(self._interval)
+            now = time.monotonic()
+            self._last_beat = now
+            loop_lag_seconds.observe(max(now - expected, 0.0))
+
+    def _watch(self) -> None:
+        reported_beat = None
+        blocked_since = None
+        while not self._stopped.wait(self._threshold / 4):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self._interval
+            if stalled <= self._threshold:
+                if blocked_since is not None:
+                    # El loop volvió a latir: registrar cuánto duró el bloqueo
+                    loop_blocked_seconds.observe(beat - blocked_since - self._interval)
+                    blocked_since = None
+                continue
+            if reported_beat == beat:
+                continue
+            reported_beat = beat
+            blocked_since = beat
+            loop_blocked_total.inc()
+            logger.warning(
+                "Event loop blocked for more than %.3fs; loop thread stack:\n%s",
+                stalled,
+                self.loop_stack(),
+            )
+
+    def loop_stack(self) -> str:
+        """Pila actual del hilo que ejecuta el event loop"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return "<loop thread not found>"
+        return "".join(traceback.format_stack(frame))
+
+
+# Monitor global del event loop (Singleton)
+loop_monitor = LoopMonitor(
+    settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    settings.LOOP_MONITOR_BLOCK_THRESHOLD_SECONDS,
+)
+
+
+def start_loop_monitor() -> None:
+    """Arranca el monitor en el event loop en ejecución"""
+    loop_monitor.start()
+
+
+async def stop_loop_monitor() -> None:
+    """Detiene el monitor del event loop"""
+    await loop_monitor.stop()
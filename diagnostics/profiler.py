@@ -0,0 +1,107 @@
+"""
+Profiler estadístico bajo demanda para el worker en ejecución.
+
+- CPU: un hilo muestrea cada ``interval`` segundos la pila de todos los
+  demás hilos con ``sys._current_frames`` (sin instrumentar el código
+  perfilado) y cuenta cuántas veces aparece cada pila.
+- Memoria: compara dos snapshots de ``tracemalloc`` tomados al principio y
+  al final de la ventana y atribuye a cada pila los bytes que crecieron.
+
+Ambos modos producen el formato "collapsed stacks" (``marco;marco;... N``)
+que leen flamegraph.pl, speedscope o inferno.
+"""
+
+from collections import Counter
+from time import perf_counter
+from types import CodeType, FrameType
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+# Un solo perfilado a la vez por worker
+profile_lock = asyncio.Lock()
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_ROOT):
+        return filename[len(_ROOT):]
+    parts = filename.replace(os.sep, "/").rsplit("/", 2)
+    return "/".join(parts[-2:])
+
+
+def _collapse(frame: FrameType, thread_name: str, labels: dict[CodeType, str]) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        label = labels.get(code)
+        if label is None:
+            # ';' separa marcos en el formato collapsed
+            label = labels[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+        names.append(label)
+        frame = frame.f_back
+    names.append(thread_name)
+    names.reverse()
+    return ";".join(names)
+
+
+def sample_stacks(seconds: float, interval: float) -> Counter:
+    """
+    Muestrea las pilas de todos los hilos (salvo el propio) durante ``seconds``.
+
+    Returns:
+        Counter: Número de muestras por pila colapsada
+    """
+    own = threading.get_ident()
+    labels: dict[CodeType, str] = {}
+    counts: Counter = Counter()
+    deadline = perf_counter() + seconds
+    while perf_counter() < deadline:
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident != own:
+                counts[_collapse(frame, thread_names.get(ident, f"thread-{ident}"), labels)] += 1
+        time.sleep(interval)
+    return counts
+
+
+async def sample_allocations(seconds: float, frames: int = 32) -> Counter:
+    """
+    Bytes asignados y aún vivos al final de la ventana, por pila.
+
+    Si tracemalloc no estaba activo se activa solo durante la ventana; las
+    asignaciones hechas antes no aparecen en el diff.
+
+    Returns:
+        Counter: Crecimiento en bytes por pila colapsada
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(frames)
+    try:
+        before = tracemalloc.take_snapshot()
+        await asyncio.sleep(seconds)
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "traceback")
+    counts: Counter = Counter()
+    for stat in stats:
+        if stat.size_diff > 0:
+            # Los tracebacks de tracemalloc van del marco más antiguo al más reciente
+            stack = ";".join(f"{_short_path(frame.filename)}:{frame.lineno}" for frame in stat.traceback)
+            counts[stack] += stat.size_diff
+    return counts
+
+
+def format_collapsed(counts: Counter) -> str:
+    """Una línea ``pila cuenta`` por pila, de mayor a menor"""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
@@ -0,0 +1,41 @@
+"""
+Contexto por petición compartido entre el middleware y las capas internas.
+
+El middleware de access log crea un RequestContext y lo publica en una
+ContextVar; los repositorios suman ahí el tiempo pasado en el backend y
+los servicios anotan el item afectado. Las ContextVar se copian a los
+hilos de run_in_threadpool, y como el objeto es mutable las anotaciones
+hechas desde el threadpool también llegan al middleware.
+"""
+
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestContext:
+    """Datos de la petición en curso acumulados durante su ejecución"""
+
+    __slots__ = ("upstream_seconds", "upstream_calls", "item_id")
+
+    def __init__(self):
+        self.upstream_seconds = 0.0
+        self.upstream_calls = 0
+        self.item_id: Optional[str] = None
+
+
+request_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def record_upstream(seconds: float) -> None:
+    """Suma una llamada al backend a la petición en curso (si la hay)"""
+    context = request_context.get()
+    if context is not None:
+        context.upstream_seconds += seconds
+        context.upstream_calls += 1
+
+
+def set_request_item_id(item_id) -> None:
+    """Anota el item afectado por la petición en curso (si la hay)"""
+    context = request_context.get()
+    if context is not None:
+        context.item_id = str(item_id)
@@ -0,0 +1,21 @@
+"""
+Items client package - Cliente asíncrono de la API de items.
+
+Usa los mismos modelos Pydantic que la app (``models``) para las
+peticiones y las respuestas.
+"""
+
+from .client import CONSISTENCY_TOKEN_HEADER, ItemsClient
+from .errors import ItemNotFoundError, ItemsAPIError
+from .lookup_batcher import LookupBatcher
+from .routes import ROUTES, Route
+
+__all__ = [
+    "CONSISTENCY_TOKEN_HEADER",
+    "ItemsClient",
+    "ItemNotFoundError",
+    "ItemsAPIError",
+    "LookupBatcher",
+    "ROUTES",
+    "Route",
+]
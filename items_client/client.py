@@ -0,0 +1,269 @@
+"""
+Cliente asíncrono de la API de items.
+
+Un solo ``httpx.AsyncClient`` con pool de conexiones keep-alive atiende
+todas las llamadas. Las operaciones idempotentes se reintentan ante
+errores de transporte y respuestas 429/502/503/504, respetando
+``Retry-After`` (el límite de concurrencia del servidor lo envía con 503).
+El token de consistencia que devuelven las escrituras se reenvía durante
+``read_your_writes_seconds``, así que el cliente lee sus propias escrituras
+aunque el servidor lea de réplicas; pasado ese plazo deja de enviarlo para
+que el servidor vuelva a atender sus lecturas desde réplicas y cachés.
+"""
+
+from typing import Any, AsyncIterator, Optional, Union
+import asyncio
+import random
+import time
+import uuid
+
+import httpx
+
+from models import (
+    ChangedItem,
+    Item,
+    ItemBase,
+    ItemChanges,
+    ItemCreate,
+    ItemStats,
+    ItemSuggestion,
+    QuoteRequest,
+    QuoteResponse,
+)
+from .errors import ItemsAPIError
+from .lookup_batcher import LookupBatcher
+from .routes import ADAPTERS, ROUTES
+
+
+# Mismo header que db/consistency.py (el cliente no importa el paquete db)
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+
+_RETRY_STATUSES = {429, 502, 503, 504}
+
+# Máximo de ids por POST /items/lookup (ItemLookupRequest)
+MAX_LOOKUP_IDS = 1000
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _as_uuid(item_id: Union[uuid.UUID, str]) -> uuid.UUID:
+    return item_id if isinstance(item_id, uuid.UUID) else uuid.UUID(str(item_id))
+
+
+class ItemsClient:
+    """
+    Cliente de la API de items.
+
+    Uso::
+
+        async with ItemsClient("https://api.example.com", token=jwt) as client:
+            item = await client.create_item(ItemCreate(name="A", description="B"))
+            same = await client.get_item(item.id)
+            async for page in client.iter_changes():
+                ...
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: Optional[str] = None,
+        timeout: float = 10.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        retries: int = 3,
+        backoff: float = 0.1,
+        max_batch_size: int = 100,
+        batch_window: float = 0.0,
+        read_your_writes_seconds: float = 5.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_keepalive_connections
+            ),
+            transport=transport,
+        )
+        self._retries = retries
+        self._backoff = backoff
+        self._batcher = LookupBatcher(
+            self.get_items, max_batch_size=min(max_batch_size, MAX_LOOKUP_IDS), window=batch_window
+        )
+        self._read_your_writes = read_your_writes_seconds
+        self.consistency_token: Optional[str] = None
+        self._consistency_expires = 0.0
+
+    async def __aenter__(self) -> "ItemsClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Resuelve las lecturas pendientes y cierra el pool de conexiones"""
+        await self._batcher.aclose()
+        await self._http.aclose()
+
+    async def _send(self, method: str, path: str, retry: bool, **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            headers = {}
+            if self.consistency_token is not None and time.monotonic() < self._consistency_expires:
+                headers[CONSISTENCY_TOKEN_HEADER] = self.consistency_token
+            try:
+                response = await self._http.request(method, path, headers=headers, **kwargs)
+            except httpx.TransportError:
+                if not retry or attempt >= self._retries:
+                    raise
+                delay = None
+            else:
+                if not retry or attempt >= self._retries or response.status_code not in _RETRY_STATUSES:
+                    return response
+                delay = _retry_after(response)
+            if delay is None:
+                # Backoff exponencial con jitter para no sincronizar a los clientes
+                delay = self._backoff * (2 ** attempt) * random.uniform(0.5, 1.0)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _call(self, operation: str, path_params: Optional[dict] = None, **kwargs) -> Any:
+        route = ROUTES[operation]
+        path = route.path.format(**path_params) if path_params else route.path
+        response = await self._send(route.method, path, route.idempotent, **kwargs)
+
+        token = response.headers.get(CONSISTENCY_TOKEN_HEADER)
+        if token is not None:
+            self.consistency_token = token
+            self._consistency_expires = time.monotonic() + self._read_your_writes
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail")
+            except ValueError:
+                detail = response.text
+            raise ItemsAPIError(response.status_code, detail, _retry_after(response))
+        if route.response is None:
+            return None
+        return ADAPTERS[operation].validate_json(response.content)
+
+    async def create_item(self, item: Union[ItemCreate, dict]) -> ItemBase:
+        """Crea un item (no se reintenta: podría duplicarse)"""
+        item = ItemCreate.model_validate(item)
+        return await self._call("create_item", json=item.model_dump(mode="json"))
+
+    async def get_item(self, item_id: Union[uuid.UUID, str]) -> ItemBase:
+        """
+        Obtiene un item por id.
+
+        Las llamadas concurrentes se juntan en búsquedas en bloque.
+
+        Raises:
+            ItemNotFoundError: Si el item no existe
+        """
+        return await self._batcher.get(_as_uuid(item_id))
+
+    async def get_items(self, item_ids: list[Union[uuid.UUID, str]]) -> list[ItemBase]:
+        """Obtiene varios items en el orden pedido, omitiendo los que no existen"""
+        ids = [str(_as_uuid(item_id)) for item_id in item_ids]
+        if not ids:
+            return []
+        chunks = [ids[start:start + MAX_LOOKUP_IDS] for start in range(0, len(ids), MAX_LOOKUP_IDS)]
+        pages = await asyncio.gather(*(self._call("lookup_items", json={"ids": chunk}) for chunk in chunks))
+        return [item for page in pages for item in page]
+
+    async def list_items(
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[ItemBase]:
+        """Obtiene una página de items"""
+        params = {"limit": limit, "offset": offset}
+        if min_price is not None:
+            params["min_price"] = min_price
+        if max_price is not None:
+            params["max_price"] = max_price
+        return await self._call("list_items", params=params)
+
+    async def iter_items(
+        self,
+        page_size: int = 100,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> AsyncIterator[ItemBase]:
+        """Recorre todos los items página a página"""
+        offset = 0
+        while True:
+            page = await self.list_items(page_size, offset, min_price, max_price)
+            for item in page:
+                yield item
+            if len(page) < page_size:
+                return
+            offset += page_size
+
+    async def update_item(self, item_id: Union[uuid.UUID, str], item: Union[ItemCreate, dict]) -> Item:
+        """Reemplaza los datos de un item"""
+        item = ItemCreate.model_validate(item)
+        return await self._call(
+            "update_item", {"item_id": _as_uuid(item_id)}, json=item.model_dump(mode="json")
+        )
+
+    async def delete_item(self, item_id: Union[uuid.UUID, str]) -> None:
+        """Elimina un item"""
+        await self._call("delete_item", {"item_id": _as_uuid(item_id)})
+
+    async def get_stats(self) -> ItemStats:
+        """Obtiene las estadísticas agregadas de price y tax"""
+        return await self._call("get_stats")
+
+    async def suggest_items(self, prefix: str, limit: int = 10) -> list[ItemSuggestion]:
+        """Autocompleta nombres de items por prefijo"""
+        return await self._call("suggest_items", params={"prefix": prefix, "limit": limit})
+
+    async def quote(self, request: Union[QuoteRequest, dict]) -> QuoteResponse:
+        """Cotiza una cesta"""
+        request = QuoteRequest.model_validate(request)
+        return await self._call("quote", json=request.model_dump(mode="json"))
+
+    async def get_changes(self, since: Optional[str] = None, limit: int = 100) -> ItemChanges:
+        """Obtiene una tanda de cambios desde un token de sincronización"""
+        params = {"limit": limit}
+        if since is not None:
+            params["since"] = since
+        return await self._call("get_changes", params=params)
+
+    async def iter_changes(self, since: Optional[str] = None, limit: int = 100) -> AsyncIterator[ItemChanges]:
+        """
+        Sigue el cursor de GET /items/changes hasta ponerse al día.
+
+        El ``next_token`` de la última tanda sirve para la siguiente
+        sincronización.
+        """
+        while True:
+            changes = await self.get_changes(since, limit)
+            yield changes
+            if not changes.has_more:
+                return
+            since = changes.next_token
+
+    async def export_items(self, batch_size: int = 1000) -> AsyncIterator[ChangedItem]:
+        """
+        Exporta todos los items en tandas de ``batch_size`` sin cargarlos en memoria.
+
+        Recorre el feed de cambios desde el principio: un item modificado
+        durante la exportación puede aparecer dos veces (la última es la
+        versión vigente).
+        """
+        async for changes in self.iter_changes(limit=batch_size):
+            for item in changes.items:
+                yield item
+
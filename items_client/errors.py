@@ -0,0 +1,23 @@
+"""
+Errores del cliente de la API de items.
+"""
+
+from typing import Any, Optional
+
+
+class ItemsAPIError(Exception):
+    """Respuesta de error de la API"""
+
+    def __init__(self, status_code: int, detail: Any = None, retry_after: Optional[float] = None):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class ItemNotFoundError(ItemsAPIError):
+    """El item pedido no existe"""
+
+    def __init__(self, item_id: Any):
+        super().__init__(404, f"Item not found: {item_id}")
+        self.item_id = item_id
@@ -0,0 +1,85 @@
+"""
+Agrupación de lecturas por id en búsquedas en bloque.
+
+Las llamadas a ``get`` hechas a la vez (p. ej. desde un ``asyncio.gather``)
+se acumulan hasta el siguiente paso del event loop, o durante ``window``
+segundos si se configura, y se resuelven con una sola petición a
+POST /items/lookup de hasta ``max_batch_size`` ids. Los ids repetidos se
+piden una vez.
+"""
+
+from typing import Awaitable, Callable, Optional
+import asyncio
+import uuid
+
+from models import ItemBase
+from .errors import ItemNotFoundError
+
+
+class LookupBatcher:
+    """Junta lecturas por id concurrentes en búsquedas en bloque"""
+
+    def __init__(
+        self,
+        fetch: Callable[[list[uuid.UUID]], Awaitable[list[ItemBase]]],
+        max_batch_size: int = 100,
+        window: float = 0.0,
+    ):
+        self._fetch = fetch
+        self._max_batch_size = max_batch_size
+        self._window = window
+        self._pending: dict[uuid.UUID, list[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.Handle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get(self, item_id: uuid.UUID) -> ItemBase:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(item_id, []).append(future)
+        if len(self._pending) >= self._max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            if self._window > 0:
+                self._timer = loop.call_later(self._window, self.flush)
+            else:
+                self._timer = loop.call_soon(self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Envía ya las lecturas acumuladas"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.create_task(self._resolve(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: dict[uuid.UUID, list[asyncio.Future]]) -> None:
+        try:
+            items = await self._fetch(list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        found = {item.id: item for item in items}
+        for item_id, futures in batch.items():
+            item = found.get(item_id)
+            for future in futures:
+                # Los que se cancelaron mientras tanto ya no esperan resultado
+                if future.done():
+                    continue
+                if item is None:
+                    future.set_exception(ItemNotFoundError(item_id))
+                else:
+                    future.set_result(item)
+
+    async def aclose(self) -> None:
+        """Envía lo pendiente y espera las búsquedas en curso"""
+        self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,41 @@
+"""
+Operaciones de la API que usa el cliente.
+
+Cada operación fija el método, la ruta y el tipo de la respuesta con los
+mismos modelos Pydantic que la app (``models``). Los tests comparan esta
+tabla con el esquema OpenAPI de la app, así que un cambio de ruta o de
+``response_model`` en el servidor rompe el build del cliente.
+"""
+
+from typing import Any, NamedTuple
+
+from pydantic import TypeAdapter
+
+from models import Item, ItemBase, ItemChanges, ItemStats, ItemSuggestion, QuoteResponse
+
+
+class Route(NamedTuple):
+    """Operación de la API"""
+    method: str
+    path: str
+    response: Any
+    # Se puede repetir sin efectos duplicados (reintentos)
+    idempotent: bool
+
+
+ROUTES: dict[str, Route] = {
+    "create_item": Route("POST", "/items", ItemBase, idempotent=False),
+    "list_items": Route("GET", "/items", list[ItemBase], idempotent=True),
+    "get_stats": Route("GET", "/items/stats", ItemStats, idempotent=True),
+    "suggest_items": Route("GET", "/items/suggest", list[ItemSuggestion], idempotent=True),
+    "get_changes": Route("GET", "/items/changes", ItemChanges, idempotent=True),
+    "quote": Route("POST", "/items/quote", QuoteResponse, idempotent=True),
+    "lookup_items": Route("POST", "/items/lookup", list[ItemBase], idempotent=True),
+    "update_item": Route("PUT", "/items/{item_id}", Item, idempotent=True),
+    "delete_item": Route("DELETE", "/items/{item_id}", None, idempotent=True),
+}
+
+# Validadores construidos una vez por operación
+ADAPTERS: dict[str, TypeAdapter] = {
+    name: TypeAdapter(route.response) for name, route in ROUTES.items() if route.response is not None
+}
@@ -1,16 +1,93 @@
-from fastapi import FastAPI
-from config import settings
-from routes import item_router
-
-app = FastAPI(
-    title=settings.APP_NAME,
-    version=settings.APP_VERSION,
-    debug=settings.DEBUG
-)
-
-# Incluir routers
-app.include_router(item_router)
-
-@app.get("/")
-async def root():
-    return {"message": "Hello World - Connected to Supabase"}
\ No newline at end of file
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from config import settings
+from db import close_user_client_pool
+from diagnostics import start_loop_monitor, stop_loop_monitor
+from middleware import AccessLogMiddleware, TracingMiddleware, start_access_log, stop_access_log
+from repositories import close_item_repository
+from routes import batch_router, debug_router, item_router, metrics_router
+from services.cache_service import (
+    save_item_cache_hot_keys,
+    start_item_cache,
+    start_item_list_cache,
+    stop_item_cache,
+    stop_item_list_cache,
+    warm_item_caches,
+)
+from services.replica_service import start_item_replica, stop_item_replica
+from services.stats_service import start_item_stats, stop_item_stats
+from services.suggest_service import start_item_suggest, stop_item_suggest
+from tracing import start_tracing, stop_tracing
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.TRACING_ENABLED:
+        start_tracing()
+    if settings.ACCESS_LOG_ENABLED:
+        start_access_log()
+    if settings.LOOP_MONITOR_ENABLED:
+        start_loop_monitor()
+    if settings.ITEM_REPLICA_ENABLED:
+        await start_item_replica()
+    if settings.ITEM_STATS_ENABLED:
+        start_item_stats()
+    if settings.ITEM_SUGGEST_ENABLED:
+        await start_item_suggest()
+    if settings.ITEM_LIST_CACHE_ENABLED:
+        start_item_list_cache()
+    if settings.ITEM_CACHE_ENABLED:
+        start_item_cache()
+    # Antes del yield: el worker no acepta peticiones hasta terminar el warm-up
+    if not settings.ITEM_REPLICA_ENABLED:
+        await warm_item_caches()
+    yield
+    save_item_cache_hot_keys()
+    if settings.ITEM_CACHE_ENABLED:
+        stop_item_cache()
+    if settings.ITEM_LIST_CACHE_ENABLED:
+        stop_item_list_cache()
+    if settings.ITEM_SUGGEST_ENABLED:
+        await stop_item_suggest()
+    if settings.ITEM_STATS_ENABLED:
+        await stop_item_stats()
+    if settings.ITEM_REPLICA_ENABLED:
+        await stop_item_replica()
+    # Liberar conexiones del backend de items al apagar el worker
+    await close_item_repository()
+    close_user_client_pool()
+    if settings.LOOP_MONITOR_ENABLED:
+        await stop_loop_monitor()
+    if settings.ACCESS_LOG_ENABLED:
+        stop_access_log()
+    if settings.TRACING_ENABLED:
+        stop_tracing()
+
+
+app = FastAPI(
+    title=settings.APP_NAME,
+    version=settings.APP_VERSION,
+    debug=settings.DEBUG,
+    lifespan=lifespan
+)
+
+if settings.ACCESS_LOG_ENABLED:
+    app.add_middleware(
+        AccessLogMiddleware,
+        sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+        slow_seconds=settings.ACCESS_LOG_SLOW_SECONDS,
+    )
+
+# Añadido después del access log para envolverlo: el access log ve el trace id
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+# Incluir routers
+app.include_router(item_router)
+app.include_router(batch_router)
+app.include_router(metrics_router)
+app.include_router(debug_router)
+
+@app.get("/")
+async def root():
+    return {"message": "Hello World - Connected to Supabase"}
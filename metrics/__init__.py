@@ -0,0 +1,13 @@
+"""
+Metrics package - Métricas del proceso expuestas en GET /metrics.
+"""
+
+from .registry import Counter, Gauge, MetricsRegistry, Summary, registry
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "MetricsRegistry",
+    "Summary",
+    "registry",
+]
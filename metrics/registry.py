@@ -0,0 +1,204 @@
+"""
+Registro de métricas del proceso en formato de exposición de Prometheus.
+
+Implementación mínima sin dependencias: contadores, gauges (con valor fijo
+o calculado al exportar) y summaries con cuantiles sobre una ventana
+deslizante de observaciones. Todas las métricas aceptan labels opcionales
+y son seguras para usarse desde hilos auxiliares.
+"""
+
+from collections import deque
+from typing import Callable, Optional
+import math
+import threading
+
+
+Labels = Optional[dict[str, str]]
+
+
+def _label_key(labels: Labels) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(key: tuple[tuple[str, str], ...], extra: Labels = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    escaped = (
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Valor monótono creciente"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: Labels = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, labels: Labels = None) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Valor que sube y baja; con ``function`` se calcula al exportar"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, function: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation)
+        self._values: dict[tuple, float] = {}
+        self._function = function
+
+    def set(self, value: float, labels: Labels = None) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1.0, labels: Labels = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, labels: Labels = None) -> None:
+        self.inc(-amount, labels)
+
+    def value(self, labels: Labels = None) -> float:
+        if self._function is not None:
+            return self._function()
+        return self._values.get(_label_key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        if self._function is not None:
+            return [f"{self.name} {_format_value(self._function())}"]
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in items]
+
+
+class Summary(_Metric):
+    """Cuantiles sobre las últimas ``window`` observaciones, más count y sum totales"""
+
+    kind = "summary"
+
+    def __init__(self, name: str, documentation: str, window: int = 1024,
+                 quantiles: tuple[float, ...] = (0.5, 0.9, 0.99)):
+        super().__init__(name, documentation)
+        self._window = window
+        self._quantiles = quantiles
+        self._observations: dict[tuple, deque] = {}
+        self._counts: dict[tuple, int] = {}
+        self._sums: dict[tuple, float] = {}
+
+    def observe(self, value: float, labels: Labels = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            window = self._observations.get(key)
+            if window is None:
+                window = self._observations[key] = deque(maxlen=self._window)
+            window.append(value)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def quantile(self, q: float, labels: Labels = None) -> float:
+        """Cuantil ``q`` de la ventana actual (NaN si no hay observaciones)"""
+        with self._lock:
+            values = sorted(self._observations.get(_label_key(labels), ()))
+        return _quantile(values, q)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            snapshot = [
+                (key, sorted(window), self._counts[key], self._sums[key])
+                for key, window in self._observations.items()
+            ]
+        lines = []
+        for key, values, count, total in snapshot:
+            for q in self._quantiles:
+                labels = _format_labels(key, {"quantile": str(q)})
+                lines.append(f"{self.name}{labels} {_format_value(_quantile(values, q))}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+        return lines
+
+
+def _quantile(values: list[float], q: float) -> float:
+    if not values:
+        return math.nan
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+class MetricsRegistry:
+    """Colección de métricas del proceso; cada nombre se registra una sola vez"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"La métrica {name} ya existe con otro tipo")
+            return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._get_or_create(Counter, name, documentation)
+
+    def gauge(self, name: str, documentation: str,
+              function: Optional[Callable[[], float]] = None) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, function=function)
+
+    def summary(self, name: str, documentation: str, window: int = 1024,
+                quantiles: tuple[float, ...] = (0.5, 0.9, 0.99)) -> Summary:
+        return self._get_or_create(Summary, name, documentation, window=window, quantiles=quantiles)
+
+    def render(self) -> str:
+        """Exporta todas las métricas en formato de texto de Prometheus"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+# Registro global del proceso (Singleton)
+registry = MetricsRegistry()
@@ -0,0 +1,13 @@
+"""
+Middleware package - Middlewares ASGI de la aplicación.
+"""
+
+from .access_log import AccessLogMiddleware, start_access_log, stop_access_log
+from .tracing import TracingMiddleware
+
+__all__ = [
+    "AccessLogMiddleware",
+    "TracingMiddleware",
+    "start_access_log",
+    "stop_access_log",
+]
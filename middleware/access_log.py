@@ -0,0 +1,172 @@
+"""
+Access log estructurado (JSON) que no bloquea el event loop.
+
+AccessLogMiddleware es un middleware ASGI puro: mide la petición, decide
+si se registra y encola el registro sin formatearlo. La serialización a
+JSON y la escritura al fichero o stdout ocurren en el hilo de un
+QueueListener.
+
+Política de muestreo:
+- Errores (status >= 400) y peticiones lentas: siempre.
+- Resto: con probabilidad ``sample_rate``; cada registro lleva la tasa
+  aplicada para poder reponderar los conteos al analizarlos.
+
+La cola es acotada: si el hilo escritor no da abasto los registros se
+descartan (``access_log_dropped_total``) en lugar de frenar peticiones.
+El coste del middleware por petición se publica en
+``access_log_overhead_seconds``.
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+from time import perf_counter
+from typing import Optional
+import json
+import logging
+import queue
+import random
+import sys
+import time
+
+from config.settings import settings
+from diagnostics.request_context import RequestContext, request_context
+from metrics import registry
+from tracing import get_current_span
+
+
+access_log_dropped_total = registry.counter(
+    "access_log_dropped_total",
+    "Registros de access log descartados por cola llena",
+)
+access_log_overhead_seconds = registry.summary(
+    "access_log_overhead_seconds",
+    "Tiempo del middleware de access log por petición (sin la app)",
+)
+
+access_logger = logging.getLogger("access")
+access_logger.setLevel(logging.INFO)
+access_logger.propagate = False
+
+
+class JsonFormatter(logging.Formatter):
+    """Serializa el dict del registro como una línea JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.access, separators=(",", ":"), default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler que nunca bloquea ni formatea en el hilo del event loop"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # El formateo queda para el hilo del listener
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            access_log_dropped_total.inc()
+
+
+class _DrainingQueueListener(QueueListener):
+    """QueueListener que espera hueco para el centinela en lugar de fallar"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+_queue: queue.Queue = queue.Queue(maxsize=settings.ACCESS_LOG_QUEUE_SIZE)
+access_logger.addHandler(_DroppingQueueHandler(_queue))
+
+_listener: Optional[QueueListener] = None
+
+
+def _build_handler() -> logging.Handler:
+    if settings.ACCESS_LOG_FILE:
+        handler = logging.FileHandler(settings.ACCESS_LOG_FILE, encoding="utf-8")
+    else:
+        handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def start_access_log(handler: Optional[logging.Handler] = None) -> None:
+    """Arranca el hilo que escribe los registros encolados"""
+    global _listener
+
+    if _listener is None:
+        _listener = _DrainingQueueListener(_queue, handler or _build_handler())
+        _listener.start()
+
+
+def stop_access_log() -> None:
+    """Vacía la cola, detiene el hilo escritor y cierra su handler"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+class AccessLogMiddleware:
+    """Middleware ASGI que registra cada petición HTTP en el logger "access" """
+
+    def __init__(self, app, sample_rate: float = 1.0, slow_seconds: float = 0.5):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext()
+        token = request_context.set(context)
+        status = 500
+        start = perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            finished = perf_counter()
+            request_context.reset(token)
+            self._log(scope, status, finished - start, context)
+            access_log_overhead_seconds.observe(perf_counter() - finished)
+
+    def _log(self, scope, status: int, latency: float, context: RequestContext) -> None:
+        if status >= 400 or latency >= self.slow_seconds:
+            sample_rate = 1.0
+        elif random.random() < self.sample_rate:
+            sample_rate = self.sample_rate
+        else:
+            return
+
+        route = scope.get("route")
+        span = get_current_span()
+        item_id = context.item_id or scope.get("path_params", {}).get("item_id")
+        entry = {
+            "ts": round(time.time(), 3),
+            "method": scope["method"],
+            "route": route.path if route is not None else None,
+            "path": scope["path"],
+            "status": status,
+            "latency_ms": round(latency * 1000, 3),
+            "upstream_ms": round(context.upstream_seconds * 1000, 3),
+            "upstream_calls": context.upstream_calls,
+            "item_id": item_id,
+            "sample_rate": sample_rate,
+            "trace_id": span.context.trace_id if span is not None else None,
+        }
+        # makeRecord + handle evita el findCaller() de logger.info()
+        access_logger.handle(access_logger.makeRecord(
+            access_logger.name, logging.INFO, "", 0, "access", None, None, extra={"access": entry},
+        ))
@@ -0,0 +1,48 @@
+"""
+Middleware ASGI que abre el span SERVER de cada petición HTTP.
+
+Continúa la traza del header ``traceparent`` entrante (respetando su flag
+de muestreo) o empieza una nueva muestreada según TRACING_SAMPLE_RATE. Al
+terminar nombra el span con la plantilla de la ruta (``GET /items/{item_id}``)
+para que los nombres tengan cardinalidad acotada.
+"""
+
+from tracing import SPAN_KIND_SERVER, parse_traceparent, tracer
+
+
+class TracingMiddleware:
+    """Abre un span por petición y lo deja activo para las capas internas"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+
+        method = scope["method"]
+        with tracer.start_span(method, kind=SPAN_KIND_SERVER, root=True, parent=parent) as span:
+            span.set_attribute("http.request.method", method)
+            span.set_attribute("url.path", scope["path"])
+
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status("ERROR")
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{method} {route.path}")
+                    span.set_attribute("http.route", route.path)
@@ -5,10 +5,48 @@ Este paquete organiza los modelos de datos de forma modular y escalable.
 Cada módulo representa una entidad del dominio.
 """
 
-from .items import Item, ItemBase, ItemCreate
+from .batch import (
+    BatchOperation,
+    BatchOperationResult,
+    BatchRequest,
+    BatchResponse,
+)
+from .items import (
+    Item,
+    ItemBase,
+    ItemCreate,
+    ChangedItem,
+    ItemChanges,
+    ItemTombstone,
+    ItemLookupRequest,
+    HistogramBucket,
+    ItemStats,
+    NumericStats,
+    ItemSuggestion,
+    QuoteLine,
+    QuoteLineResult,
+    QuoteRequest,
+    QuoteResponse,
+)
 
 __all__ = [
+    "BatchOperation",
+    "BatchOperationResult",
+    "BatchRequest",
+    "BatchResponse",
     "Item",
     "ItemBase",
     "ItemCreate",
+    "ChangedItem",
+    "ItemChanges",
+    "ItemTombstone",
+    "ItemLookupRequest",
+    "HistogramBucket",
+    "ItemStats",
+    "NumericStats",
+    "ItemSuggestion",
+    "QuoteLine",
+    "QuoteLineResult",
+    "QuoteRequest",
+    "QuoteResponse",
 ]
@@ -0,0 +1,12 @@
+"""
+Batch models module - Contiene los esquemas Pydantic para peticiones en lote.
+"""
+
+from .batch import BatchOperation, BatchOperationResult, BatchRequest, BatchResponse
+
+__all__ = [
+    "BatchOperation",
+    "BatchOperationResult",
+    "BatchRequest",
+    "BatchResponse",
+]
@@ -0,0 +1,59 @@
+"""
+Esquemas Pydantic para peticiones en lote (POST /batch).
+"""
+
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class BatchOperation(BaseModel):
+    """
+    Sub-petición del lote.
+
+    Los strings de ``path`` y ``body`` pueden referenciar resultados de
+    operaciones anteriores con ``${<id>.body.<campo>}`` (por ejemplo
+    ``/items/${nuevo.body.id}``); la referencia implica la dependencia.
+    Si el string es solo la referencia se sustituye por el valor con su
+    tipo original.
+    """
+    id: str = Field(..., min_length=1, max_length=64, pattern=r"^[A-Za-z0-9_-]+$", description="Identificador en el lote")
+    method: Literal["GET", "POST", "PUT", "DELETE"] = Field(..., description="Método HTTP")
+    path: str = Field(..., description="Ruta bajo /items, con query string opcional")
+    body: Optional[Any] = Field(None, description="Cuerpo JSON de la sub-petición")
+    depends_on: list[str] = Field(default_factory=list, description="Operaciones que deben terminar antes")
+
+
+class BatchRequest(BaseModel):
+    """Schema para enviar varias operaciones de items en una sola petición"""
+    operations: list[BatchOperation] = Field(..., min_length=1, description="Operaciones del lote")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "operations": [
+                        {
+                            "id": "nuevo",
+                            "method": "POST",
+                            "path": "/items",
+                            "body": {"name": "Laptop", "description": "Laptop de alta gama", "price": 1299.99, "tax": 21.0},
+                        },
+                        {"id": "detalle", "method": "GET", "path": "/items/${nuevo.body.id}"},
+                        {"id": "lista", "method": "GET", "path": "/items?limit=20"},
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class BatchOperationResult(BaseModel):
+    """Resultado de una sub-petición"""
+    id: str
+    status: int = Field(..., description="Status HTTP de la sub-petición (424 si falló una dependencia)")
+    body: Optional[Any] = Field(None, description="Cuerpo JSON de la respuesta")
+
+
+class BatchResponse(BaseModel):
+    """Resultados en el mismo orden que las operaciones enviadas"""
+    results: list[BatchOperationResult]
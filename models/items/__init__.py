@@ -3,9 +3,26 @@ Items models module - Contiene los esquemas Pydantic para items.
 """
 
 from .item import Item, ItemBase, ItemCreate
+from .changes import ChangedItem, ItemChanges, ItemTombstone
+from .lookup import ItemLookupRequest
+from .stats import HistogramBucket, ItemStats, NumericStats
+from .suggestion import ItemSuggestion
+from .quote import QuoteLine, QuoteLineResult, QuoteRequest, QuoteResponse
 
 __all__ = [
     "Item",
     "ItemBase",
     "ItemCreate",
+    "ChangedItem",
+    "ItemChanges",
+    "ItemTombstone",
+    "ItemLookupRequest",
+    "HistogramBucket",
+    "ItemStats",
+    "NumericStats",
+    "ItemSuggestion",
+    "QuoteLine",
+    "QuoteLineResult",
+    "QuoteRequest",
+    "QuoteResponse",
 ]
@@ -0,0 +1,34 @@
+"""
+Esquemas Pydantic para la sincronización incremental de items.
+"""
+
+import uuid
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+from .item import Item
+
+
+class ChangedItem(Item):
+    """Item creado o modificado, con su marca de modificación"""
+    updated_at: datetime = Field(..., description="Fecha y hora de la última modificación")
+
+
+class ItemTombstone(BaseModel):
+    """Item borrado"""
+    id: uuid.UUID = Field(..., description="ID del item borrado")
+    deleted_at: datetime = Field(..., description="Fecha y hora del borrado")
+
+
+class ItemChanges(BaseModel):
+    """
+    Tanda de cambios de GET /items/changes.
+
+    ``items`` va en orden ``(updated_at, id)`` y ``deleted`` en orden
+    ``(deleted_at, id)``. El cliente aplica ambas listas y pide la siguiente
+    tanda con ``next_token``; con ``has_more`` en False ya está al día.
+    """
+    items: list[ChangedItem] = Field(default_factory=list, description="Items creados o modificados")
+    deleted: list[ItemTombstone] = Field(default_factory=list, description="Items borrados")
+    next_token: str = Field(..., description="Token para pedir los cambios siguientes")
+    has_more: bool = Field(..., description="True si hay más cambios disponibles ya")
@@ -0,0 +1,24 @@
+"""
+Esquemas Pydantic para la búsqueda de varios items por id (POST /items/lookup).
+"""
+
+import uuid
+from pydantic import BaseModel, Field
+
+
+class ItemLookupRequest(BaseModel):
+    """
+    Schema para pedir varios items en una sola consulta.
+
+    La respuesta trae los items encontrados en el orden pedido; los ids que
+    no existen se omiten.
+    """
+    ids: list[uuid.UUID] = Field(..., min_length=1, max_length=1000, description="IDs de los items")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {"ids": ["123e4567-e89b-12d3-a456-426614174000"]}
+            ]
+        }
+    }
@@ -0,0 +1,61 @@
+"""
+Esquemas Pydantic para cotizar cestas de items (POST /items/quote).
+"""
+
+from typing import Optional
+import uuid
+from pydantic import BaseModel, Field
+
+
+class QuoteLine(BaseModel):
+    """Línea de la cesta a cotizar"""
+    item_id: uuid.UUID = Field(..., description="ID del item")
+    quantity: int = Field(..., gt=0, le=1_000_000, description="Cantidad de unidades")
+
+
+class QuoteRequest(BaseModel):
+    """
+    Schema para cotizar una cesta.
+
+    Un mismo item puede aparecer en varias líneas.
+    """
+    lines: list[QuoteLine] = Field(..., min_length=1, max_length=50_000, description="Líneas de la cesta")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "lines": [
+                        {"item_id": "123e4567-e89b-12d3-a456-426614174000", "quantity": 3}
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class QuoteLineResult(BaseModel):
+    """
+    Resultado de una línea.
+
+    ``tax`` del item es una tasa porcentual (21.0 = 21%). Los importes son
+    None cuando el item no tiene precio.
+    """
+    item_id: uuid.UUID
+    quantity: int
+    unit_price: Optional[float] = Field(None, description="Precio unitario del item")
+    tax_rate: float = Field(..., description="Tasa de impuesto aplicada (0 si el item no tiene tax)")
+    net: Optional[float] = Field(None, description="unit_price * quantity")
+    tax_amount: Optional[float] = Field(None, description="Impuesto de la línea, redondeado al centavo")
+    gross: Optional[float] = Field(None, description="net + tax_amount")
+
+
+class QuoteResponse(BaseModel):
+    """Cotización de la cesta completa"""
+    lines: list[QuoteLineResult]
+    net_total: float = Field(..., description="Suma de net de las líneas con precio")
+    tax_total: float = Field(..., description="Suma de tax_amount de las líneas con precio")
+    gross_total: float = Field(..., description="net_total + tax_total")
+    unpriced_item_ids: list[uuid.UUID] = Field(
+        default_factory=list, description="Items sin precio, excluidos de los totales"
+    )
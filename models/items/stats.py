@@ -0,0 +1,39 @@
+"""
+Esquemas Pydantic para las estadísticas agregadas de items.
+"""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class NumericStats(BaseModel):
+    """Resumen de una columna numérica (solo valores no nulos)"""
+    count: int = Field(..., description="Cantidad de valores no nulos")
+    sum: float = Field(..., description="Suma de los valores")
+    mean: Optional[float] = Field(None, description="Media de los valores")
+    min: Optional[float] = Field(None, description="Valor mínimo")
+    max: Optional[float] = Field(None, description="Valor máximo")
+
+
+class HistogramBucket(BaseModel):
+    """Bucket de un histograma: [lower, upper)"""
+    lower: float = Field(..., description="Límite inferior (incluido)")
+    upper: Optional[float] = Field(None, description="Límite superior (excluido); None si es abierto")
+    count: int = Field(..., description="Cantidad de items en el bucket")
+
+
+class ItemStats(BaseModel):
+    """
+    Estadísticas agregadas de la tabla items.
+
+    Se mantienen de forma incremental y se reconcilian periódicamente con
+    un agregado calculado en la base de datos.
+    """
+    count: int = Field(..., description="Cantidad total de items")
+    price: NumericStats
+    tax: NumericStats
+    price_histogram: list[HistogramBucket]
+    tax_histogram: list[HistogramBucket]
+    reconciled_at: Optional[datetime] = Field(None, description="Última reconciliación con la base de datos")
+    stale: bool = Field(False, description="True si min/max pueden estar desactualizados hasta la próxima reconciliación")
@@ -0,0 +1,12 @@
+"""
+Esquema Pydantic de las sugerencias de autocompletado (GET /items/suggest).
+"""
+
+import uuid
+from pydantic import BaseModel, Field
+
+
+class ItemSuggestion(BaseModel):
+    """Item cuyo nombre empieza por el prefijo buscado"""
+    id: uuid.UUID = Field(..., description="ID del item")
+    name: str = Field(..., description="Nombre del item")
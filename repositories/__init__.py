@@ -0,0 +1,48 @@
+"""
+Repositories package - Acceso a datos desacoplado del backend de almacenamiento.
+
+Cada entidad define una interfaz y varias implementaciones intercambiables
+(Supabase, PostgreSQL directo, memoria) seleccionadas desde config.settings.
+"""
+
+from .item_repository import (
+    ItemRepository,
+    AdaptiveConcurrencyLimiter,
+    UpstreamOverloadedError,
+    HedgedItemRepository,
+    ReadHedger,
+    InstrumentedItemRepository,
+    LimitedItemRepository,
+    MemoryItemRepository,
+    PostgresItemRepository,
+    RoutingItemRepository,
+    ShardedItemRepository,
+    SupabaseItemRepository,
+    create_item_repository,
+    get_item_repository,
+    close_item_repository,
+    uuid7,
+    uuid7_time,
+    uuid_bytes,
+)
+
+__all__ = [
+    "ItemRepository",
+    "AdaptiveConcurrencyLimiter",
+    "UpstreamOverloadedError",
+    "HedgedItemRepository",
+    "ReadHedger",
+    "InstrumentedItemRepository",
+    "LimitedItemRepository",
+    "MemoryItemRepository",
+    "PostgresItemRepository",
+    "RoutingItemRepository",
+    "ShardedItemRepository",
+    "SupabaseItemRepository",
+    "create_item_repository",
+    "get_item_repository",
+    "close_item_repository",
+    "uuid7",
+    "uuid7_time",
+    "uuid_bytes",
+]
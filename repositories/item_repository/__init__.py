@@ -0,0 +1,50 @@
+"""
+Item repository module - Backends de almacenamiento para items.
+"""
+
+from .base import ItemRepository, LIST_COLUMNS, ALL_COLUMNS
+from .concurrency_limiter import AdaptiveConcurrencyLimiter, UpstreamOverloadedError
+from .hedging import HedgedItemRepository, ReadHedger
+from .ids import uuid7, uuid7_time, uuid_bytes
+from .instrumented_repository import InstrumentedItemRepository
+from .limited_repository import LimitedItemRepository
+from .memory_repository import MemoryItemRepository
+from .postgres_repository import PostgresItemRepository
+from .routing_repository import RoutingItemRepository
+from .sharded_repository import HashRing, ShardedItemRepository
+from .supabase_repository import SupabaseItemRepository
+from .factory import (
+    create_item_repository,
+    create_shard_repository,
+    create_sharded_item_repository,
+    create_read_hedger,
+    get_item_repository,
+    close_item_repository,
+)
+
+__all__ = [
+    "ItemRepository",
+    "LIST_COLUMNS",
+    "ALL_COLUMNS",
+    "AdaptiveConcurrencyLimiter",
+    "UpstreamOverloadedError",
+    "HedgedItemRepository",
+    "ReadHedger",
+    "InstrumentedItemRepository",
+    "LimitedItemRepository",
+    "MemoryItemRepository",
+    "PostgresItemRepository",
+    "RoutingItemRepository",
+    "ShardedItemRepository",
+    "SupabaseItemRepository",
+    "HashRing",
+    "uuid7",
+    "uuid7_time",
+    "uuid_bytes",
+    "create_item_repository",
+    "create_shard_repository",
+    "create_sharded_item_repository",
+    "create_read_hedger",
+    "get_item_repository",
+    "close_item_repository",
+]
@@ -0,0 +1,157 @@
+"""
+Interfaz del repositorio de items.
+
+Todos los backends de almacenamiento implementan esta interfaz y devuelven
+filas como diccionarios con la misma forma que la respuesta JSON de Supabase
+(``id`` como string, ``price``/``tax`` como float o None).
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+import uuid
+
+
+# Columnas devueltas en los listados (sin metadata)
+LIST_COLUMNS = ("id", "name", "description", "price", "tax")
+
+# Columnas completas de la tabla items
+ALL_COLUMNS = LIST_COLUMNS + ("created_at", "updated_at")
+
+# Posición de lectura en el orden (updated_at, id) de get_changed_since
+Watermark = tuple[str, str]
+
+# Orden de get_page/get_full_page: (created_at, id) o solo id (ids UUIDv7)
+PAGE_ORDERS = ("created_at", "id")
+
+
+def check_page_order(page_order: str) -> str:
+    """Valida el orden de páginas de un backend"""
+    if page_order not in PAGE_ORDERS:
+        raise ValueError(f"Orden de páginas desconocido: {page_order}")
+    return page_order
+
+
+def escape_like(text: str) -> str:
+    """Escapa los comodines de LIKE/ILIKE (``%``, ``_`` y ``\\``) de un texto literal"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class ItemRepository(ABC):
+    """Acceso a datos para la tabla items"""
+
+    @abstractmethod
+    async def create(self, data: dict) -> Optional[dict]:
+        """Inserta un item y devuelve la fila creada; ``data`` puede traer el ``id``"""
+
+    @abstractmethod
+    async def get_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        """
+        Devuelve una página de items con las columnas de LIST_COLUMNS.
+
+        ``min_price``/``max_price`` filtran por rango cerrado de precio; con
+        cualquiera de los dos los items sin precio quedan fuera.
+        """
+
+    @abstractmethod
+    async def get_full_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        """
+        Como get_page pero con las columnas completas (ALL_COLUMNS).
+
+        Las filas van siempre en orden ``(created_at, id)`` (o ``id`` en los
+        backends con ``page_order="id"``), de modo que las páginas de varios
+        backends con el mismo orden se pueden combinar.
+        """
+
+    @abstractmethod
+    async def get_by_id(self, item_id: uuid.UUID) -> Optional[dict]:
+        """Devuelve la fila completa del item o None si no existe"""
+
+    @abstractmethod
+    async def get_many(self, item_ids: list[uuid.UUID]) -> list[dict]:
+        """Devuelve en una sola consulta las filas completas de los ids existentes"""
+
+    @abstractmethod
+    async def update(self, item_id: uuid.UUID, data: dict) -> Optional[dict]:
+        """Actualiza un item y devuelve la fila resultante o None si no existe"""
+
+    @abstractmethod
+    async def put(self, row: dict) -> Optional[dict]:
+        """
+        Inserta o reemplaza una fila completa tal cual, id y timestamps incluidos.
+
+        Sirve para mover filas entre backends sin cambiar su identidad ni su
+        posición en el orden de los listados.
+        """
+
+    @abstractmethod
+    async def delete(self, item_id: uuid.UUID) -> Optional[dict]:
+        """Elimina un item y devuelve la fila eliminada o None si no existía"""
+
+    @abstractmethod
+    async def get_changed_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        """
+        Devuelve filas completas creadas o modificadas después de ``after``.
+
+        Las filas se ordenan por ``(updated_at, id)`` y ``after`` es el par
+        ``(updated_at, id)`` de la última fila recibida (None para empezar
+        desde el principio), de modo que se puede recorrer la tabla por
+        keyset sin saltarse filas con el mismo ``updated_at``.
+        """
+
+    @abstractmethod
+    async def get_deleted_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        """
+        Devuelve las lápidas (``id``, ``deleted_at``) de items borrados después de ``after``.
+
+        Mismo recorrido por keyset que get_changed_since, en orden
+        ``(deleted_at, id)`` (ver db/migrations/004_item_tombstones.sql).
+        Un id que se vuelve a insertar deja de tener lápida.
+        """
+
+    @abstractmethod
+    async def search_names(self, prefix: str, limit: int) -> list[dict]:
+        """
+        Devuelve ``id`` y ``name`` de los items cuyo nombre empieza por ``prefix``.
+
+        Sin distinguir mayúsculas (``ILIKE 'prefix%'``), en orden ``(name, id)``
+        y como mucho ``limit`` filas. Es el camino de GET /items/suggest para
+        las peticiones que no pueden usar el índice compartido del worker.
+        """
+
+    @abstractmethod
+    async def aggregate(self, price_edges: list[float], tax_edges: list[float]) -> dict:
+        """
+        Calcula en el backend las estadísticas agregadas de la tabla.
+
+        Devuelve ``count`` (filas totales), ``price`` y ``tax`` con
+        ``count``/``sum``/``min``/``max`` sobre los valores no nulos, y
+        ``price_histogram``/``tax_histogram`` con un contador por cada borde:
+        el bucket ``i`` cubre ``[edges[i], edges[i + 1])`` y el último es
+        abierto por arriba. Los valores menores al primer borde caen en el
+        primer bucket.
+        """
+
+    async def replication_position(self) -> Optional[int]:
+        """
+        Posición de replicación del endpoint en bytes del WAL.
+
+        En el primario es la posición actual; en una réplica, la última
+        aplicada (ver db/migrations/003_replication_position.sql). None si
+        el backend no tiene replicación.
+        """
+        return None
+
+    async def close(self) -> None:
+        """Libera los recursos del backend (conexiones, pools, etc.)"""
@@ -0,0 +1,226 @@
+"""
+Límite adaptativo de concurrencia para las llamadas al backend.
+
+El límite se descubre a partir de la latencia observada con el algoritmo
+gradient2 (Netflix concurrency-limits): se compara la latencia reciente
+(media móvil corta) con la de referencia (media móvil larga). Mientras
+coinciden el límite crece en ~sqrt(límite) por muestra; cuando la latencia
+reciente sube, el límite se reduce en la misma proporción. Los errores de
+transporte y los timeouts reducen el límite un 10%.
+
+Con el límite alcanzado las llamadas esperan en una cola FIFO acotada,
+cada una con su plazo; si la cola está llena o vence el plazo se rechazan
+con UpstreamOverloadedError (503) en lugar de sumar carga al backend.
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import AsyncIterator, Callable, Optional
+import asyncio
+import math
+
+import httpx
+from fastapi import HTTPException
+
+from metrics import registry
+
+
+_limit = registry.gauge("item_upstream_limit", "Límite de concurrencia actual por pool")
+_in_flight = registry.gauge("item_upstream_in_flight", "Llamadas en curso por pool")
+_queue_depth = registry.gauge("item_upstream_queue_depth", "Llamadas esperando turno por pool")
+_rejected = registry.counter(
+    "item_upstream_rejected_total", "Llamadas rechazadas (pool, reason=queue_full|deadline)"
+)
+_queue_wait = registry.summary("item_upstream_queue_wait_seconds", "Espera en la cola por pool")
+
+# Errores que indican saturación del backend (no errores de la consulta)
+_DROP_ERRORS = (asyncio.TimeoutError, TimeoutError, OSError, httpx.TransportError)
+
+
+class UpstreamOverloadedError(HTTPException):
+    """El backend está saturado y la llamada no consiguió turno a tiempo"""
+
+    def __init__(self, pool: str, retry_after: float):
+        super().__init__(
+            status_code=503,
+            detail=f"Upstream {pool} concurrency limit reached",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+class AdaptiveConcurrencyLimiter:
+    """Semáforo cuyo tamaño sigue a la latencia del backend (gradient2)"""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: float = 20,
+        min_limit: float = 1,
+        max_limit: float = 200,
+        max_queue: int = 100,
+        queue_timeout: float = 1.0,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        long_window: int = 600,
+        short_window: int = 10,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._tolerance = tolerance
+        self._smoothing = smoothing
+        self._long_alpha = 2 / (long_window + 1)
+        self._short_alpha = 2 / (short_window + 1)
+        self._long_rtt: Optional[float] = None
+        self._short_rtt: Optional[float] = None
+        self._clock = clock
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._labels = {"pool": name}
+        self._publish()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _publish(self) -> None:
+        _limit.set(int(self.limit), labels=self._labels)
+        _in_flight.set(self._in_flight, labels=self._labels)
+        _queue_depth.set(len(self._waiters), labels=self._labels)
+
+    def _reject(self, reason: str) -> UpstreamOverloadedError:
+        _rejected.inc(labels={**self._labels, "reason": reason})
+        return UpstreamOverloadedError(self.name, self.queue_timeout)
+
+    def try_acquire(self) -> bool:
+        """Toma un turno solo si hay uno libre sin esperar; devuelve si lo tomó"""
+        if self._in_flight < int(self.limit) and not self._waiters:
+            self._in_flight += 1
+            self._publish()
+            return True
+        return False
+
+    async def acquire(self, deadline: Optional[float] = None) -> None:
+        """
+        Espera un turno.
+
+        Args:
+            deadline: Instante (según el reloj del limitador) límite de espera;
+                por defecto ahora + ``queue_timeout``
+
+        Raises:
+            UpstreamOverloadedError: Si la cola está llena o vence el plazo
+        """
+        if self.try_acquire():
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full")
+
+        started = self._clock()
+        deadline = started + self.queue_timeout if deadline is None else deadline
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        try:
+            await asyncio.wait({waiter}, timeout=max(deadline - started, 0))
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # _wake ya dio el turno cuando se canceló la petición: pasa al siguiente
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                # Plazo vencido o petición cancelada: sale de la cola sin turno
+                waiter.cancel()
+                self._waiters.remove(waiter)
+                self._publish()
+        _queue_wait.observe(self._clock() - started, labels=self._labels)
+        if waiter.cancelled():
+            raise self._reject("deadline")
+
+    def release(self, rtt: Optional[float] = None, dropped: bool = False) -> None:
+        """
+        Devuelve un turno y ajusta el límite.
+
+        Args:
+            rtt: Duración de la llamada; None si no debe usarse como muestra
+            dropped: True si la llamada falló por saturación del backend
+        """
+        in_flight = self._in_flight
+        self._in_flight -= 1
+        if dropped:
+            self.limit = max(self.min_limit, self.limit * 0.9)
+        elif rtt is not None:
+            self._on_sample(rtt, in_flight)
+        self._wake()
+        self._publish()
+
+    def release_when_done(self, task: asyncio.Future) -> None:
+        """
+        Devuelve al terminar ``task`` un turno ya tomado con try_acquire,
+        con las mismas muestras que ``slot``. Un callback, y no un bloque
+        dentro de la tarea, porque una tarea cancelada antes de empezar
+        nunca ejecuta su código.
+        """
+        started = self._clock()
+
+        def done(task: asyncio.Future) -> None:
+            if task.cancelled():
+                self.release()
+            elif task.exception() is not None:
+                self.release(dropped=isinstance(task.exception(), _DROP_ERRORS))
+            else:
+                self.release(self._clock() - started)
+
+        task.add_done_callback(done)
+
+    def _on_sample(self, rtt: float, in_flight: int) -> None:
+        rtt = max(rtt, 1e-6)
+        if self._long_rtt is None:
+            self._long_rtt = self._short_rtt = rtt
+        self._short_rtt += self._short_alpha * (rtt - self._short_rtt)
+        self._long_rtt += self._long_alpha * (rtt - self._long_rtt)
+        # Tras una mejora sostenida la referencia baja más rápido que la media larga
+        if self._long_rtt / self._short_rtt > 2:
+            self._long_rtt *= 0.95
+
+        # Con menos de medio límite en uso la latencia no dice nada del límite
+        if in_flight < self.limit / 2:
+            return
+
+        gradient = max(0.5, min(1.0, self._tolerance * self._long_rtt / self._short_rtt))
+        target = self.limit * gradient + math.sqrt(self.limit)
+        limit = self.limit * (1 - self._smoothing) + target * self._smoothing
+        self.limit = max(self.min_limit, min(self.max_limit, limit))
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Ejecuta el bloque con un turno, midiendo su duración como muestra"""
+        await self.acquire()
+        started = self._clock()
+        try:
+            yield
+        except _DROP_ERRORS:
+            self.release(dropped=True)
+            raise
+        except BaseException:
+            # Errores de la consulta o cancelaciones: no dicen nada de la carga
+            self.release()
+            raise
+        self.release(self._clock() - started)
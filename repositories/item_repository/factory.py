@@ -0,0 +1,181 @@
+"""
+Selección del backend de items según ``settings.ITEM_REPOSITORY_BACKEND``.
+"""
+
+from typing import Optional
+
+from supabase import create_client
+
+from config.settings import settings
+from .base import ItemRepository
+from .concurrency_limiter import AdaptiveConcurrencyLimiter
+from .hedging import HedgedItemRepository, ReadHedger
+from .instrumented_repository import InstrumentedItemRepository
+from .limited_repository import LimitedItemRepository
+from .memory_repository import MemoryItemRepository
+from .postgres_repository import PostgresItemRepository
+from .routing_repository import RoutingItemRepository
+from .sharded_repository import ShardedItemRepository
+from .supabase_repository import SupabaseItemRepository
+
+
+# Repositorio de items (Singleton)
+_item_repository: Optional[ItemRepository] = None
+
+
+def create_item_repository(backend: str, endpoint: Optional[str] = None) -> ItemRepository:
+    """
+    Construye un repositorio de items para el backend indicado.
+
+    Args:
+        backend: "supabase", "postgres" o "memory"
+        endpoint: URL de Supabase o DSN de PostgreSQL de una réplica de
+            lectura; None para el primario configurado
+
+    Returns:
+        ItemRepository: Nueva instancia del backend
+    """
+    if backend == "supabase":
+        if endpoint is None:
+            return SupabaseItemRepository(page_order=settings.ITEM_PAGE_ORDER)
+        return SupabaseItemRepository(
+            client=create_client(endpoint, settings.SUPABASE_KEY), page_order=settings.ITEM_PAGE_ORDER
+        )
+    if backend == "postgres":
+        return PostgresItemRepository(
+            endpoint or settings.POSTGRES_DSN,
+            min_size=settings.POSTGRES_POOL_MIN_SIZE,
+            max_size=settings.POSTGRES_POOL_MAX_SIZE,
+            page_order=settings.ITEM_PAGE_ORDER,
+        )
+    if backend == "memory":
+        if endpoint is not None:
+            raise ValueError("El backend memory no admite réplicas de lectura")
+        return MemoryItemRepository(settings.ITEM_PAGE_ORDER)
+    raise ValueError(f"Backend de items desconocido: {backend}")
+
+
+def create_shard_repository(backend: str, shard: dict) -> ItemRepository:
+    """
+    Construye el repositorio de un shard de ``ITEM_SHARDS``.
+
+    Args:
+        backend: "supabase", "postgres" o "memory"
+        shard: ``{"name", "url", "key"}`` (supabase), ``{"name", "dsn"}``
+            (postgres) o ``{"name"}`` (memory, para tests y desarrollo)
+
+    Returns:
+        ItemRepository: Nueva instancia del backend del shard
+    """
+    if backend == "supabase":
+        client = create_client(shard["url"], shard.get("key") or settings.SUPABASE_KEY)
+        return SupabaseItemRepository(client=client, page_order=settings.ITEM_PAGE_ORDER)
+    if backend == "postgres":
+        return PostgresItemRepository(
+            shard["dsn"],
+            min_size=settings.POSTGRES_POOL_MIN_SIZE,
+            max_size=settings.POSTGRES_POOL_MAX_SIZE,
+            page_order=settings.ITEM_PAGE_ORDER,
+        )
+    if backend == "memory":
+        return MemoryItemRepository(settings.ITEM_PAGE_ORDER)
+    raise ValueError(f"Backend de items desconocido: {backend}")
+
+
+def create_sharded_item_repository() -> ShardedItemRepository:
+    """Construye el repositorio repartido según ``ITEM_SHARDS``"""
+    backend = settings.ITEM_REPOSITORY_BACKEND
+    return ShardedItemRepository(
+        {shard["name"]: create_shard_repository(backend, shard) for shard in settings.ITEM_SHARDS},
+        previous=settings.ITEM_SHARDS_PREVIOUS or None,
+        vnodes=settings.ITEM_SHARD_VNODES,
+        page_order=settings.ITEM_PAGE_ORDER,
+    )
+
+
+def create_upstream_limiter(pool: str, initial_limit: int) -> AdaptiveConcurrencyLimiter:
+    """Limitador adaptativo con los parámetros de settings"""
+    return AdaptiveConcurrencyLimiter(
+        pool,
+        initial_limit=initial_limit,
+        min_limit=settings.ITEM_UPSTREAM_MIN_LIMIT,
+        max_limit=settings.ITEM_UPSTREAM_MAX_LIMIT,
+        max_queue=settings.ITEM_UPSTREAM_MAX_QUEUE,
+        queue_timeout=settings.ITEM_UPSTREAM_QUEUE_TIMEOUT_SECONDS,
+    )
+
+
+def create_read_hedger(limiter: Optional[AdaptiveConcurrencyLimiter] = None) -> ReadHedger:
+    """Hedger de lecturas con los parámetros de settings; ``limiter`` da turno a las coberturas"""
+    return ReadHedger(
+        percentile=settings.ITEM_HEDGE_PERCENTILE,
+        budget_ratio=settings.ITEM_HEDGE_BUDGET_RATIO,
+        min_delay=settings.ITEM_HEDGE_MIN_DELAY_SECONDS,
+        min_samples=settings.ITEM_HEDGE_MIN_SAMPLES,
+        limiter=limiter,
+    )
+
+
+def get_item_repository() -> ItemRepository:
+    """
+    Obtiene o crea el repositorio de items configurado.
+
+    Con ``ITEM_READ_ENDPOINTS`` el backend se envuelve en un
+    RoutingItemRepository que manda las lecturas a esas réplicas; con
+    ``ITEM_SHARDS`` los items se reparten entre esos backends. Con
+    ``ITEM_HEDGING_ENABLED`` las lecturas lentas se repiten. Con
+    ``ITEM_UPSTREAM_LIMITER_ENABLED`` las llamadas pasan por limitadores
+    adaptativos de concurrencia.
+
+    Returns:
+        ItemRepository: Instancia compartida del backend configurado,
+        instrumentada para medir el tiempo de cada llamada
+    """
+    global _item_repository
+
+    if _item_repository is None:
+        backend = settings.ITEM_REPOSITORY_BACKEND
+        # Los clientes por usuario solo existen en PostgREST: otro backend
+        # ignoraría el JWT y serviría todas las filas sin RLS
+        if settings.SUPABASE_USER_CLIENTS_ENABLED and backend != "supabase":
+            raise ValueError(f"SUPABASE_USER_CLIENTS_ENABLED requiere el backend supabase, no {backend}")
+        if settings.ITEM_SHARDS:
+            if settings.ITEM_READ_ENDPOINTS:
+                raise ValueError("ITEM_SHARDS e ITEM_READ_ENDPOINTS no se pueden combinar")
+            # Los shards usan clientes fijos con la clave de servicio: saltarían las políticas RLS
+            if settings.SUPABASE_USER_CLIENTS_ENABLED:
+                raise ValueError("ITEM_SHARDS y SUPABASE_USER_CLIENTS_ENABLED no se pueden combinar")
+            repository = create_sharded_item_repository()
+        else:
+            repository = create_item_repository(backend)
+        reads = writes = None
+        if settings.ITEM_UPSTREAM_LIMITER_ENABLED:
+            reads = create_upstream_limiter("reads", settings.ITEM_UPSTREAM_READ_INITIAL_LIMIT)
+            writes = create_upstream_limiter("writes", settings.ITEM_UPSTREAM_WRITE_INITIAL_LIMIT)
+        # Las coberturas comparten el limitador de lecturas: cada una ocupa un turno más
+        hedger = create_read_hedger(reads) if settings.ITEM_HEDGING_ENABLED else None
+        if settings.ITEM_READ_ENDPOINTS:
+            repository = RoutingItemRepository(
+                repository,
+                [create_item_repository(backend, endpoint) for endpoint in settings.ITEM_READ_ENDPOINTS],
+                health_interval=settings.ITEM_READ_HEALTH_INTERVAL_SECONDS,
+                health_timeout=settings.ITEM_READ_HEALTH_TIMEOUT_SECONDS,
+                max_lag_bytes=settings.ITEM_READ_MAX_LAG_BYTES,
+                hedger=hedger,
+            )
+        elif hedger is not None:
+            repository = HedgedItemRepository(repository, hedger)
+        if reads is not None:
+            repository = LimitedItemRepository(repository, reads=reads, writes=writes)
+        _item_repository = InstrumentedItemRepository(repository)
+
+    return _item_repository
+
+
+async def close_item_repository() -> None:
+    """Cierra el repositorio actual; el siguiente acceso crea uno nuevo"""
+    global _item_repository
+
+    if _item_repository is not None:
+        await _item_repository.close()
+        _item_repository = None
@@ -0,0 +1,245 @@
+"""
+Lecturas con cobertura (hedging) para recortar la cola de latencia.
+
+Si la primera llamada de una lectura idempotente no terminó cuando se
+cumple el percentil ``percentile`` de la latencia reciente de esa
+operación, se lanza una segunda (a otra réplica si la hay, ver
+routing_repository.py) y gana la primera que termine bien; la otra se
+cancela.
+
+Un presupuesto tipo token bucket limita la carga extra: cada lectura
+aporta ``budget_ratio`` fichas y cada cobertura gasta una, así que como
+mucho esa fracción de las lecturas llega a duplicarse.
+
+Con ``limiter`` (el de lecturas de LimitedItemRepository, que envuelve a
+este nivel y solo ve una llamada por lectura) la segunda llamada necesita
+además un turno libre de ese limitador: si no lo hay no se lanza, en lugar
+de esperar o de sumar carga a un backend ya saturado.
+"""
+
+from collections import deque
+from time import perf_counter
+from typing import Awaitable, Callable, Optional, TypeVar
+import asyncio
+import uuid
+
+from metrics import registry
+from .base import ItemRepository, Watermark
+from .concurrency_limiter import AdaptiveConcurrencyLimiter
+
+
+T = TypeVar("T")
+
+_hedges = registry.counter(
+    "item_read_hedges_total",
+    "Lecturas que superaron el umbral (outcome=won|lost|budget_exhausted|limiter_full)",
+)
+_delay = registry.gauge(
+    "item_read_hedge_delay_seconds", "Espera antes de lanzar la segunda llamada por operación"
+)
+
+
+class LatencyTracker:
+    """Percentil de las últimas ``window`` latencias de una operación"""
+
+    def __init__(self, percentile: float, window: int = 1000, min_samples: int = 100,
+                 refresh_every: int = 50):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self._refresh_every = refresh_every
+        self._pending = 0
+        self.threshold: Optional[float] = None
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._pending += 1
+        # Ordenar la ventana en cada lectura costaría más que la propia cobertura
+        if self._pending >= self._refresh_every and len(self._samples) >= self._min_samples:
+            ordered = sorted(self._samples)
+            index = min(int(len(ordered) * self._percentile / 100), len(ordered) - 1)
+            self.threshold = ordered[index]
+            self._pending = 0
+
+
+class HedgeBudget:
+    """Fichas para coberturas: ``ratio`` por lectura, una por cobertura"""
+
+    def __init__(self, ratio: float, max_tokens: float = 10.0):
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self.tokens = 0.0
+
+    def deposit(self) -> None:
+        self.tokens = min(self.tokens + self._ratio, self._max_tokens)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class ReadHedger:
+    """Lanza una segunda llamada cuando la primera supera el percentil configurado"""
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget_ratio: float = 0.1,
+        min_delay: float = 0.0,
+        window: int = 1000,
+        min_samples: int = 100,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    ):
+        self.percentile = percentile
+        self.limiter = limiter
+        self.budget = HedgeBudget(budget_ratio)
+        self._min_delay = min_delay
+        self._window = window
+        self._min_samples = min_samples
+        self._trackers: dict[str, LatencyTracker] = {}
+
+    def tracker(self, operation: str) -> LatencyTracker:
+        tracker = self._trackers.get(operation)
+        if tracker is None:
+            tracker = self._trackers[operation] = LatencyTracker(
+                self.percentile, window=self._window, min_samples=self._min_samples
+            )
+        return tracker
+
+    @staticmethod
+    async def _timed(tracker: LatencyTracker, call: Callable[[], Awaitable[T]]) -> T:
+        start = perf_counter()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            # Una llamada cancelada tardó al menos esto: sin la muestra, las
+            # coberturas esconderían la cola y el umbral bajaría solo
+            tracker.record(perf_counter() - start)
+            raise
+        tracker.record(perf_counter() - start)
+        return result
+
+    async def run(
+        self,
+        operation: str,
+        first: Callable[[], Awaitable[T]],
+        second: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Ejecuta ``first`` y, si tarda más que el umbral, también ``second``.
+
+        Args:
+            operation: Nombre de la operación (cada una tiene su percentil)
+            first: Llamada original
+            second: Llamada de cobertura, idealmente a otro backend
+
+        Returns:
+            El resultado de la primera llamada que termine bien
+        """
+        tracker = self.tracker(operation)
+        self.budget.deposit()
+        if tracker.threshold is None:
+            return await self._timed(tracker, first)
+
+        delay = max(tracker.threshold, self._min_delay)
+        _delay.set(delay, labels={"operation": operation})
+        tasks = [asyncio.create_task(self._timed(tracker, first))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return tasks[0].result()
+            if not self.budget.withdraw():
+                _hedges.inc(labels={"operation": operation, "outcome": "budget_exhausted"})
+                return await tasks[0]
+            if self.limiter is not None and not self.limiter.try_acquire():
+                _hedges.inc(labels={"operation": operation, "outcome": "limiter_full"})
+                return await tasks[0]
+            tasks.append(asyncio.create_task(self._timed(tracker, second)))
+            if self.limiter is not None:
+                self.limiter.release_when_done(tasks[1])
+            return await self._race(operation, tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    async def _race(operation: str, tasks: list[asyncio.Task]) -> T:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    outcome = "won" if task is tasks[1] else "lost"
+                    _hedges.inc(labels={"operation": operation, "outcome": outcome})
+                    return task.result()
+        # Fallaron las dos: se propaga el error de la llamada original
+        raise tasks[0].exception()
+
+
+class HedgedItemRepository(ItemRepository):
+    """Cubre las lecturas idempotentes repitiéndolas contra el mismo backend"""
+
+    def __init__(self, inner: ItemRepository, hedger: ReadHedger):
+        self.inner = inner
+        self.hedger = hedger
+
+    async def _hedged(self, operation: str, call: Callable[[], Awaitable[T]]) -> T:
+        return await self.hedger.run(operation, call, call)
+
+    async def create(self, data: dict) -> Optional[dict]:
+        return await self.inner.create(data)
+
+    async def get_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        return await self._hedged("get_page", lambda: self.inner.get_page(limit, offset, min_price, max_price))
+
+    async def get_full_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        return await self._hedged(
+            "get_full_page", lambda: self.inner.get_full_page(limit, offset, min_price, max_price)
+        )
+
+    async def get_by_id(self, item_id: uuid.UUID) -> Optional[dict]:
+        return await self._hedged("get_by_id", lambda: self.inner.get_by_id(item_id))
+
+    async def get_many(self, item_ids: list[uuid.UUID]) -> list[dict]:
+        return await self._hedged("get_many", lambda: self.inner.get_many(item_ids))
+
+    async def update(self, item_id: uuid.UUID, data: dict) -> Optional[dict]:
+        return await self.inner.update(item_id, data)
+
+    async def put(self, row: dict) -> Optional[dict]:
+        return await self.inner.put(row)
+
+    async def delete(self, item_id: uuid.UUID) -> Optional[dict]:
+        return await self.inner.delete(item_id)
+
+    async def get_changed_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        return await self.inner.get_changed_since(after, limit)
+
+    async def get_deleted_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        return await self.inner.get_deleted_since(after, limit)
+
+    async def search_names(self, prefix: str, limit: int) -> list[dict]:
+        return await self.inner.search_names(prefix, limit)
+
+    async def aggregate(self, price_edges: list[float], tax_edges: list[float]) -> dict:
+        return await self.inner.aggregate(price_edges, tax_edges)
+
+    async def replication_position(self) -> Optional[int]:
+        return await self.inner.replication_position()
+
+    async def close(self) -> None:
+        await self.inner.close()
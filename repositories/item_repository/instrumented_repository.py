@@ -0,0 +1,92 @@
+"""
+Decorador de ItemRepository que mide el tiempo de cada llamada al backend.
+
+Cada operación se publica en el summary ``item_repository_seconds`` (por
+operación) y se suma al tiempo upstream de la petición en curso, que el
+access log reporta junto a la latencia total.
+"""
+
+from time import perf_counter
+from typing import Awaitable, Optional, TypeVar
+import uuid
+
+from diagnostics.request_context import record_upstream
+from metrics import registry
+from .base import ItemRepository, Watermark
+
+
+T = TypeVar("T")
+
+repository_seconds = registry.summary(
+    "item_repository_seconds",
+    "Duración de las llamadas al backend de items",
+)
+
+
+class InstrumentedItemRepository(ItemRepository):
+    """Delega en otro repositorio midiendo cada llamada"""
+
+    def __init__(self, inner: ItemRepository):
+        self.inner = inner
+
+    async def _timed(self, operation: str, call: Awaitable[T]) -> T:
+        start = perf_counter()
+        try:
+            return await call
+        finally:
+            elapsed = perf_counter() - start
+            repository_seconds.observe(elapsed, labels={"operation": operation})
+            record_upstream(elapsed)
+
+    async def create(self, data: dict) -> Optional[dict]:
+        return await self._timed("create", self.inner.create(data))
+
+    async def get_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        return await self._timed("get_page", self.inner.get_page(limit, offset, min_price, max_price))
+
+    async def get_full_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        return await self._timed(
+            "get_full_page", self.inner.get_full_page(limit, offset, min_price, max_price)
+        )
+
+    async def get_by_id(self, item_id: uuid.UUID) -> Optional[dict]:
+        return await self._timed("get_by_id", self.inner.get_by_id(item_id))
+
+    async def get_many(self, item_ids: list[uuid.UUID]) -> list[dict]:
+        return await self._timed("get_many", self.inner.get_many(item_ids))
+
+    async def update(self, item_id: uuid.UUID, data: dict) -> Optional[dict]:
+        return await self._timed("update", self.inner.update(item_id, data))
+
+    async def put(self, row: dict) -> Optional[dict]:
+        return await self._timed("put", self.inner.put(row))
+
+    async def delete(self, item_id: uuid.UUID) -> Optional[dict]:
+        return await self._timed("delete", self.inner.delete(item_id))
+
+    async def get_changed_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        return await self._timed("get_changed_since", self.inner.get_changed_since(after, limit))
+
+    async def get_deleted_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        return await self._timed("get_deleted_since", self.inner.get_deleted_since(after, limit))
+
+    async def search_names(self, prefix: str, limit: int) -> list[dict]:
+        return await self._timed("search_names", self.inner.search_names(prefix, limit))
+
+    async def aggregate(self, price_edges: list[float], tax_edges: list[float]) -> dict:
+        return await self._timed("aggregate", self.inner.aggregate(price_edges, tax_edges))
+
+    async def close(self) -> None:
+        await self.inner.close()
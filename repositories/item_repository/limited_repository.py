@@ -0,0 +1,88 @@
+"""
+Decorador de ItemRepository que limita la concurrencia hacia el backend.
+
+Las lecturas y las escrituras usan limitadores adaptativos separados, de
+modo que una ráfaga de lecturas lentas no deja sin turno a las escrituras
+(ver concurrency_limiter.py).
+"""
+
+from typing import Awaitable, Callable, Optional, TypeVar
+import uuid
+
+from .base import ItemRepository, Watermark
+from .concurrency_limiter import AdaptiveConcurrencyLimiter
+
+
+T = TypeVar("T")
+
+
+class LimitedItemRepository(ItemRepository):
+    """Delega en otro repositorio pidiendo turno a un limitador por tipo de llamada"""
+
+    def __init__(self, inner: ItemRepository, reads: AdaptiveConcurrencyLimiter,
+                 writes: AdaptiveConcurrencyLimiter):
+        self.inner = inner
+        self.reads = reads
+        self.writes = writes
+
+    @staticmethod
+    async def _limited(limiter: AdaptiveConcurrencyLimiter, call: Callable[[], Awaitable[T]]) -> T:
+        # La corrutina se crea con turno: si se rechaza, no queda ninguna sin esperar
+        async with limiter.slot():
+            return await call()
+
+    async def create(self, data: dict) -> Optional[dict]:
+        return await self._limited(self.writes, lambda: self.inner.create(data))
+
+    async def get_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        return await self._limited(self.reads, lambda: self.inner.get_page(limit, offset, min_price, max_price))
+
+    async def get_full_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        return await self._limited(
+            self.reads, lambda: self.inner.get_full_page(limit, offset, min_price, max_price)
+        )
+
+    async def get_by_id(self, item_id: uuid.UUID) -> Optional[dict]:
+        return await self._limited(self.reads, lambda: self.inner.get_by_id(item_id))
+
+    async def get_many(self, item_ids: list[uuid.UUID]) -> list[dict]:
+        return await self._limited(self.reads, lambda: self.inner.get_many(item_ids))
+
+    async def update(self, item_id: uuid.UUID, data: dict) -> Optional[dict]:
+        return await self._limited(self.writes, lambda: self.inner.update(item_id, data))
+
+    async def put(self, row: dict) -> Optional[dict]:
+        return await self._limited(self.writes, lambda: self.inner.put(row))
+
+    async def delete(self, item_id: uuid.UUID) -> Optional[dict]:
+        return await self._limited(self.writes, lambda: self.inner.delete(item_id))
+
+    async def get_changed_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        return await self._limited(self.reads, lambda: self.inner.get_changed_since(after, limit))
+
+    async def get_deleted_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        return await self._limited(self.reads, lambda: self.inner.get_deleted_since(after, limit))
+
+    async def search_names(self, prefix: str, limit: int) -> list[dict]:
+        return await self._limited(self.reads, lambda: self.inner.search_names(prefix, limit))
+
+    async def aggregate(self, price_edges: list[float], tax_edges: list[float]) -> dict:
+        return await self._limited(self.reads, lambda: self.inner.aggregate(price_edges, tax_edges))
+
+    async def replication_position(self) -> Optional[int]:
+        return await self.inner.replication_position()
+
+    async def close(self) -> None:
+        await self.inner.close()
@@ -0,0 +1,140 @@
+"""
+Repositorio de items en memoria.
+
+Pensado para tests, benchmarks y desarrollo local: no hace I/O y mantiene
+los items en un diccionario por id en orden de inserción.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Optional
+import uuid
+
+from .base import ItemRepository, LIST_COLUMNS, Watermark, check_page_order
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+class MemoryItemRepository(ItemRepository):
+    """Backend en memoria del proceso"""
+
+    def __init__(self, page_order: str = "created_at"):
+        self._rows: dict[str, dict] = {}
+        self._tombstones: dict[str, str] = {}
+        self._page_order = check_page_order(page_order)
+
+    def _ordered(self) -> list[dict]:
+        if self._page_order == "id":
+            return sorted(self._rows.values(), key=lambda row: row["id"])
+        return sorted(self._rows.values(), key=lambda row: (row["created_at"], row["id"]))
+
+    async def create(self, data: dict) -> Optional[dict]:
+        now = _now()
+        row = {
+            "id": str(uuid.uuid4()),
+            **data,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self._rows[row["id"]] = row
+        self._tombstones.pop(row["id"], None)
+        return dict(row)
+
+    async def get_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        rows = self._ordered() if self._page_order == "id" else self._rows.values()
+        if min_price is not None or max_price is not None:
+            rows = [
+                row for row in rows
+                if row.get("price") is not None
+                and (min_price is None or row["price"] >= min_price)
+                and (max_price is None or row["price"] <= max_price)
+            ]
+        rows = list(rows)[offset:offset + limit]
+        return [{column: row.get(column) for column in LIST_COLUMNS} for row in rows]
+
+    async def get_full_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        rows = self._ordered()
+        if min_price is not None or max_price is not None:
+            rows = [
+                row for row in rows
+                if row.get("price") is not None
+                and (min_price is None or row["price"] >= min_price)
+                and (max_price is None or row["price"] <= max_price)
+            ]
+        return [dict(row) for row in rows[offset:offset + limit]]
+
+    async def get_by_id(self, item_id: uuid.UUID) -> Optional[dict]:
+        row = self._rows.get(str(item_id))
+        return dict(row) if row is not None else None
+
+    async def get_many(self, item_ids: list[uuid.UUID]) -> list[dict]:
+        rows = (self._rows.get(str(item_id)) for item_id in item_ids)
+        return [dict(row) for row in rows if row is not None]
+
+    async def update(self, item_id: uuid.UUID, data: dict) -> Optional[dict]:
+        row = self._rows.get(str(item_id))
+        if row is None:
+            return None
+        row.update(data, updated_at=_now())
+        return dict(row)
+
+    async def put(self, row: dict) -> Optional[dict]:
+        self._rows[str(row["id"])] = dict(row)
+        self._tombstones.pop(str(row["id"]), None)
+        return dict(row)
+
+    async def delete(self, item_id: uuid.UUID) -> Optional[dict]:
+        deleted = self._rows.pop(str(item_id), None)
+        if deleted is not None:
+            self._tombstones[str(item_id)] = _now()
+        return deleted
+
+    async def get_changed_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        rows = sorted(self._rows.values(), key=lambda row: (row["updated_at"], row["id"]))
+        if after is not None:
+            rows = [row for row in rows if (row["updated_at"], row["id"]) > tuple(after)]
+        return [dict(row) for row in rows[:limit]]
+
+    async def get_deleted_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        tombstones = sorted((deleted_at, item_id) for item_id, deleted_at in self._tombstones.items())
+        if after is not None:
+            tombstones = [tombstone for tombstone in tombstones if tombstone > tuple(after)]
+        return [{"id": item_id, "deleted_at": deleted_at} for deleted_at, item_id in tombstones[:limit]]
+
+    async def search_names(self, prefix: str, limit: int) -> list[dict]:
+        prefix = prefix.casefold()
+        rows = sorted(
+            (row["name"], row["id"]) for row in self._rows.values()
+            if row.get("name") and row["name"].casefold().startswith(prefix)
+        )
+        return [{"id": item_id, "name": name} for name, item_id in rows[:limit]]
+
+    async def aggregate(self, price_edges: list[float], tax_edges: list[float]) -> dict:
+        result = {"count": len(self._rows)}
+        for column, edges in (("price", price_edges), ("tax", tax_edges)):
+            values = [row[column] for row in self._rows.values() if row.get(column) is not None]
+            histogram = [0] * len(edges)
+            for value in values:
+                histogram[max(bisect_right(edges, value) - 1, 0)] += 1
+            result[column] = {
+                "count": len(values),
+                "sum": sum(values),
+                "min": min(values, default=None),
+                "max": max(values, default=None),
+            }
+            result[f"{column}_histogram"] = histogram
+        return result
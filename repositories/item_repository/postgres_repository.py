@@ -0,0 +1,246 @@
+"""
+Repositorio de items sobre PostgreSQL directo (asyncpg).
+
+Evita el salto HTTP de PostgREST: las consultas viajan por el protocolo
+binario de PostgreSQL usando sentencias preparadas y un pool propio.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional
+import asyncio
+import json
+import uuid
+
+from db.postgres import create_postgres_pool
+from .base import ItemRepository, ALL_COLUMNS, LIST_COLUMNS, Watermark, check_page_order, escape_like
+
+
+_RETURNING_ALL = ", ".join(ALL_COLUMNS)
+
+_INSERT_SQL = f"""
+    INSERT INTO items (id, name, description, price, tax)
+    VALUES (coalesce($5::uuid, gen_random_uuid()), $1, $2, $3, $4)
+    RETURNING {_RETURNING_ALL}
+"""
+_PUT_SQL = f"""
+    INSERT INTO items ({_RETURNING_ALL})
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+    ON CONFLICT (id) DO UPDATE SET
+        name = EXCLUDED.name, description = EXCLUDED.description,
+        price = EXCLUDED.price, tax = EXCLUDED.tax,
+        created_at = EXCLUDED.created_at, updated_at = EXCLUDED.updated_at
+    RETURNING {_RETURNING_ALL}
+"""
+# ORDER BY de las páginas según page_order; con ids UUIDv7 "id" recorre el índice de la clave primaria
+_PAGE_ORDER_BY = {"created_at": "created_at, id", "id": "id"}
+_SELECT_PAGE_SQL = {
+    order: f"""
+        SELECT {", ".join(LIST_COLUMNS)} FROM items
+        WHERE ($3::numeric IS NULL OR price >= $3) AND ($4::numeric IS NULL OR price <= $4)
+        ORDER BY {order_by}
+        LIMIT $1 OFFSET $2
+    """
+    for order, order_by in _PAGE_ORDER_BY.items()
+}
+_SELECT_FULL_PAGE_SQL = {
+    order: f"""
+        SELECT {_RETURNING_ALL} FROM items
+        WHERE ($3::numeric IS NULL OR price >= $3) AND ($4::numeric IS NULL OR price <= $4)
+        ORDER BY {order_by}
+        LIMIT $1 OFFSET $2
+    """
+    for order, order_by in _PAGE_ORDER_BY.items()
+}
+_SELECT_BY_ID_SQL = f"SELECT {_RETURNING_ALL} FROM items WHERE id = $1"
+_SELECT_MANY_SQL = f"SELECT {_RETURNING_ALL} FROM items WHERE id = ANY($1::uuid[])"
+_SELECT_CHANGED_SQL = f"""
+    SELECT {_RETURNING_ALL} FROM items
+    WHERE $1::timestamptz IS NULL OR (updated_at, id) > ($1::timestamptz, $2::uuid)
+    ORDER BY updated_at, id
+    LIMIT $3
+"""
+_SEARCH_NAMES_SQL = """
+    SELECT id, name FROM items
+    WHERE name ILIKE $1
+    ORDER BY name, id
+    LIMIT $2
+"""
+# Tabla y triggers de db/migrations/004_item_tombstones.sql
+_SELECT_DELETED_SQL = """
+    SELECT id, deleted_at FROM item_tombstones
+    WHERE $1::timestamptz IS NULL OR (deleted_at, id) > ($1::timestamptz, $2::uuid)
+    ORDER BY deleted_at, id
+    LIMIT $3
+"""
+# updated_at también lo mantiene el trigger de db/migrations/002_items_updated_at.sql
+_UPDATE_SQL = f"""
+    UPDATE items SET name = $2, description = $3, price = $4, tax = $5, updated_at = now()
+    WHERE id = $1
+    RETURNING {_RETURNING_ALL}
+"""
+_DELETE_SQL = f"DELETE FROM items WHERE id = $1 RETURNING {_RETURNING_ALL}"
+# Mismo cálculo que la función replication_position() de db/migrations/003_replication_position.sql
+_REPLICATION_POSITION_SQL = """
+    SELECT (
+        CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() ELSE pg_current_wal_lsn() END
+        - '0/0'::pg_lsn
+    )::bigint
+"""
+
+# Mismo cálculo que la función item_stats() de db/migrations/001_item_stats.sql
+_AGGREGATE_SQL = """
+    WITH price_buckets AS (
+        SELECT greatest(width_bucket(price, $1::numeric[]), 1) AS i, count(*) AS n
+        FROM items WHERE price IS NOT NULL GROUP BY 1
+    ), tax_buckets AS (
+        SELECT greatest(width_bucket(tax, $2::numeric[]), 1) AS i, count(*) AS n
+        FROM items WHERE tax IS NOT NULL GROUP BY 1
+    )
+    SELECT json_build_object(
+        'count', count(*),
+        'price', json_build_object(
+            'count', count(price), 'sum', coalesce(sum(price), 0),
+            'min', min(price), 'max', max(price)
+        ),
+        'tax', json_build_object(
+            'count', count(tax), 'sum', coalesce(sum(tax), 0),
+            'min', min(tax), 'max', max(tax)
+        ),
+        'price_histogram', (
+            SELECT coalesce(json_agg(coalesce(b.n, 0) ORDER BY s.i), '[]')
+            FROM generate_series(1, cardinality($1::numeric[])) AS s(i)
+            LEFT JOIN price_buckets b USING (i)
+        ),
+        'tax_histogram', (
+            SELECT coalesce(json_agg(coalesce(b.n, 0) ORDER BY s.i), '[]')
+            FROM generate_series(1, cardinality($2::numeric[])) AS s(i)
+            LEFT JOIN tax_buckets b USING (i)
+        )
+    )
+    FROM items
+"""
+
+
+def _to_json_value(value: Any) -> Any:
+    """Convierte tipos de asyncpg al formato que devuelve PostgREST"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _record_to_dict(record) -> Optional[dict]:
+    if record is None:
+        return None
+    return {key: _to_json_value(value) for key, value in record.items()}
+
+
+class PostgresItemRepository(ItemRepository):
+    """Backend asyncpg con pool de conexiones propio"""
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10, page_order: str = "created_at"):
+        self._dsn = dsn
+        self._page_order = check_page_order(page_order)
+        self._min_size = min_size
+        self._max_size = max_size
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self):
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await create_postgres_pool(self._dsn, self._min_size, self._max_size)
+        return self._pool
+
+    async def create(self, data: dict) -> Optional[dict]:
+        pool = await self._get_pool()
+        record = await pool.fetchrow(
+            _INSERT_SQL, data["name"], data["description"], data.get("price"), data.get("tax"), data.get("id")
+        )
+        return _record_to_dict(record)
+
+    async def get_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        pool = await self._get_pool()
+        records = await pool.fetch(_SELECT_PAGE_SQL[self._page_order], limit, offset, min_price, max_price)
+        return [_record_to_dict(record) for record in records]
+
+    async def get_full_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        pool = await self._get_pool()
+        records = await pool.fetch(_SELECT_FULL_PAGE_SQL[self._page_order], limit, offset, min_price, max_price)
+        return [_record_to_dict(record) for record in records]
+
+    async def get_by_id(self, item_id: uuid.UUID) -> Optional[dict]:
+        pool = await self._get_pool()
+        return _record_to_dict(await pool.fetchrow(_SELECT_BY_ID_SQL, item_id))
+
+    async def get_many(self, item_ids: list[uuid.UUID]) -> list[dict]:
+        pool = await self._get_pool()
+        records = await pool.fetch(_SELECT_MANY_SQL, list(item_ids))
+        return [_record_to_dict(record) for record in records]
+
+    async def update(self, item_id: uuid.UUID, data: dict) -> Optional[dict]:
+        pool = await self._get_pool()
+        record = await pool.fetchrow(
+            _UPDATE_SQL, item_id, data["name"], data["description"], data.get("price"), data.get("tax")
+        )
+        return _record_to_dict(record)
+
+    async def put(self, row: dict) -> Optional[dict]:
+        pool = await self._get_pool()
+        record = await pool.fetchrow(
+            _PUT_SQL,
+            uuid.UUID(str(row["id"])), row["name"], row["description"], row.get("price"), row.get("tax"),
+            datetime.fromisoformat(row["created_at"]), datetime.fromisoformat(row["updated_at"]),
+        )
+        return _record_to_dict(record)
+
+    async def delete(self, item_id: uuid.UUID) -> Optional[dict]:
+        pool = await self._get_pool()
+        return _record_to_dict(await pool.fetchrow(_DELETE_SQL, item_id))
+
+    async def get_changed_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        pool = await self._get_pool()
+        updated_at, item_id = (datetime.fromisoformat(after[0]), after[1]) if after else (None, None)
+        records = await pool.fetch(_SELECT_CHANGED_SQL, updated_at, item_id, limit)
+        return [_record_to_dict(record) for record in records]
+
+    async def get_deleted_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        pool = await self._get_pool()
+        deleted_at, item_id = (datetime.fromisoformat(after[0]), after[1]) if after else (None, None)
+        records = await pool.fetch(_SELECT_DELETED_SQL, deleted_at, item_id, limit)
+        return [_record_to_dict(record) for record in records]
+
+    async def search_names(self, prefix: str, limit: int) -> list[dict]:
+        pool = await self._get_pool()
+        records = await pool.fetch(_SEARCH_NAMES_SQL, f"{escape_like(prefix)}%", limit)
+        return [_record_to_dict(record) for record in records]
+
+    async def aggregate(self, price_edges: list[float], tax_edges: list[float]) -> dict:
+        pool = await self._get_pool()
+        return json.loads(await pool.fetchval(_AGGREGATE_SQL, price_edges, tax_edges))
+
+    async def replication_position(self) -> Optional[int]:
+        pool = await self._get_pool()
+        return await pool.fetchval(_REPLICATION_POSITION_SQL)
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
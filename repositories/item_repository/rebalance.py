@@ -0,0 +1,80 @@
+"""
+Rebalanceo en línea de items entre shards.
+
+Uso, después de agregar un shard a ``ITEM_SHARDS`` y dejar la lista anterior
+en ``ITEM_SHARDS_PREVIOUS`` (y desplegar los workers con esa configuración)::
+
+    python -m repositories.item_repository.rebalance [--batch-size 500] [--dry-run]
+
+Recorre cada shard por keyset ``(updated_at, id)`` y mueve al dueño actual
+las filas que ya no le corresponden. Los workers siguen atendiendo
+peticiones mientras tanto (ver sharded_repository.py). Al terminar se puede
+vaciar ``ITEM_SHARDS_PREVIOUS``.
+"""
+
+from collections import Counter
+from typing import Optional
+import argparse
+import asyncio
+import logging
+
+from .base import Watermark
+from .sharded_repository import ShardedItemRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+async def rebalance(repository: ShardedItemRepository, batch_size: int = 500,
+                    dry_run: bool = False) -> Counter:
+    """
+    Mueve cada fila al shard dueño según el anillo actual.
+
+    Args:
+        repository: Repositorio con los shards del anillo actual
+        batch_size: Filas leídas por consulta
+        dry_run: Solo cuenta las filas que habría que mover
+
+    Returns:
+        Counter: Filas movidas por par ``(origen, destino)``
+    """
+    moved: Counter = Counter()
+    for name, shard in repository.shards.items():
+        after: Optional[Watermark] = None
+        scanned = 0
+        while True:
+            rows = await shard.get_changed_since(after, batch_size)
+            for row in rows:
+                owner = repository.owner(row["id"])
+                if owner == name:
+                    continue
+                if dry_run or await repository.move(row["id"], name, owner) is not None:
+                    moved[(name, owner)] += 1
+            scanned += len(rows)
+            if len(rows) < batch_size:
+                break
+            after = (rows[-1]["updated_at"], rows[-1]["id"])
+        logger.info("Shard %s: %d rows scanned", name, scanned)
+    return moved
+
+
+async def _main(batch_size: int, dry_run: bool) -> None:
+    from .factory import create_sharded_item_repository
+
+    repository = create_sharded_item_repository()
+    try:
+        moved = await rebalance(repository, batch_size, dry_run)
+    finally:
+        await repository.close()
+    for (source, target), count in sorted(moved.items()):
+        print(f"{source} -> {target}: {count}")
+    print(f"total: {sum(moved.values())}{' (dry run)' if dry_run else ''}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Mueve los items al shard dueño según ITEM_SHARDS")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    arguments = parser.parse_args()
+    asyncio.run(_main(arguments.batch_size, arguments.dry_run))
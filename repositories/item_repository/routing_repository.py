@@ -0,0 +1,260 @@
+"""
+Decorador de ItemRepository que separa lecturas y escrituras.
+
+Las escrituras (y el resto de operaciones) van al primario. Las lecturas
+de ItemService (get_page, get_full_page, get_by_id, get_many) van a la réplica sana con
+menos consultas en curso, desempatando por la latencia media reciente.
+
+Un loop de health check pide periódicamente la posición de replicación de
+cada réplica: las que fallan o acumulan más de ``max_lag_bytes`` de
+retraso respecto del primario dejan de recibir lecturas hasta el siguiente
+chequeo correcto. Si una lectura falla en una réplica se repite en el
+primario y la réplica queda marcada como caída.
+
+Consistencia de sesión: después de cada escritura se guarda la posición
+del primario en el contexto de la petición (ver db/consistency.py). Las
+peticiones que traen ese token solo leen de réplicas cuya última posición
+conocida lo alcanza; mientras ninguna lo haga, leen del primario. Las
+peticiones con cliente por usuario (RLS) siempre leen del primario.
+
+Con un ReadHedger (ver hedging.py) las lecturas lentas se repiten en la
+siguiente réplica candidata, o en el primario si no queda otra.
+"""
+
+from time import perf_counter
+from typing import Awaitable, Callable, Optional, TypeVar
+import asyncio
+import contextvars
+import logging
+import uuid
+
+from db import get_read_position, get_request_user_client, record_write_position
+from metrics import registry
+from .base import ItemRepository, Watermark
+from .hedging import ReadHedger
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_reads = registry.counter(
+    "item_read_routing_total", "Lecturas por destino (endpoint=primary|replica-N)"
+)
+_fallbacks = registry.counter(
+    "item_read_replica_fallbacks_total", "Lecturas repetidas en el primario tras fallar en una réplica"
+)
+_lag = registry.gauge(
+    "item_read_replica_lag_bytes", "Retraso de cada réplica respecto del primario en bytes de WAL"
+)
+_healthy = registry.gauge(
+    "item_read_replica_healthy", "1 si la réplica recibe lecturas, 0 si no"
+)
+
+# Peso de la última muestra en la latencia media de cada réplica
+_EWMA_WEIGHT = 0.2
+
+
+class ReadEndpoint:
+    """Estado de una réplica de lectura"""
+
+    def __init__(self, name: str, repository: ItemRepository):
+        self.name = name
+        self.repository = repository
+        self.in_flight = 0
+        self.latency = 0.0
+        # Sin chequeo todavía: recibe lecturas sin token hasta que uno falle
+        self.healthy = True
+        self.position: Optional[int] = None
+        self.lag_bytes: Optional[int] = None
+
+
+class RoutingItemRepository(ItemRepository):
+    """Primario para escrituras, réplicas para lecturas"""
+
+    def __init__(
+        self,
+        primary: ItemRepository,
+        replicas: list[ItemRepository],
+        health_interval: float = 2.0,
+        health_timeout: float = 1.0,
+        max_lag_bytes: Optional[int] = None,
+        hedger: Optional[ReadHedger] = None,
+    ):
+        self.primary = primary
+        self.replicas = [ReadEndpoint(f"replica-{index}", replica) for index, replica in enumerate(replicas)]
+        self._health_interval = health_interval
+        self._health_timeout = health_timeout
+        self._max_lag_bytes = max_lag_bytes
+        self._hedger = hedger
+        self._health_task: Optional[asyncio.Task] = None
+
+    def _ensure_health_checks(self) -> None:
+        # Se arranca con la primera operación: el repositorio se crea fuera del event loop
+        if self._health_task is None and self.replicas:
+            self._health_task = asyncio.create_task(self._run_health_checks(), context=contextvars.Context())
+
+    async def check_health(self) -> None:
+        """Actualiza la posición y el estado de cada réplica"""
+        try:
+            primary_position = await asyncio.wait_for(
+                self.primary.replication_position(), self._health_timeout
+            )
+        except Exception:
+            logger.warning("Primary replication position check failed", exc_info=True)
+            primary_position = None
+
+        async def check(endpoint: ReadEndpoint) -> None:
+            try:
+                endpoint.position = await asyncio.wait_for(
+                    endpoint.repository.replication_position(), self._health_timeout
+                )
+            except Exception as e:
+                if endpoint.healthy:
+                    logger.warning("Read replica %s failed health check: %r", endpoint.name, e)
+                endpoint.healthy = False
+                return
+            if primary_position is not None and endpoint.position is not None:
+                endpoint.lag_bytes = max(primary_position - endpoint.position, 0)
+                _lag.set(endpoint.lag_bytes, labels={"endpoint": endpoint.name})
+            endpoint.healthy = self._max_lag_bytes is None or (endpoint.lag_bytes or 0) <= self._max_lag_bytes
+
+        await asyncio.gather(*(check(endpoint) for endpoint in self.replicas))
+        for endpoint in self.replicas:
+            _healthy.set(1 if endpoint.healthy else 0, labels={"endpoint": endpoint.name})
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            try:
+                await self.check_health()
+            except Exception:
+                logger.exception("Read replica health check failed")
+            await asyncio.sleep(self._health_interval)
+
+    def _choose(self, exclude: Optional[ReadEndpoint] = None) -> Optional[ReadEndpoint]:
+        """Réplica para la lectura en curso, o None para leer del primario"""
+        if get_request_user_client() is not None:
+            return None
+        required = get_read_position()
+        candidates = [
+            endpoint for endpoint in self.replicas
+            if endpoint is not exclude and endpoint.healthy and (
+                required is None or (endpoint.position is not None and endpoint.position >= required)
+            )
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda endpoint: (endpoint.in_flight, endpoint.latency))
+
+    async def _read(self, operation: str, call: Callable[[ItemRepository], Awaitable[T]]) -> T:
+        self._ensure_health_checks()
+        endpoint = self._choose()
+        if self._hedger is None:
+            return await self._read_from(endpoint, call)
+        return await self._hedger.run(
+            operation,
+            lambda: self._read_from(endpoint, call),
+            lambda: self._read_from(self._choose(exclude=endpoint), call),
+        )
+
+    async def _read_from(
+        self, endpoint: Optional[ReadEndpoint], call: Callable[[ItemRepository], Awaitable[T]]
+    ) -> T:
+        if endpoint is None:
+            _reads.inc(labels={"endpoint": "primary"})
+            return await call(self.primary)
+
+        _reads.inc(labels={"endpoint": endpoint.name})
+        endpoint.in_flight += 1
+        start = perf_counter()
+        try:
+            result = await call(endpoint.repository)
+        except Exception as e:
+            logger.warning("Read from %s failed, retrying on primary: %r", endpoint.name, e)
+            endpoint.healthy = False
+            _fallbacks.inc()
+            return await call(self.primary)
+        finally:
+            endpoint.in_flight -= 1
+        endpoint.latency += _EWMA_WEIGHT * (perf_counter() - start - endpoint.latency)
+        return result
+
+    async def _write(self, call: Awaitable[T]) -> T:
+        self._ensure_health_checks()
+        result = await call
+        if result is not None:
+            try:
+                position = await self.primary.replication_position()
+            except Exception:
+                # La escritura ya se confirmó: sin token la sesión puede leer datos viejos
+                logger.warning("Could not read primary replication position", exc_info=True)
+            else:
+                if position is not None:
+                    record_write_position(position)
+        return result
+
+    async def create(self, data: dict) -> Optional[dict]:
+        return await self._write(self.primary.create(data))
+
+    async def get_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        return await self._read("get_page", lambda repository: repository.get_page(limit, offset, min_price, max_price))
+
+    async def get_full_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        return await self._read(
+            "get_full_page", lambda repository: repository.get_full_page(limit, offset, min_price, max_price)
+        )
+
+    async def get_by_id(self, item_id: uuid.UUID) -> Optional[dict]:
+        return await self._read("get_by_id", lambda repository: repository.get_by_id(item_id))
+
+    async def get_many(self, item_ids: list[uuid.UUID]) -> list[dict]:
+        return await self._read("get_many", lambda repository: repository.get_many(item_ids))
+
+    async def update(self, item_id: uuid.UUID, data: dict) -> Optional[dict]:
+        return await self._write(self.primary.update(item_id, data))
+
+    async def put(self, row: dict) -> Optional[dict]:
+        return await self._write(self.primary.put(row))
+
+    async def delete(self, item_id: uuid.UUID) -> Optional[dict]:
+        return await self._write(self.primary.delete(item_id))
+
+    async def get_changed_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        # La réplica en memoria avanza su watermark con lo que recibe: siempre del primario
+        return await self.primary.get_changed_since(after, limit)
+
+    async def get_deleted_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        return await self.primary.get_deleted_since(after, limit)
+
+    async def search_names(self, prefix: str, limit: int) -> list[dict]:
+        return await self._read("search_names", lambda repository: repository.search_names(prefix, limit))
+
+    async def aggregate(self, price_edges: list[float], tax_edges: list[float]) -> dict:
+        return await self.primary.aggregate(price_edges, tax_edges)
+
+    async def replication_position(self) -> Optional[int]:
+        return await self.primary.replication_position()
+
+    async def close(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        await self.primary.close()
+        for endpoint in self.replicas:
+            await endpoint.repository.close()
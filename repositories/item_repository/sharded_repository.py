@@ -0,0 +1,238 @@
+"""
+Repositorio de items repartido en varios backends por hashing consistente.
+
+Cada item vive en el shard dueño de su ``id`` según un anillo de hashing
+consistente con nodos virtuales: al agregar un shard solo cambia de dueño
+~1/N de los ids. Los ids se generan aquí al crear, para saber a qué shard
+va la fila antes de insertarla.
+
+Las operaciones por id van al shard dueño. Los listados son scatter-gather:
+cada shard devuelve sus primeras ``offset + limit`` filas en orden
+``(created_at, id)`` y se combinan con un merge k-way ordenado.
+
+Rebalanceo en línea: mientras ``previous`` tiene la lista de shards del
+anillo anterior, una fila puede seguir en su dueño anterior. Las lecturas
+por id la buscan en ambos, las actualizaciones la mueven antes de
+escribirla, los borrados la eliminan de ambos y los listados descartan
+duplicados. La herramienta de repositories/item_repository/rebalance.py
+recorre los shards y mueve las filas restantes.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime
+from hashlib import blake2b
+from itertools import islice
+from typing import Iterable, Optional
+import asyncio
+import heapq
+import uuid
+
+from metrics import registry
+from .base import ItemRepository, LIST_COLUMNS, Watermark, check_page_order
+
+
+_moves = registry.counter("item_shard_moves_total", "Filas movidas al shard dueño según el anillo actual")
+
+
+def _hash(data: bytes) -> int:
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Anillo de hashing consistente con nodos virtuales"""
+
+    def __init__(self, names: Iterable[str], vnodes: int = 64):
+        points = sorted((_hash(f"{name}#{index}".encode()), name) for name in names for index in range(vnodes))
+        if not points:
+            raise ValueError("El anillo necesita al menos un shard")
+        self._points = [point for point, _ in points]
+        self._names = [name for _, name in points]
+
+    def owner(self, item_id) -> str:
+        """Shard dueño de un id"""
+        point = _hash(uuid.UUID(str(item_id)).bytes)
+        return self._names[bisect_right(self._points, point) % len(self._points)]
+
+
+def _order_key(column: str):
+    if column == "id":
+        # Ids en texto canónico (minúsculas): el orden lexicográfico es el de uuid en PostgreSQL
+        return lambda row: row["id"]
+
+    def key(row: dict) -> tuple[datetime, str]:
+        return datetime.fromisoformat(row[column]), row["id"]
+    return key
+
+
+def _merge(pages: list[list[dict]], column: str, skip: int, take: int) -> list[dict]:
+    """Merge k-way de páginas ordenadas por ``(column, id)`` sin ids repetidos"""
+    seen = set()
+
+    def unique(rows):
+        for row in rows:
+            # Durante un rebalanceo una fila puede estar un instante en dos shards
+            if row["id"] not in seen:
+                seen.add(row["id"])
+                yield row
+
+    return list(islice(unique(heapq.merge(*pages, key=_order_key(column))), skip, skip + take))
+
+
+class ShardedItemRepository(ItemRepository):
+    """Reparte los items entre varios repositorios según el hash del id"""
+
+    def __init__(self, shards: dict[str, ItemRepository], previous: Optional[list[str]] = None,
+                 vnodes: int = 64, page_order: str = "created_at"):
+        unknown = set(previous or ()) - set(shards)
+        if unknown:
+            raise ValueError(f"Shards anteriores sin configurar: {sorted(unknown)}")
+        self.shards = shards
+        # Debe coincidir con el page_order de los shards para que el merge sea correcto
+        self.page_order = check_page_order(page_order)
+        self.ring = HashRing(shards, vnodes)
+        self.previous_ring = HashRing(previous, vnodes) if previous else None
+
+    def owner(self, item_id) -> str:
+        """Shard dueño de un id en el anillo actual"""
+        return self.ring.owner(item_id)
+
+    def _previous_owner(self, item_id) -> Optional[str]:
+        """Dueño en el anillo anterior si difiere del actual (rebalanceo en curso)"""
+        if self.previous_ring is None:
+            return None
+        previous = self.previous_ring.owner(item_id)
+        return previous if previous != self.ring.owner(item_id) else None
+
+    async def move(self, item_id, source: str, target: str) -> Optional[dict]:
+        """
+        Mueve una fila de un shard a otro conservando id y timestamps.
+
+        Si la fila cambió en el origen entre la copia y el borrado, se copia
+        de nuevo la versión borrada.
+
+        Returns:
+            dict: Fila en el destino, o None si ya no estaba en el origen
+        """
+        row = await self.shards[source].get_by_id(uuid.UUID(str(item_id)))
+        if row is None:
+            return None
+        await self.shards[target].put(row)
+        deleted = await self.shards[source].delete(uuid.UUID(str(item_id)))
+        if deleted is not None and deleted.get("updated_at") != row.get("updated_at"):
+            await self.shards[target].put(deleted)
+            row = deleted
+        _moves.inc()
+        return row
+
+    async def create(self, data: dict) -> Optional[dict]:
+        item_id = str(data.get("id") or uuid.uuid4())
+        return await self.shards[self.owner(item_id)].create({**data, "id": item_id})
+
+    async def get_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        rows = await self.get_full_page(limit, offset, min_price, max_price)
+        return [{column: row.get(column) for column in LIST_COLUMNS} for row in rows]
+
+    async def get_full_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        pages = await asyncio.gather(*(
+            shard.get_full_page(offset + limit, 0, min_price, max_price) for shard in self.shards.values()
+        ))
+        return _merge(pages, self.page_order, offset, limit)
+
+    async def get_by_id(self, item_id: uuid.UUID) -> Optional[dict]:
+        found = await self.shards[self.owner(item_id)].get_by_id(item_id)
+        previous = self._previous_owner(item_id)
+        if found is None and previous is not None:
+            found = await self.shards[previous].get_by_id(item_id)
+        return found
+
+    async def get_many(self, item_ids: list[uuid.UUID]) -> list[dict]:
+        groups: dict[str, list[uuid.UUID]] = defaultdict(list)
+        for item_id in item_ids:
+            groups[self.owner(item_id)].append(item_id)
+        results = await asyncio.gather(*(self.shards[name].get_many(ids) for name, ids in groups.items()))
+        rows = [row for result in results for row in result]
+
+        if self.previous_ring is not None:
+            found = {row["id"] for row in rows}
+            missing: dict[str, list[uuid.UUID]] = defaultdict(list)
+            for item_id in item_ids:
+                previous = self._previous_owner(item_id)
+                if previous is not None and str(item_id) not in found:
+                    missing[previous].append(item_id)
+            results = await asyncio.gather(*(self.shards[name].get_many(ids) for name, ids in missing.items()))
+            rows.extend(row for result in results for row in result)
+        return rows
+
+    async def update(self, item_id: uuid.UUID, data: dict) -> Optional[dict]:
+        owner = self.owner(item_id)
+        updated = await self.shards[owner].update(item_id, data)
+        previous = self._previous_owner(item_id)
+        if updated is None and previous is not None:
+            if await self.move(item_id, previous, owner) is not None:
+                updated = await self.shards[owner].update(item_id, data)
+        return updated
+
+    async def put(self, row: dict) -> Optional[dict]:
+        stored = await self.shards[self.owner(row["id"])].put(row)
+        previous = self._previous_owner(row["id"])
+        if previous is not None:
+            await self.shards[previous].delete(uuid.UUID(str(row["id"])))
+        return stored
+
+    async def delete(self, item_id: uuid.UUID) -> Optional[dict]:
+        deleted = await self.shards[self.owner(item_id)].delete(item_id)
+        previous = self._previous_owner(item_id)
+        if previous is not None:
+            deleted = await self.shards[previous].delete(item_id) or deleted
+        return deleted
+
+    async def get_changed_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        pages = await asyncio.gather(*(shard.get_changed_since(after, limit) for shard in self.shards.values()))
+        return _merge(pages, "updated_at", 0, limit)
+
+    async def get_deleted_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        pages = await asyncio.gather(*(shard.get_deleted_since(after, limit) for shard in self.shards.values()))
+        # Mover una fila deja una lápida en el shard de origen: quien las lee
+        # debe descartar las de ids que siguen existiendo
+        return _merge(pages, "deleted_at", 0, limit)
+
+    async def search_names(self, prefix: str, limit: int) -> list[dict]:
+        pages = await asyncio.gather(*(shard.search_names(prefix, limit) for shard in self.shards.values()))
+        # Se ordena en Python: la collation de cada backend puede no coincidir con heapq.merge
+        rows = {row["id"]: row for page in pages for row in page}
+        return sorted(rows.values(), key=lambda row: (row["name"], row["id"]))[:limit]
+
+    async def aggregate(self, price_edges: list[float], tax_edges: list[float]) -> dict:
+        parts = await asyncio.gather(*(shard.aggregate(price_edges, tax_edges) for shard in self.shards.values()))
+        result = {"count": sum(part["count"] for part in parts)}
+        for column in ("price", "tax"):
+            stats = [part[column] for part in parts]
+            minimums = [stat["min"] for stat in stats if stat["min"] is not None]
+            maximums = [stat["max"] for stat in stats if stat["max"] is not None]
+            result[column] = {
+                "count": sum(stat["count"] for stat in stats),
+                "sum": sum(float(stat["sum"] or 0) for stat in stats),
+                "min": min(minimums, default=None),
+                "max": max(maximums, default=None),
+            }
+            result[f"{column}_histogram"] = [
+                sum(counts) for counts in zip(*(part[f"{column}_histogram"] for part in parts))
+            ]
+        return result
+
+    async def close(self) -> None:
+        for shard in self.shards.values():
+            await shard.close()
@@ -0,0 +1,212 @@
+"""
+Repositorio de items sobre Supabase (PostgREST).
+
+El cliente de Supabase es síncrono, así que cada operación se ejecuta en el
+threadpool para no bloquear el event loop. Cada operación usa el cliente de
+la petición en curso (el del usuario si la petición trae su JWT, ver
+db/supabase.py), de modo que PostgREST aplica RLS.
+
+Un repositorio construido con ``client`` (p. ej. el de una réplica de
+lectura) usa siempre ese cliente en lugar del de la petición.
+
+Cada llamada a PostgREST abre un span CLIENT (tabla, operación y filas
+devueltas) y propaga la traza en curso con el header ``traceparent``.
+"""
+
+from typing import Optional
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+
+from db import get_request_supabase_client
+from tracing import SPAN_KIND_CLIENT, tracer
+from .base import ItemRepository, LIST_COLUMNS, Watermark, check_page_order, escape_like
+
+
+class SupabaseItemRepository(ItemRepository):
+    """Backend que usa el query builder de PostgREST"""
+
+    table_name = "items"
+    tombstones_table_name = "item_tombstones"
+
+    def __init__(self, client=None, page_order: str = "created_at"):
+        self._fixed_client = client
+        self._page_order = check_page_order(page_order)
+
+    def _client(self):
+        return self._fixed_client or get_request_supabase_client()
+
+    def _execute(self, operation: str, query, target: Optional[str] = None):
+        """Ejecuta una consulta de PostgREST dentro de un span CLIENT"""
+        target = target or self.table_name
+        attributes = {"db.system": "postgresql", "db.operation": operation, "db.sql.table": target}
+        with tracer.start_span(f"postgrest {operation} {target}", SPAN_KIND_CLIENT, attributes) as span:
+            if span.traceparent is not None:
+                query.headers["traceparent"] = span.traceparent
+            response = query.execute()
+            if isinstance(response.data, list):
+                span.set_attribute("db.response.rows", len(response.data))
+            return response
+
+    async def create(self, data: dict) -> Optional[dict]:
+        return await run_in_threadpool(self._create, data)
+
+    async def get_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        return await run_in_threadpool(self._get_page, limit, offset, min_price, max_price)
+
+    async def get_full_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        return await run_in_threadpool(self._get_full_page, limit, offset, min_price, max_price)
+
+    async def get_by_id(self, item_id: uuid.UUID) -> Optional[dict]:
+        return await run_in_threadpool(self._get_by_id, item_id)
+
+    async def get_many(self, item_ids: list[uuid.UUID]) -> list[dict]:
+        return await run_in_threadpool(self._get_many, item_ids)
+
+    async def update(self, item_id: uuid.UUID, data: dict) -> Optional[dict]:
+        return await run_in_threadpool(self._update, item_id, data)
+
+    async def put(self, row: dict) -> Optional[dict]:
+        return await run_in_threadpool(self._put, row)
+
+    async def delete(self, item_id: uuid.UUID) -> Optional[dict]:
+        return await run_in_threadpool(self._delete, item_id)
+
+    async def get_changed_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        return await run_in_threadpool(self._get_changed_since, after, limit)
+
+    async def get_deleted_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        return await run_in_threadpool(self._get_deleted_since, after, limit)
+
+    async def search_names(self, prefix: str, limit: int) -> list[dict]:
+        return await run_in_threadpool(self._search_names, prefix, limit)
+
+    async def aggregate(self, price_edges: list[float], tax_edges: list[float]) -> dict:
+        return await run_in_threadpool(self._aggregate, price_edges, tax_edges)
+
+    async def replication_position(self) -> Optional[int]:
+        return await run_in_threadpool(self._replication_position)
+
+    def _create(self, data: dict) -> Optional[dict]:
+        response = self._execute("insert", self._client().table(self.table_name).insert(data))
+        return response.data[0] if response.data else None
+
+    def _get_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float],
+        max_price: Optional[float],
+    ) -> list[dict]:
+        query = self._client().table(self.table_name).select(", ".join(LIST_COLUMNS))
+        if min_price is not None:
+            query = query.gte("price", min_price)
+        if max_price is not None:
+            query = query.lte("price", max_price)
+        if self._page_order == "id":
+            query = query.order("id")
+        response = self._execute("select", query.range(offset, offset + limit - 1))
+        return response.data
+
+    def _get_full_page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float],
+        max_price: Optional[float],
+    ) -> list[dict]:
+        query = self._client().table(self.table_name).select("*")
+        if min_price is not None:
+            query = query.gte("price", min_price)
+        if max_price is not None:
+            query = query.lte("price", max_price)
+        if self._page_order == "id":
+            query = query.order("id")
+        else:
+            query = query.order("created_at").order("id")
+        query = query.range(offset, offset + limit - 1)
+        return self._execute("select", query).data
+
+    def _get_by_id(self, item_id: uuid.UUID) -> Optional[dict]:
+        query = self._client().table(self.table_name).select("*").eq("id", str(item_id))
+        response = self._execute("select", query)
+        return response.data[0] if response.data else None
+
+    def _get_many(self, item_ids: list[uuid.UUID]) -> list[dict]:
+        query = (
+            self._client()
+            .table(self.table_name)
+            .select("*")
+            .in_("id", [str(item_id) for item_id in item_ids])
+        )
+        response = self._execute("select", query)
+        return response.data
+
+    def _get_changed_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        query = self._client().table(self.table_name).select("*")
+        if after is not None:
+            updated_at, item_id = after
+            query = query.or_(f"updated_at.gt.{updated_at},and(updated_at.eq.{updated_at},id.gt.{item_id})")
+        response = self._execute("select", query.order("updated_at").order("id").limit(limit))
+        return response.data
+
+    def _get_deleted_since(self, after: Optional[Watermark], limit: int) -> list[dict]:
+        # Tabla definida en db/migrations/004_item_tombstones.sql
+        query = self._client().table(self.tombstones_table_name).select("id, deleted_at")
+        if after is not None:
+            deleted_at, item_id = after
+            query = query.or_(f"deleted_at.gt.{deleted_at},and(deleted_at.eq.{deleted_at},id.gt.{item_id})")
+        query = query.order("deleted_at").order("id").limit(limit)
+        return self._execute("select", query, target=self.tombstones_table_name).data
+
+    def _update(self, item_id: uuid.UUID, data: dict) -> Optional[dict]:
+        query = self._client().table(self.table_name).update(data).eq("id", str(item_id))
+        response = self._execute("update", query)
+        return response.data[0] if response.data else None
+
+    def _put(self, row: dict) -> Optional[dict]:
+        response = self._execute("upsert", self._client().table(self.table_name).upsert(row))
+        return response.data[0] if response.data else None
+
+    def _delete(self, item_id: uuid.UUID) -> Optional[dict]:
+        query = self._client().table(self.table_name).delete().eq("id", str(item_id))
+        response = self._execute("delete", query)
+        return response.data[0] if response.data else None
+
+    def _search_names(self, prefix: str, limit: int) -> list[dict]:
+        query = (
+            self._client()
+            .table(self.table_name)
+            .select("id, name")
+            .ilike("name", f"{escape_like(prefix)}%")
+            .order("name")
+            .order("id")
+            .limit(limit)
+        )
+        return self._execute("select", query).data
+
+    def _aggregate(self, price_edges: list[float], tax_edges: list[float]) -> dict:
+        # Función SQL definida en db/migrations/001_item_stats.sql
+        query = self._client().rpc(
+            "item_stats", {"price_edges": price_edges, "tax_edges": tax_edges}
+        )
+        response = self._execute("rpc", query, target="item_stats")
+        return response.data
+
+    def _replication_position(self) -> Optional[int]:
+        # Función SQL definida en db/migrations/003_replication_position.sql
+        query = self._client().rpc("replication_position", {})
+        response = self._execute("rpc", query, target="replication_position")
+        return response.data
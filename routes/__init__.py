@@ -1,3 +1,6 @@
+from .batch_routes import router as batch_router
+from .debug_routes import router as debug_router
 from .item_routes import router as item_router
+from .metrics_routes import router as metrics_router
 
-__all__ = ["item_router"]
+__all__ = ["batch_router", "debug_router", "item_router", "metrics_router"]
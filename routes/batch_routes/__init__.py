@@ -0,0 +1,7 @@
+"""
+Batch routes module - Define la ruta para peticiones en lote.
+"""
+
+from .batch_routes import router
+
+__all__ = ["router"]
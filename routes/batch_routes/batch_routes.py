@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Request, Response
+from controllers import BatchController
+from models import BatchRequest, BatchResponse
+from tracing import TracedRoute
+
+router = APIRouter(
+    prefix="/batch",
+    tags=["batch"],
+    route_class=TracedRoute,
+)
+
+
+@router.post("", response_model=BatchResponse)
+async def execute_batch(batch: BatchRequest, request: Request, response: Response):
+    """Ejecuta varias operaciones de items en una sola petición"""
+    return await BatchController.execute(request.app, batch, request.scope["headers"], response)
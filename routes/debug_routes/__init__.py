@@ -0,0 +1,7 @@
+"""
+Debug routes module - Endpoints de diagnóstico del worker (deshabilitados por defecto).
+"""
+
+from .debug_routes import router
+
+__all__ = ["router"]
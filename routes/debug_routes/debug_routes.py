@@ -0,0 +1,47 @@
+from typing import Literal, Optional
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from config.settings import settings
+from diagnostics.profiler import format_collapsed, profile_lock, sample_allocations, sample_stacks
+
+
+def require_debug_token(authorization: Optional[str] = Header(None)) -> None:
+    """Exige el endpoint habilitado y ``Authorization: Bearer <DEBUG_PROFILE_TOKEN>``"""
+    if not settings.DEBUG_PROFILE_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = settings.DEBUG_PROFILE_TOKEN
+    if not expected:
+        raise HTTPException(status_code=403, detail="DEBUG_PROFILE_TOKEN is not configured")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid debug token", headers={"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    dependencies=[Depends(require_debug_token)],
+    include_in_schema=False,
+)
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10.0, gt=0, description="Duración de la ventana de muestreo"),
+    mode: Literal["cpu", "alloc"] = Query("cpu", description="cpu: pilas en ejecución, alloc: diff de tracemalloc"),
+):
+    """Perfila el worker durante ``seconds`` y devuelve pilas colapsadas"""
+    if seconds > settings.DEBUG_PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be <= {settings.DEBUG_PROFILE_MAX_SECONDS}")
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    async with profile_lock:
+        if mode == "cpu":
+            counts = await run_in_threadpool(sample_stacks, seconds, settings.DEBUG_PROFILE_INTERVAL_SECONDS)
+        else:
+            counts = await sample_allocations(seconds)
+    return PlainTextResponse(format_collapsed(counts))
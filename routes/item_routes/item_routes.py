@@ -1,24 +1,102 @@
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
 from controllers import ItemController
-from models import Item, ItemBase, ItemCreate
+from db import bind_consistency_token, bind_user_supabase_client
+from config.settings import settings
+from models import (
+    Item,
+    ItemBase,
+    ItemChanges,
+    ItemCreate,
+    ItemLookupRequest,
+    ItemStats,
+    ItemSuggestion,
+    QuoteRequest,
+    QuoteResponse,
+)
+from serialization import ARROW_STREAM, MSGPACK, item_response_format
+from tracing import TracedRoute
 import uuid
 
 router = APIRouter(
     prefix="/items",
-    tags=["items"]
+    tags=["items"],
+    route_class=TracedRoute,
+    # Deja el cliente de Supabase del usuario (RLS) como cliente de la petición
+    # y la posición mínima de lectura del token de consistencia
+    dependencies=[Depends(bind_user_supabase_client), Depends(bind_consistency_token)]
 )
 
 
 @router.post("", response_model=ItemBase)
-async def create_item(item: ItemCreate):
+async def create_item(item: ItemCreate, response: Response):
     """Crea un nuevo item en Supabase"""
-    return await ItemController.create_item(item)
+    return await ItemController.create_item(item, response)
+
 
+# Formatos binarios de las rutas que devuelven listas de items (ver serialization/)
+ITEM_LIST_FORMATS = {
+    200: {
+        "content": {
+            MSGPACK: {"schema": {"type": "string", "format": "binary"}},
+            ARROW_STREAM: {"schema": {"type": "string", "format": "binary"}},
+        },
+        "description": "Lista de items; MessagePack o Arrow según el header Accept",
+    }
+}
 
-@router.get("", response_model=list[ItemBase])
-async def get_items(limit: int = 10, offset: int = 0):
+
+@router.get("", response_model=list[ItemBase], responses=ITEM_LIST_FORMATS)
+async def get_items(
+    response: Response,
+    limit: int = 10,
+    offset: int = 0,
+    min_price: Optional[float] = Query(None, ge=0, description="Precio mínimo (incluido)"),
+    max_price: Optional[float] = Query(None, ge=0, description="Precio máximo (incluido)"),
+    media_type: str = Depends(item_response_format),
+):
     """Obtiene lista de items desde Supabase"""
-    return await ItemController.get_items(limit, offset)
+    return await ItemController.get_items(limit, offset, min_price, max_price, response, media_type)
+
+
+@router.get("/stats", response_model=ItemStats)
+async def get_stats():
+    """Obtiene estadísticas agregadas de price y tax"""
+    return await ItemController.get_stats()
+
+
+@router.get("/suggest", response_model=list[ItemSuggestion])
+async def suggest_items(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Comienzo del nombre (sin distinguir tildes ni mayúsculas)"),
+    limit: int = Query(10, ge=1, le=settings.ITEM_SUGGEST_MAX_LIMIT),
+):
+    """Autocompleta nombres de items por prefijo desde el índice en memoria del worker"""
+    return await ItemController.suggest_items(prefix, limit)
+
+
+@router.get("/changes", response_model=ItemChanges)
+async def get_changes(
+    since: Optional[str] = Query(None, description="next_token de la respuesta anterior"),
+    limit: int = Query(100, ge=1, le=settings.ITEM_CHANGES_MAX_LIMIT),
+):
+    """Obtiene los items creados, modificados y borrados desde un token"""
+    return await ItemController.get_changes(since, limit)
+
+
+@router.post("/quote", response_model=QuoteResponse)
+async def quote_items(request: QuoteRequest):
+    """Cotiza una cesta: importes netos, impuestos y totales"""
+    return await ItemController.quote(request)
+
+
+@router.post("/lookup", response_model=list[ItemBase], responses=ITEM_LIST_FORMATS)
+async def lookup_items(
+    request: ItemLookupRequest,
+    response: Response,
+    media_type: str = Depends(item_response_format),
+):
+    """Obtiene varios items por ID en una sola consulta"""
+    return await ItemController.lookup_items(request, response, media_type)
 
 
 @router.get("/{item_id}", response_model=ItemBase)
@@ -28,12 +106,12 @@ async def get_item(item_id: uuid.UUID):
 
 
 @router.put("/{item_id}", response_model=Item)
-async def update_item(item_id: uuid.UUID, item: ItemCreate):
+async def update_item(item_id: uuid.UUID, item: ItemCreate, response: Response):
     """Actualiza un item existente"""
-    return await ItemController.update_item(item_id, item)
+    return await ItemController.update_item(item_id, item, response)
 
 
 @router.delete("/{item_id}")
-async def delete_item(item_id: uuid.UUID):
+async def delete_item(item_id: uuid.UUID, response: Response):
     """Elimina un item"""
-    return await ItemController.delete_item(item_id)
+    return await ItemController.delete_item(item_id, response)
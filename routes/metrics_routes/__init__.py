@@ -0,0 +1,7 @@
+"""
+Metrics routes module - Expone las métricas del proceso para Prometheus.
+"""
+
+from .metrics_routes import router
+
+__all__ = ["router"]
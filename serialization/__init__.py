@@ -0,0 +1,22 @@
+"""
+Serialization package - Formatos de respuesta alternativos a JSON.
+
+- negotiation: elección del formato según el header Accept
+- item_formats: MessagePack y Arrow para listas de items
+"""
+
+from .negotiation import ARROW_STREAM, JSON, MSGPACK, item_response_format, negotiate
+from .item_formats import decode_arrow, decode_msgpack, encode_arrow, encode_items, encode_msgpack
+
+__all__ = [
+    "ARROW_STREAM",
+    "JSON",
+    "MSGPACK",
+    "item_response_format",
+    "negotiate",
+    "decode_arrow",
+    "decode_msgpack",
+    "encode_arrow",
+    "encode_items",
+    "encode_msgpack",
+]
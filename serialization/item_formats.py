@@ -0,0 +1,95 @@
+"""
+Codificación binaria de listas de items (columnas de LIST_COLUMNS).
+
+Las filas llegan tal como las devuelve ItemService (dicts del backend, la
+caché o la réplica) y se codifican sin pasar por los modelos Pydantic:
+
+- MessagePack: lista de mapas (una fila por mapa); el id va como 16 bytes
+  binarios en lugar de 36 caracteres y los números como float64.
+- Arrow IPC stream: un RecordBatch columnar (id ``fixed_size_binary(16)``,
+  textos ``string``, price/tax ``float64`` con nulos) construido columna
+  por columna a partir de las filas.
+
+msgpack y pyarrow se importan al codificar: sin ellos la negociación
+(negotiation.py) no ofrece esos formatos.
+"""
+
+from typing import Iterable
+import uuid
+
+from repositories import uuid_bytes
+from .negotiation import ARROW_STREAM, MSGPACK
+
+
+def encode_msgpack(rows: Iterable[dict]) -> bytes:
+    """Filas como lista de mapas MessagePack"""
+    import msgpack
+
+    return msgpack.packb([
+        {
+            "id": uuid_bytes(row["id"]),
+            "name": row["name"],
+            "description": row["description"],
+            "price": row["price"],
+            "tax": row["tax"],
+        }
+        for row in rows
+    ])
+
+
+def decode_msgpack(payload: bytes) -> list[dict]:
+    """Inverso de encode_msgpack con los ids como uuid.UUID"""
+    import msgpack
+
+    rows = msgpack.unpackb(payload)
+    for row in rows:
+        row["id"] = uuid.UUID(bytes=row["id"])
+    return rows
+
+
+def arrow_schema():
+    """Esquema Arrow de una lista de items"""
+    import pyarrow as pa
+
+    return pa.schema([
+        pa.field("id", pa.binary(16), nullable=False),
+        pa.field("name", pa.string(), nullable=False),
+        pa.field("description", pa.string(), nullable=False),
+        pa.field("price", pa.float64()),
+        pa.field("tax", pa.float64()),
+    ])
+
+
+def encode_arrow(rows: list[dict]) -> bytes:
+    """Filas como un RecordBatch en formato Arrow IPC stream"""
+    import pyarrow as pa
+
+    schema = arrow_schema()
+    # Columna de ids como un único buffer de 16 bytes por fila, sin arrays intermedios
+    ids = pa.py_buffer(b"".join(uuid_bytes(row["id"]) for row in rows))
+    columns = [
+        pa.Array.from_buffers(pa.binary(16), len(rows), [None, ids]),
+        pa.array([row["name"] for row in rows], type=pa.string()),
+        pa.array([row["description"] for row in rows], type=pa.string()),
+        pa.array([row["price"] for row in rows], type=pa.float64()),
+        pa.array([row["tax"] for row in rows], type=pa.float64()),
+    ]
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(pa.record_batch(columns, schema=schema))
+    return sink.getvalue().to_pybytes()
+
+
+def decode_arrow(payload: bytes):
+    """Lee un stream de encode_arrow como pyarrow.Table"""
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(payload).read_all()
+
+
+ENCODERS = {MSGPACK: encode_msgpack, ARROW_STREAM: encode_arrow}
+
+
+def encode_items(rows: list[dict], media_type: str) -> bytes:
+    """Codifica las filas en el formato binario negociado"""
+    return ENCODERS[media_type](rows)
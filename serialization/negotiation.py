@@ -0,0 +1,98 @@
+"""
+Negociación del formato de respuesta con el header ``Accept``.
+
+JSON es siempre el formato por defecto: solo se responde en binario si el
+cliente lo prefiere explícitamente (un ``*/*`` o un Accept sin formatos
+conocidos recibe JSON) y la librería del formato está instalada.
+"""
+
+from importlib.util import find_spec
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Alias habituales de cada formato
+_ALIASES = {"application/x-msgpack": MSGPACK}
+
+_REQUIRES = {MSGPACK: "msgpack", ARROW_STREAM: "pyarrow"}
+
+
+def available_formats() -> list[str]:
+    """Formatos que puede producir el proceso, JSON primero"""
+    return [JSON] + [media_type for media_type, module in _REQUIRES.items() if find_spec(module) is not None]
+
+
+_AVAILABLE = available_formats()
+
+
+def _parse_accept(accept: str) -> list[tuple[str, float]]:
+    ranges = []
+    for part in accept.split(","):
+        media_range, *params = (piece.strip() for piece in part.split(";"))
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((_ALIASES.get(media_range.lower(), media_range.lower()), quality))
+    return ranges
+
+
+def _match(media_type: str, ranges: list[tuple[str, float]]) -> Optional[tuple[float, int, int]]:
+    """(q, especificidad, -posición) del rango más específico que incluye ``media_type``"""
+    kind = media_type.split("/", 1)[0]
+    best = None
+    for position, (media_range, quality) in enumerate(ranges):
+        if media_range == media_type:
+            rank = 2
+        elif media_range == f"{kind}/*":
+            rank = 1
+        elif media_range == "*/*":
+            rank = 0
+        else:
+            continue
+        if best is None or rank > best[1]:
+            best = (quality, rank, -position)
+    return best
+
+
+def negotiate(accept: Optional[str], offered: Optional[list[str]] = None) -> str:
+    """
+    Elige el formato de respuesta.
+
+    A igual q gana el rango más específico y, entre tipos nombrados, el que
+    el cliente lista primero; con comodines gana el orden del servidor.
+
+    Args:
+        accept: Valor del header Accept (None o vacío: JSON)
+        offered: Formatos disponibles en orden de preferencia del servidor
+
+    Returns:
+        str: Media type elegido; JSON si ninguno es aceptable
+    """
+    offered = offered or _AVAILABLE
+    if not accept:
+        return JSON
+    ranges = _parse_accept(accept)
+    chosen, chosen_key = JSON, None
+    for media_type in offered:
+        key = _match(media_type, ranges)
+        if key is not None and key[0] > 0 and (chosen_key is None or key > chosen_key):
+            chosen, chosen_key = media_type, key
+    return chosen
+
+
+def item_response_format(request: Request, response: Response) -> str:
+    """Dependencia de las rutas de items: formato negociado de la respuesta"""
+    response.headers["Vary"] = "Accept"
+    return negotiate(request.headers.get("accept"))
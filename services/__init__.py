@@ -1,3 +1,8 @@
+from .batch_service import BatchService
 from .item_service import ItemService
+from .stats_service import ItemStatsService
+from .suggest_service import ItemSuggestService
+from .quote_service import QuoteService
+from .sync_service import ItemSyncService
 
-__all__ = ["ItemService"]
+__all__ = ["BatchService", "ItemService", "ItemStatsService", "ItemSuggestService", "ItemSyncService", "QuoteService"]
@@ -0,0 +1,3 @@
+from .batch_service import BatchService
+
+__all__ = ["BatchService"]
@@ -0,0 +1,72 @@
+"""
+Ejecución de sub-peticiones HTTP contra la propia app ASGI, sin red.
+"""
+
+from typing import Any, Optional
+import json
+
+
+async def call_asgi(
+    app,
+    method: str,
+    path: str,
+    body: Any = None,
+    headers: Optional[list[tuple[bytes, bytes]]] = None,
+) -> tuple[int, Any, dict[str, str]]:
+    """
+    Ejecuta una petición en proceso y devuelve ``(status, cuerpo JSON, headers)``.
+
+    Los nombres de los headers de la respuesta van en minúsculas.
+
+    Pasa por todos los middlewares de la app, así que cada sub-petición se
+    registra en el access log y en las trazas como una petición más.
+    """
+    path, _, query = path.partition("?")
+    raw_body = b"" if body is None else json.dumps(body).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(raw_body)).encode()),
+            *(headers or []),
+        ],
+        "client": None,
+        "server": None,
+    }
+    request_sent = False
+    status = 500
+    response_headers: dict[str, str] = {}
+    chunks: list[bytes] = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": raw_body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers.update(
+                (name.decode("latin-1").lower(), value.decode("latin-1"))
+                for name, value in message.get("headers", [])
+            )
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    content = b"".join(chunks)
+    try:
+        return status, json.loads(content) if content else None, response_headers
+    except ValueError:
+        return status, content.decode("utf-8", "replace"), response_headers
@@ -0,0 +1,190 @@
+"""
+Ejecución de lotes de operaciones sobre /items (POST /batch).
+
+Las operaciones forman un DAG: las aristas salen de ``depends_on`` y de
+las referencias ``${<id>.body.<campo>}``. Cada operación espera a sus
+dependencias y luego corre como sub-petición en proceso contra la app,
+con a lo sumo ``BATCH_MAX_CONCURRENCY`` sub-peticiones simultáneas por
+lote. Si una dependencia responde con error, sus dependientes no se
+ejecutan y devuelven 424.
+
+Read-your-writes: cada sub-petición lleva el token de consistencia más
+reciente del lote (el de la petición original o el de una escritura ya
+respondida), así que una lectura que depende de una escritura no va a una
+réplica atrasada. El token más reciente se devuelve en la respuesta del lote.
+"""
+
+from typing import Any, Optional
+import asyncio
+import re
+
+from fastapi import HTTPException
+
+from config.settings import settings
+from db import CONSISTENCY_TOKEN_HEADER, format_lsn, parse_lsn, record_write_position
+from models import BatchOperation, BatchOperationResult, BatchRequest, BatchResponse
+from .asgi import call_asgi
+
+
+_REFERENCE_RE = re.compile(r"\$\{([A-Za-z0-9_-]+)\.body((?:\.[^.}]+)*)\}")
+
+# Headers de la petición original que se reenvían a cada sub-petición
+_FORWARDED_HEADERS = (b"authorization", b"accept-language")
+
+# El token de consistencia se reenvía aparte: se adelanta con cada escritura del lote
+_TOKEN_HEADER = CONSISTENCY_TOKEN_HEADER.lower()
+
+_ALLOWED_PREFIX = "/items"
+
+
+def _references(value: Any) -> set[str]:
+    """Ids de operación referenciados dentro de un valor JSON"""
+    if isinstance(value, str):
+        return {match.group(1) for match in _REFERENCE_RE.finditer(value)}
+    if isinstance(value, dict):
+        return set().union(*(_references(item) for item in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(_references(item) for item in value)) if value else set()
+    return set()
+
+
+def _lookup(body: Any, path: str) -> Any:
+    for key in filter(None, path.split(".")):
+        if isinstance(body, list):
+            body = body[int(key)]
+        elif isinstance(body, dict):
+            body = body[key]
+        else:
+            raise KeyError(key)
+    return body
+
+
+def _resolve(value: Any, results: dict[str, BatchOperationResult]) -> Any:
+    """Sustituye las referencias por los valores de los resultados"""
+    if isinstance(value, str):
+        whole = _REFERENCE_RE.fullmatch(value)
+        if whole:
+            return _lookup(results[whole.group(1)].body, whole.group(2))
+        return _REFERENCE_RE.sub(lambda match: str(_lookup(results[match.group(1)].body, match.group(2))), value)
+    if isinstance(value, dict):
+        return {key: _resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results) for item in value]
+    return value
+
+
+def _is_allowed_path(path: str) -> bool:
+    path = path.split("?", 1)[0]
+    if ".." in path.split("/"):
+        return False
+    return path == _ALLOWED_PREFIX or path.startswith(_ALLOWED_PREFIX + "/")
+
+
+def _plan(operations: list[BatchOperation]) -> dict[str, list[str]]:
+    """Valida el lote y devuelve las dependencias de cada operación"""
+    ids = [operation.id for operation in operations]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Operation ids must be unique")
+
+    known = set(ids)
+    dependencies: dict[str, list[str]] = {}
+    for operation in operations:
+        if not _is_allowed_path(operation.path):
+            raise HTTPException(status_code=400, detail=f"Operation '{operation.id}': path must be under {_ALLOWED_PREFIX}")
+        needed = set(operation.depends_on) | _references(operation.path) | _references(operation.body)
+        unknown = needed - known
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Operation '{operation.id}' depends on unknown {sorted(unknown)}")
+        if operation.id in needed:
+            raise HTTPException(status_code=400, detail=f"Operation '{operation.id}' depends on itself")
+        dependencies[operation.id] = sorted(needed)
+
+    # Detección de ciclos (DFS con colores)
+    state: dict[str, int] = {}
+
+    def visit(node: str) -> None:
+        state[node] = 1
+        for dependency in dependencies[node]:
+            if state.get(dependency) == 1:
+                raise HTTPException(status_code=400, detail=f"Dependency cycle through '{dependency}'")
+            if dependency not in state:
+                visit(dependency)
+        state[node] = 2
+
+    for operation_id in ids:
+        if operation_id not in state:
+            visit(operation_id)
+    return dependencies
+
+
+class BatchService:
+    """Servicio que ejecuta lotes de operaciones sobre items"""
+
+    @staticmethod
+    async def execute(
+        app,
+        batch: BatchRequest,
+        headers: Optional[list[tuple[bytes, bytes]]] = None,
+    ) -> BatchResponse:
+        """Ejecuta el lote respetando dependencias y el límite de concurrencia"""
+        if len(batch.operations) > settings.BATCH_MAX_OPERATIONS:
+            raise HTTPException(status_code=400, detail=f"A batch accepts at most {settings.BATCH_MAX_OPERATIONS} operations")
+
+        dependencies = _plan(batch.operations)
+        forwarded = [(name, value) for name, value in headers or [] if name in _FORWARDED_HEADERS]
+        incoming = [value for name, value in headers or [] if name == _TOKEN_HEADER.encode()]
+        # Posición read-your-writes más reciente conocida por el lote
+        position = parse_lsn(incoming[0].decode("latin-1")) if incoming else None
+        wrote = False
+        semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+        results: dict[str, BatchOperationResult] = {}
+        done: dict[str, asyncio.Event] = {operation.id: asyncio.Event() for operation in batch.operations}
+
+        async def run(operation: BatchOperation) -> None:
+            try:
+                results[operation.id] = await run_operation(operation)
+            finally:
+                done[operation.id].set()
+
+        async def run_operation(operation: BatchOperation) -> BatchOperationResult:
+            nonlocal position, wrote
+            for dependency in dependencies[operation.id]:
+                await done[dependency].wait()
+                if results[dependency].status >= 400:
+                    return BatchOperationResult(
+                        id=operation.id, status=424, body={"detail": f"Dependency '{dependency}' failed"}
+                    )
+            try:
+                path = _resolve(operation.path, results)
+                body = _resolve(operation.body, results)
+            except (KeyError, IndexError, ValueError, TypeError) as e:
+                return BatchOperationResult(
+                    id=operation.id, status=400, body={"detail": f"Unresolved reference: {e}"}
+                )
+            if not _is_allowed_path(path):
+                return BatchOperationResult(
+                    id=operation.id, status=400, body={"detail": f"Resolved path must be under {_ALLOWED_PREFIX}"}
+                )
+            async with semaphore:
+                sub_headers = forwarded
+                if position is not None:
+                    sub_headers = [*forwarded, (_TOKEN_HEADER.encode(), format_lsn(position).encode())]
+                try:
+                    status, response_body, response_headers = await call_asgi(
+                        app, operation.method, path, body, sub_headers
+                    )
+                except Exception as e:
+                    status, response_body, response_headers = 500, {"detail": str(e)}, {}
+            token = response_headers.get(_TOKEN_HEADER)
+            written = parse_lsn(token) if token else None
+            if written is not None:
+                wrote = True
+                if position is None or written > position:
+                    position = written
+            return BatchOperationResult(id=operation.id, status=status, body=response_body)
+
+        await asyncio.gather(*(run(operation) for operation in batch.operations))
+        if wrote:
+            # En el contexto de la petición del lote: el controlador lo devuelve como header
+            record_write_position(position)
+        return BatchResponse(results=[results[operation.id] for operation in batch.operations])
@@ -0,0 +1,21 @@
+from .swr_cache import SWRCache
+from .list_cache import ItemListCache, item_list_cache, start_item_list_cache, stop_item_list_cache
+from .item_cache import ItemCache, item_cache, start_item_cache, stop_item_cache
+from .warmup import load_hot_keys, save_hot_keys, save_item_cache_hot_keys, warm_item_caches, warm_up
+
+__all__ = [
+    "SWRCache",
+    "ItemListCache",
+    "item_list_cache",
+    "start_item_list_cache",
+    "stop_item_list_cache",
+    "ItemCache",
+    "item_cache",
+    "start_item_cache",
+    "stop_item_cache",
+    "load_hot_keys",
+    "save_hot_keys",
+    "save_item_cache_hot_keys",
+    "warm_item_caches",
+    "warm_up",
+]
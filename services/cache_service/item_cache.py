@@ -0,0 +1,49 @@
+"""
+Caché stale-while-revalidate de GET /items/{item_id}.
+
+La clave es el id como string. A diferencia de las páginas, una escritura
+solo descarta la entrada del item afectado. Los items inexistentes también
+se guardan (como None) para que los ids inválidos repetidos no lleguen al
+backend.
+"""
+
+from typing import Optional
+
+from config.settings import settings
+from services.item_service import ItemService
+from .swr_cache import SWRCache
+
+
+class ItemCache(SWRCache[Optional[dict]]):
+    """SWRCache de filas de items que se invalida por id"""
+
+    def on_item_created(self, row: dict) -> None:
+        self.discard(str(row["id"]))
+
+    def on_item_updated(self, old: Optional[dict], new: dict) -> None:
+        self.discard(str(new["id"]))
+
+    def on_item_deleted(self, row: dict) -> None:
+        self.discard(str(row["id"]))
+
+
+# Caché global de items por id (Singleton)
+item_cache = ItemCache(
+    "item_cache",
+    settings.ITEM_CACHE_FRESH_SECONDS,
+    settings.ITEM_CACHE_STALE_SECONDS,
+    settings.ITEM_CACHE_MAX_ENTRIES,
+)
+
+
+def start_item_cache() -> None:
+    """Conecta la caché a ItemService"""
+    ItemService.add_change_listener(item_cache)
+    ItemService.set_item_cache(item_cache)
+
+
+def stop_item_cache() -> None:
+    """Desconecta la caché de ItemService y la vacía"""
+    ItemService.set_item_cache(None)
+    ItemService.remove_change_listener(item_cache)
+    item_cache.invalidate()
@@ -0,0 +1,58 @@
+"""
+Caché stale-while-revalidate de las páginas de GET /items.
+
+La clave es la combinación completa de parámetros (limit, offset,
+min_price, max_price). Las escrituras hechas por este worker vacían la
+caché a través del listener de ItemService; las de otros workers se ven
+como mucho ``fresh + stale`` segundos después.
+
+Cuando un cliente pide una página completa, ItemService pide por adelantado
+la siguiente (``ITEM_LIST_CACHE_PREFETCH_CONCURRENCY`` cargas simultáneas
+como máximo, 0 lo desactiva).
+"""
+
+from typing import Optional
+
+from config.settings import settings
+from services.item_service import ItemService
+from .swr_cache import SWRCache
+
+
+class ItemListCache(SWRCache[list]):
+    """SWRCache de páginas de items que se invalida con cada escritura"""
+
+    def on_item_created(self, row: dict) -> None:
+        self.invalidate()
+
+    def on_item_updated(self, old: Optional[dict], new: dict) -> None:
+        self.invalidate()
+
+    def on_item_deleted(self, row: dict) -> None:
+        self.invalidate()
+
+    def cache_control(self) -> str:
+        """Valor de Cache-Control coherente con los TTL de la caché"""
+        return f"public, max-age={int(self.fresh_ttl)}, stale-while-revalidate={int(self.stale_ttl)}"
+
+
+# Caché global de páginas de items (Singleton)
+item_list_cache = ItemListCache(
+    "item_list_cache",
+    settings.ITEM_LIST_CACHE_FRESH_SECONDS,
+    settings.ITEM_LIST_CACHE_STALE_SECONDS,
+    settings.ITEM_LIST_CACHE_MAX_ENTRIES,
+    settings.ITEM_LIST_CACHE_PREFETCH_CONCURRENCY,
+)
+
+
+def start_item_list_cache() -> None:
+    """Conecta la caché a ItemService"""
+    ItemService.add_change_listener(item_list_cache)
+    ItemService.set_list_cache(item_list_cache)
+
+
+def stop_item_list_cache() -> None:
+    """Desconecta la caché de ItemService y la vacía"""
+    ItemService.set_list_cache(None)
+    ItemService.remove_change_listener(item_list_cache)
+    item_list_cache.invalidate()
@@ -0,0 +1,202 @@
+"""
+Caché en memoria con semántica stale-while-revalidate.
+
+Cada entrada pasa por tres estados según su edad:
+- fresca (< fresh_ttl): se sirve tal cual.
+- stale (< fresh_ttl + stale_ttl): se sirve al instante y se lanza una
+  única tarea en segundo plano que la recarga.
+- vencida: se descarta y la petición espera a la carga.
+
+Las cargas concurrentes de una misma clave se agrupan en una sola tarea.
+``prefetch`` permite cargar por adelantado una clave que probablemente se
+pida pronto (con un máximo de cargas anticipadas simultáneas) y mide
+cuántas de ellas se llegan a leer. La caché lleva además la cuenta de las
+claves más leídas, que sirve de fuente para el warm-up del próximo arranque.
+Las tareas de recarga corren en un contexto vacío: no heredan el span, el
+contexto de access log ni el cliente de Supabase de la petición que las
+disparó.
+"""
+
+from collections import Counter, OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+import asyncio
+import contextvars
+import logging
+import time
+
+from metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Entry(Generic[T]):
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value: T, stored_at: float):
+        self.value = value
+        self.stored_at = stored_at
+
+
+class SWRCache(Generic[T]):
+    """LRU acotado con TTL fresco y ventana stale-while-revalidate"""
+
+    def __init__(self, name: str, fresh_ttl: float, stale_ttl: float, max_entries: int = 1024,
+                 max_prefetch: int = 0, clock: Callable[[], float] = time.monotonic):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_prefetch = max_prefetch
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry[T]] = OrderedDict()
+        self._loads: dict[Hashable, asyncio.Task] = {}
+        self._prefetching = 0
+        # Claves cargadas por prefetch que todavía no se han leído
+        self._prefetched: set[Hashable] = set()
+        self._reads: Counter = Counter()
+        self._prefetch_hits = 0
+        self._prefetch_issued = 0
+        self._requests = registry.counter(
+            f"{name}_requests_total", "Lecturas de la caché (result=fresh|stale|miss)"
+        )
+        self._refresh_errors = registry.counter(
+            f"{name}_refresh_errors_total", "Recargas en segundo plano fallidas"
+        )
+        self._prefetches = registry.counter(
+            f"{name}_prefetch_total", "Cargas anticipadas (result=issued|skipped)"
+        )
+        self._prefetch_hits_total = registry.counter(
+            f"{name}_prefetch_hits_total", "Lecturas servidas por una carga anticipada"
+        )
+        registry.gauge(
+            f"{name}_prefetch_hit_ratio",
+            "Fracción de cargas anticipadas que se llegaron a leer",
+            function=lambda: self.prefetch_hit_ratio,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def prefetch_hit_ratio(self) -> float:
+        """Lecturas servidas por prefetch / prefetches lanzados"""
+        return self._prefetch_hits / self._prefetch_issued if self._prefetch_issued else 0.0
+
+    def hot_keys(self, limit: int) -> list[Hashable]:
+        """Las ``limit`` claves más leídas desde el arranque"""
+        return [key for key, _ in self._reads.most_common(limit)]
+
+    def _record_read(self, key: Hashable) -> None:
+        self._reads[key] += 1
+        # Acota el contador: conserva solo las claves más leídas
+        if len(self._reads) > 4 * self.max_entries:
+            self._reads = Counter(dict(self._reads.most_common(self.max_entries)))
+        if key in self._prefetched:
+            self._prefetched.discard(key)
+            self._prefetch_hits += 1
+            self._prefetch_hits_total.inc()
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> tuple[T, float]:
+        """
+        Devuelve el valor de ``key`` y su edad en segundos.
+
+        Args:
+            key: Clave de la entrada
+            loader: Corrutina que carga el valor si falta o está stale
+
+        Returns:
+            tuple: (valor, edad); la edad es 0 si se acaba de cargar
+        """
+        self._record_read(key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.stored_at
+            if age < self.fresh_ttl:
+                self._entries.move_to_end(key)
+                self._requests.inc(labels={"result": "fresh"})
+                return entry.value, age
+            if age < self.fresh_ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self._requests.inc(labels={"result": "stale"})
+                self._load(key, loader)
+                return entry.value, age
+            del self._entries[key]
+
+        self._requests.inc(labels={"result": "miss"})
+        # shield: si esta petición se cancela, la carga compartida sigue
+        return await asyncio.shield(self._load(key, loader)), 0.0
+
+    def prefetch(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> bool:
+        """
+        Carga ``key`` en segundo plano si no está fresca ni cargándose.
+
+        No espera a la carga. Si ya hay ``max_prefetch`` cargas anticipadas
+        en curso la descarta en lugar de encolarla.
+
+        Returns:
+            bool: True si se lanzó una carga
+        """
+        if key in self._loads:
+            return False
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() - entry.stored_at < self.fresh_ttl:
+            return False
+        if self._prefetching >= self.max_prefetch:
+            self._prefetches.inc(labels={"result": "skipped"})
+            return False
+        self._prefetching += 1
+        self._prefetch_issued += 1
+        self._prefetches.inc(labels={"result": "issued"})
+        self._prefetched.add(key)
+        self._load(key, loader).add_done_callback(self._prefetch_done)
+        return True
+
+    def _prefetch_done(self, task: asyncio.Task) -> None:
+        self._prefetching -= 1
+
+    async def warm(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> None:
+        """Carga ``key`` y espera a que quede guardada (warm-up del arranque)"""
+        await self._load(key, loader)
+
+    def invalidate(self) -> None:
+        """Descarta todas las entradas; las cargas en curso no se guardan"""
+        self._entries.clear()
+        self._prefetched.clear()
+        # Las lecturas siguientes no deben unirse a cargas anteriores a la escritura
+        self._loads.clear()
+
+    def discard(self, key: Hashable) -> None:
+        """Descarta una entrada; si se estaba cargando, la carga no se guarda"""
+        self._entries.pop(key, None)
+        self._prefetched.discard(key)
+        self._loads.pop(key, None)
+
+    def _load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        task = self._loads.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fill(key, loader), context=contextvars.Context())
+            self._loads[key] = task
+            task.add_done_callback(lambda done: self._loaded(key, done))
+        return task
+
+    async def _fill(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        value = await loader()
+        # Si la carga se invalidó mientras corría, otra tarea (o ninguna) ocupa su lugar
+        if self._loads.get(key) is asyncio.current_task():
+            self._entries[key] = _Entry(value, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._prefetched.discard(evicted)
+        return value
+
+    def _loaded(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._loads.get(key) is task:
+            del self._loads[key]
+        if not task.cancelled() and task.exception() is not None:
+            self._prefetched.discard(key)
+            self._refresh_errors.inc()
+            # Las recargas en segundo plano no tienen a quién propagar el error
+            logger.warning("Cache load failed for %r: %r", key, task.exception())
@@ -0,0 +1,163 @@
+"""
+Warm-up de las cachés de items al arrancar el worker.
+
+Al apagarse, cada worker graba en ``CACHE_WARMUP_FILE`` las claves más
+leídas de sus cachés (ids de items y páginas de GET /items). Al arrancar,
+el lifespan carga esas claves más las primeras ``CACHE_WARMUP_FIRST_PAGES``
+páginas antes de empezar a aceptar peticiones, con un máximo de
+``CACHE_WARMUP_CONCURRENCY`` consultas simultáneas y un tiempo total
+acotado: un warm-up lento o fallido nunca impide arrancar.
+
+Formato del fichero::
+
+    {"items": ["<uuid>", ...], "pages": [[limit, offset, min_price, max_price], ...]}
+"""
+
+from typing import Optional
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+
+from config.settings import settings
+from metrics import registry
+from repositories import ItemRepository, get_item_repository
+from .item_cache import ItemCache, item_cache
+from .list_cache import ItemListCache, item_list_cache
+
+
+logger = logging.getLogger(__name__)
+
+_warmup_keys = registry.counter(
+    "cache_warmup_keys_total", "Claves cargadas por el warm-up (cache, result=loaded|failed)"
+)
+
+
+def load_hot_keys(path: str) -> dict:
+    """
+    Lee el fichero de claves calientes.
+
+    Returns:
+        dict: ``{"items": [...], "pages": [...]}``; vacío si el fichero no
+        existe o no se puede leer
+    """
+    try:
+        with open(path, encoding="utf-8") as source:
+            data = json.load(source)
+    except FileNotFoundError:
+        return {"items": [], "pages": []}
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable cache warm-up file %s", path, exc_info=True)
+        return {"items": [], "pages": []}
+    return {"items": list(data.get("items", [])), "pages": [tuple(page) for page in data.get("pages", [])]}
+
+
+def save_hot_keys(path: str, list_cache: Optional[ItemListCache], cache: Optional[ItemCache],
+                  top_pages: int, top_items: int) -> None:
+    """Graba las claves más leídas de las cachés (escritura atómica)"""
+    data = {
+        "items": [str(key) for key in cache.hot_keys(top_items)] if cache is not None else [],
+        "pages": [list(key) for key in list_cache.hot_keys(top_pages)] if list_cache is not None else [],
+    }
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as target:
+        json.dump(data, target)
+    # Varios workers pueden grabar a la vez: gana el último, sin ficheros a medias
+    os.replace(temporary, path)
+
+
+async def warm_up(
+    repository: ItemRepository,
+    list_cache: Optional[ItemListCache],
+    cache: Optional[ItemCache],
+    hot_keys: dict,
+    first_pages: int,
+    page_limit: int,
+    concurrency: int,
+) -> int:
+    """
+    Carga en las cachés las páginas y los items indicados.
+
+    Args:
+        repository: Backend del que se cargan las claves
+        list_cache: Caché de páginas (None para no calentarla)
+        cache: Caché de items por id (None para no calentarla)
+        hot_keys: Claves grabadas (ver load_hot_keys)
+        first_pages: Páginas iniciales sin filtros que se cargan siempre
+        page_limit: Tamaño de esas páginas iniciales
+        concurrency: Consultas simultáneas como máximo
+
+    Returns:
+        int: Claves cargadas
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(name: str, target, key, loader) -> bool:
+        async with semaphore:
+            try:
+                await target.warm(key, loader)
+            except Exception as e:
+                logger.debug("Cache warm-up failed for %s %r: %r", name, key, e)
+                _warmup_keys.inc(labels={"cache": name, "result": "failed"})
+                return False
+        _warmup_keys.inc(labels={"cache": name, "result": "loaded"})
+        return True
+
+    jobs = []
+    if list_cache is not None:
+        pages = [(page_limit, index * page_limit, None, None) for index in range(first_pages)]
+        pages += [page for page in hot_keys["pages"] if page not in pages]
+        for limit, offset, min_price, max_price in pages:
+            loader = (lambda l=limit, o=offset, lo=min_price, hi=max_price: repository.get_page(l, o, lo, hi))
+            jobs.append(run("pages", list_cache, (limit, offset, min_price, max_price), loader))
+    if cache is not None:
+        for item_id in dict.fromkeys(hot_keys["items"]):
+            loader = (lambda i=item_id: repository.get_by_id(uuid.UUID(i)))
+            jobs.append(run("items", cache, str(item_id), loader))
+    results = await asyncio.gather(*jobs)
+    return sum(results)
+
+
+async def warm_item_caches() -> None:
+    """Warm-up con la configuración de settings (llamado desde el lifespan)"""
+    list_cache = item_list_cache if settings.ITEM_LIST_CACHE_ENABLED else None
+    cache = item_cache if settings.ITEM_CACHE_ENABLED else None
+    if list_cache is None and cache is None:
+        return
+    hot_keys = (
+        load_hot_keys(settings.CACHE_WARMUP_FILE) if settings.CACHE_WARMUP_FILE
+        else {"items": [], "pages": []}
+    )
+    started = time.perf_counter()
+    try:
+        loaded = await asyncio.wait_for(
+            warm_up(
+                get_item_repository(), list_cache, cache, hot_keys,
+                settings.CACHE_WARMUP_FIRST_PAGES,
+                settings.CACHE_WARMUP_PAGE_LIMIT,
+                settings.CACHE_WARMUP_CONCURRENCY,
+            ),
+            timeout=settings.CACHE_WARMUP_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Cache warm-up timed out after %.1fs", settings.CACHE_WARMUP_TIMEOUT_SECONDS)
+        return
+    logger.info("Cache warm-up loaded %d keys in %.2fs", loaded, time.perf_counter() - started)
+
+
+def save_item_cache_hot_keys() -> None:
+    """Graba las claves calientes en CACHE_WARMUP_FILE (llamado al apagar)"""
+    if not settings.CACHE_WARMUP_FILE:
+        return
+    try:
+        save_hot_keys(
+            settings.CACHE_WARMUP_FILE,
+            item_list_cache if settings.ITEM_LIST_CACHE_ENABLED else None,
+            item_cache if settings.ITEM_CACHE_ENABLED else None,
+            settings.CACHE_WARMUP_TOP_PAGES,
+            settings.CACHE_WARMUP_TOP_ITEMS,
+        )
+    except OSError:
+        logger.warning("Could not save cache warm-up file %s", settings.CACHE_WARMUP_FILE, exc_info=True)
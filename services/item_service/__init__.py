@@ -1,3 +1,4 @@
 from .item_service import ItemService
+from .events import ItemChangeListener
 
-__all__ = ["ItemService"]
+__all__ = ["ItemService", "ItemChangeListener"]
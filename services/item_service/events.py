@@ -0,0 +1,22 @@
+"""
+Notificaciones de cambios de items.
+
+Los componentes que mantienen estado derivado de la tabla items
+(estadísticas, cachés, índices) se registran en ItemService como listeners
+y reciben cada escritura confirmada por el repositorio.
+"""
+
+from typing import Optional, Protocol
+
+
+class ItemChangeListener(Protocol):
+    """Interfaz de los listeners de cambios de items"""
+
+    def on_item_created(self, row: dict) -> None:
+        """Se llama con la fila creada"""
+
+    def on_item_updated(self, old: Optional[dict], new: dict) -> None:
+        """Se llama con la fila anterior (si se conoce) y la nueva"""
+
+    def on_item_deleted(self, row: dict) -> None:
+        """Se llama con la fila eliminada"""
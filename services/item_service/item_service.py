@@ -1,64 +1,234 @@
 from fastapi import HTTPException
-from db import get_supabase_client
+from config.settings import settings
+from db import CONSISTENCY_TOKEN_HEADER, get_consistency_token, get_read_position, get_request_user_client
+from diagnostics import set_request_item_id
+from repositories import UpstreamOverloadedError, get_item_repository, uuid7
 from models import Item, ItemBase, ItemCreate
+from tracing import traced
+from .events import ItemChangeListener
+from typing import Optional
 import uuid
 
 
 class ItemService:
     """Servicio que contiene la lógica de negocio para items"""
 
+    # Listeners notificados después de cada escritura confirmada
+    _listeners: list[ItemChangeListener] = []
+
+    # Réplica en memoria usada para las lecturas cuando está lista
+    _read_replica = None
+
+    # Caché stale-while-revalidate de las páginas de get_items
+    _list_cache = None
+
+    # Caché stale-while-revalidate de get_item_by_id
+    _item_cache = None
+
+    @staticmethod
+    def set_read_replica(replica) -> None:
+        """Configura (o quita con None) la réplica que atiende las lecturas"""
+        ItemService._read_replica = replica
+
+    @staticmethod
+    def set_list_cache(cache) -> None:
+        """Configura (o quita con None) la caché de páginas de items"""
+        ItemService._list_cache = cache
+
+    @staticmethod
+    def set_item_cache(cache) -> None:
+        """Configura (o quita con None) la caché de items por id"""
+        ItemService._item_cache = cache
+
     @staticmethod
-    def create_item(item: ItemCreate) -> ItemBase:
-        """Crea un nuevo item en Supabase"""
-        db = get_supabase_client()
+    def shared_reads() -> bool:
+        """
+        True si la petición puede leer de la réplica en memoria o las cachés.
+
+        Las peticiones con cliente por usuario (RLS) ven otras filas, y las
+        que traen un token de consistencia necesitan ver sus escrituras: ambas
+        leen del backend.
+        """
+        return get_request_user_client() is None and get_read_position() is None
+
+    @staticmethod
+    def consistency_headers() -> dict[str, str]:
+        """Header con el token read-your-writes si la petición escribió"""
+        token = get_consistency_token()
+        return {CONSISTENCY_TOKEN_HEADER: token} if token is not None else {}
+
+    @staticmethod
+    def add_change_listener(listener: ItemChangeListener) -> None:
+        """Registra un listener de cambios de items"""
+        if listener not in ItemService._listeners:
+            ItemService._listeners.append(listener)
+
+    @staticmethod
+    def remove_change_listener(listener: ItemChangeListener) -> None:
+        """Desregistra un listener de cambios de items"""
+        if listener in ItemService._listeners:
+            ItemService._listeners.remove(listener)
+
+    @staticmethod
+    @traced("ItemService.create_item")
+    async def create_item(item: ItemCreate) -> ItemBase:
+        """Crea un nuevo item en el backend configurado"""
+        repository = get_item_repository()
+        data = item.model_dump()
+        if settings.ITEM_ID_GENERATION == "uuid7":
+            # Ids ordenados por tiempo: inserciones al final del índice de la clave primaria
+            data["id"] = str(uuid7())
         try:
-            response = db.table("items").insert(item.model_dump()).execute()
-            if response.data:
-                return response.data[0]
+            created = await repository.create(data)
+            if created:
+                set_request_item_id(created["id"])
+                for listener in ItemService._listeners:
+                    listener.on_item_created(created)
+                return created
             raise HTTPException(status_code=400, detail="Failed to create item")
+        except UpstreamOverloadedError:
+            raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
     @staticmethod
-    def get_items(limit: int, offset: int) -> list[ItemBase]:
-        """Obtiene lista de items desde Supabase"""
-        db = get_supabase_client()
+    async def get_items(
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[ItemBase]:
+        """Obtiene lista de items desde la réplica, la caché o el backend configurado"""
+        items, _ = await ItemService.get_items_with_age(limit, offset, min_price, max_price)
+        return items
+
+    @staticmethod
+    @traced("ItemService.get_items")
+    async def get_items_with_age(
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> tuple[list[ItemBase], Optional[float]]:
+        """
+        Obtiene lista de items junto con la edad de la página servida.
+
+        Returns:
+            tuple: (items, edad en segundos de la página compartible entre
+            usuarios, o None si la página depende del usuario)
+        """
+        shared = ItemService.shared_reads()
+        replica = ItemService._read_replica
+        if shared and replica is not None and replica.ready:
+            return replica.page(limit, offset, min_price, max_price), 0.0
+        repository = get_item_repository()
+        cache = ItemService._list_cache
         try:
-            response = db.table("items").select("id, name, description, price, tax").range(offset, offset + limit - 1).execute()
-            return response.data
+            # Las páginas de un usuario (RLS) o de una sesión con token no se comparten
+            if cache is None or not shared:
+                return await repository.get_page(limit, offset, min_price, max_price), None
+            items, age = await cache.get(
+                (limit, offset, min_price, max_price),
+                lambda: repository.get_page(limit, offset, min_price, max_price),
+            )
+            # Una página completa suele ir seguida de la siguiente
+            if len(items) == limit:
+                next_offset = offset + limit
+                cache.prefetch(
+                    (limit, next_offset, min_price, max_price),
+                    lambda: repository.get_page(limit, next_offset, min_price, max_price),
+                )
+            return items, age
+        except UpstreamOverloadedError:
+            raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
     @staticmethod
-    def get_item_by_id(item_id: uuid.UUID) -> ItemBase:
+    def list_cache_headers(age: Optional[float]) -> dict[str, str]:
+        """Headers de caché HTTP para una página devuelta por get_items_with_age"""
+        cache = ItemService._list_cache
+        if cache is None:
+            return {}
+        if age is None:
+            return {"Cache-Control": "private, no-cache"}
+        return {"Cache-Control": cache.cache_control(), "Age": str(int(age))}
+
+    @staticmethod
+    @traced("ItemService.get_item_by_id")
+    async def get_item_by_id(item_id: uuid.UUID) -> ItemBase:
         """Obtiene un item específico por ID"""
-        db = get_supabase_client()
+        shared = ItemService.shared_reads()
+        replica = ItemService._read_replica
+        if shared and replica is not None and replica.ready:
+            found = replica.get(item_id)
+            if found:
+                return found
+            raise HTTPException(status_code=404, detail="Item not found")
+        repository = get_item_repository()
+        cache = ItemService._item_cache
         try:
-            response = db.table("items").select("*").eq("id", str(item_id)).execute()
-            if response.data and len(response.data) > 0:
-                return response.data[0]
+            if cache is None or not shared:
+                found = await repository.get_by_id(item_id)
+            else:
+                found, _ = await cache.get(str(item_id), lambda: repository.get_by_id(item_id))
+            if found:
+                return found
             raise HTTPException(status_code=404, detail="Item not found")
+        except UpstreamOverloadedError:
+            raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
     @staticmethod
-    def update_item(item_id: uuid.UUID, item: ItemCreate) -> Item:
+    @traced("ItemService.get_items_by_ids")
+    async def get_items_by_ids(item_ids: list[uuid.UUID]) -> list[ItemBase]:
+        """Obtiene varios items en una consulta, en el orden pedido y sin los que no existen"""
+        item_ids = list(dict.fromkeys(item_ids))
+        replica = ItemService._read_replica
+        if ItemService.shared_reads() and replica is not None and replica.ready:
+            rows = replica.get_many(item_ids)
+        else:
+            try:
+                rows = await get_item_repository().get_many(item_ids)
+            except UpstreamOverloadedError:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        rows_by_id = {row["id"]: row for row in rows}
+        return [rows_by_id[str(item_id)] for item_id in item_ids if str(item_id) in rows_by_id]
+
+    @staticmethod
+    @traced("ItemService.update_item")
+    async def update_item(item_id: uuid.UUID, item: ItemCreate) -> Item:
         """Actualiza un item existente"""
-        db = get_supabase_client()
+        repository = get_item_repository()
         try:
-            response = db.table("items").update(item.model_dump()).eq("id", str(item_id)).execute()
-            if response.data and len(response.data) > 0:
-                return response.data[0]
+            # Los listeners necesitan la fila anterior para aplicar el delta
+            previous = await repository.get_by_id(item_id) if ItemService._listeners else None
+            updated = await repository.update(item_id, item.model_dump())
+            if updated:
+                for listener in ItemService._listeners:
+                    listener.on_item_updated(previous, updated)
+                return updated
             raise HTTPException(status_code=404, detail="Item not found")
+        except UpstreamOverloadedError:
+            raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
 
     @staticmethod
-    def delete_item(item_id: uuid.UUID) -> dict:
+    @traced("ItemService.delete_item")
+    async def delete_item(item_id: uuid.UUID) -> dict:
         """Elimina un item"""
-        db = get_supabase_client()
+        repository = get_item_repository()
         try:
-            db.table("items").delete().eq("id", str(item_id)).execute()
+            deleted = await repository.delete(item_id)
+            if deleted:
+                for listener in ItemService._listeners:
+                    listener.on_item_deleted(deleted)
             return {"message": "Item deleted successfully"}
+        except UpstreamOverloadedError:
+            raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,3 @@
+from .quote_service import QuoteService
+
+__all__ = ["QuoteService"]
@@ -0,0 +1,111 @@
+"""
+Aritmética vectorizada de cotizaciones.
+
+Los importes de cada línea se calculan exactos a partir de precio x
+cantidad y se redondean una sola vez al centavo (half-up), igual que
+``Decimal(str(price)) * quantity`` cuantizado con ROUND_HALF_UP:
+
+- Camino rápido: precio y tasa se escalan a enteros exactos (diezmilésimas)
+  y el resto son operaciones int64 sobre arrays de NumPy
+- Las líneas con más decimales o importes que no caben en int64 se calculan
+  con fracciones exactas; si el resultado en centavos no cabe en int64 se
+  rechazan con QuoteOverflowError
+"""
+
+from fractions import Fraction
+from typing import NamedTuple
+import math
+
+import numpy as np
+
+
+# Precio en diezmilésimas de unidad (0.125 -> 1250)
+_PRICE_SCALE = 10_000
+# Tasa en diezmilésimas de punto porcentual (10.005% -> 100050)
+_RATE_SCALE = 10_000
+# net_units / _NET_DIVISOR = centavos; net_units * rate_units / _TAX_DIVISOR = centavos de impuesto
+_NET_DIVISOR = _PRICE_SCALE // 100
+_TAX_DIVISOR = _PRICE_SCALE * _RATE_SCALE
+# Cota (estimada en float) de los productos intermedios del camino rápido
+_FAST_LIMIT = float(2 ** 62)
+_INT64_MAX = int(np.iinfo(np.int64).max)
+
+
+class QuoteOverflowError(ValueError):
+    """Un importe de la cotización no se puede representar en centavos int64"""
+
+
+class QuoteArrays(NamedTuple):
+    """Resultado por línea en centavos; ``priced`` marca las líneas con precio"""
+    priced: np.ndarray
+    net: np.ndarray
+    tax: np.ndarray
+    gross: np.ndarray
+
+
+def _round_half_up(value: Fraction) -> int:
+    return math.floor(value + Fraction(1, 2))
+
+
+def exact_line(price: float, tax_rate: float, quantity: int) -> tuple[int, int]:
+    """
+    Calcula net e impuesto de una línea en centavos con aritmética exacta.
+
+    Raises:
+        QuoteOverflowError: Si el importe no es finito o no cabe en int64
+    """
+    if not (math.isfinite(price) and math.isfinite(tax_rate)):
+        raise QuoteOverflowError("Quote amounts must be finite")
+    net = Fraction(repr(price)) * int(quantity)
+    net_cents = _round_half_up(net * 100)
+    tax_cents = _round_half_up(net * Fraction(repr(tax_rate)))
+    if net_cents + tax_cents > _INT64_MAX:
+        raise QuoteOverflowError("Quote amount is too large")
+    return net_cents, tax_cents
+
+
+def compute_quote(prices: np.ndarray, tax_rates: np.ndarray, quantities: np.ndarray) -> QuoteArrays:
+    """
+    Calcula net, impuesto y bruto de cada línea.
+
+    Args:
+        prices: Precio unitario por línea (float64, NaN si el item no tiene precio)
+        tax_rates: Tasa porcentual por línea (float64, NaN se trata como 0)
+        quantities: Cantidad por línea (int64)
+
+    Returns:
+        QuoteArrays: Importes por línea en centavos; las líneas sin precio
+        quedan en 0 y con ``priced`` en False
+
+    Raises:
+        QuoteOverflowError: Si el bruto de alguna línea no cabe en int64
+    """
+    priced = ~np.isnan(prices)
+    price = np.where(priced, prices, 0.0)
+    rate = np.where(np.isnan(tax_rates), 0.0, tax_rates)
+    quantities = quantities.astype(np.int64)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        price_units = np.rint(price * _PRICE_SCALE)
+        rate_units = np.rint(rate * _RATE_SCALE)
+        # El escalado es exacto si vuelve al mismo float, y los productos no desbordan
+        fast = (
+            (price_units / _PRICE_SCALE == price)
+            & (rate_units / _RATE_SCALE == rate)
+            & (price_units * quantities < _FAST_LIMIT)
+            & (price * quantities * rate < _FAST_LIMIT)
+            & (rate_units < _FAST_LIMIT / _TAX_DIVISOR)
+        )
+    price_units = np.where(fast, price_units, 0).astype(np.int64)
+    rate_units = np.where(fast, rate_units, 0).astype(np.int64)
+
+    net_units = price_units * quantities
+    net = (net_units + _NET_DIVISOR // 2) // _NET_DIVISOR
+    # round_half_up(net_units * rate_units / _TAX_DIVISOR) sin desbordar int64
+    whole, rest = np.divmod(net_units, _TAX_DIVISOR)
+    tax = whole * rate_units + (rest * rate_units + _TAX_DIVISOR // 2) // _TAX_DIVISOR
+
+    for i in np.flatnonzero(priced & ~fast).tolist():
+        net[i], tax[i] = exact_line(float(price[i]), float(rate[i]), int(quantities[i]))
+
+    return QuoteArrays(priced=priced, net=net, tax=tax, gross=net + tax)
@@ -0,0 +1,79 @@
+from fastapi import HTTPException
+import numpy as np
+
+from models import QuoteRequest, QuoteResponse
+from repositories import UpstreamOverloadedError, get_item_repository
+from tracing import traced
+from .pricing import QuoteOverflowError, compute_quote
+
+
+class QuoteService:
+    """Servicio que cotiza cestas de items usando price y tax"""
+
+    @staticmethod
+    @traced("QuoteService.quote")
+    async def quote(request: QuoteRequest) -> QuoteResponse:
+        """Carga los items de la cesta en una consulta y calcula los importes"""
+        item_ids = list(dict.fromkeys(line.item_id for line in request.lines))
+        repository = get_item_repository()
+        try:
+            rows = await repository.get_many(item_ids)
+        except UpstreamOverloadedError:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        rows_by_id = {row["id"]: row for row in rows}
+        id_strings = [str(item_id) for item_id in item_ids]
+        missing = [item_id for item_id in id_strings if item_id not in rows_by_id]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Items not found: {', '.join(missing)}")
+
+        # Columnas por item único y expansión a líneas con un índice entero
+        position = {item_id: index for index, item_id in enumerate(item_ids)}
+        item_rows = [rows_by_id[item_id] for item_id in id_strings]
+        item_prices = np.array(
+            [np.nan if row["price"] is None else row["price"] for row in item_rows], dtype=np.float64
+        )
+        item_taxes = np.array(
+            [np.nan if row["tax"] is None else row["tax"] for row in item_rows], dtype=np.float64
+        )
+        line_index = np.fromiter((position[line.item_id] for line in request.lines), dtype=np.intp)
+        quantities = np.fromiter((line.quantity for line in request.lines), dtype=np.int64)
+
+        try:
+            result = compute_quote(item_prices[line_index], item_taxes[line_index], quantities)
+        except QuoteOverflowError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+        priced = result.priced.tolist()
+        net = (result.net / 100).tolist()
+        tax = (result.tax / 100).tolist()
+        gross = (result.gross / 100).tolist()
+        unit_prices = (item_prices[line_index]).tolist()
+        tax_rates = np.nan_to_num(item_taxes[line_index]).tolist()
+
+        # Diccionarios planos: FastAPI los valida una sola vez contra response_model
+        lines = [
+            {
+                "item_id": line.item_id,
+                "quantity": line.quantity,
+                "unit_price": unit_prices[i] if priced[i] else None,
+                "tax_rate": tax_rates[i],
+                "net": net[i] if priced[i] else None,
+                "tax_amount": tax[i] if priced[i] else None,
+                "gross": gross[i] if priced[i] else None,
+            }
+            for i, line in enumerate(request.lines)
+        ]
+        unpriced = [item_id for item_id, row in zip(item_ids, item_rows) if row["price"] is None]
+        # Suma con enteros de Python: el total de muchas líneas grandes desborda int64
+        net_total, tax_total = int(result.net.sum(dtype=object)), int(result.tax.sum(dtype=object))
+
+        return {
+            "lines": lines,
+            "net_total": net_total / 100,
+            "tax_total": tax_total / 100,
+            "gross_total": (net_total + tax_total) / 100,
+            "unpriced_item_ids": unpriced,
+        }
@@ -0,0 +1,10 @@
+from .columnar_table import ColumnarItemTable
+from .replica_service import ItemReplica, item_replica, start_item_replica, stop_item_replica
+
+__all__ = [
+    "ColumnarItemTable",
+    "ItemReplica",
+    "item_replica",
+    "start_item_replica",
+    "stop_item_replica",
+]
@@ -0,0 +1,294 @@
+"""
+Tabla de items en formato columnar para réplicas en memoria.
+
+Cada columna se guarda en un array contiguo indexado por slot en lugar de
+un diccionario por fila: ids como 16 bytes big-endian en un bytearray,
+price/tax como float64 (NaN = NULL), timestamps como microsegundos int64 y
+textos como referencias a strings internados.
+
+Índices:
+- Por id: arrays NumPy ordenados con los 64 bits altos del uuid y su slot
+  (16 bytes por fila, búsqueda con ``searchsorted``), más un dict pequeño
+  con las filas agregadas desde la última reconstrucción del índice.
+- Por ``(created_at, id)`` (o solo ``id`` con ``order_by_id``, para ids
+  UUIDv7): array de slots ordenado que sirve los listados paginados y, con
+  vistas NumPy sobre las columnas, los filtros de precio.
+"""
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+import math
+import sys
+import uuid
+
+import numpy as np
+
+from repositories.item_repository import ALL_COLUMNS, LIST_COLUMNS
+
+
+_NULL_TIMESTAMP = -(2 ** 63)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Filas nuevas toleradas fuera del índice ordenado antes de reconstruirlo
+_MIN_RECENT = 1024
+
+
+def _to_micros(value) -> int:
+    if value is None:
+        return _NULL_TIMESTAMP
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(value: int) -> Optional[str]:
+    if value == _NULL_TIMESTAMP:
+        return None
+    return (_EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+def _to_float(value) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _from_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+class ColumnarItemTable:
+    """Snapshot columnar de la tabla items"""
+
+    def __init__(self, order_by_id: bool = False):
+        self._order_by_id = order_by_id
+        self._ids = bytearray()
+        self._names: list[Optional[str]] = []
+        self._descriptions: list[Optional[str]] = []
+        self._prices = array("d")
+        self._taxes = array("d")
+        self._created = array("q")
+        self._updated = array("q")
+        self._alive = bytearray()
+        self._free: list[int] = []
+        self._size = 0
+
+        self._index_keys = np.empty(0, dtype=np.uint64)
+        self._index_slots = np.empty(0, dtype=np.int64)
+        self._recent: dict[int, int] = {}
+
+        self._order = array("q")
+        self._order_dirty = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id) -> bool:
+        return self._find(self._key(item_id)) is not None
+
+    @staticmethod
+    def _key(item_id) -> int:
+        return (item_id if isinstance(item_id, uuid.UUID) else uuid.UUID(str(item_id))).int
+
+    def _id_int(self, slot: int) -> int:
+        return int.from_bytes(self._ids[slot * 16:slot * 16 + 16], "big")
+
+    def _sort_key(self, slot: int) -> tuple[int, int]:
+        if self._order_by_id:
+            return 0, self._id_int(slot)
+        return self._created[slot], self._id_int(slot)
+
+    def _find(self, key: int) -> Optional[int]:
+        slot = self._recent.get(key)
+        if slot is not None:
+            return slot
+        keys = self._index_keys
+        if not len(keys):
+            return None
+        high = np.uint64(key >> 64)
+        position = int(np.searchsorted(keys, high))
+        while position < len(keys) and keys[position] == high:
+            slot = int(self._index_slots[position])
+            if self._alive[slot] and self._id_int(slot) == key:
+                return slot
+            position += 1
+        return None
+
+    def _allocate(self, key: int) -> int:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._prices)
+            self._ids.extend(bytes(16))
+            self._names.append(None)
+            self._descriptions.append(None)
+            self._prices.append(math.nan)
+            self._taxes.append(math.nan)
+            self._created.append(_NULL_TIMESTAMP)
+            self._updated.append(_NULL_TIMESTAMP)
+            self._alive.append(0)
+        self._ids[slot * 16:slot * 16 + 16] = key.to_bytes(16, "big")
+        self._alive[slot] = 1
+        self._recent[key] = slot
+        self._size += 1
+        return slot
+
+    def _write(self, slot: int, row: dict, created: int) -> None:
+        self._names[slot] = _intern(row.get("name"))
+        self._descriptions[slot] = _intern(row.get("description"))
+        self._prices[slot] = _to_float(row.get("price"))
+        self._taxes[slot] = _to_float(row.get("tax"))
+        self._created[slot] = created
+        self._updated[slot] = _to_micros(row.get("updated_at"))
+
+    def upsert(self, row: dict) -> None:
+        """Inserta o reemplaza una fila (dict con la forma de ItemRepository)"""
+        key = self._key(row["id"])
+        created = _to_micros(row.get("created_at"))
+        slot = self._find(key)
+
+        if slot is None:
+            slot = self._allocate(key)
+            reorder = True
+        else:
+            # En orden por id una fila existente nunca cambia de posición
+            reorder = not self._order_by_id and self._created[slot] != created
+            if reorder and not self._order_dirty:
+                self._order.remove(slot)
+
+        self._write(slot, row, created)
+
+        if self._order_dirty:
+            # Carga masiva: finalize() ordena y reconstruye el índice
+            if reorder:
+                self._order.append(slot)
+            return
+        if reorder:
+            self._insert_ordered(slot)
+        if len(self._recent) > max(_MIN_RECENT, self._size // 10):
+            self._rebuild_index()
+
+    def extend(self, rows: Iterable[dict]) -> None:
+        """
+        Carga masiva: inserta filas sin mantener los índices al día.
+
+        Debe cerrarse con finalize(), que ordena y reconstruye los índices
+        una sola vez en lugar de hacerlo fila por fila.
+        """
+        self._order_dirty = True
+        for row in rows:
+            self.upsert(row)
+
+    def finalize(self) -> None:
+        """Reconstruye el orden de las páginas y el índice por id"""
+        if self._order_dirty:
+            slots = np.flatnonzero(np.frombuffer(self._alive, dtype=np.uint8))
+            ids = np.frombuffer(self._ids, dtype=">u8").reshape(-1, 2)[slots]
+            keys = (ids[:, 1], ids[:, 0])
+            if not self._order_by_id:
+                keys += (np.frombuffer(self._created, dtype=np.int64)[slots],)
+            ordered = slots[np.lexsort(keys)]
+            self._order = array("q", ordered.astype(np.int64).tobytes())
+            self._order_dirty = False
+        self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        slots = np.flatnonzero(np.frombuffer(self._alive, dtype=np.uint8))
+        high = np.frombuffer(self._ids, dtype=">u8")[0::2][slots].astype(np.uint64)
+        by_key = np.argsort(high, kind="stable")
+        self._index_keys = high[by_key]
+        self._index_slots = slots[by_key].astype(np.int64)
+        self._recent = {}
+
+    def _insert_ordered(self, slot: int) -> None:
+        order = self._order
+        sort_key = self._sort_key(slot)
+        # Caso habitual: los items nuevos son los más recientes
+        if not order or sort_key >= self._sort_key(order[-1]):
+            order.append(slot)
+        else:
+            order.insert(bisect_right(order, sort_key, key=self._sort_key), slot)
+
+    def delete(self, item_id) -> bool:
+        """Elimina una fila; devuelve False si no existía"""
+        key = self._key(item_id)
+        slot = self._find(key)
+        if slot is None:
+            return False
+        self._recent.pop(key, None)
+        if not self._order_dirty:
+            self._order.remove(slot)
+        self._alive[slot] = 0
+        self._names[slot] = self._descriptions[slot] = None
+        self._free.append(slot)
+        self._size -= 1
+        return True
+
+    def _row(self, slot: int, columns: tuple[str, ...]) -> dict:
+        values = {
+            "id": str(uuid.UUID(bytes=bytes(self._ids[slot * 16:slot * 16 + 16]))),
+            "name": self._names[slot],
+            "description": self._descriptions[slot],
+            "price": _from_float(self._prices[slot]),
+            "tax": _from_float(self._taxes[slot]),
+        }
+        if columns is ALL_COLUMNS:
+            values["created_at"] = _from_micros(self._created[slot])
+            values["updated_at"] = _from_micros(self._updated[slot])
+        return values
+
+    def get(self, item_id) -> Optional[dict]:
+        """Devuelve la fila completa o None"""
+        slot = self._find(self._key(item_id))
+        return None if slot is None else self._row(slot, ALL_COLUMNS)
+
+    def get_many(self, item_ids) -> list[dict]:
+        """Devuelve las filas completas de los ids existentes"""
+        slots = (self._find(self._key(item_id)) for item_id in item_ids)
+        return [self._row(slot, ALL_COLUMNS) for slot in slots if slot is not None]
+
+    def page(
+        self,
+        limit: int,
+        offset: int,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> list[dict]:
+        """Página en el orden de la tabla con las columnas de LIST_COLUMNS"""
+        if min_price is None and max_price is None:
+            slots = self._order[offset:offset + limit]
+        else:
+            order = np.frombuffer(self._order, dtype=np.int64)
+            prices = np.frombuffer(self._prices, dtype=np.float64)[order]
+            mask = ~np.isnan(prices)
+            if min_price is not None:
+                mask &= prices >= min_price
+            if max_price is not None:
+                mask &= prices <= max_price
+            slots = order[mask][offset:offset + limit].tolist()
+            # Soltar las vistas antes de que los arrays vuelvan a crecer
+            del order, prices, mask
+        return [self._row(slot, LIST_COLUMNS) for slot in slots]
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados ocupados por la tabla (strings únicos incluidos)"""
+        total = sum(sys.getsizeof(column) for column in (
+            self._ids, self._names, self._descriptions, self._prices, self._taxes,
+            self._created, self._updated, self._alive, self._free, self._order, self._recent,
+        ))
+        total += self._index_keys.nbytes + self._index_slots.nbytes
+        total += sum(sys.getsizeof(key) + sys.getsizeof(slot) for key, slot in self._recent.items())
+        seen = set()
+        for column in (self._names, self._descriptions):
+            for text in column:
+                if text is not None and id(text) not in seen:
+                    seen.add(id(text))
+                    total += sys.getsizeof(text)
+        return total
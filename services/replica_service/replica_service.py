@@ -0,0 +1,162 @@
+"""
+Réplica de lectura en memoria de la tabla items.
+
+Cada worker carga al arrancar un snapshot columnar de la tabla y lo
+mantiene al día pidiendo las filas con ``(updated_at, id)`` posterior a su
+watermark. Mientras la réplica está lista, ItemService responde
+get_item_by_id y get_items (con sus filtros) sin consultar el backend.
+
+Las escrituras hechas por este worker se aplican al instante a través del
+listener de ItemService. Los borrados hechos por otros workers no aparecen
+en los pulls incrementales, así que la réplica se recarga completa cada
+``ITEM_REPLICA_FULL_RELOAD_SECONDS``.
+"""
+
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+import asyncio
+import logging
+import time
+
+from config.settings import settings
+from repositories import ItemRepository, get_item_repository
+from repositories.item_repository.base import Watermark
+from services.item_service import ItemService
+from .columnar_table import ColumnarItemTable
+
+
+logger = logging.getLogger(__name__)
+
+# Menor uuid posible: junto con un updated_at desplazado arma un watermark inclusivo
+_MIN_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+class ItemReplica:
+    """Snapshot columnar de items sincronizado por watermark"""
+
+    def __init__(self, batch_size: int = 1000, overlap_seconds: float = 1.0, order_by_id: bool = False):
+        self._order_by_id = order_by_id
+        self.table = ColumnarItemTable(order_by_id)
+        self._batch_size = batch_size
+        self._overlap = timedelta(seconds=overlap_seconds)
+        self._watermark: Optional[Watermark] = None
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """True después de la primera carga completa"""
+        return self._loaded_at is not None
+
+    async def _fetch(self, repository: ItemRepository, apply: Callable[[list[dict]], None],
+                     after: Optional[Watermark]) -> tuple[int, Optional[Watermark]]:
+        applied = 0
+        while True:
+            rows = await repository.get_changed_since(after, self._batch_size)
+            apply(rows)
+            applied += len(rows)
+            if rows:
+                after = (rows[-1]["updated_at"], rows[-1]["id"])
+            if len(rows) < self._batch_size:
+                return applied, after
+
+    async def load(self, repository: ItemRepository) -> int:
+        """Construye un snapshot nuevo desde cero y lo reemplaza de forma atómica"""
+        table = ColumnarItemTable(self._order_by_id)
+        # La tabla nueva no es visible hasta el swap: carga masiva sin índices
+        loaded, watermark = await self._fetch(repository, table.extend, None)
+        table.finalize()
+        self.table, self._watermark = table, watermark
+        self._loaded_at = time.monotonic()
+        return loaded
+
+    async def pull(self, repository: ItemRepository) -> int:
+        """
+        Aplica las filas modificadas desde el watermark.
+
+        Relee una pequeña ventana (``overlap_seconds``) antes del watermark
+        para no perder filas de transacciones que confirmaron tarde con un
+        updated_at anterior; reaplicarlas es idempotente.
+        """
+        after = self._watermark
+        if after is not None and self._overlap:
+            shifted = datetime.fromisoformat(after[0]) - self._overlap
+            after = (shifted.isoformat(), _MIN_UUID)
+        applied, watermark = await self._fetch(repository, self._apply, after)
+        if watermark is not None and (self._watermark is None or watermark > self._watermark):
+            self._watermark = watermark
+        return applied
+
+    def _apply(self, rows: list[dict]) -> None:
+        for row in rows:
+            self.table.upsert(row)
+
+    def page(self, limit: int, offset: int, min_price: Optional[float] = None,
+             max_price: Optional[float] = None) -> list[dict]:
+        return self.table.page(limit, offset, min_price, max_price)
+
+    def get(self, item_id) -> Optional[dict]:
+        return self.table.get(item_id)
+
+    def get_many(self, item_ids) -> list[dict]:
+        return self.table.get_many(item_ids)
+
+    def on_item_created(self, row: dict) -> None:
+        self.table.upsert(row)
+
+    def on_item_updated(self, old: Optional[dict], new: dict) -> None:
+        self.table.upsert(new)
+
+    def on_item_deleted(self, row: dict) -> None:
+        self.table.delete(row["id"])
+
+    async def run(self, get_repository: Callable[[], ItemRepository],
+                  sync_interval: float, reload_interval: float) -> None:
+        """Pull incremental cada ``sync_interval`` y recarga completa periódica"""
+        while True:
+            await asyncio.sleep(sync_interval)
+            try:
+                if time.monotonic() - self._loaded_at >= reload_interval:
+                    await self.load(get_repository())
+                else:
+                    await self.pull(get_repository())
+            except Exception:
+                logger.exception("Item replica sync failed")
+
+
+# Réplica global del worker (Singleton)
+item_replica = ItemReplica(
+    settings.ITEM_REPLICA_BATCH_SIZE,
+    settings.ITEM_REPLICA_SYNC_OVERLAP_SECONDS,
+    settings.ITEM_PAGE_ORDER == "id",
+)
+
+_sync_task: Optional[asyncio.Task] = None
+
+
+async def start_item_replica() -> None:
+    """Carga la réplica, la conecta a ItemService y arranca la sincronización"""
+    global _sync_task
+
+    await item_replica.load(get_item_repository())
+    ItemService.add_change_listener(item_replica)
+    ItemService.set_read_replica(item_replica)
+    _sync_task = asyncio.create_task(item_replica.run(
+        get_item_repository,
+        settings.ITEM_REPLICA_SYNC_SECONDS,
+        settings.ITEM_REPLICA_FULL_RELOAD_SECONDS,
+    ))
+
+
+async def stop_item_replica() -> None:
+    """Detiene la sincronización y desconecta la réplica de ItemService"""
+    global _sync_task
+
+    ItemService.set_read_replica(None)
+    ItemService.remove_change_listener(item_replica)
+    if _sync_task is not None:
+        _sync_task.cancel()
+        try:
+            await _sync_task
+        except asyncio.CancelledError:
+            pass
+        _sync_task = None
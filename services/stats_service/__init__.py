@@ -0,0 +1,15 @@
+from .stats_service import (
+    ItemStatsService,
+    ItemStatsTracker,
+    item_stats,
+    start_item_stats,
+    stop_item_stats,
+)
+
+__all__ = [
+    "ItemStatsService",
+    "ItemStatsTracker",
+    "item_stats",
+    "start_item_stats",
+    "stop_item_stats",
+]
@@ -0,0 +1,239 @@
+"""
+Estadísticas agregadas de items mantenidas de forma incremental.
+
+ItemStatsTracker se registra como listener de ItemService y aplica cada
+create/update/delete como un delta sobre contadores, sumas e histogramas,
+de modo que GET /items/stats no consulta la base de datos. Un loop en
+segundo plano reconcilia periódicamente contra el agregado calculado por
+el backend (ItemRepository.aggregate), corrigiendo la deriva que puedan
+introducir escrituras concurrentes o hechas por otros workers.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Callable, Optional
+import asyncio
+import logging
+
+from fastapi import HTTPException
+
+from config.settings import settings
+from models import HistogramBucket, ItemStats, NumericStats
+from repositories import ItemRepository, UpstreamOverloadedError, get_item_repository
+from services.item_service import ItemService
+from tracing import traced
+
+
+logger = logging.getLogger(__name__)
+
+
+class _ColumnStats:
+    """Contadores de una columna numérica nullable"""
+
+    __slots__ = ("edges", "count", "total", "min", "max", "histogram")
+
+    def __init__(self, edges: list[float]):
+        self.edges = list(edges)
+        self.load({"count": 0, "sum": 0, "min": None, "max": None}, [0] * len(self.edges))
+
+    def load(self, aggregate: dict, histogram: list[int]) -> None:
+        self.count = aggregate["count"]
+        self.total = float(aggregate["sum"] or 0)
+        self.min = aggregate["min"]
+        self.max = aggregate["max"]
+        self.histogram = list(histogram)
+
+    def _bucket(self, value: float) -> int:
+        return max(bisect_right(self.edges, value) - 1, 0)
+
+    def add(self, value: Optional[float]) -> None:
+        if value is None:
+            return
+        self.count += 1
+        self.total += value
+        self.histogram[self._bucket(value)] += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def remove(self, value: Optional[float]) -> bool:
+        """Quita un valor; devuelve True si era el mínimo o el máximo"""
+        if value is None:
+            return False
+        self.count -= 1
+        self.total -= value
+        self.histogram[self._bucket(value)] -= 1
+        if self.count == 0:
+            self.total = 0.0
+            self.min = self.max = None
+            return False
+        return value == self.min or value == self.max
+
+    def to_model(self) -> NumericStats:
+        return NumericStats(
+            count=self.count,
+            sum=self.total,
+            mean=self.total / self.count if self.count else None,
+            min=self.min,
+            max=self.max,
+        )
+
+    def buckets(self) -> list[HistogramBucket]:
+        uppers = self.edges[1:] + [None]
+        return [
+            HistogramBucket(lower=lower, upper=upper, count=count)
+            for lower, upper, count in zip(self.edges, uppers, self.histogram)
+        ]
+
+
+class ItemStatsTracker:
+    """Estadísticas de items actualizadas con cada escritura de ItemService"""
+
+    def __init__(self, price_edges: list[float], tax_edges: list[float]):
+        self._count = 0
+        self._price = _ColumnStats(price_edges)
+        self._tax = _ColumnStats(tax_edges)
+        self._reconciled_at: Optional[datetime] = None
+        self._stale = False
+        self._snapshot: Optional[ItemStats] = None
+        self._reconcile_requested: Optional[asyncio.Event] = None
+
+    @property
+    def loaded(self) -> bool:
+        """True después de la primera reconciliación"""
+        return self._reconciled_at is not None
+
+    def on_item_created(self, row: dict) -> None:
+        if not self.loaded:
+            return
+        self._count += 1
+        self._price.add(row.get("price"))
+        self._tax.add(row.get("tax"))
+        self._snapshot = None
+
+    def on_item_updated(self, old: Optional[dict], new: dict) -> None:
+        if not self.loaded:
+            return
+        if old is None:
+            # Sin la fila anterior no hay delta posible
+            self._mark_stale()
+            return
+        lost_extremum = self._price.remove(old.get("price")) | self._tax.remove(old.get("tax"))
+        self._price.add(new.get("price"))
+        self._tax.add(new.get("tax"))
+        self._snapshot = None
+        if lost_extremum:
+            self._mark_stale()
+
+    def on_item_deleted(self, row: dict) -> None:
+        if not self.loaded:
+            return
+        self._count -= 1
+        lost_extremum = self._price.remove(row.get("price")) | self._tax.remove(row.get("tax"))
+        self._snapshot = None
+        if lost_extremum:
+            self._mark_stale()
+
+    def _mark_stale(self) -> None:
+        self._stale = True
+        self._snapshot = None
+        self.request_reconcile()
+
+    def request_reconcile(self) -> None:
+        """Adelanta la próxima reconciliación del loop en segundo plano"""
+        if self._reconcile_requested is not None:
+            self._reconcile_requested.set()
+
+    def snapshot(self) -> ItemStats:
+        """Devuelve las estadísticas actuales (cacheadas hasta el próximo cambio)"""
+        if self._snapshot is None:
+            self._snapshot = ItemStats(
+                count=self._count,
+                price=self._price.to_model(),
+                tax=self._tax.to_model(),
+                price_histogram=self._price.buckets(),
+                tax_histogram=self._tax.buckets(),
+                reconciled_at=self._reconciled_at,
+                stale=self._stale,
+            )
+        return self._snapshot
+
+    async def reconcile(self, repository: ItemRepository) -> None:
+        """Reemplaza el estado con el agregado calculado por el backend"""
+        aggregate = await repository.aggregate(self._price.edges, self._tax.edges)
+        self._count = aggregate["count"]
+        self._price.load(aggregate["price"], aggregate["price_histogram"])
+        self._tax.load(aggregate["tax"], aggregate["tax_histogram"])
+        self._reconciled_at = datetime.now(timezone.utc)
+        self._stale = False
+        self._snapshot = None
+
+    async def run(self, get_repository: Callable[[], ItemRepository], interval: float) -> None:
+        """Reconcilia cada ``interval`` segundos o antes si se solicita"""
+        self._reconcile_requested = asyncio.Event()
+        try:
+            while True:
+                self._reconcile_requested.clear()
+                try:
+                    await self.reconcile(get_repository())
+                except Exception:
+                    logger.exception("Item stats reconciliation failed")
+                try:
+                    await asyncio.wait_for(self._reconcile_requested.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._reconcile_requested = None
+
+
+# Tracker global de estadísticas (Singleton)
+item_stats = ItemStatsTracker(settings.ITEM_STATS_PRICE_BUCKETS, settings.ITEM_STATS_TAX_BUCKETS)
+
+_reconcile_task: Optional[asyncio.Task] = None
+
+
+def start_item_stats() -> None:
+    """Registra el tracker en ItemService y arranca la reconciliación periódica"""
+    global _reconcile_task
+
+    ItemService.add_change_listener(item_stats)
+    _reconcile_task = asyncio.create_task(
+        item_stats.run(get_item_repository, settings.ITEM_STATS_RECONCILE_SECONDS)
+    )
+
+
+async def stop_item_stats() -> None:
+    """Detiene la reconciliación y desregistra el tracker"""
+    global _reconcile_task
+
+    ItemService.remove_change_listener(item_stats)
+    if _reconcile_task is not None:
+        _reconcile_task.cancel()
+        try:
+            await _reconcile_task
+        except asyncio.CancelledError:
+            pass
+        _reconcile_task = None
+
+
+class ItemStatsService:
+    """Servicio de estadísticas agregadas de items"""
+
+    @staticmethod
+    @traced("ItemStatsService.get_stats")
+    async def get_stats() -> ItemStats:
+        """Devuelve las estadísticas; sin tracking activo consulta el agregado"""
+        if settings.ITEM_STATS_ENABLED and item_stats.loaded and ItemService.shared_reads():
+            return item_stats.snapshot()
+        # Agregado solo para esta petición, con su cliente (puede ser uno por
+        # usuario con RLS): el tracker global solo lo reconcilia el loop en
+        # segundo plano con el cliente de servicio
+        tracker = ItemStatsTracker(settings.ITEM_STATS_PRICE_BUCKETS, settings.ITEM_STATS_TAX_BUCKETS)
+        try:
+            await tracker.reconcile(get_item_repository())
+        except UpstreamOverloadedError:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return tracker.snapshot()
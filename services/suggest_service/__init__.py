@@ -0,0 +1,18 @@
+from .prefix_index import NamePrefixIndex, normalize_name
+from .suggest_service import (
+    ItemSuggestIndex,
+    ItemSuggestService,
+    item_suggest_index,
+    start_item_suggest,
+    stop_item_suggest,
+)
+
+__all__ = [
+    "NamePrefixIndex",
+    "normalize_name",
+    "ItemSuggestIndex",
+    "ItemSuggestService",
+    "item_suggest_index",
+    "start_item_suggest",
+    "stop_item_suggest",
+]
@@ -0,0 +1,370 @@
+"""
+Índice de prefijos de nombres de items para el autocompletado.
+
+Los nombres se normalizan (NFKD sin diacríticos, casefold y espacios
+colapsados) y se guardan en arrays paralelos ordenados por
+``(nombre normalizado, id)``: nombres normalizados (strings internados),
+ids como 16 bytes big-endian en un bytearray y nombres originales para la
+respuesta (el mismo objeto que la clave si el nombre ya está normalizado).
+
+Dos niveles, para que las escrituras no muevan arrays de millones de
+entradas:
+
+- Base: todos los nombres de la última carga o compactación; solo cambia
+  para marcar entradas muertas (bytearray de un byte por fila) o
+  actualizar un nombre original.
+- Delta: altas y renombres posteriores, en arrays ordenados pequeños más un
+  dict id -> clave.
+
+Una búsqueda hace ``bisect_left`` del prefijo en ambos niveles y mezcla las
+``limit`` primeras entradas vivas: O(log n + k). Cuando el delta y las
+entradas muertas superan ``n / 16`` se compactan en una base nueva.
+
+No hay mapa id -> nombre para la base (duplicaría la memoria): las
+escrituras del listener conocen el nombre y ubican la fila por bisección;
+los cambios leídos del backend (apply) y las lápidas usan un índice por
+id de la base (64 bits altos ordenados con NumPy, construido a demanda).
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import compress
+from typing import Iterable, Optional
+import sys
+import unicodedata
+
+import numpy as np
+
+from repositories import uuid_bytes
+
+
+# Tamaño mínimo del delta + entradas muertas antes de compactar
+_MIN_COMPACT = 4096
+
+
+def normalize_name(text: str) -> str:
+    """Forma de búsqueda de un nombre: sin tildes, en minúsculas y con espacios simples"""
+    if text.isascii():
+        return " ".join(text.lower().split())
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def normalize_prefix(prefix: str) -> str:
+    """Como normalize_name, pero un espacio final exige que la palabra esté completa"""
+    normalized = normalize_name(prefix)
+    if normalized and prefix[-1:].isspace():
+        normalized += " "
+    return normalized
+
+
+def _id_text(raw_id: bytes) -> str:
+    text = raw_id.hex()
+    return f"{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}"
+
+
+def _entry(name: Optional[str]) -> tuple[str, str]:
+    """(clave normalizada, nombre original); la clave vacía no se indexa"""
+    name = name or ""
+    key = sys.intern(normalize_name(name))
+    return key, key if key == name else name
+
+
+class _SortedNames:
+    """Arrays paralelos (clave, id, nombre) ordenados por (clave, id)"""
+
+    __slots__ = ("keys", "labels", "ids")
+
+    def __init__(self, keys: Optional[list[str]] = None, labels: Optional[list[str]] = None,
+                 ids: Optional[bytearray] = None):
+        self.keys = keys if keys is not None else []
+        self.labels = labels if labels is not None else []
+        self.ids = ids if ids is not None else bytearray()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def id_at(self, position: int) -> bytes:
+        return bytes(self.ids[position * 16:position * 16 + 16])
+
+    def position(self, key: str, raw_id: bytes) -> int:
+        """Posición de ``(key, raw_id)`` en el orden"""
+        low = bisect_left(self.keys, key)
+        high = bisect_right(self.keys, key, low)
+        while low < high:
+            middle = (low + high) // 2
+            if self.ids[middle * 16:middle * 16 + 16] < raw_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find(self, key: str, raw_id: bytes) -> Optional[int]:
+        position = self.position(key, raw_id)
+        return position if self.ids[position * 16:position * 16 + 16] == raw_id else None
+
+    def insert(self, key: str, raw_id: bytes, label: str) -> None:
+        position = self.position(key, raw_id)
+        self.keys.insert(position, key)
+        self.labels.insert(position, label)
+        self.ids[position * 16:position * 16] = raw_id
+
+    def delete(self, position: int) -> None:
+        del self.keys[position]
+        del self.labels[position]
+        del self.ids[position * 16:position * 16 + 16]
+
+    def id_lookup(self) -> tuple[np.ndarray, np.ndarray]:
+        """64 bits altos de los ids ordenados y la posición de cada uno"""
+        high = np.frombuffer(self.ids, dtype=">u8")[0::2].astype(np.uint64)
+        order = np.argsort(high, kind="stable")
+        return high[order], order
+
+    def prefix_matches(self, prefix: str, limit: int, dead: Optional[bytearray] = None) -> list[tuple[str, bytes, str]]:
+        """Hasta ``limit`` entradas vivas (clave, id, nombre) cuya clave empieza por ``prefix``"""
+        keys, ids, labels = self.keys, self.ids, self.labels
+        position = bisect_left(keys, prefix)
+        matches = []
+        while len(matches) < limit and position < len(keys) and keys[position].startswith(prefix):
+            if dead is None or not dead[position]:
+                matches.append((keys[position], bytes(ids[position * 16:position * 16 + 16]), labels[position]))
+            position += 1
+        return matches
+
+    def memory_usage(self, seen: set) -> int:
+        total = sys.getsizeof(self.keys) + sys.getsizeof(self.labels) + sys.getsizeof(self.ids)
+        for column in (self.keys, self.labels):
+            for text in column:
+                if id(text) not in seen:
+                    seen.add(id(text))
+                    total += sys.getsizeof(text)
+        return total
+
+
+class NamePrefixIndex:
+    """Nombres normalizados ordenados con búsqueda por prefijo"""
+
+    def __init__(self):
+        self._set_base(_SortedNames())
+        # apply() guarda posiciones de la base: compacta solo al terminar el lote
+        self._in_batch = False
+
+    def __len__(self) -> int:
+        return len(self._base) - self._dead_count + len(self._delta)
+
+    def __contains__(self, item_id) -> bool:
+        raw_id = uuid_bytes(item_id)
+        return raw_id in self._delta_keys or raw_id in self._scan_base([raw_id])
+
+    def load(self, rows: Iterable[dict]) -> None:
+        """Reemplaza el contenido con las filas dadas (un solo ordenamiento)"""
+        entries = {}
+        for row in rows:
+            key, label = _entry(row["name"])
+            if key:
+                entries[uuid_bytes(row["id"])] = (key, label)
+        ordered = sorted(entries.items(), key=lambda entry: (entry[1][0], entry[0]))
+        self._set_base(_SortedNames(
+            [key for _, (key, _) in ordered],
+            [label for _, (_, label) in ordered],
+            bytearray(b"".join(raw_id for raw_id, _ in ordered)),
+        ))
+
+    def _set_base(self, base: _SortedNames) -> None:
+        self._base = base
+        self._dead = bytearray(len(base))
+        self._dead_count = 0
+        self._delta = _SortedNames()
+        self._delta_keys: dict[bytes, str] = {}
+        # Búsqueda por id en la base (16 bytes por fila): se construye al
+        # primer id que no se encuentra por nombre y vale hasta la compactación
+        self._base_lookup: Optional[tuple[np.ndarray, np.ndarray]] = None
+
+    def _find_base(self, raw_id: bytes, name: Optional[str]) -> Optional[int]:
+        """Posición viva de un id en la base buscándolo por nombre"""
+        if name is None:
+            return None
+        key = _entry(name)[0]
+        position = self._base.find(key, raw_id) if key else None
+        return position if position is not None and not self._dead[position] else None
+
+    def _scan_base(self, raw_ids: list[bytes]) -> dict[bytes, int]:
+        """Posiciones vivas en la base de ids cuyo nombre no se conoce"""
+        if not raw_ids or not len(self._base):
+            return {}
+        if self._base_lookup is None:
+            self._base_lookup = self._base.id_lookup()
+        high, order = self._base_lookup
+        found = {}
+        for raw_id in set(raw_ids):
+            target = np.uint64(int.from_bytes(raw_id[:8], "big"))
+            start = int(np.searchsorted(high, target))
+            while start < len(high) and high[start] == target:
+                position = int(order[start])
+                if not self._dead[position] and self._base.id_at(position) == raw_id:
+                    found[raw_id] = position
+                    break
+                start += 1
+        return found
+
+    def _set(self, raw_id: bytes, key: str, label: str, base_position: Optional[int]) -> bool:
+        """
+        Deja ``raw_id`` con la clave dada; ``base_position`` es su entrada viva en la base.
+
+        Returns:
+            bool: False si solo cambió el nombre original
+        """
+        delta_key = self._delta_keys.get(raw_id)
+        if delta_key is not None:
+            position = self._delta.find(delta_key, raw_id)
+            if delta_key == key:
+                self._delta.labels[position] = label
+                return False
+            self._delta.delete(position)
+            del self._delta_keys[raw_id]
+        elif base_position is not None:
+            if self._base.keys[base_position] == key:
+                self._base.labels[base_position] = label
+                return False
+            self._dead[base_position] = 1
+            self._dead_count += 1
+        if key:
+            self._delta.insert(key, raw_id, label)
+            self._delta_keys[raw_id] = key
+        self._maybe_compact()
+        return True
+
+    def _remove(self, raw_id: bytes, base_position: Optional[int]) -> bool:
+        delta_key = self._delta_keys.pop(raw_id, None)
+        if delta_key is not None:
+            self._delta.delete(self._delta.find(delta_key, raw_id))
+        elif base_position is not None:
+            self._dead[base_position] = 1
+            self._dead_count += 1
+        else:
+            return False
+        self._maybe_compact()
+        return True
+
+    def add(self, item_id, name: Optional[str]) -> None:
+        """Agrega un item que no está en el índice (sin buscar una entrada anterior)"""
+        self._set(uuid_bytes(item_id), *_entry(name), None)
+
+    def upsert(self, item_id, name: Optional[str], old_name: Optional[str] = None) -> None:
+        """
+        Agrega un item o actualiza su nombre.
+
+        ``old_name`` (el nombre anterior, si se conoce) evita recorrer la
+        base para encontrar la entrada vieja.
+        """
+        raw_id = uuid_bytes(item_id)
+        position = None
+        if raw_id not in self._delta_keys:
+            position = self._find_base(raw_id, old_name if old_name is not None else name)
+            if position is None:
+                position = self._scan_base([raw_id]).get(raw_id)
+        self._set(raw_id, *_entry(name), position)
+
+    def remove(self, item_id, name: Optional[str] = None) -> bool:
+        """Quita un item (``name`` acelera la búsqueda); devuelve False si no estaba"""
+        raw_id = uuid_bytes(item_id)
+        position = None
+        if raw_id not in self._delta_keys:
+            position = self._find_base(raw_id, name)
+            if position is None:
+                position = self._scan_base([raw_id]).get(raw_id)
+        return self._remove(raw_id, position)
+
+    def apply(self, rows: Iterable[dict], deleted_ids: Iterable = ()) -> int:
+        """
+        Aplica un lote de filas cambiadas (``id``, ``name``) y de ids borrados.
+
+        Las filas que siguen en la base con el mismo nombre se ubican por
+        bisección; el resto de ids, con el índice por id de la base.
+
+        Returns:
+            int: Cantidad de entradas agregadas, movidas o quitadas
+        """
+        upserts = {uuid_bytes(row["id"]): _entry(row.get("name")) for row in rows}
+        removals = [uuid_bytes(item_id) for item_id in deleted_ids]
+
+        located = {}
+        for raw_id, (key, _) in upserts.items():
+            if raw_id not in self._delta_keys:
+                position = self._find_base(raw_id, key)
+                if position is not None:
+                    located[raw_id] = position
+        pending = [raw_id for raw_id in list(upserts) + removals
+                   if raw_id not in located and raw_id not in self._delta_keys]
+        located.update(self._scan_base(pending))
+
+        changed = 0
+        self._in_batch = True
+        try:
+            for raw_id, (key, label) in upserts.items():
+                changed += self._set(raw_id, key, label, located.get(raw_id))
+            for raw_id in removals:
+                changed += self._remove(raw_id, located.pop(raw_id, None))
+        finally:
+            self._in_batch = False
+        self._maybe_compact()
+        return changed
+
+    def _maybe_compact(self) -> None:
+        if self._in_batch:
+            return
+        if len(self._delta) + self._dead_count > max(_MIN_COMPACT, len(self._base) // 16):
+            self.compact()
+
+    def compact(self) -> None:
+        """Mezcla la base viva y el delta en una base nueva"""
+        base = self._base
+        if self._dead_count:
+            keep = np.frombuffer(self._dead, dtype=np.uint8) == 0
+            ids = bytearray(np.frombuffer(base.ids, dtype="V16")[keep].tobytes())
+            keep = keep.tolist()
+            base = _SortedNames(list(compress(base.keys, keep)), list(compress(base.labels, keep)), ids)
+        delta = self._delta
+        merged = _SortedNames()
+        previous = 0
+        for position, key in enumerate(delta.keys):
+            raw_id = delta.id_at(position)
+            index = base.position(key, raw_id)
+            merged.keys.extend(base.keys[previous:index])
+            merged.labels.extend(base.labels[previous:index])
+            merged.ids += base.ids[previous * 16:index * 16]
+            merged.keys.append(key)
+            merged.labels.append(delta.labels[position])
+            merged.ids += raw_id
+            previous = index
+        merged.keys.extend(base.keys[previous:])
+        merged.labels.extend(base.labels[previous:])
+        merged.ids += base.ids[previous * 16:]
+        self._set_base(merged)
+
+    def search(self, prefix: str, limit: int) -> list[tuple[str, str]]:
+        """
+        Hasta ``limit`` items cuyo nombre normalizado empieza por ``prefix``.
+
+        Returns:
+            list: ``(id, nombre)`` en orden alfabético del nombre normalizado,
+            de modo que los nombres más cortos con la misma raíz salen primero
+        """
+        prefix = normalize_prefix(prefix)
+        if not prefix:
+            return []
+        matches = self._base.prefix_matches(prefix, limit, self._dead)
+        if self._delta.keys:
+            delta = self._delta.prefix_matches(prefix, limit)
+            if delta:
+                matches = sorted(matches + delta)[:limit]
+        return [(_id_text(raw_id), label) for _, raw_id, label in matches]
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados ocupados por el índice (strings únicos incluidos)"""
+        seen = set()
+        total = self._base.memory_usage(seen) + self._delta.memory_usage(seen) + sys.getsizeof(self._dead)
+        if self._base_lookup is not None:
+            total += sum(array.nbytes for array in self._base_lookup)
+        total += sys.getsizeof(self._delta_keys) + sum(sys.getsizeof(raw_id) for raw_id in self._delta_keys)
+        return total
@@ -0,0 +1,203 @@
+"""
+Autocompletado de nombres de items (GET /items/suggest).
+
+Cada worker mantiene un NamePrefixIndex con los nombres de todos los items:
+lo carga completo al arrancar, aplica al instante las escrituras propias
+(listener de ItemService) y cada ``ITEM_SUGGEST_SYNC_SECONDS`` lee del
+backend los cambios y las lápidas posteriores a sus watermarks, de modo
+que también ve las escrituras y borrados de otros workers. Una recarga
+completa periódica corrige cualquier deriva.
+
+El índice se carga con el cliente de servicio y contiene todas las filas:
+las peticiones con cliente por usuario (RLS) o con token de consistencia
+no lo usan y consultan el backend (``ILIKE 'prefix%'``), igual que las
+demás lecturas compartidas de ItemService.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+import asyncio
+import logging
+import time
+
+from fastapi import HTTPException
+
+from config.settings import settings
+from metrics import registry
+from models import ItemSuggestion
+from repositories import ItemRepository, UpstreamOverloadedError, get_item_repository
+from repositories.item_repository.base import Watermark
+from services.item_service import ItemService
+from tracing import traced
+from .prefix_index import NamePrefixIndex
+
+
+logger = logging.getLogger(__name__)
+
+# Menor uuid posible: junto con una marca de tiempo arma un watermark inclusivo
+_MIN_UUID = "00000000-0000-0000-0000-000000000000"
+
+_index_bytes = registry.gauge(
+    "item_suggest_index_bytes", "Memoria del índice de autocompletado medida en la última carga completa"
+)
+
+
+class ItemSuggestIndex:
+    """Índice de prefijos de nombres sincronizado con el backend"""
+
+    def __init__(self, batch_size: int = 1000, overlap_seconds: float = 1.0):
+        self.index = NamePrefixIndex()
+        self._batch_size = batch_size
+        self._overlap = timedelta(seconds=overlap_seconds)
+        self._changed: Optional[Watermark] = None
+        self._deleted: Optional[Watermark] = None
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """True después de la primera carga completa"""
+        return self._loaded_at is not None
+
+    def _shifted(self, watermark: Optional[Watermark]) -> Optional[Watermark]:
+        """Retrocede ``overlap`` para releer transacciones que confirmaron tarde"""
+        if watermark is None or not self._overlap:
+            return watermark
+        return (datetime.fromisoformat(watermark[0]) - self._overlap).isoformat(), _MIN_UUID
+
+    async def load(self, repository: ItemRepository) -> int:
+        """Construye el índice desde cero y lo reemplaza de forma atómica"""
+        # Los borrados anteriores a la carga ya no están en la tabla
+        deleted = (datetime.now(timezone.utc).isoformat(), _MIN_UUID)
+        rows, after = [], None
+        while True:
+            batch = await repository.get_changed_since(after, self._batch_size)
+            rows.extend({"id": row["id"], "name": row["name"]} for row in batch)
+            if batch:
+                after = (batch[-1]["updated_at"], batch[-1]["id"])
+            if len(batch) < self._batch_size:
+                break
+        index = NamePrefixIndex()
+        index.load(rows)
+        self.index, self._changed, self._deleted = index, after, self._shifted(deleted)
+        self._loaded_at = time.monotonic()
+        _index_bytes.set(index.memory_usage())
+        return len(index)
+
+    async def pull(self, repository: ItemRepository) -> int:
+        """Aplica los cambios y los borrados posteriores a los watermarks"""
+        applied = 0
+        after = self._shifted(self._changed)
+        while True:
+            rows = await repository.get_changed_since(after, self._batch_size)
+            self.index.apply(rows)
+            applied += len(rows)
+            if rows:
+                after = (rows[-1]["updated_at"], rows[-1]["id"])
+                if self._changed is None or after > self._changed:
+                    self._changed = after
+            if len(rows) < self._batch_size:
+                break
+
+        after = self._shifted(self._deleted)
+        while True:
+            tombstones = await repository.get_deleted_since(after, self._batch_size)
+            self.index.apply((), [tombstone["id"] for tombstone in tombstones])
+            applied += len(tombstones)
+            if tombstones:
+                after = (tombstones[-1]["deleted_at"], tombstones[-1]["id"])
+                if self._deleted is None or after > self._deleted:
+                    self._deleted = after
+            if len(tombstones) < self._batch_size:
+                break
+        return applied
+
+    def on_item_created(self, row: dict) -> None:
+        # Id nuevo generado en esta escritura: no hay entrada anterior que buscar
+        self.index.add(row["id"], row.get("name"))
+
+    def on_item_updated(self, old: Optional[dict], new: dict) -> None:
+        self.index.upsert(new["id"], new.get("name"), old.get("name") if old else None)
+
+    def on_item_deleted(self, row: dict) -> None:
+        self.index.remove(row["id"], row.get("name"))
+
+    def suggest(self, prefix: str, limit: int) -> list[dict]:
+        return [{"id": item_id, "name": name} for item_id, name in self.index.search(prefix, limit)]
+
+    async def run(self, get_repository: Callable[[], ItemRepository],
+                  sync_interval: float, reload_interval: float) -> None:
+        """Pull incremental cada ``sync_interval`` y recarga completa periódica"""
+        while True:
+            await asyncio.sleep(sync_interval)
+            try:
+                if time.monotonic() - self._loaded_at >= reload_interval:
+                    await self.load(get_repository())
+                else:
+                    await self.pull(get_repository())
+            except Exception:
+                logger.exception("Item suggest index sync failed")
+
+
+# Índice global del worker (Singleton)
+item_suggest_index = ItemSuggestIndex(settings.ITEM_SUGGEST_BATCH_SIZE, settings.ITEM_SUGGEST_SYNC_OVERLAP_SECONDS)
+registry.gauge(
+    "item_suggest_index_entries", "Nombres en el índice de autocompletado",
+    function=lambda: len(item_suggest_index.index),
+)
+
+_sync_task: Optional[asyncio.Task] = None
+
+
+async def start_item_suggest() -> None:
+    """Carga el índice, lo conecta a ItemService y arranca la sincronización"""
+    global _sync_task
+
+    await item_suggest_index.load(get_item_repository())
+    ItemService.add_change_listener(item_suggest_index)
+    _sync_task = asyncio.create_task(item_suggest_index.run(
+        get_item_repository,
+        settings.ITEM_SUGGEST_SYNC_SECONDS,
+        settings.ITEM_SUGGEST_FULL_RELOAD_SECONDS,
+    ))
+
+
+async def stop_item_suggest() -> None:
+    """Detiene la sincronización y desregistra el índice"""
+    global _sync_task
+
+    ItemService.remove_change_listener(item_suggest_index)
+    if _sync_task is not None:
+        _sync_task.cancel()
+        try:
+            await _sync_task
+        except asyncio.CancelledError:
+            pass
+        _sync_task = None
+
+
+class ItemSuggestService:
+    """Servicio de autocompletado de nombres de items"""
+
+    @staticmethod
+    @traced("ItemSuggestService.suggest")
+    async def suggest(prefix: str, limit: int) -> list[ItemSuggestion]:
+        """Devuelve hasta ``limit`` items cuyo nombre empieza por ``prefix``"""
+        if not ItemService.shared_reads():
+            return await ItemSuggestService._search_backend(prefix, limit)
+        if not item_suggest_index.ready:
+            raise HTTPException(status_code=503, detail="Item suggestions are not available")
+        return item_suggest_index.suggest(prefix, limit)
+
+    @staticmethod
+    async def _search_backend(prefix: str, limit: int) -> list[ItemSuggestion]:
+        """Busca en el backend con el cliente de la petición (sin tildes: ILIKE)"""
+        prefix = prefix.lstrip()
+        if not prefix:
+            return []
+        try:
+            rows = await get_item_repository().search_names(prefix, limit)
+        except UpstreamOverloadedError:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return [{"id": row["id"], "name": row["name"]} for row in rows]
@@ -0,0 +1,3 @@
+from .sync_service import ItemSyncService, decode_sync_token, encode_sync_token
+
+__all__ = ["ItemSyncService", "decode_sync_token", "encode_sync_token"]
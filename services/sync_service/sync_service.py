@@ -0,0 +1,135 @@
+"""
+Sincronización incremental de items (GET /items/changes).
+
+El token de sincronización es opaco para el cliente: codifica la posición
+alcanzada en los dos recorridos por keyset, ``(updated_at, id)`` sobre
+items y ``(deleted_at, id)`` sobre las lápidas, más la fecha hasta la que
+el cliente lo recibió todo: la de la última respuesta sin ``has_more``, que
+se arrastra mientras una cadena de tandas sigue a medias. Ambas posiciones
+solo avanzan, así que reenviar un token nunca pierde cambios; como mucho
+repite alguno.
+
+``updated_at`` toma la hora de inicio de la transacción, de modo que una
+transacción lenta puede confirmar filas con una marca anterior a otras ya
+visibles. Para no saltárselas, solo se devuelven cambios con más de
+``ITEM_CHANGES_SETTLE_SECONDS`` de antigüedad.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import base64
+import binascii
+import json
+import uuid
+
+from fastapi import HTTPException
+
+from config.settings import settings
+from models import ItemChanges
+from repositories import UpstreamOverloadedError, get_item_repository
+from repositories.item_repository.base import Watermark
+from tracing import traced
+
+
+def encode_sync_token(rows: Optional[Watermark], deleted: Optional[Watermark], issued_at: datetime) -> str:
+    """Codifica las posiciones de ambos recorridos como token base64url"""
+    payload = {
+        "u": list(rows) if rows else None,
+        "d": list(deleted) if deleted else None,
+        "t": issued_at.isoformat(),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> tuple[Optional[Watermark], Optional[Watermark], datetime]:
+    """
+    Decodifica un token de encode_sync_token.
+
+    Raises:
+        ValueError: Si el token no es válido
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        rows = tuple(payload["u"]) if payload["u"] else None
+        deleted = tuple(payload["d"]) if payload["d"] else None
+        issued_at = datetime.fromisoformat(payload["t"])
+        for watermark in (rows, deleted):
+            if watermark is not None:
+                datetime.fromisoformat(watermark[0])
+                uuid.UUID(watermark[1])
+    except (binascii.Error, ValueError, KeyError, TypeError, IndexError) as e:
+        raise ValueError("Token de sincronización inválido") from e
+    return rows, deleted, issued_at
+
+
+def _settled(rows: list[dict], column: str, cutoff: datetime) -> list[dict]:
+    """Prefijo de filas (ordenadas por ``column``) anteriores a ``cutoff``"""
+    for index, row in enumerate(rows):
+        if datetime.fromisoformat(row[column]) >= cutoff:
+            return rows[:index]
+    return rows
+
+
+class ItemSyncService:
+    """Servicio de sincronización incremental de items"""
+
+    @staticmethod
+    @traced("ItemSyncService.get_changes")
+    async def get_changes(since: Optional[str], limit: int) -> ItemChanges:
+        """
+        Devuelve hasta ``limit`` items cambiados y ``limit`` borrados desde ``since``.
+
+        Args:
+            since: Token de una respuesta anterior; None para empezar desde cero
+            limit: Máximo de filas de cada lista
+
+        Raises:
+            HTTPException: 400 si el token es inválido, 410 si es más viejo
+            que la retención de lápidas (hace falta una sincronización completa)
+        """
+        now = datetime.now(timezone.utc)
+        rows_after = deleted_after = None
+        issued_at = now
+        if since:
+            try:
+                rows_after, deleted_after, issued_at = decode_sync_token(since)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if issued_at < now - timedelta(days=settings.ITEM_TOMBSTONE_RETENTION_DAYS):
+                raise HTTPException(
+                    status_code=410, detail="Sync token expired: tombstones were pruned, full resync required"
+                )
+
+        repository = get_item_repository()
+        cutoff = now - timedelta(seconds=settings.ITEM_CHANGES_SETTLE_SECONDS)
+        try:
+            fetched_rows = await repository.get_changed_since(rows_after, limit + 1)
+            fetched_deleted = await repository.get_deleted_since(deleted_after, limit + 1)
+            rows = _settled(fetched_rows, "updated_at", cutoff)
+            tombstones = _settled(fetched_deleted, "deleted_at", cutoff)
+            has_more = len(rows) > limit or len(tombstones) > limit
+            rows, tombstones = rows[:limit], tombstones[:limit]
+
+            if rows:
+                rows_after = (rows[-1]["updated_at"], rows[-1]["id"])
+            if tombstones:
+                deleted_after = (tombstones[-1]["deleted_at"], tombstones[-1]["id"])
+                # Una fila movida entre shards deja una lápida aunque siga existiendo
+                alive = {
+                    row["id"] for row in
+                    await repository.get_many([uuid.UUID(tombstone["id"]) for tombstone in tombstones])
+                }
+                tombstones = [tombstone for tombstone in tombstones if tombstone["id"] not in alive]
+        except UpstreamOverloadedError:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return ItemChanges(
+            items=rows,
+            deleted=tombstones,
+            # Con has_more quedan lápidas por entregar desde el inicio de la
+            # cadena: si la retención las alcanza, el 410 debe saltar igual
+            next_token=encode_sync_token(rows_after, deleted_after, issued_at if has_more else now),
+            has_more=has_more,
+        )
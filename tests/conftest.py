@@ -8,6 +8,7 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock, patch
 from main import app
+from repositories import MemoryItemRepository
 
 
 @pytest.fixture
@@ -35,12 +36,28 @@ def mock_supabase_client():
     Yields:
         MagicMock: Mock del cliente de Supabase
     """
-    with patch('services.item_service.item_service.get_supabase_client') as mock_client:
+    with patch('repositories.item_repository.supabase_repository.get_request_supabase_client') as mock_client:
         mock = MagicMock()
         mock_client.return_value = mock
         yield mock
 
 
+@pytest.fixture
+def memory_repository(monkeypatch):
+    """
+    Fixture que reemplaza el backend de items por uno en memoria.
+
+    Permite probar la lógica de los servicios de punta a punta sin mocks
+    del query builder de Supabase.
+
+    Returns:
+        MemoryItemRepository: Repositorio usado por ItemService durante el test
+    """
+    repository = MemoryItemRepository()
+    monkeypatch.setattr("repositories.item_repository.factory._item_repository", repository)
+    return repository
+
+
 @pytest.fixture
 def sample_item_data():
     """
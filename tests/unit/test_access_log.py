@@ -0,0 +1,118 @@
+"""
+Unit tests para el access log estructurado.
+"""
+
+import json
+import logging
+import queue
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from middleware import AccessLogMiddleware, start_access_log, stop_access_log
+from middleware.access_log import JsonFormatter, access_log_dropped_total, access_logger
+from repositories import InstrumentedItemRepository, MemoryItemRepository
+from diagnostics import RequestContext, request_context
+
+
+class ListHandler(logging.Handler):
+    """Handler que guarda las líneas JSON escritas por el hilo del listener"""
+
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(JsonFormatter())
+        self.lines: list[dict] = []
+
+    def emit(self, record):
+        self.lines.append(json.loads(self.format(record)))
+
+
+def build_app(sample_rate: float, slow_seconds: float = 0.5) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AccessLogMiddleware, sample_rate=sample_rate, slow_seconds=slow_seconds)
+
+    @app.get("/things/{item_id}")
+    async def get_thing(item_id: str):
+        return {"id": item_id}
+
+    @app.get("/slow")
+    async def slow():
+        time.sleep(0.02)
+        return {}
+
+    @app.get("/boom")
+    async def boom():
+        raise HTTPException(status_code=404, detail="missing")
+
+    return app
+
+
+@pytest.fixture
+def access_lines():
+    """Arranca el listener con un handler en memoria y devuelve sus líneas"""
+    stop_access_log()
+    handler = ListHandler()
+    start_access_log(handler)
+    yield handler.lines
+    stop_access_log()
+
+
+class TestAccessLogMiddleware:
+    """Tests del muestreo y del contenido de los registros"""
+
+    def test_record_fields(self, access_lines):
+        """Cada registro lleva ruta, status, latencias e item id"""
+        TestClient(build_app(sample_rate=1.0)).get("/things/abc")
+        stop_access_log()
+
+        [entry] = access_lines
+        assert entry["method"] == "GET"
+        assert entry["route"] == "/things/{item_id}"
+        assert entry["path"] == "/things/abc"
+        assert entry["status"] == 200
+        assert entry["item_id"] == "abc"
+        assert entry["latency_ms"] >= entry["upstream_ms"] == 0
+        assert entry["sample_rate"] == 1.0
+
+    def test_sampling_keeps_errors_and_slow_requests(self, access_lines):
+        """Con sample_rate=0 solo se registran errores y peticiones lentas"""
+        client = TestClient(build_app(sample_rate=0.0, slow_seconds=0.01))
+        for _ in range(20):
+            client.get("/things/abc")
+        client.get("/boom")
+        client.get("/slow")
+        stop_access_log()
+
+        assert sorted(entry["path"] for entry in access_lines) == ["/boom", "/slow"]
+
+    def test_full_queue_drops_instead_of_blocking(self, monkeypatch):
+        """Con la cola llena los registros se descartan y se cuentan"""
+        stop_access_log()
+        full = queue.Queue(maxsize=1)
+        full.put_nowait(None)
+        monkeypatch.setattr(access_logger.handlers[0], "queue", full)
+        dropped = access_log_dropped_total.value()
+
+        TestClient(build_app(sample_rate=1.0)).get("/things/abc")
+
+        assert access_log_dropped_total.value() == dropped + 1
+
+
+class TestInstrumentedItemRepository:
+    """Tests de la medición del tiempo upstream"""
+
+    async def test_upstream_time_is_added_to_request_context(self):
+        """Cada llamada al backend suma al contexto de la petición"""
+        repository = InstrumentedItemRepository(MemoryItemRepository())
+        context = RequestContext()
+        token = request_context.set(context)
+        try:
+            created = await repository.create({"name": "A", "description": "B", "price": 1.0, "tax": None})
+            await repository.get_by_id(created["id"])
+        finally:
+            request_context.reset(token)
+
+        assert context.upstream_calls == 2
+        assert context.upstream_seconds > 0
@@ -0,0 +1,120 @@
+"""
+Unit tests para el endpoint de peticiones en lote (POST /batch).
+"""
+
+import asyncio
+
+import pytest
+
+from config.settings import settings
+
+
+def create_op(op_id: str, sample_item_data: dict, **extra) -> dict:
+    return {"id": op_id, "method": "POST", "path": "/items", "body": sample_item_data, **extra}
+
+
+class TestBatchExecution:
+    """Tests de ejecución de lotes"""
+
+    def test_create_then_get_with_reference(self, client, memory_repository, sample_item_data):
+        """Una operación puede usar el resultado de otra en path y body"""
+        response = client.post("/batch", json={"operations": [
+            create_op("nuevo", sample_item_data),
+            {"id": "detalle", "method": "GET", "path": "/items/${nuevo.body.id}"},
+            {
+                "id": "copia",
+                "method": "PUT",
+                "path": "/items/${nuevo.body.id}",
+                "body": {
+                    "name": "Copia de ${nuevo.body.name}",
+                    "description": "${nuevo.body.description}",
+                    "price": "${nuevo.body.price}",
+                    "tax": None,
+                },
+            },
+            {"id": "lista", "method": "GET", "path": "/items?limit=5", "depends_on": ["copia"]},
+        ]})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["id"] for result in results] == ["nuevo", "detalle", "copia", "lista"]
+        assert all(result["status"] == 200 for result in results)
+
+        created = results[0]["body"]
+        assert results[1]["body"]["id"] == created["id"]
+        assert results[2]["body"]["name"] == f"Copia de {sample_item_data['name']}"
+        assert results[2]["body"]["price"] == sample_item_data["price"]
+        assert [item["name"] for item in results[3]["body"]] == [results[2]["body"]["name"]]
+
+    def test_failed_dependency_skips_dependents(self, client, memory_repository):
+        """Los dependientes de una operación fallida responden 424"""
+        missing = "123e4567-e89b-12d3-a456-426614174000"
+        response = client.post("/batch", json={"operations": [
+            {"id": "falla", "method": "GET", "path": f"/items/{missing}"},
+            {"id": "siguiente", "method": "DELETE", "path": "/items/${falla.body.id}"},
+            {"id": "independiente", "method": "GET", "path": "/items"},
+        ]})
+
+        statuses = {result["id"]: result["status"] for result in response.json()["results"]}
+        assert statuses["falla"] >= 400
+        assert statuses["siguiente"] == 424
+        assert statuses["independiente"] == 200
+
+    def test_invalid_sub_request_body_reports_422(self, client, memory_repository):
+        response = client.post("/batch", json={"operations": [
+            {"id": "malo", "method": "POST", "path": "/items", "body": {"name": "sin descripción"}},
+        ]})
+        [result] = response.json()["results"]
+        assert result["status"] == 422
+
+    def test_unresolved_reference(self, client, memory_repository, sample_item_data):
+        response = client.post("/batch", json={"operations": [
+            create_op("nuevo", sample_item_data),
+            {"id": "detalle", "method": "GET", "path": "/items/${nuevo.body.missing}"},
+        ]})
+        assert response.json()["results"][1]["status"] == 400
+
+
+class TestBatchValidation:
+    """Tests de validación del lote completo"""
+
+    @pytest.mark.parametrize("operations", [
+        [{"id": "a", "method": "GET", "path": "/batch"}],
+        [{"id": "a", "method": "GET", "path": "/items/../metrics"}],
+        [{"id": "a", "method": "GET", "path": "/items", "depends_on": ["b"]}],
+        [{"id": "a", "method": "GET", "path": "/items"}, {"id": "a", "method": "GET", "path": "/items"}],
+        [
+            {"id": "a", "method": "GET", "path": "/items/${b.body.id}"},
+            {"id": "b", "method": "GET", "path": "/items/${a.body.id}"},
+        ],
+    ])
+    def test_rejected_batches(self, client, memory_repository, operations):
+        assert client.post("/batch", json={"operations": operations}).status_code == 400
+
+    def test_operation_limit(self, client, memory_repository, monkeypatch):
+        monkeypatch.setattr(settings, "BATCH_MAX_OPERATIONS", 2)
+        operations = [{"id": str(i), "method": "GET", "path": "/items"} for i in range(3)]
+        assert client.post("/batch", json={"operations": operations}).status_code == 400
+
+
+class TestBatchConcurrency:
+    """Tests del límite de concurrencia"""
+
+    def test_independent_operations_run_concurrently_up_to_cap(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "BATCH_MAX_CONCURRENCY", 3)
+        running = peak = 0
+
+        async def fake_call_asgi(app, method, path, body=None, headers=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return 200, [], {}
+
+        monkeypatch.setattr("services.batch_service.batch_service.call_asgi", fake_call_asgi)
+        operations = [{"id": str(i), "method": "GET", "path": "/items"} for i in range(10)]
+        response = client.post("/batch", json={"operations": operations})
+
+        assert response.status_code == 200
+        assert peak == 3
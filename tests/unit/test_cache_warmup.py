@@ -0,0 +1,138 @@
+"""
+Unit tests del warm-up de cachés y del prefetch de la página siguiente.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+from main import app
+from services.cache_service import (
+    SWRCache,
+    item_cache,
+    item_list_cache,
+    load_hot_keys,
+    save_hot_keys,
+    start_item_cache,
+    start_item_list_cache,
+    stop_item_cache,
+    stop_item_list_cache,
+    warm_up,
+)
+
+
+class TestPrefetch:
+    """Tests de SWRCache.prefetch"""
+
+    async def test_prefetch_is_bounded_and_measured(self):
+        cache = SWRCache("test_prefetch_cache", fresh_ttl=10, stale_ttl=10, max_prefetch=1)
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "page"
+
+        assert cache.prefetch("a", slow) is True
+        assert cache.prefetch("a", slow) is False
+        assert cache.prefetch("b", slow) is False
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert (await cache.get("a", slow))[0] == "page"
+        assert cache.prefetch_hit_ratio == 1.0
+        # Ya está fresca: no se vuelve a pedir
+        assert cache.prefetch("a", slow) is False
+
+    async def test_hot_keys_orders_by_reads(self):
+        cache = SWRCache("test_hot_keys_cache", fresh_ttl=10, stale_ttl=10)
+
+        async def loader():
+            return 1
+
+        for key in ("a", "b", "b", "c", "b", "c"):
+            await cache.get(key, loader)
+        assert cache.hot_keys(2) == ["b", "c"]
+
+
+@pytest.fixture
+def caches(memory_repository):
+    """Conecta las cachés de páginas y de items a ItemService durante el test"""
+    start_item_list_cache()
+    start_item_cache()
+    yield
+    stop_item_cache()
+    stop_item_list_cache()
+
+
+class TestCachedEndpoints:
+    """Tests de prefetch e invalidación a través de la API"""
+
+    def test_full_page_prefetches_next_page(self, client, caches, sample_item_data):
+        for _ in range(3):
+            client.post("/items", json=sample_item_data)
+        client.get("/items?limit=2&offset=0")
+        # La carga anticipada corre en segundo plano: se espera a que termine
+        prefetch = item_list_cache._loads.get((2, 2, None, None))
+        if prefetch is not None:
+            client.portal.call(asyncio.wait, [prefetch])
+        assert (2, 2, None, None) in item_list_cache._entries
+        assert len(client.get("/items?limit=2&offset=2").json()) == 1
+        assert item_list_cache.prefetch_hit_ratio > 0
+
+    def test_item_cache_is_invalidated_by_update(self, client, caches, sample_item_data):
+        created = client.post("/items", json=sample_item_data).json()
+        assert client.get(f"/items/{created['id']}").json()["name"] == sample_item_data["name"]
+        assert created["id"] in item_cache._entries
+
+        client.put(f"/items/{created['id']}", json={**sample_item_data, "name": "Renamed"})
+        assert client.get(f"/items/{created['id']}").json()["name"] == "Renamed"
+
+
+class TestWarmUp:
+    """Tests de la carga de claves calientes"""
+
+    async def test_warm_up_loads_first_pages_and_hot_items(self, memory_repository):
+        created = await memory_repository.create({"name": "a", "description": "b", "price": 1.0, "tax": None})
+        list_cache = SWRCache("test_warmup_pages", fresh_ttl=10, stale_ttl=10)
+        cache = SWRCache("test_warmup_items", fresh_ttl=10, stale_ttl=10)
+        hot_keys = {"items": [created["id"], "not-a-uuid"], "pages": [(5, 0, 1.0, None)]}
+
+        loaded = await warm_up(memory_repository, list_cache, cache, hot_keys, 2, 10, 4)
+
+        assert loaded == 4
+        assert len(list_cache) == 3
+        assert len(cache) == 1
+
+    def test_hot_keys_round_trip(self, tmp_path):
+        path = str(tmp_path / "hot.json")
+        pages = SWRCache("test_round_trip_pages", fresh_ttl=10, stale_ttl=10)
+        pages._record_read((10, 0, None, 5.0))
+        items = SWRCache("test_round_trip_items", fresh_ttl=10, stale_ttl=10)
+        item_id = str(uuid.uuid4())
+        items._record_read(item_id)
+
+        save_hot_keys(path, pages, items, top_pages=10, top_items=10)
+        assert load_hot_keys(path) == {"items": [item_id], "pages": [(10, 0, None, 5.0)]}
+
+    def test_missing_or_corrupt_file_is_empty(self, tmp_path):
+        corrupt = tmp_path / "corrupt.json"
+        corrupt.write_text("{")
+        assert load_hot_keys(str(tmp_path / "missing.json")) == {"items": [], "pages": []}
+        assert load_hot_keys(str(corrupt)) == {"items": [], "pages": []}
+
+    def test_lifespan_warms_before_serving_and_records_on_shutdown(
+        self, memory_repository, monkeypatch, tmp_path
+    ):
+        path = tmp_path / "hot.json"
+        monkeypatch.setattr(settings, "ITEM_LIST_CACHE_ENABLED", True)
+        monkeypatch.setattr(settings, "CACHE_WARMUP_FILE", str(path))
+
+        with TestClient(app) as client:
+            assert len(item_list_cache) == settings.CACHE_WARMUP_FIRST_PAGES
+            client.get("/items?limit=3")
+
+        assert (3, 0, None, None) in load_hot_keys(str(path))["pages"]
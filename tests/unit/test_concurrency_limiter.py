@@ -0,0 +1,158 @@
+"""
+Unit tests del límite adaptativo de concurrencia hacia el backend.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from repositories import (
+    AdaptiveConcurrencyLimiter,
+    LimitedItemRepository,
+    MemoryItemRepository,
+    UpstreamOverloadedError,
+)
+from services import ItemService
+
+
+def saturate(limiter: AdaptiveConcurrencyLimiter, rtt: float, samples: int) -> None:
+    """Registra muestras como si el límite estuviera completamente en uso"""
+    for _ in range(samples):
+        limiter._in_flight = int(limiter.limit) + 1
+        limiter.release(rtt)
+    limiter._in_flight = 0
+
+
+class TestGradient:
+    """Tests del ajuste del límite"""
+
+    def test_grows_while_latency_is_stable(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=10, max_limit=100)
+        saturate(limiter, 0.01, 50)
+        assert limiter.limit > 20
+
+    def test_shrinks_when_latency_rises(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=10, max_limit=100)
+        saturate(limiter, 0.01, 50)
+        grown = limiter.limit
+        saturate(limiter, 0.2, 50)
+        assert limiter.limit < grown / 2
+
+    def test_does_not_grow_when_app_limited(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=10)
+        for _ in range(50):
+            limiter._in_flight = 1
+            limiter.release(0.01)
+        assert limiter.limit == 10
+
+    def test_drops_cut_the_limit(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=10, min_limit=8)
+        limiter._in_flight = 1
+        limiter.release(dropped=True)
+        assert limiter.limit == 9
+        for _ in range(5):
+            limiter._in_flight = 1
+            limiter.release(dropped=True)
+        assert limiter.limit == 8
+
+
+class TestQueue:
+    """Tests de la cola con plazos"""
+
+    async def test_waiters_get_slots_in_order(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, min_limit=1)
+        await limiter.acquire()
+        order = []
+
+        async def wait(name):
+            await limiter.acquire()
+            order.append(name)
+
+        tasks = [asyncio.create_task(wait(name)) for name in ("a", "b")]
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 2
+
+        limiter.release()
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b"]
+        assert limiter.in_flight == 1
+
+    async def test_full_queue_rejects_immediately(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, min_limit=1, max_queue=0)
+        await limiter.acquire()
+        with pytest.raises(UpstreamOverloadedError) as error:
+            await limiter.acquire()
+        assert error.value.status_code == 503
+        assert "Retry-After" in error.value.headers
+
+    async def test_deadline_rejects_and_leaves_queue(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, min_limit=1, queue_timeout=0.01)
+        await limiter.acquire()
+        with pytest.raises(UpstreamOverloadedError):
+            await limiter.acquire()
+        assert limiter.queue_depth == 0
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, min_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.queue_depth == 0
+
+    async def test_cancel_after_wake_hands_slot_to_next_waiter(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, min_limit=1)
+        await limiter.acquire()
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        # release() le da el turno a ``first``, que se cancela antes de correr
+        limiter.release()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        await asyncio.wait_for(second, timeout=1)
+        assert limiter.in_flight == 1
+        assert limiter.queue_depth == 0
+
+    async def test_slot_releases_on_errors(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=4, min_limit=1)
+        with pytest.raises(ConnectionError):
+            async with limiter.slot():
+                raise ConnectionError("reset")
+        assert limiter.in_flight == 0
+        assert limiter.limit == pytest.approx(3.6)
+
+
+class SlowMemoryRepository(MemoryItemRepository):
+    """Backend en memoria con latencia"""
+
+    async def get_by_id(self, item_id):
+        await asyncio.sleep(0.05)
+        return await super().get_by_id(item_id)
+
+
+class TestLimitedRepository:
+    """Tests de ItemService con el backend saturado"""
+
+    async def test_overload_surfaces_as_503(self, monkeypatch):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, min_limit=1, max_queue=1, queue_timeout=0.01)
+        writes = AdaptiveConcurrencyLimiter("test-writes", initial_limit=1)
+        repository = LimitedItemRepository(SlowMemoryRepository(), reads=limiter, writes=writes)
+        monkeypatch.setattr("repositories.item_repository.factory._item_repository", repository)
+
+        results = await asyncio.gather(
+            *(ItemService.get_item_by_id(uuid.uuid4()) for _ in range(3)), return_exceptions=True
+        )
+        statuses = sorted(result.status_code for result in results)
+        # La primera llega al backend (404 -> 400 del servicio); el resto se rechaza
+        assert statuses == [400, 503, 503]
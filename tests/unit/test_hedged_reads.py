@@ -0,0 +1,236 @@
+"""
+Unit tests de las lecturas con cobertura (hedging).
+"""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from repositories import (
+    AdaptiveConcurrencyLimiter,
+    HedgedItemRepository,
+    LimitedItemRepository,
+    MemoryItemRepository,
+    ReadHedger,
+    RoutingItemRepository,
+)
+from repositories.item_repository.hedging import HedgeBudget, LatencyTracker
+
+
+def primed(threshold: float = 0.01, budget_ratio: float = 1.0, limiter=None) -> ReadHedger:
+    """Hedger con el umbral de get_by_id ya calculado"""
+    hedger = ReadHedger(percentile=95, budget_ratio=budget_ratio, min_samples=10, limiter=limiter)
+    for _ in range(50):
+        hedger.tracker("get_by_id").record(threshold)
+    return hedger
+
+
+class SlowMemoryRepository(MemoryItemRepository):
+    """Repositorio en memoria con latencias programadas para get_by_id"""
+
+    def __init__(self, rows: dict = None, latencies: list = None):
+        super().__init__()
+        if rows is not None:
+            self._rows = rows
+        self.latencies = list(latencies or [])
+        self.calls = 0
+        self.cancelled = 0
+
+    async def get_by_id(self, item_id):
+        self.calls += 1
+        latency = self.latencies.pop(0) if self.latencies else 0
+        try:
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return await super().get_by_id(item_id)
+
+    async def replication_position(self):
+        return 0
+
+
+class TestLatencyTracker:
+    """Tests del percentil móvil"""
+
+    def test_no_threshold_until_min_samples(self):
+        tracker = LatencyTracker(95, min_samples=100, refresh_every=10)
+        for _ in range(99):
+            tracker.record(0.01)
+        assert tracker.threshold is None
+        tracker.record(0.01)
+        assert tracker.threshold == 0.01
+
+    def test_threshold_follows_percentile(self):
+        tracker = LatencyTracker(90, window=100, min_samples=10, refresh_every=100)
+        for value in range(100):
+            tracker.record(value / 1000)
+        assert tracker.threshold == pytest.approx(0.09)
+
+
+class TestHedgeBudget:
+    """Tests del presupuesto de coberturas"""
+
+    def test_caps_hedges_to_ratio(self):
+        budget = HedgeBudget(0.25)
+        granted = 0
+        for _ in range(1000):
+            budget.deposit()
+            granted += budget.withdraw()
+        assert granted == 250
+
+
+class TestHedgedItemRepository:
+    """Tests de la carrera entre la llamada original y la cobertura"""
+
+    async def _create(self, repository):
+        return await repository.create({"name": "Hedged", "description": "d", "price": 1.0, "tax": None})
+
+    async def test_fast_reads_are_not_hedged(self):
+        inner = SlowMemoryRepository()
+        created = await self._create(inner)
+        repository = HedgedItemRepository(inner, primed())
+
+        assert (await repository.get_by_id(uuid.UUID(created["id"])))["id"] == created["id"]
+        assert inner.calls == 1
+
+    async def test_slow_read_is_hedged_and_loser_cancelled(self):
+        inner = SlowMemoryRepository(latencies=[5, 0])
+        created = await self._create(inner)
+        repository = HedgedItemRepository(inner, primed())
+
+        start = time.perf_counter()
+        found = await repository.get_by_id(uuid.UUID(created["id"]))
+        assert found["id"] == created["id"]
+        assert time.perf_counter() - start < 1
+        await asyncio.sleep(0)
+        assert inner.calls == 2
+        assert inner.cancelled == 1
+
+    async def test_exhausted_budget_waits_for_original(self):
+        inner = SlowMemoryRepository(latencies=[0.05])
+        created = await self._create(inner)
+        repository = HedgedItemRepository(inner, primed(budget_ratio=0))
+
+        assert (await repository.get_by_id(uuid.UUID(created["id"])))["id"] == created["id"]
+        assert inner.calls == 1
+
+    async def test_original_failure_after_hedge_uses_hedge(self):
+        hedger = primed()
+
+        async def first():
+            await asyncio.sleep(0.02)
+            raise ConnectionError("reset")
+
+        async def second():
+            await asyncio.sleep(0.05)
+            return "hedge"
+
+        assert await hedger.run("get_by_id", first, second) == "hedge"
+
+    async def test_both_failing_raises_original_error(self):
+        hedger = primed()
+
+        async def first():
+            await asyncio.sleep(0.02)
+            raise ConnectionError("first")
+
+        async def second():
+            raise TimeoutError("second")
+
+        with pytest.raises(ConnectionError, match="first"):
+            await hedger.run("get_by_id", first, second)
+
+
+class TestHedgeLimiter:
+    """Tests de las coberturas bajo el limitador de lecturas"""
+
+    async def test_hedge_takes_and_returns_a_read_slot(self):
+        inner = SlowMemoryRepository(latencies=[5, 0])
+        created = await inner.create({"name": "Hedged", "description": "d", "price": 1.0, "tax": None})
+        reads = AdaptiveConcurrencyLimiter("reads", initial_limit=2)
+        repository = LimitedItemRepository(
+            HedgedItemRepository(inner, primed(limiter=reads)),
+            reads=reads,
+            writes=AdaptiveConcurrencyLimiter("writes"),
+        )
+
+        slots = []
+        original_acquire = reads.try_acquire
+
+        def spy():
+            taken = original_acquire()
+            slots.append(reads.in_flight)
+            return taken
+
+        reads.try_acquire = spy
+        found = await repository.get_by_id(uuid.UUID(created["id"]))
+        assert found["id"] == created["id"]
+        assert inner.calls == 2
+        # La lectura original y la cobertura ocupaban un turno cada una
+        assert slots[-1] == 2
+        await asyncio.sleep(0.01)
+        assert reads.in_flight == 0
+
+    async def test_full_limiter_skips_the_hedge(self):
+        inner = SlowMemoryRepository(latencies=[0.05])
+        created = await inner.create({"name": "Hedged", "description": "d", "price": 1.0, "tax": None})
+        reads = AdaptiveConcurrencyLimiter("reads", initial_limit=1)
+        repository = LimitedItemRepository(
+            HedgedItemRepository(inner, primed(limiter=reads)),
+            reads=reads,
+            writes=AdaptiveConcurrencyLimiter("writes"),
+        )
+
+        found = await repository.get_by_id(uuid.UUID(created["id"]))
+        assert found["id"] == created["id"]
+        assert inner.calls == 1
+        assert reads.in_flight == 0
+
+    async def test_cancelled_hedge_returns_its_slot(self):
+        reads = AdaptiveConcurrencyLimiter("reads", initial_limit=2)
+        hedger = primed(limiter=reads)
+
+        async def first():
+            await asyncio.sleep(0.02)
+            return "original"
+
+        async def second():
+            await asyncio.sleep(5)
+            return "hedge"
+
+        assert await hedger.run("get_by_id", first, second) == "original"
+        # La cancelación y el callback de la tarea perdedora tardan dos vueltas del loop
+        await asyncio.sleep(0.01)
+        assert reads.in_flight == 0
+
+
+class TestHedgedRouting:
+    """Tests de coberturas con réplicas de lectura"""
+
+    async def test_hedge_goes_to_another_replica(self):
+        primary = SlowMemoryRepository()
+        created = await primary.create({"name": "Hedged", "description": "d", "price": 1.0, "tax": None})
+        slow = SlowMemoryRepository(primary._rows, latencies=[5])
+        fast = SlowMemoryRepository(primary._rows)
+        routing = RoutingItemRepository(primary, [slow, fast], health_interval=3600, hedger=primed())
+        try:
+            found = await routing.get_by_id(uuid.UUID(created["id"]))
+            assert found["id"] == created["id"]
+            assert (slow.calls, fast.calls, primary.calls) == (1, 1, 0)
+        finally:
+            await routing.close()
+
+    async def test_single_replica_hedges_on_primary(self):
+        primary = SlowMemoryRepository()
+        created = await primary.create({"name": "Hedged", "description": "d", "price": 1.0, "tax": None})
+        replica = SlowMemoryRepository(primary._rows, latencies=[5])
+        routing = RoutingItemRepository(primary, [replica], health_interval=3600, hedger=primed())
+        try:
+            found = await routing.get_by_id(uuid.UUID(created["id"]))
+            assert found["id"] == created["id"]
+            assert (replica.calls, primary.calls) == (1, 1)
+        finally:
+            await routing.close()
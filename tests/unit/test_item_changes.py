@@ -0,0 +1,105 @@
+"""
+Unit tests para GET /items/changes (sincronización incremental).
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from config.settings import settings
+from services.sync_service import decode_sync_token, encode_sync_token
+
+
+@pytest.fixture(autouse=True)
+def no_settle(monkeypatch):
+    """Sin ventana de asentamiento para ver los cambios recién hechos"""
+    monkeypatch.setattr(settings, "ITEM_CHANGES_SETTLE_SECONDS", 0)
+
+
+def sync(client, token=None, limit=100):
+    """Consume todas las tandas desde ``token`` y devuelve (items, borrados, token)"""
+    items, deleted = [], []
+    while True:
+        params = {"limit": limit, **({"since": token} if token else {})}
+        body = client.get("/items/changes", params=params).json()
+        items += body["items"]
+        deleted += body["deleted"]
+        token = body["next_token"]
+        if not body["has_more"]:
+            return items, deleted, token
+
+
+class TestSyncToken:
+    """Tests del token de sincronización"""
+
+    def test_round_trip(self):
+        now = datetime.now(timezone.utc)
+        watermark = (now.isoformat(), "123e4567-e89b-12d3-a456-426614174000")
+        assert decode_sync_token(encode_sync_token(watermark, None, now)) == (watermark, None, now)
+
+    @pytest.mark.parametrize("token", ["garbage", encode_sync_token(("not-a-date", "x"), None, datetime.now())])
+    def test_invalid_token_returns_400(self, client, memory_repository, token):
+        assert client.get("/items/changes", params={"since": token}).status_code == 400
+
+    def test_expired_token_returns_410(self, client, memory_repository):
+        old = datetime.now(timezone.utc) - timedelta(days=settings.ITEM_TOMBSTONE_RETENTION_DAYS + 1)
+        response = client.get("/items/changes", params={"since": encode_sync_token(None, None, old)})
+        assert response.status_code == 410
+
+    def test_has_more_chain_expires_from_its_start(self, client, memory_repository, sample_item_data, monkeypatch):
+        """Una cadena con has_more que se reanuda tras la poda da 410 aunque su última tanda sea reciente"""
+        for _ in range(3):
+            client.delete(f"/items/{client.post('/items', json=sample_item_data).json()['id']}")
+        started = datetime.now(timezone.utc) - timedelta(days=settings.ITEM_TOMBSTONE_RETENTION_DAYS - 1)
+
+        body = client.get("/items/changes", params={"since": encode_sync_token(None, None, started), "limit": 1}).json()
+        assert body["has_more"] is True
+        assert decode_sync_token(body["next_token"])[2] == started
+
+        # Pasan dos días: la poda alcanza lápidas posteriores al inicio de la cadena
+        monkeypatch.setattr(settings, "ITEM_TOMBSTONE_RETENTION_DAYS", settings.ITEM_TOMBSTONE_RETENTION_DAYS - 2)
+        response = client.get("/items/changes", params={"since": body["next_token"], "limit": 1})
+        assert response.status_code == 410
+
+    def test_completed_chain_gets_a_fresh_token(self, client, memory_repository, sample_item_data):
+        """La última tanda de una cadena vuelve a fechar el token"""
+        client.post("/items", json=sample_item_data)
+        started = datetime.now(timezone.utc) - timedelta(days=1)
+        _, _, token = sync(client, encode_sync_token(None, None, started))
+        assert decode_sync_token(token)[2] > started
+
+
+class TestItemChanges:
+    """Tests del endpoint de cambios"""
+
+    def test_initial_sync_returns_everything_in_chunks(self, client, memory_repository, sample_item_data):
+        ids = [client.post("/items", json=sample_item_data).json()["id"] for _ in range(5)]
+        first = client.get("/items/changes", params={"limit": 2}).json()
+        assert len(first["items"]) == 2 and first["has_more"] is True
+
+        items, deleted, _ = sync(client, limit=2)
+        assert [item["id"] for item in items] == ids
+        assert deleted == []
+
+    def test_delta_contains_updates_creates_and_tombstones(self, client, memory_repository, sample_item_data):
+        ids = [client.post("/items", json=sample_item_data).json()["id"] for _ in range(3)]
+        _, _, token = sync(client)
+
+        client.put(f"/items/{ids[0]}", json={**sample_item_data, "name": "Changed"})
+        client.delete(f"/items/{ids[1]}")
+        new_id = client.post("/items", json=sample_item_data).json()["id"]
+
+        items, deleted, token = sync(client, token)
+        assert [item["id"] for item in items] == [ids[0], new_id]
+        assert items[0]["name"] == "Changed"
+        assert [tombstone["id"] for tombstone in deleted] == [ids[1]]
+
+        assert sync(client, token)[:2] == ([], [])
+
+    def test_unsettled_changes_are_deferred(self, client, memory_repository, sample_item_data, monkeypatch):
+        monkeypatch.setattr(settings, "ITEM_CHANGES_SETTLE_SECONDS", 3600)
+        client.post("/items", json=sample_item_data)
+        body = client.get("/items/changes").json()
+        assert body["items"] == [] and body["has_more"] is False
+        # Sin cambios asentados el token no avanza
+        assert decode_sync_token(body["next_token"])[:2] == (None, None)
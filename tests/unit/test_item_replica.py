@@ -0,0 +1,159 @@
+"""
+Unit tests para la réplica de lectura columnar en memoria.
+"""
+
+import sys
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from models import ItemCreate
+from services import ItemService
+from services.replica_service import ColumnarItemTable, ItemReplica
+
+
+def make_row(index: int, price=None, created_at="2024-01-01T00:00:00+00:00") -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "name": f"Item {index}",
+        "description": "Replica test item",
+        "price": price,
+        "tax": 21.0,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+@pytest.fixture
+def replica(memory_repository):
+    """Réplica conectada a ItemService durante el test"""
+    item_replica = ItemReplica(batch_size=2, overlap_seconds=0)
+    ItemService.add_change_listener(item_replica)
+    ItemService.set_read_replica(item_replica)
+    yield item_replica
+    ItemService.set_read_replica(None)
+    ItemService.remove_change_listener(item_replica)
+
+
+class TestColumnarItemTable:
+    """Tests de la estructura columnar"""
+
+    def test_upsert_and_get_roundtrip(self):
+        table = ColumnarItemTable()
+        row = make_row(1, price=9.5, created_at="2024-05-01T10:20:30.123456+00:00")
+        table.upsert(row)
+
+        assert len(table) == 1
+        assert table.get(uuid.UUID(row["id"])) == row
+        assert table.get(uuid.uuid4()) is None
+
+    def test_page_is_ordered_by_created_at(self):
+        table = ColumnarItemTable()
+        late = make_row(1, created_at="2024-03-01T00:00:00+00:00")
+        early = make_row(2, created_at="2024-01-01T00:00:00+00:00")
+        middle = make_row(3, created_at="2024-02-01T00:00:00+00:00")
+        for row in (late, early, middle):
+            table.upsert(row)
+
+        assert [row["id"] for row in table.page(10, 0)] == [early["id"], middle["id"], late["id"]]
+        assert [row["id"] for row in table.page(1, 1)] == [middle["id"]]
+        assert set(table.page(1, 0)[0]) == {"id", "name", "description", "price", "tax"}
+
+    def test_page_price_filters(self):
+        table = ColumnarItemTable()
+        for index, price in enumerate([None, 1.0, 5.0, 9.0, 12.0]):
+            table.upsert(make_row(index, price=price, created_at=f"2024-01-0{index + 1}T00:00:00+00:00"))
+
+        assert [row["price"] for row in table.page(10, 0, min_price=5.0, max_price=9.0)] == [5.0, 9.0]
+        assert [row["price"] for row in table.page(1, 1, min_price=0.0)] == [5.0]
+
+    def test_delete_reuses_slot(self):
+        table = ColumnarItemTable()
+        first, second = make_row(1), make_row(2)
+        table.upsert(first)
+        assert table.delete(first["id"]) is True
+        assert table.delete(first["id"]) is False
+        table.upsert(second)
+
+        assert len(table) == 1
+        assert table.page(10, 0)[0]["id"] == second["id"]
+        assert len(table._prices) == 1
+
+    def test_bulk_load_and_incremental_index(self):
+        """Carga masiva + upserts que fuerzan reconstrucciones del índice"""
+        table = ColumnarItemTable()
+        bulk = [make_row(i, created_at=f"2024-01-01T00:00:{i % 60:02d}+00:00") for i in range(3_000)]
+        table.extend(reversed(bulk))
+        table.finalize()
+        extra = [make_row(i, created_at="2024-02-01T00:00:00+00:00") for i in range(2_000)]
+        for row in extra:
+            table.upsert(row)
+
+        assert len(table) == 5_000
+        assert all(table.get(row["id"])["name"] == row["name"] for row in bulk + extra)
+        created = [table.get(row["id"])["created_at"] for row in table.page(5_000, 0)]
+        assert created == sorted(created)
+
+    def test_uses_less_memory_than_list_of_dicts(self):
+        rows = [make_row(i, price=float(i)) for i in range(5_000)]
+        table = ColumnarItemTable()
+        for row in rows:
+            table.upsert(row)
+
+        dict_size = sys.getsizeof(rows) + sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values()) for row in rows
+        )
+        assert table.memory_usage() < dict_size / 2
+
+
+class TestItemReplica:
+    """Tests de carga, sincronización y lecturas desde ItemService"""
+
+    async def test_load_and_pull(self, replica, memory_repository):
+        data = {"name": "Item", "description": "Replica test item", "price": 1.0, "tax": None}
+        created = [await memory_repository.create(data) for _ in range(3)]
+        assert await replica.load(memory_repository) == 3
+        assert replica.ready
+
+        # Cambio hecho por otro worker directamente en el backend
+        await memory_repository.update(uuid.UUID(created[0]["id"]), {"name": "Renamed"})
+        new = await memory_repository.create(data)
+        assert await replica.pull(memory_repository) == 2
+
+        assert replica.get(created[0]["id"])["name"] == "Renamed"
+        assert replica.get(new["id"]) is not None
+
+    async def test_reads_are_served_from_replica(self, replica, memory_repository):
+        created = await ItemService.create_item(ItemCreate(name="A", description="a", price=3.0))
+        await replica.load(memory_repository)
+
+        # Borrado directo en el backend: la réplica sigue respondiendo sin consultarlo
+        await memory_repository.delete(uuid.UUID(created["id"]))
+
+        assert (await ItemService.get_item_by_id(uuid.UUID(created["id"])))["name"] == "A"
+        assert len(await ItemService.get_items(10, 0, min_price=1.0)) == 1
+
+    async def test_local_writes_apply_immediately(self, replica, memory_repository):
+        await replica.load(memory_repository)
+        created = await ItemService.create_item(ItemCreate(name="B", description="b"))
+        assert replica.get(created["id"])["name"] == "B"
+
+        await ItemService.delete_item(uuid.UUID(created["id"]))
+        assert replica.get(created["id"]) is None
+
+
+class TestGetItemsFilters:
+    """Tests de los filtros de precio en GET /items"""
+
+    def test_filter_by_price_range(self, client: TestClient, memory_repository):
+        for price in (1.0, 5.0, 20.0):
+            client.post("/items", json={"name": "F", "description": "f", "price": price})
+
+        response = client.get("/items?min_price=2&max_price=10")
+
+        assert response.status_code == 200
+        assert [item["price"] for item in response.json()] == [5.0]
+
+    def test_negative_min_price(self, client: TestClient):
+        assert client.get("/items?min_price=-1").status_code == 422
@@ -0,0 +1,264 @@
+"""
+Tests de conformidad para los backends de ItemRepository.
+
+La misma batería de tests se ejecuta contra cada backend:
+- memory: siempre
+- sharded: tres shards en memoria detrás de ShardedItemRepository
+- postgres: solo si TEST_POSTGRES_DSN apunta a una base de datos de prueba
+- supabase: solo como test de integración (pytest -m integration)
+"""
+
+import os
+import uuid
+
+import pytest
+
+from repositories import (
+    MemoryItemRepository,
+    PostgresItemRepository,
+    ShardedItemRepository,
+    SupabaseItemRepository,
+)
+from repositories.item_repository import ALL_COLUMNS, LIST_COLUMNS
+
+
+TEST_POSTGRES_DSN = os.getenv("TEST_POSTGRES_DSN")
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS items (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        name TEXT NOT NULL,
+        description TEXT NOT NULL,
+        price NUMERIC,
+        tax NUMERIC,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+    )
+"""
+
+
+@pytest.fixture(params=[
+    "memory",
+    "sharded",
+    pytest.param("postgres", marks=[
+        pytest.mark.integration,
+        pytest.mark.skipif(not TEST_POSTGRES_DSN, reason="TEST_POSTGRES_DSN no configurado"),
+    ]),
+    pytest.param("supabase", marks=pytest.mark.integration),
+])
+async def repository(request):
+    """
+    Fixture parametrizada que proporciona cada backend de items.
+
+    Yields:
+        ItemRepository: Backend listo para usar
+    """
+    if request.param == "memory":
+        repo = MemoryItemRepository()
+    elif request.param == "sharded":
+        repo = ShardedItemRepository({name: MemoryItemRepository() for name in ("a", "b", "c")})
+    elif request.param == "postgres":
+        repo = PostgresItemRepository(TEST_POSTGRES_DSN)
+        pool = await repo._get_pool()
+        await pool.execute(CREATE_TABLE_SQL)
+    else:
+        repo = SupabaseItemRepository()
+
+    yield repo
+    await repo.close()
+
+
+@pytest.fixture
+def item_data():
+    """Datos de un item con nombre único para no chocar con otros tests"""
+    return {
+        "name": f"Repo Test {uuid.uuid4().hex[:8]}",
+        "description": "Item creado por los tests de conformidad",
+        "price": 10.5,
+        "tax": 21.0,
+    }
+
+
+class TestItemRepositoryConformance:
+    """Contrato común que deben cumplir todos los backends"""
+
+    async def test_create_returns_full_row(self, repository, item_data):
+        created = await repository.create(item_data)
+        try:
+            assert set(ALL_COLUMNS) <= set(created)
+            assert isinstance(created["id"], str)
+            uuid.UUID(created["id"])
+            assert created["name"] == item_data["name"]
+            assert created["price"] == item_data["price"]
+            assert created["tax"] == item_data["tax"]
+        finally:
+            await repository.delete(created["id"])
+
+    async def test_create_with_null_price_and_tax(self, repository, item_data):
+        created = await repository.create({**item_data, "price": None, "tax": None})
+        try:
+            assert created["price"] is None
+            assert created["tax"] is None
+        finally:
+            await repository.delete(created["id"])
+
+    async def test_get_by_id(self, repository, item_data):
+        created = await repository.create(item_data)
+        try:
+            found = await repository.get_by_id(uuid.UUID(created["id"]))
+            assert found["id"] == created["id"]
+            assert found["description"] == item_data["description"]
+        finally:
+            await repository.delete(created["id"])
+
+    async def test_get_by_id_missing_returns_none(self, repository):
+        assert await repository.get_by_id(uuid.uuid4()) is None
+
+    async def test_get_page_respects_limit_and_columns(self, repository, item_data):
+        created = [await repository.create(item_data) for _ in range(3)]
+        try:
+            page = await repository.get_page(2, 0)
+            assert len(page) == 2
+            for row in page:
+                assert set(row) == set(LIST_COLUMNS)
+        finally:
+            for row in created:
+                await repository.delete(row["id"])
+
+    async def test_update(self, repository, item_data):
+        created = await repository.create(item_data)
+        try:
+            changes = {**item_data, "name": "Renamed", "price": 20.0}
+            updated = await repository.update(uuid.UUID(created["id"]), changes)
+            assert updated["id"] == created["id"]
+            assert updated["name"] == "Renamed"
+            assert updated["price"] == 20.0
+            assert (await repository.get_by_id(uuid.UUID(created["id"])))["name"] == "Renamed"
+        finally:
+            await repository.delete(created["id"])
+
+    async def test_update_missing_returns_none(self, repository, item_data):
+        assert await repository.update(uuid.uuid4(), item_data) is None
+
+    async def test_delete_returns_deleted_row(self, repository, item_data):
+        created = await repository.create(item_data)
+        deleted = await repository.delete(uuid.UUID(created["id"]))
+        assert deleted["id"] == created["id"]
+        assert await repository.get_by_id(uuid.UUID(created["id"])) is None
+
+    async def test_delete_missing_returns_none(self, repository):
+        assert await repository.delete(uuid.uuid4()) is None
+
+    async def test_aggregate_reflects_new_rows(self, repository, item_data):
+        edges = [0, 10, 100]
+        before = await repository.aggregate(edges, edges)
+        created = await repository.create({**item_data, "price": 12.5, "tax": None})
+        try:
+            after = await repository.aggregate(edges, edges)
+            assert after["count"] == before["count"] + 1
+            assert after["price"]["count"] == before["price"]["count"] + 1
+            assert after["price"]["sum"] == pytest.approx(before["price"]["sum"] + 12.5)
+            assert after["tax"]["count"] == before["tax"]["count"]
+            assert after["price_histogram"][1] == before["price_histogram"][1] + 1
+            assert len(after["tax_histogram"]) == len(edges)
+        finally:
+            await repository.delete(created["id"])
+
+    async def test_get_many_skips_missing_ids(self, repository, item_data):
+        created = [await repository.create(item_data) for _ in range(2)]
+        try:
+            ids = [uuid.UUID(row["id"]) for row in created] + [uuid.uuid4()]
+            found = await repository.get_many(ids)
+            assert sorted(row["id"] for row in found) == sorted(row["id"] for row in created)
+            assert await repository.get_many([]) == []
+        finally:
+            for row in created:
+                await repository.delete(row["id"])
+
+    async def test_get_page_price_filters(self, repository, item_data):
+        marker = uuid.uuid4().hex
+        prices = [None, 1.0, 5.0, 9.0]
+        created = [
+            await repository.create({**item_data, "description": marker, "price": price})
+            for price in prices
+        ]
+        try:
+            page = await repository.get_page(1000, 0, min_price=4.0, max_price=9.0)
+            assert sorted(row["price"] for row in page if row["description"] == marker) == [5.0, 9.0]
+            page = await repository.get_page(1000, 0, min_price=0.0)
+            assert len([row for row in page if row["description"] == marker]) == 3
+        finally:
+            for row in created:
+                await repository.delete(row["id"])
+
+    async def test_get_changed_since_walks_keyset(self, repository, item_data):
+        created = [await repository.create(item_data) for _ in range(3)]
+        try:
+            seen = []
+            watermark = None
+            while True:
+                batch = await repository.get_changed_since(watermark, 2)
+                if not batch:
+                    break
+                seen.extend(row["id"] for row in batch)
+                watermark = (batch[-1]["updated_at"], batch[-1]["id"])
+            assert {row["id"] for row in created} <= set(seen)
+            assert len(seen) == len(set(seen))
+
+            updated = await repository.update(uuid.UUID(created[0]["id"]), {**item_data, "name": "Changed"})
+            changed = await repository.get_changed_since(watermark, 10)
+            assert [row["id"] for row in changed] == [updated["id"]]
+            assert changed[0]["name"] == "Changed"
+        finally:
+            for row in created:
+                await repository.delete(row["id"])
+
+    async def test_get_full_page_is_ordered_with_all_columns(self, repository, item_data):
+        created = [await repository.create(item_data) for _ in range(3)]
+        try:
+            page = await repository.get_full_page(1000, 0)
+            assert set(ALL_COLUMNS) <= set(page[0])
+            keys = [(row["created_at"], row["id"]) for row in page]
+            assert keys == sorted(keys)
+            assert [row["id"] for row in await repository.get_full_page(2, 1)] == [row["id"] for row in page[1:3]]
+        finally:
+            for row in created:
+                await repository.delete(row["id"])
+
+    async def test_create_with_given_id(self, repository, item_data):
+        item_id = str(uuid.uuid4())
+        created = await repository.create({**item_data, "id": item_id})
+        try:
+            assert created["id"] == item_id
+            assert (await repository.get_by_id(uuid.UUID(item_id)))["name"] == item_data["name"]
+        finally:
+            await repository.delete(item_id)
+
+    async def test_put_keeps_id_and_timestamps(self, repository, item_data):
+        created = await repository.create(item_data)
+        await repository.delete(uuid.UUID(created["id"]))
+        try:
+            stored = await repository.put(created)
+            assert stored["id"] == created["id"]
+            found = await repository.get_by_id(uuid.UUID(created["id"]))
+            assert found["created_at"] == created["created_at"]
+            assert found["updated_at"] == created["updated_at"]
+        finally:
+            await repository.delete(created["id"])
+
+    async def test_get_deleted_since_records_tombstones(self, repository, item_data):
+        before = await repository.get_deleted_since(None, 100000)
+        watermark = (before[-1]["deleted_at"], before[-1]["id"]) if before else None
+        created = await repository.create(item_data)
+        await repository.delete(uuid.UUID(created["id"]))
+
+        tombstones = await repository.get_deleted_since(watermark, 10)
+        assert [tombstone["id"] for tombstone in tombstones] == [created["id"]]
+        assert await repository.get_deleted_since((tombstones[0]["deleted_at"], tombstones[0]["id"]), 10) == []
+
+        # Reinsertar el mismo id quita la lápida
+        await repository.put(created)
+        try:
+            assert await repository.get_deleted_since(watermark, 10) == []
+        finally:
+            await repository.delete(created["id"])
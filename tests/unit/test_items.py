@@ -243,6 +243,36 @@ class TestGetItem:
         assert response.status_code == 422  # Validation error
 
 
+class TestLookupItems:
+    """Tests para POST /items/lookup"""
+
+    def test_lookup_keeps_order_and_skips_missing(self, client: TestClient, memory_repository, sample_item_data):
+        """
+        Test que verifica que la búsqueda en bloque devuelve los items pedidos en orden.
+
+        Args:
+            client: TestClient fixture
+            memory_repository: Backend en memoria
+            sample_item_data: Datos de ejemplo
+        """
+        ids = [client.post("/items", json=sample_item_data).json()["id"] for _ in range(3)]
+        requested = [ids[2], "123e4567-e89b-12d3-a456-426614174999", ids[0], ids[2]]
+
+        response = client.post("/items/lookup", json={"ids": requested})
+
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()] == [ids[2], ids[0]]
+
+    def test_lookup_requires_ids(self, client: TestClient):
+        """
+        Test que verifica que una búsqueda sin ids es inválida.
+
+        Args:
+            client: TestClient fixture
+        """
+        assert client.post("/items/lookup", json={"ids": []}).status_code == 422
+
+
 class TestUpdateItem:
     """Tests para el endpoint PUT /items/{item_id}"""
 
@@ -0,0 +1,155 @@
+"""
+Unit tests del cliente asíncrono de la API (items_client).
+
+El cliente habla con la app en proceso a través de httpx.ASGITransport.
+"""
+
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from config.settings import settings
+from db import CONSISTENCY_TOKEN_HEADER
+from items_client import CONSISTENCY_TOKEN_HEADER as CLIENT_CONSISTENCY_TOKEN_HEADER
+from items_client import ROUTES, ItemNotFoundError, ItemsAPIError, ItemsClient
+from main import app
+from models import ChangedItem, Item, ItemBase
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transporte ASGI que guarda cada petición enviada"""
+
+    def __init__(self):
+        self._inner = httpx.ASGITransport(app=app)
+        self.requests: list[httpx.Request] = []
+
+    async def handle_async_request(self, request):
+        self.requests.append(request)
+        return await self._inner.handle_async_request(request)
+
+
+@pytest.fixture
+def transport(memory_repository, monkeypatch):
+    """Transporte contra la app con el backend en memoria"""
+    monkeypatch.setattr(settings, "ITEM_CHANGES_SETTLE_SECONDS", 0)
+    return RecordingTransport()
+
+
+@pytest.fixture
+async def items_client(transport):
+    """Cliente de la API conectado a la app en proceso"""
+    async with ItemsClient("http://test", transport=transport, backoff=0) as client:
+        yield client
+
+
+def _response_schema(operation: dict) -> dict:
+    return operation["responses"]["200"]["content"]["application/json"]["schema"]
+
+
+class TestRoutesMatchOpenAPI:
+    """La tabla de operaciones del cliente debe coincidir con el esquema de la app"""
+
+    def test_routes_exist_with_same_response_model(self):
+        paths = app.openapi()["paths"]
+        for name, route in ROUTES.items():
+            operation = paths.get(route.path, {}).get(route.method.lower())
+            assert operation is not None, f"{name}: {route.method} {route.path} no existe"
+            if route.response is None:
+                continue
+            schema = _response_schema(operation)
+            model = getattr(route.response, "__args__", (route.response,))[0]
+            reference = schema["items"]["$ref"] if schema.get("type") == "array" else schema["$ref"]
+            assert reference.rsplit("/", 1)[-1] == model.__name__, name
+
+    def test_consistency_header_matches_server(self):
+        assert CLIENT_CONSISTENCY_TOKEN_HEADER == CONSISTENCY_TOKEN_HEADER
+
+
+class TestItemsClient:
+    """Tests de las operaciones del cliente"""
+
+    async def test_crud_round_trip_is_typed(self, items_client, sample_item_data):
+        created = await items_client.create_item(sample_item_data)
+        assert isinstance(created, ItemBase)
+
+        updated = await items_client.update_item(created.id, {**sample_item_data, "name": "Renamed"})
+        assert isinstance(updated, Item)
+        assert (await items_client.get_item(str(created.id))).name == "Renamed"
+
+        await items_client.delete_item(created.id)
+        with pytest.raises(ItemNotFoundError):
+            await items_client.get_item(created.id)
+
+    async def test_concurrent_gets_fold_into_one_lookup(self, items_client, transport, sample_item_data):
+        created = [await items_client.create_item(sample_item_data) for _ in range(5)]
+        transport.requests.clear()
+
+        ids = [item.id for item in created] + [created[0].id]
+        found = await asyncio.gather(*(items_client.get_item(item_id) for item_id in ids))
+
+        assert [item.id for item in found] == ids
+        assert [(request.method, request.url.path) for request in transport.requests] == [("POST", "/items/lookup")]
+
+    async def test_missing_id_fails_only_its_caller(self, items_client, sample_item_data):
+        created = await items_client.create_item(sample_item_data)
+        found, missing = await asyncio.gather(
+            items_client.get_item(created.id), items_client.get_item(uuid.uuid4()), return_exceptions=True
+        )
+        assert found.id == created.id
+        assert isinstance(missing, ItemNotFoundError)
+
+    async def test_iter_items_walks_all_pages(self, items_client, sample_item_data):
+        created = [await items_client.create_item(sample_item_data) for _ in range(5)]
+        seen = [item.id async for item in items_client.iter_items(page_size=2)]
+        assert seen == [item.id for item in created]
+
+    async def test_export_follows_changes_cursor(self, items_client, transport, sample_item_data):
+        created = [await items_client.create_item(sample_item_data) for _ in range(5)]
+        transport.requests.clear()
+
+        exported = [item async for item in items_client.export_items(batch_size=2)]
+        assert all(isinstance(item, ChangedItem) for item in exported)
+        assert [item.id for item in exported] == [item.id for item in created]
+        assert len(transport.requests) == 3
+
+    async def test_write_token_is_sent_on_following_reads(self, items_client, transport, sample_item_data, monkeypatch):
+        monkeypatch.setattr(
+            "services.item_service.item_service.get_consistency_token", lambda: "0/10"
+        )
+        created = await items_client.create_item(sample_item_data)
+        await items_client.get_item(created.id)
+        assert transport.requests[-1].headers[CONSISTENCY_TOKEN_HEADER] == "0/10"
+
+    async def test_api_errors_are_raised(self, items_client):
+        with pytest.raises(ItemsAPIError) as error:
+            await items_client.list_items(min_price=-1)
+        assert error.value.status_code == 422
+
+
+class TestRetries:
+    """Tests de los reintentos"""
+
+    async def test_idempotent_reads_retry_after_503(self):
+        responses = iter([
+            httpx.Response(503, headers={"Retry-After": "0"}, json={"detail": "busy"}),
+            httpx.Response(200, json=[]),
+        ])
+        transport = httpx.MockTransport(lambda request: next(responses))
+        async with ItemsClient("http://test", transport=transport, backoff=0) as client:
+            assert await client.list_items() == []
+
+    async def test_creates_are_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, headers={"Retry-After": "0"}, json={"detail": "busy"})
+
+        async with ItemsClient("http://test", transport=httpx.MockTransport(handler), backoff=0) as client:
+            with pytest.raises(ItemsAPIError) as error:
+                await client.create_item({"name": "A", "description": "B"})
+        assert error.value.status_code == 503
+        assert error.value.retry_after == 0
+        assert len(calls) == 1
@@ -0,0 +1,82 @@
+"""
+Unit tests para el registro de métricas y el monitor del event loop.
+"""
+
+import asyncio
+import logging
+import time
+
+from diagnostics import LoopMonitor
+from diagnostics.loop_monitor import loop_blocked_total, loop_lag_seconds
+from metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Tests del formato de exposición de Prometheus"""
+
+    def test_render_counter_gauge_and_summary(self):
+        """Cada tipo de métrica se exporta con HELP, TYPE y sus muestras"""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests").inc(labels={"route": "/items"})
+        registry.gauge("pool_size", "Pool", function=lambda: 3)
+        summary = registry.summary("latency_seconds", "Latency", quantiles=(0.5, 1.0))
+        for value in (0.1, 0.2, 0.3, 0.4):
+            summary.observe(value)
+
+        text = registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{route="/items"} 1' in text
+        assert "pool_size 3" in text
+        assert 'latency_seconds{quantile="0.5"} 0.3' in text
+        assert 'latency_seconds{quantile="1.0"} 0.4' in text
+        assert "latency_seconds_count 4" in text
+
+    def test_same_name_returns_same_metric(self):
+        """Registrar dos veces un nombre devuelve la métrica existente"""
+        registry = MetricsRegistry()
+        assert registry.counter("hits", "Hits") is registry.counter("hits", "Hits")
+
+    def test_metrics_endpoint(self, client):
+        """GET /metrics responde en formato de texto de Prometheus"""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE event_loop_lag_seconds summary" in response.text
+
+
+class TestLoopMonitor:
+    """Tests de la medición de lag y de la detección de bloqueos"""
+
+    async def test_blocking_callback_is_reported_with_stack(self, caplog):
+        """Un callback que bloquea el loop se denuncia con su pila"""
+        monitor = LoopMonitor(interval=0.01, threshold=0.05)
+        blocked_before = loop_blocked_total.value()
+        lag_count_before = loop_lag_seconds._counts.get((), 0)
+        monitor.start()
+        try:
+            await _sleep_ticks(3)
+            with caplog.at_level(logging.WARNING, logger="diagnostics.loop_monitor"):
+                _block_the_loop(0.3)
+                await _sleep_ticks(3)
+        finally:
+            await monitor.stop()
+
+        assert loop_blocked_total.value() == blocked_before + 1
+        assert loop_lag_seconds._counts[()] > lag_count_before
+        assert loop_lag_seconds.quantile(1.0) >= 0.2
+        assert "_block_the_loop" in caplog.text
+
+    async def test_stop_is_idempotent(self):
+        """stop() sin start() previo no falla"""
+        monitor = LoopMonitor()
+        await monitor.stop()
+        assert not monitor.running
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def _sleep_ticks(count: int) -> None:
+    for _ in range(count):
+        await asyncio.sleep(0.02)
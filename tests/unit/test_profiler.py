@@ -0,0 +1,91 @@
+"""
+Unit tests para el profiler bajo demanda (GET /debug/profile).
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from config.settings import settings
+from diagnostics.profiler import format_collapsed, sample_allocations
+
+
+TOKEN = "test-debug-token"
+AUTH = {"Authorization": f"Bearer {TOKEN}"}
+
+
+@pytest.fixture
+def profiler_enabled(monkeypatch):
+    """Habilita el endpoint con un token conocido"""
+    monkeypatch.setattr(settings, "DEBUG_PROFILE_ENABLED", True)
+    monkeypatch.setattr(settings, "DEBUG_PROFILE_TOKEN", TOKEN)
+    monkeypatch.setattr(settings, "DEBUG_PROFILE_INTERVAL_SECONDS", 0.001)
+
+
+@pytest.fixture
+def busy_thread():
+    """Hilo que consume CPU en una función reconocible durante el test"""
+    stop = threading.Event()
+    thread = threading.Thread(target=_spin_for_profiler, args=(stop,), name="busy")
+    thread.start()
+    yield
+    stop.set()
+    thread.join()
+
+
+def _spin_for_profiler(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestDebugProfileAccess:
+    """Tests de la protección del endpoint"""
+
+    def test_disabled_by_default(self, client):
+        assert client.get("/debug/profile", headers=AUTH).status_code == 404
+
+    def test_requires_token(self, client, profiler_enabled):
+        assert client.get("/debug/profile?seconds=0.01").status_code == 401
+        response = client.get("/debug/profile?seconds=0.01", headers={"Authorization": "Bearer wrong"})
+        assert response.status_code == 401
+
+    def test_enabled_without_token_is_forbidden(self, client, profiler_enabled, monkeypatch):
+        monkeypatch.setattr(settings, "DEBUG_PROFILE_TOKEN", None)
+        assert client.get("/debug/profile?seconds=0.01", headers=AUTH).status_code == 403
+
+    def test_window_is_bounded(self, client, profiler_enabled):
+        seconds = settings.DEBUG_PROFILE_MAX_SECONDS + 1
+        assert client.get(f"/debug/profile?seconds={seconds}", headers=AUTH).status_code == 400
+
+
+class TestDebugProfileOutput:
+    """Tests del formato collapsed stacks"""
+
+    def test_cpu_profile_contains_busy_function(self, client, profiler_enabled, busy_thread):
+        response = client.get("/debug/profile?seconds=0.2", headers=AUTH)
+        assert response.status_code == 200
+
+        lines = response.text.splitlines()
+        assert lines
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        busy = [line for line in lines if line.startswith("busy;")]
+        assert any("_spin_for_profiler (tests/unit/test_profiler.py:" in line for line in busy)
+
+    async def test_alloc_profile_attributes_growth(self):
+        retained = []
+
+        async def allocate():
+            await asyncio.sleep(0.01)
+            retained.extend(bytearray(1024) for _ in range(1000))
+
+        task = asyncio.create_task(allocate())
+        counts = await sample_allocations(0.1)
+        await task
+
+        text = format_collapsed(counts)
+        top_stack, top_bytes = text.splitlines()[0].rsplit(" ", 1)
+        assert "tests/unit/test_profiler.py" in top_stack
+        assert int(top_bytes) >= 1000 * 1024
@@ -0,0 +1,128 @@
+"""
+Unit tests para la cotización de cestas (POST /items/quote).
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+import random
+import uuid
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.quote_service.pricing import QuoteOverflowError, compute_quote
+
+
+def reference_line(price: float, tax: float, quantity: int) -> tuple[Decimal, Decimal]:
+    """Cálculo de referencia con Decimal, línea por línea, redondeando al final"""
+    net = Decimal(str(price)) * quantity
+    tax_amount = (net * Decimal(str(tax)) / 100).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return net.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP), tax_amount
+
+
+class TestComputeQuote:
+    """Tests de la aritmética vectorizada"""
+
+    def test_matches_decimal_reference(self):
+        """Los importes coinciden con Decimal para precios y tasas aleatorios"""
+        rng = random.Random(42)
+        prices = [rng.randint(1, 500_000) / 100 for _ in range(2_000)]
+        taxes = [rng.choice([0.0, 4.0, 10.0, 10.5, 21.0]) for _ in prices]
+        quantities = [rng.randint(1, 1_000) for _ in prices]
+
+        result = compute_quote(np.array(prices), np.array(taxes), np.array(quantities))
+
+        for i, (price, tax, quantity) in enumerate(zip(prices, taxes, quantities)):
+            net, tax_amount = reference_line(price, tax, quantity)
+            assert result.net[i] == int(net * 100)
+            assert result.tax[i] == int(tax_amount * 100)
+            assert result.gross[i] == int((net + tax_amount) * 100)
+
+    def test_rounds_half_up(self):
+        """0.05 * 10% = 0.005 se redondea a 0.01"""
+        result = compute_quote(np.array([0.05]), np.array([10.0]), np.array([1]))
+        assert result.tax[0] == 1
+
+    def test_sub_cent_prices_and_rates_match_reference(self):
+        """El precio unitario no se redondea antes de multiplicar por la cantidad"""
+        cases = [(0.125, 0.0, 8), (0.125, 0.0, 1), (10.0, 10.005, 1), (0.1234567, 21.0, 3), (0.005, 7.125, 333)]
+        prices, taxes, quantities = (np.array(column) for column in zip(*cases))
+
+        result = compute_quote(prices, taxes, quantities)
+
+        assert result.net[0] == 100
+        assert result.net[1] == 13
+        assert result.tax[2] == 100
+        for i, (price, tax, quantity) in enumerate(cases):
+            net, tax_amount = reference_line(price, tax, quantity)
+            assert result.net[i] == int(net * 100)
+            assert result.tax[i] == int(tax_amount * 100)
+
+    def test_null_price_and_tax(self):
+        """Sin tax se aplica 0; sin price la línea queda sin cotizar"""
+        result = compute_quote(np.array([10.0, np.nan]), np.array([np.nan, 21.0]), np.array([2, 5]))
+        assert result.priced.tolist() == [True, False]
+        assert result.net.tolist() == [2_000, 0]
+        assert result.tax.tolist() == [0, 0]
+
+    def test_large_basket_does_not_overflow(self):
+        """Importes grandes no desbordan int64 al aplicar la tasa"""
+        result = compute_quote(np.array([9_999_999.99]), np.array([21.0]), np.array([1_000_000]))
+        net, tax_amount = reference_line(9_999_999.99, 21.0, 1_000_000)
+        assert result.tax[0] == int(tax_amount * 100)
+        assert result.net[0] == int(net * 100)
+
+    def test_huge_amounts_use_exact_path_or_overflow(self):
+        """Los importes fuera del camino int64 se calculan exactos o se rechazan"""
+        result = compute_quote(np.array([4e15]), np.array([21.0]), np.array([1]))
+        net, tax_amount = reference_line(4e15, 21.0, 1)
+        assert result.net[0] == int(net * 100)
+        assert result.tax[0] == int(tax_amount * 100)
+
+        with pytest.raises(QuoteOverflowError):
+            compute_quote(np.array([1e12]), np.array([21.0]), np.array([1_000_000]))
+
+
+class TestQuoteEndpoint:
+    """Tests para el endpoint POST /items/quote"""
+
+    def test_quote_basket(self, client: TestClient, memory_repository):
+        """Calcula líneas y totales, incluyendo items repetidos y sin precio"""
+        priced = client.post("/items", json={"name": "A", "description": "a", "price": 19.99, "tax": 21.0}).json()
+        no_tax = client.post("/items", json={"name": "B", "description": "b", "price": 5.0}).json()
+        no_price = client.post("/items", json={"name": "C", "description": "c"}).json()
+
+        response = client.post("/items/quote", json={"lines": [
+            {"item_id": priced["id"], "quantity": 3},
+            {"item_id": no_tax["id"], "quantity": 2},
+            {"item_id": no_price["id"], "quantity": 1},
+            {"item_id": priced["id"], "quantity": 1},
+        ]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [line["net"] for line in data["lines"]] == [59.97, 10.0, None, 19.99]
+        assert [line["tax_amount"] for line in data["lines"]] == [12.59, 0.0, None, 4.2]
+        assert data["net_total"] == 89.96
+        assert data["tax_total"] == 16.79
+        assert data["gross_total"] == 106.75
+        assert data["unpriced_item_ids"] == [no_price["id"]]
+
+    def test_quote_missing_item(self, client: TestClient, memory_repository):
+        """Un item inexistente devuelve 404"""
+        missing_id = str(uuid.uuid4())
+        response = client.post("/items/quote", json={"lines": [{"item_id": missing_id, "quantity": 1}]})
+
+        assert response.status_code == 404
+        assert missing_id in response.json()["detail"]
+
+    def test_quote_overflow(self, client: TestClient, memory_repository):
+        """Un importe que no cabe en centavos int64 devuelve 422"""
+        item = client.post("/items", json={"name": "A", "description": "a", "price": 1e12, "tax": 21.0}).json()
+        response = client.post("/items/quote", json={"lines": [{"item_id": item["id"], "quantity": 1_000_000}]})
+        assert response.status_code == 422
+
+    def test_quote_invalid_quantity(self, client: TestClient):
+        """Las cantidades deben ser positivas"""
+        response = client.post("/items/quote", json={"lines": [{"item_id": str(uuid.uuid4()), "quantity": 0}]})
+        assert response.status_code == 422
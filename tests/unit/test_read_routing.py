@@ -0,0 +1,168 @@
+"""
+Unit tests del read/write splitting y los tokens de consistencia.
+"""
+
+import uuid
+
+import pytest
+
+from db import CONSISTENCY_TOKEN_HEADER, format_lsn, parse_lsn
+from repositories import InstrumentedItemRepository, MemoryItemRepository, RoutingItemRepository
+
+
+class ReplicatedMemoryRepository(MemoryItemRepository):
+    """Repositorio en memoria con posición de replicación y contador de lecturas"""
+
+    def __init__(self, rows: dict = None, position: int = 0):
+        super().__init__()
+        if rows is not None:
+            self._rows = rows
+        self.position = position
+        self.reads = 0
+        self.fail = False
+
+    async def get_by_id(self, item_id):
+        self.reads += 1
+        if self.fail:
+            raise ConnectionError("replica down")
+        return await super().get_by_id(item_id)
+
+    async def get_page(self, limit, offset, min_price=None, max_price=None):
+        self.reads += 1
+        if self.fail:
+            raise ConnectionError("replica down")
+        return await super().get_page(limit, offset, min_price, max_price)
+
+    async def create(self, data):
+        self.position += 100
+        return await super().create(data)
+
+    async def replication_position(self):
+        if self.fail:
+            raise ConnectionError("replica down")
+        return self.position
+
+
+@pytest.fixture
+def primary():
+    return ReplicatedMemoryRepository(position=1000)
+
+
+@pytest.fixture
+def replicas(primary):
+    return [ReplicatedMemoryRepository(primary._rows, 1000), ReplicatedMemoryRepository(primary._rows, 1000)]
+
+
+@pytest.fixture
+def routing(primary, replicas):
+    return RoutingItemRepository(primary, replicas, health_interval=3600, max_lag_bytes=500)
+
+
+class TestLsn:
+    """Tests del formato del token"""
+
+    def test_round_trip(self):
+        assert format_lsn(0x16B374D848) == "16/B374D848"
+        assert parse_lsn("16/B374D848") == 0x16B374D848
+
+    def test_invalid_tokens(self):
+        assert parse_lsn("nope") is None
+        assert parse_lsn("zz/1") is None
+
+
+class TestRoutingItemRepository:
+    """Tests de la selección de endpoint"""
+
+    async def test_reads_go_to_least_loaded_replica(self, routing, primary, replicas):
+        routing.replicas[0].in_flight = 3
+        await routing.get_by_id(uuid.uuid4())
+        assert (primary.reads, replicas[0].reads, replicas[1].reads) == (0, 0, 1)
+        await routing.close()
+
+    async def test_write_records_primary_position(self, routing, primary):
+        from db import get_consistency_token
+
+        await routing.create({"name": "a", "description": "b", "price": 1.0, "tax": None})
+        assert get_consistency_token() == format_lsn(primary.position)
+        await routing.close()
+
+    async def test_token_reads_from_primary_until_replica_catches_up(self, routing, primary, replicas):
+        from db.consistency import _read_position
+
+        await routing.check_health()
+        _read_position.set(1100)
+        await routing.get_page(10, 0)
+        assert primary.reads == 1
+
+        replicas[1].position = 1100
+        await routing.check_health()
+        await routing.get_page(10, 0)
+        assert (primary.reads, replicas[0].reads, replicas[1].reads) == (1, 0, 1)
+        await routing.close()
+
+    async def test_failed_read_falls_back_to_primary(self, routing, primary, replicas):
+        for replica in replicas:
+            replica.fail = True
+        await routing.get_page(10, 0)
+        assert primary.reads == 1
+        assert routing.replicas[0].healthy is False or routing.replicas[1].healthy is False
+        await routing.close()
+
+    async def test_lagging_replica_is_unhealthy(self, routing, primary, replicas):
+        primary.position = 2000
+        replicas[1].position = 1800
+        await routing.check_health()
+        assert [endpoint.healthy for endpoint in routing.replicas] == [False, True]
+        assert routing.replicas[0].lag_bytes == 1000
+
+
+class TestConsistencyEndpoint:
+    """Tests del token read-your-writes a través de la API"""
+
+    @pytest.fixture
+    def routed(self, monkeypatch, primary, replicas):
+        repository = InstrumentedItemRepository(RoutingItemRepository(primary, replicas, health_interval=3600))
+        monkeypatch.setattr("repositories.item_repository.factory._item_repository", repository)
+        return repository
+
+    def test_write_returns_token_and_token_reads_primary(self, client, routed, primary, sample_item_data):
+        response = client.post("/items", json=sample_item_data)
+        token = response.headers[CONSISTENCY_TOKEN_HEADER]
+        assert parse_lsn(token) == primary.position
+
+        item_id = response.json()["id"]
+        assert client.get(f"/items/{item_id}", headers={CONSISTENCY_TOKEN_HEADER: token}).status_code == 200
+        assert primary.reads == 1
+
+    def test_reads_without_token_use_replicas(self, client, routed, primary, sample_item_data):
+        client.get("/items")
+        assert CONSISTENCY_TOKEN_HEADER not in client.get("/items").headers
+        assert primary.reads == 0
+
+    def test_batch_reads_its_own_writes(self, client, monkeypatch, primary, sample_item_data):
+        """Las sub-peticiones de POST /batch llevan el token de las escrituras anteriores"""
+        # Réplica atrasada: todavía no tiene las filas nuevas del primario
+        lagging = ReplicatedMemoryRepository(position=1000)
+        repository = InstrumentedItemRepository(RoutingItemRepository(primary, [lagging], health_interval=3600))
+        monkeypatch.setattr("repositories.item_repository.factory._item_repository", repository)
+
+        response = client.post("/batch", json={"operations": [
+            {"id": "nuevo", "method": "POST", "path": "/items", "body": sample_item_data},
+            {"id": "detalle", "method": "GET", "path": "/items/${nuevo.body.id}"},
+        ]})
+
+        assert [result["status"] for result in response.json()["results"]] == [200, 200]
+        token = response.headers[CONSISTENCY_TOKEN_HEADER]
+        assert parse_lsn(token) == primary.position
+        assert (primary.reads, lagging.reads) == (1, 0)
+
+        # El token entrante también se reenvía a las lecturas del lote
+        item_id = response.json()["results"][0]["body"]["id"]
+        response = client.post(
+            "/batch",
+            json={"operations": [{"id": "detalle", "method": "GET", "path": f"/items/{item_id}"}]},
+            headers={CONSISTENCY_TOKEN_HEADER: token},
+        )
+        assert response.json()["results"][0]["status"] == 200
+        assert CONSISTENCY_TOKEN_HEADER not in response.headers
+        assert (primary.reads, lagging.reads) == (2, 0)
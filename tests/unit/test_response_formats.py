@@ -0,0 +1,85 @@
+"""
+Unit tests de la negociación de formato (JSON, MessagePack, Arrow) en las rutas de items.
+"""
+
+import uuid
+
+import pytest
+
+from serialization import ARROW_STREAM, JSON, MSGPACK, decode_arrow, decode_msgpack, negotiate
+
+
+ALL_FORMATS = [JSON, MSGPACK, ARROW_STREAM]
+
+
+class TestNegotiate:
+    """Tests de la elección de formato"""
+
+    @pytest.mark.parametrize("accept", [None, "", "*/*", "application/*", "text/html", "application/json"])
+    def test_json_is_the_default(self, accept):
+        assert negotiate(accept, ALL_FORMATS) == JSON
+
+    def test_explicit_binary_formats(self):
+        assert negotiate("application/msgpack", ALL_FORMATS) == MSGPACK
+        assert negotiate("application/x-msgpack", ALL_FORMATS) == MSGPACK
+        assert negotiate(ARROW_STREAM, ALL_FORMATS) == ARROW_STREAM
+
+    def test_quality_and_client_order(self):
+        assert negotiate("application/json;q=0.5, application/msgpack", ALL_FORMATS) == MSGPACK
+        assert negotiate("application/msgpack;q=0.4, */*;q=0.8", ALL_FORMATS) == JSON
+        assert negotiate(f"{ARROW_STREAM}, application/msgpack", ALL_FORMATS) == ARROW_STREAM
+
+    def test_unavailable_format_falls_back_to_json(self):
+        assert negotiate(ARROW_STREAM, [JSON, MSGPACK]) == JSON
+
+
+@pytest.fixture
+def items(client, memory_repository, sample_item_data):
+    """Tres items, uno sin price ni tax"""
+    created = [client.post("/items", json=sample_item_data).json() for _ in range(2)]
+    created.append(client.post("/items", json={**sample_item_data, "price": None, "tax": None}).json())
+    return created
+
+
+class TestItemRoutesFormats:
+    """Tests de las respuestas binarias de GET /items y POST /items/lookup"""
+
+    def test_json_response_is_unchanged(self, client, items):
+        response = client.get("/items")
+        assert response.headers["content-type"] == JSON
+        assert response.headers["vary"] == "Accept"
+        assert response.json() == items
+
+    def test_msgpack_matches_json(self, client, items):
+        pytest.importorskip("msgpack")
+        response = client.get("/items", headers={"Accept": MSGPACK})
+        assert response.headers["content-type"] == MSGPACK
+
+        rows = decode_msgpack(response.content)
+        assert rows == [{**item, "id": uuid.UUID(item["id"])} for item in items]
+        assert len(response.content) < len(client.get("/items").content)
+
+    def test_arrow_matches_json(self, client, items):
+        pytest.importorskip("pyarrow")
+        response = client.get("/items", params={"limit": 100}, headers={"Accept": ARROW_STREAM})
+        assert response.headers["content-type"] == ARROW_STREAM
+
+        table = decode_arrow(response.content)
+        assert table.column_names == ["id", "name", "description", "price", "tax"]
+        assert [uuid.UUID(bytes=value) for value in table.column("id").to_pylist()] == [
+            uuid.UUID(item["id"]) for item in items
+        ]
+        assert table.column("price").to_pylist() == [item["price"] for item in items]
+        assert table.column("tax").null_count == 1
+
+    def test_lookup_supports_binary_formats(self, client, items):
+        pytest.importorskip("pyarrow")
+        ids = [items[2]["id"], items[0]["id"]]
+        response = client.post("/items/lookup", json={"ids": ids}, headers={"Accept": ARROW_STREAM})
+        table = decode_arrow(response.content)
+        assert [str(uuid.UUID(bytes=value)) for value in table.column("id").to_pylist()] == ids
+
+    def test_empty_page(self, client, memory_repository):
+        pytest.importorskip("pyarrow")
+        response = client.get("/items", headers={"Accept": ARROW_STREAM})
+        assert decode_arrow(response.content).num_rows == 0
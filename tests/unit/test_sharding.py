@@ -0,0 +1,157 @@
+"""
+Unit tests del reparto de items entre shards y del rebalanceo en línea.
+
+Los shards son repositorios en memoria: el mismo código corre contra
+backends de Supabase o PostgreSQL configurados en ITEM_SHARDS.
+"""
+
+from collections import Counter
+import uuid
+
+import pytest
+
+from config.settings import settings
+from repositories import MemoryItemRepository, ShardedItemRepository, get_item_repository
+from repositories.item_repository import HashRing
+from repositories.item_repository.rebalance import rebalance
+
+
+def make_shards(*names: str) -> dict:
+    return {name: MemoryItemRepository() for name in names}
+
+
+@pytest.fixture
+def item_data():
+    return {"name": "Shard Item", "description": "Item repartido", "price": 10.0, "tax": 21.0}
+
+
+class TestHashRing:
+    """Tests del anillo de hashing consistente"""
+
+    def test_distribution_is_balanced(self):
+        ring = HashRing(["a", "b", "c", "d"], vnodes=128)
+        owners = Counter(ring.owner(uuid.uuid4()) for _ in range(20000))
+        assert set(owners) == {"a", "b", "c", "d"}
+        assert min(owners.values()) > 20000 / 4 * 0.7
+
+    def test_adding_a_shard_moves_about_one_nth(self):
+        before = HashRing(["a", "b", "c"])
+        after = HashRing(["a", "b", "c", "d"])
+        ids = [uuid.uuid4() for _ in range(20000)]
+        moved = [item_id for item_id in ids if before.owner(item_id) != after.owner(item_id)]
+        assert all(after.owner(item_id) == "d" for item_id in moved)
+        assert 0.15 < len(moved) / len(ids) < 0.35
+
+
+class TestShardedItemRepository:
+    """Tests del enrutado por id y del scatter-gather"""
+
+    async def test_rows_live_on_their_owner(self, item_data):
+        repository = ShardedItemRepository(make_shards("a", "b", "c"))
+        created = [await repository.create(item_data) for _ in range(30)]
+        for row in created:
+            owner = repository.owner(row["id"])
+            assert await repository.shards[owner].get_by_id(uuid.UUID(row["id"])) is not None
+        assert sum(len(shard._rows) for shard in repository.shards.values()) == 30
+
+    async def test_page_matches_single_backend_order(self, item_data):
+        repository = ShardedItemRepository(make_shards("a", "b", "c"))
+        created = [await repository.create({**item_data, "price": float(index)}) for index in range(25)]
+
+        page = await repository.get_page(10, 5)
+        assert [row["id"] for row in page] == [row["id"] for row in created[5:15]]
+        filtered = await repository.get_page(100, 0, min_price=20.0)
+        assert [row["price"] for row in filtered] == [20.0, 21.0, 22.0, 23.0, 24.0]
+
+    async def test_aggregate_combines_shards(self, item_data):
+        repository = ShardedItemRepository(make_shards("a", "b"))
+        for price in (1.0, 5.0, 50.0):
+            await repository.create({**item_data, "price": price})
+        aggregate = await repository.aggregate([0, 10], [0, 10])
+        assert aggregate["count"] == 3
+        assert aggregate["price"] == {"count": 3, "sum": 56.0, "min": 1.0, "max": 50.0}
+        assert aggregate["price_histogram"] == [2, 1]
+
+    def test_unknown_previous_shard_is_rejected(self):
+        with pytest.raises(ValueError):
+            ShardedItemRepository(make_shards("a"), previous=["a", "z"])
+
+
+class TestRebalance:
+    """Tests del rebalanceo en línea al agregar un shard"""
+
+    @pytest.fixture
+    async def migrating(self, item_data):
+        """Tres shards con datos y un cuarto recién agregado, antes de rebalancear"""
+        shards = make_shards("a", "b", "c")
+        old = ShardedItemRepository(shards)
+        created = [await old.create({**item_data, "price": float(index)}) for index in range(60)]
+        shards["d"] = MemoryItemRepository()
+        return ShardedItemRepository(shards, previous=["a", "b", "c"]), created
+
+    async def test_reads_and_writes_work_during_migration(self, migrating, item_data):
+        repository, created = migrating
+        misplaced = [row for row in created if repository.owner(row["id"]) == "d"]
+        assert misplaced
+
+        for row in created:
+            assert await repository.get_by_id(uuid.UUID(row["id"])) is not None
+        assert len(await repository.get_many([uuid.UUID(row["id"]) for row in created])) == 60
+        assert len(await repository.get_page(100, 0)) == 60
+
+        updated = await repository.update(uuid.UUID(misplaced[0]["id"]), {**item_data, "name": "Moved"})
+        assert updated["name"] == "Moved"
+        assert misplaced[0]["id"] in repository.shards["d"]._rows
+
+        assert await repository.delete(uuid.UUID(misplaced[1]["id"])) is not None
+        assert await repository.get_by_id(uuid.UUID(misplaced[1]["id"])) is None
+
+    async def test_rebalance_moves_rows_to_new_owner(self, migrating):
+        repository, created = migrating
+        assert sum((await rebalance(repository, batch_size=7, dry_run=True)).values()) > 0
+
+        moved = await rebalance(repository, batch_size=7)
+
+        assert set(target for _, target in moved) == {"d"}
+        for name, shard in repository.shards.items():
+            assert all(repository.owner(item_id) == name for item_id in shard._rows)
+        page = await repository.get_full_page(100, 0)
+        assert [row["id"] for row in page] == [row["id"] for row in created]
+        assert [row["created_at"] for row in page] == [row["created_at"] for row in created]
+        assert sum((await rebalance(repository)).values()) == 0
+
+
+class TestShardedApi:
+    """Tests de la API con ITEM_SHARDS configurado"""
+
+    def test_crud_through_api(self, client, monkeypatch, sample_item_data):
+        monkeypatch.setattr(settings, "ITEM_REPOSITORY_BACKEND", "memory")
+        monkeypatch.setattr(settings, "ITEM_SHARDS", [{"name": "a"}, {"name": "b"}])
+        monkeypatch.setattr("repositories.item_repository.factory._item_repository", None)
+
+        ids = [client.post("/items", json=sample_item_data).json()["id"] for _ in range(4)]
+        assert [row["id"] for row in client.get("/items").json()] == ids
+        assert client.get(f"/items/{ids[2]}").json()["id"] == ids[2]
+        assert client.delete(f"/items/{ids[2]}").status_code == 200
+        assert len(client.get("/items").json()) == 3
+
+    def test_user_clients_are_rejected(self, monkeypatch):
+        """Los shards saltarían RLS: no se combinan con clientes por usuario"""
+        monkeypatch.setattr(settings, "ITEM_REPOSITORY_BACKEND", "memory")
+        monkeypatch.setattr(settings, "ITEM_SHARDS", [{"name": "a"}, {"name": "b"}])
+        monkeypatch.setattr(settings, "SUPABASE_USER_CLIENTS_ENABLED", True)
+        monkeypatch.setattr("repositories.item_repository.factory._item_repository", None)
+
+        with pytest.raises(ValueError):
+            get_item_repository()
+
+    @pytest.mark.parametrize("backend", ["postgres", "memory"])
+    def test_user_clients_require_supabase_backend(self, monkeypatch, backend):
+        """Fuera de PostgREST el JWT del usuario no aplicaría RLS"""
+        monkeypatch.setattr(settings, "ITEM_REPOSITORY_BACKEND", backend)
+        monkeypatch.setattr(settings, "ITEM_SHARDS", [])
+        monkeypatch.setattr(settings, "SUPABASE_USER_CLIENTS_ENABLED", True)
+        monkeypatch.setattr("repositories.item_repository.factory._item_repository", None)
+
+        with pytest.raises(ValueError, match="supabase"):
+            get_item_repository()
@@ -0,0 +1,110 @@
+"""
+Unit tests para el pool de clientes de Supabase por usuario.
+"""
+
+import base64
+import json
+import time
+
+import pytest
+
+from config.settings import settings
+from db import SupabaseClientPool, get_request_supabase_client
+from db.supabase_pool import token_expiry
+
+
+def make_jwt(exp=None, sub="user") -> str:
+    """JWT sin firma válida: el pool solo lee el claim exp"""
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    claims = {"sub": sub} if exp is None else {"sub": sub, "exp": exp}
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(claims)}.signature"
+
+
+@pytest.fixture
+def pool():
+    client_pool = SupabaseClientPool("https://example.supabase.co", "anon-key", max_size=2)
+    yield client_pool
+    client_pool.close()
+
+
+class TestSupabaseClientPool:
+    """Tests del LRU de clientes por JWT"""
+
+    def test_token_expiry(self):
+        assert token_expiry(make_jwt(exp=1234)) == 1234
+        assert token_expiry(make_jwt()) is None
+        assert token_expiry("not-a-jwt") is None
+
+    def test_reuses_client_per_token(self, pool):
+        token = make_jwt(exp=time.time() + 60)
+        first = pool.get(token)
+        assert pool.get(token) is first
+        assert pool.get(make_jwt(exp=time.time() + 60, sub="other")) is not first
+        assert (pool.hits, pool.misses) == (1, 2)
+        assert pool.hit_rate == pytest.approx(1 / 3)
+
+    def test_clients_carry_user_jwt_and_share_transport(self, pool):
+        token_a = make_jwt(exp=time.time() + 60, sub="a")
+        token_b = make_jwt(exp=time.time() + 60, sub="b")
+        session_a = pool.get(token_a).postgrest.session
+        session_b = pool.get(token_b).postgrest.session
+
+        assert session_a.headers["Authorization"] == f"Bearer {token_a}"
+        assert session_a.headers["apiKey"] == "anon-key"
+        assert str(session_a.base_url).startswith("https://example.supabase.co/rest/v1")
+        assert session_a._transport is session_b._transport is pool._transport
+
+    def test_lru_eviction(self, pool):
+        tokens = [make_jwt(exp=time.time() + 60, sub=str(i)) for i in range(3)]
+        first = pool.get(tokens[0])
+        pool.get(tokens[1])
+        pool.get(tokens[0])
+        pool.get(tokens[2])
+
+        assert len(pool) == 2
+        assert pool.get(tokens[0]) is first
+        assert pool.misses == 3
+
+    def test_expired_entries_are_evicted(self, pool, monkeypatch):
+        now = time.time()
+        token = make_jwt(exp=now + 10)
+        first = pool.get(token)
+
+        monkeypatch.setattr(time, "time", lambda: now + 11)
+        assert pool.get(token) is not first
+        assert len(pool) == 0
+
+    def test_token_without_exp_uses_default_ttl(self, monkeypatch):
+        pool = SupabaseClientPool("https://example.supabase.co", "anon-key", default_ttl=5)
+        now = time.time()
+        first = pool.get(make_jwt())
+        assert pool.get(make_jwt()) is first
+        monkeypatch.setattr(time, "time", lambda: now + 6)
+        assert pool.get(make_jwt()) is not first
+        pool.close()
+
+
+class TestUserClientDependency:
+    """Tests de la selección del cliente por petición"""
+
+    def test_request_uses_user_client(self, client, monkeypatch, sample_items_list):
+        """Con JWT el repositorio de Supabase consulta con el cliente del usuario"""
+        monkeypatch.setattr(settings, "SUPABASE_USER_CLIENTS_ENABLED", True)
+        token = make_jwt(exp=time.time() + 60)
+        seen = []
+
+        def fake_execute(self, operation, query, target=None):
+            seen.append(get_request_supabase_client())
+            return type("Response", (), {"data": sample_items_list})()
+
+        monkeypatch.setattr(
+            "repositories.item_repository.supabase_repository.SupabaseItemRepository._execute",
+            fake_execute,
+        )
+        response = client.get("/items", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        [user_client] = seen
+        assert user_client.postgrest.session.headers["Authorization"] == f"Bearer {token}"
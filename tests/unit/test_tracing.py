@@ -0,0 +1,200 @@
+"""
+Unit tests para las trazas distribuidas.
+"""
+
+import json
+import uuid
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from middleware import TracingMiddleware
+from repositories import SupabaseItemRepository
+from routes import item_router
+from tracing import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    parse_traceparent,
+    tracer,
+)
+
+
+INCOMING_TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+INCOMING_TRACEPARENT = f"00-{INCOMING_TRACE_ID}-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Conecta el tracer global a un exporter en memoria durante el test"""
+    memory_exporter = InMemorySpanExporter()
+    processor = BatchSpanProcessor(memory_exporter)
+    monkeypatch.setattr(tracer, "processor", processor)
+    monkeypatch.setattr(tracer, "sample_rate", 1.0)
+    yield memory_exporter
+    processor.force_flush()
+
+
+@pytest.fixture
+def traced_client(memory_repository):
+    """Cliente de una app con el router de items y tracing activo"""
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+    app.include_router(item_router)
+    return TestClient(app)
+
+
+def exported(exporter: InMemorySpanExporter) -> dict:
+    tracer.processor.force_flush()
+    return {span.name: span for span in exporter.spans}
+
+
+class TestTraceparent:
+    """Tests del parseo del header W3C traceparent"""
+
+    def test_valid_header(self):
+        context = parse_traceparent(INCOMING_TRACEPARENT)
+        assert context.trace_id == INCOMING_TRACE_ID
+        assert context.span_id == "00f067aa0ba902b7"
+        assert context.sampled is True
+        assert context.traceparent == INCOMING_TRACEPARENT
+
+    @pytest.mark.parametrize("value", [
+        None,
+        "",
+        "garbage",
+        f"00-{'0' * 32}-00f067aa0ba902b7-01",
+        f"00-{INCOMING_TRACE_ID}-{'0' * 16}-01",
+    ])
+    def test_invalid_header(self, value):
+        assert parse_traceparent(value) is None
+
+
+class TestRequestTracing:
+    """Tests de los spans producidos por una petición"""
+
+    def test_spans_cover_every_layer(self, traced_client, exporter, sample_item_data):
+        """Una petición produce spans de ruta, controlador y servicio"""
+        response = traced_client.post("/items", json=sample_item_data, headers={"traceparent": INCOMING_TRACEPARENT})
+        assert response.status_code == 200
+
+        spans = exported(exporter)
+        assert set(spans) >= {
+            "POST /items",
+            "validate request",
+            "route handler",
+            "serialize response",
+            "ItemController.create_item",
+            "ItemService.create_item",
+        }
+        assert {span.context.trace_id for span in spans.values()} == {INCOMING_TRACE_ID}
+
+        server = spans["POST /items"]
+        assert server.parent_span_id == "00f067aa0ba902b7"
+        assert server.attributes["http.route"] == "/items"
+        assert server.attributes["http.response.status_code"] == 200
+        for phase in ("validate request", "route handler", "serialize response"):
+            assert spans[phase].parent_span_id == server.context.span_id
+        assert spans["ItemController.create_item"].parent_span_id == spans["route handler"].context.span_id
+        assert spans["ItemService.create_item"].parent_span_id == spans["ItemController.create_item"].context.span_id
+
+    def test_phase_spans_follow_each_other(self, traced_client, exporter, sample_item_data):
+        """Validación, handler y serialización se suceden sin solaparse"""
+        traced_client.post("/items", json=sample_item_data)
+
+        spans = exported(exporter)
+        validate, handler, serialize = (
+            spans[name] for name in ("validate request", "route handler", "serialize response")
+        )
+        assert validate.end_time_ns <= handler.start_time_ns
+        assert handler.end_time_ns <= serialize.start_time_ns
+        assert serialize.end_time_ns <= spans["POST /items"].end_time_ns
+
+    def test_invalid_body_only_has_validation_span(self, traced_client, exporter):
+        """Un 422 cierra el span de validación sin marcarlo como fallido"""
+        response = traced_client.post("/items", json={"price": "not a number"})
+        assert response.status_code == 422
+
+        spans = exported(exporter)
+        assert spans["validate request"].attributes["exception.type"] == "RequestValidationError"
+        assert spans["validate request"].status == "UNSET"
+        assert "route handler" not in spans
+        assert "serialize response" not in spans
+
+    def test_unsampled_requests_are_not_exported(self, traced_client, exporter, monkeypatch):
+        """Con sample_rate=0 no se exportan spans salvo que el padre esté muestreado"""
+        monkeypatch.setattr(tracer, "sample_rate", 0.0)
+        traced_client.get("/items")
+        assert exported(exporter) == {}
+
+        traced_client.get("/items", headers={"traceparent": INCOMING_TRACEPARENT})
+        assert "GET /items" in exported(exporter)
+
+    def test_client_errors_do_not_mark_spans_as_failed(self, traced_client, exporter):
+        """Un 4xx deja los spans sin estado de error; un 5xx sí lo marca"""
+        response = traced_client.get(f"/items/{uuid.uuid4()}")
+        assert 400 <= response.status_code < 500
+
+        spans = exported(exporter)
+        assert spans["GET /items/{item_id}"].status == "UNSET"
+        assert spans["ItemService.get_item_by_id"].status == "UNSET"
+        assert spans["ItemService.get_item_by_id"].attributes["exception.type"] == "HTTPException"
+
+        with pytest.raises(HTTPException):
+            with tracer.start_span("unavailable", root=True):
+                raise HTTPException(status_code=503)
+        assert exported(exporter)["unavailable"].status == "ERROR"
+
+    def test_no_spans_without_middleware(self, memory_repository, exporter):
+        """Fuera de una petición trazada las capas no abren spans"""
+        app = FastAPI()
+        app.include_router(item_router)
+        TestClient(app).get("/items")
+        assert exported(exporter) == {}
+
+
+class TestPostgrestSpans:
+    """Tests de los spans CLIENT de Supabase"""
+
+    async def test_span_attributes_and_traceparent_propagation(self, mock_supabase_client, exporter):
+        """Cada llamada a PostgREST abre un span y envía el traceparent"""
+        query = mock_supabase_client.table.return_value.select.return_value.in_.return_value
+        query.execute.return_value.data = [{"id": "a"}, {"id": "b"}]
+
+        with tracer.start_span("test", root=True) as parent:
+            await SupabaseItemRepository().get_many([uuid.uuid4()])
+
+        spans = exported(exporter)
+        client_span = spans["postgrest select items"]
+        assert client_span.kind == "CLIENT"
+        assert client_span.parent_span_id == parent.context.span_id
+        assert client_span.attributes == {
+            "db.system": "postgresql",
+            "db.operation": "select",
+            "db.sql.table": "items",
+            "db.response.rows": 2,
+        }
+        query.headers.__setitem__.assert_called_once_with("traceparent", client_span.traceparent)
+
+
+class TestExporters:
+    """Tests de la exportación en lotes"""
+
+    def test_file_exporter_writes_otlp_json_lines(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        processor = BatchSpanProcessor(FileSpanExporter(str(path)), schedule_delay=0.01)
+        processor.start()
+        original, tracer.processor = tracer.processor, processor
+        try:
+            with tracer.start_span("root", root=True):
+                with tracer.start_span("child"):
+                    pass
+        finally:
+            tracer.processor = original
+            processor.shutdown()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["name"] for line in lines] == ["child", "root"]
+        assert lines[0]["parentSpanId"] == lines[1]["spanId"]
+        assert lines[0]["traceId"] == lines[1]["traceId"]
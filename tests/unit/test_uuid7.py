@@ -0,0 +1,126 @@
+"""
+Unit tests de los ids UUIDv7 y del orden de páginas por id.
+"""
+
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import pytest
+
+from config.settings import settings
+from repositories import MemoryItemRepository, ShardedItemRepository, uuid7, uuid7_time, uuid_bytes
+from repositories.item_repository import ids
+from services.replica_service import ColumnarItemTable
+
+
+def _row(item_id, created_at: str, name: str = "Item") -> dict:
+    return {
+        "id": str(item_id), "name": name, "description": "Desc", "price": 1.0, "tax": None,
+        "created_at": created_at, "updated_at": created_at,
+    }
+
+
+class TestUuid7:
+    """Tests del generador de UUIDv7"""
+
+    def test_version_variant_and_time(self):
+        before = datetime.now(timezone.utc)
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        assert abs(uuid7_time(value) - before) < timedelta(seconds=1)
+
+    def test_ids_are_strictly_increasing(self):
+        values = [uuid7() for _ in range(10_000)]
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+        # El texto canónico ordena igual que el uuid
+        assert [str(value) for value in values] == sorted(str(value) for value in values)
+
+    @pytest.fixture
+    def fake_clock(self, monkeypatch):
+        """Reloj fijo; el estado del generador se restaura al terminar el test"""
+        monkeypatch.setattr(ids, "_last_ms", 0)
+        monkeypatch.setattr(ids, "_counter", 0)
+
+        def set_now(nanoseconds: int) -> None:
+            monkeypatch.setattr(ids.time, "time_ns", lambda: nanoseconds)
+        return set_now
+
+    def test_monotonic_when_clock_goes_back(self, fake_clock):
+        fake_clock(2_000_000_000_000_000_000)
+        first = uuid7()
+        fake_clock(1_000_000_000_000_000_000)
+        assert uuid7() > first
+
+    def test_counter_overflow_borrows_next_millisecond(self, fake_clock):
+        fake_clock(3_000_000_000_000_000_000)
+        values = [uuid7() for _ in range(5000)]
+        assert values == sorted(values)
+        assert uuid7_time(values[-1]) > uuid7_time(values[0])
+
+    def test_time_rejects_other_versions(self):
+        with pytest.raises(ValueError):
+            uuid7_time(uuid.uuid4())
+
+    def test_bytes_of_uuid_and_text(self):
+        value = uuid7()
+        assert uuid_bytes(value) == value.bytes
+        assert uuid_bytes(str(value)) == value.bytes
+
+
+class TestCreateWithUuid7:
+    """Tests de la generación de ids en ItemService"""
+
+    def test_created_ids_are_v7_in_creation_order(self, client, memory_repository, sample_item_data, monkeypatch):
+        monkeypatch.setattr(settings, "ITEM_ID_GENERATION", "uuid7")
+        created = [client.post("/items", json=sample_item_data).json()["id"] for _ in range(3)]
+        assert all(uuid.UUID(item_id).version == 7 for item_id in created)
+        assert created == sorted(created)
+
+    def test_database_generation_is_the_default(self, client, memory_repository, sample_item_data):
+        item_id = client.post("/items", json=sample_item_data).json()["id"]
+        assert uuid.UUID(item_id).version == 4
+
+
+class TestPageOrderById:
+    """Tests de los backends con page_order="id\""""
+
+    async def test_memory_repository_orders_by_id(self):
+        repository = MemoryItemRepository("id")
+        ids_ = sorted(str(uuid.uuid4()) for _ in range(5))
+        for item_id in reversed(ids_):
+            await repository.create({"id": item_id, "name": "A", "description": "B", "price": 1.0, "tax": None})
+        assert [row["id"] for row in await repository.get_page(10, 0)] == ids_
+        assert [row["id"] for row in await repository.get_full_page(2, 1)] == ids_[1:3]
+
+    def test_unknown_order_is_rejected(self):
+        with pytest.raises(ValueError):
+            MemoryItemRepository("name")
+
+    async def test_sharded_merge_by_id(self):
+        shards = {name: MemoryItemRepository("id") for name in ("a", "b", "c")}
+        repository = ShardedItemRepository(shards, page_order="id")
+        created = []
+        for _ in range(12):
+            row = await repository.create({"id": str(uuid7()), "name": "A", "description": "B",
+                                           "price": 1.0, "tax": None})
+            created.append(row["id"])
+        assert [row["id"] for row in await repository.get_page(5, 4)] == created[4:9]
+
+    def test_columnar_table_orders_by_id(self):
+        ids_ = sorted(uuid.uuid4() for _ in range(6))
+        # created_at decreciente: en orden por id no influye
+        rows = [_row(item_id, f"2024-01-0{9 - index}T00:00:00+00:00") for index, item_id in enumerate(ids_)]
+
+        bulk = ColumnarItemTable(order_by_id=True)
+        bulk.extend(reversed(rows))
+        bulk.finalize()
+        incremental = ColumnarItemTable(order_by_id=True)
+        for row in reversed(rows):
+            incremental.upsert(row)
+        incremental.upsert({**rows[0], "created_at": "2025-01-01T00:00:00+00:00"})
+
+        expected = [str(item_id) for item_id in ids_]
+        assert [row["id"] for row in bulk.page(10, 0)] == expected
+        assert [row["id"] for row in incremental.page(10, 0)] == expected
@@ -0,0 +1,37 @@
+"""
+Tracing package - Trazas distribuidas compatibles con OpenTelemetry.
+"""
+
+from .tracer import (
+    SPAN_KIND_CLIENT,
+    SPAN_KIND_INTERNAL,
+    SPAN_KIND_SERVER,
+    Span,
+    SpanContext,
+    Tracer,
+    get_current_span,
+    parse_traceparent,
+    tracer,
+)
+from .export import BatchSpanProcessor, FileSpanExporter, InMemorySpanExporter
+from .instrumentation import TracedRoute, traced
+from .setup import start_tracing, stop_tracing
+
+__all__ = [
+    "SPAN_KIND_CLIENT",
+    "SPAN_KIND_INTERNAL",
+    "SPAN_KIND_SERVER",
+    "BatchSpanProcessor",
+    "FileSpanExporter",
+    "InMemorySpanExporter",
+    "Span",
+    "SpanContext",
+    "TracedRoute",
+    "Tracer",
+    "get_current_span",
+    "parse_traceparent",
+    "start_tracing",
+    "stop_tracing",
+    "traced",
+    "tracer",
+]
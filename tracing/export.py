@@ -0,0 +1,145 @@
+"""
+Exportación de spans en lotes desde un hilo aparte.
+
+BatchSpanProcessor encola cada span terminado (sin bloquear: con la cola
+llena el span se descarta y se cuenta) y un hilo los entrega al exporter
+cada ``schedule_delay`` segundos o en cuanto se junta un lote completo.
+
+Exporters:
+- FileSpanExporter: una línea JSON por span (campos de OTLP/JSON)
+- InMemorySpanExporter: acumula los spans en una lista (tests)
+"""
+
+from typing import Optional, Protocol
+import json
+import logging
+import queue
+import threading
+
+from metrics import registry
+from .tracer import Span
+
+
+logger = logging.getLogger(__name__)
+
+tracing_dropped_spans_total = registry.counter(
+    "tracing_dropped_spans_total",
+    "Spans descartados por cola de exportación llena",
+)
+tracing_exported_spans_total = registry.counter(
+    "tracing_exported_spans_total",
+    "Spans entregados al exporter",
+)
+
+
+class SpanExporter(Protocol):
+    """Destino de los lotes de spans"""
+
+    def export(self, spans: list[Span]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+class FileSpanExporter:
+    """Escribe cada span como una línea JSON en un fichero"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: list[Span]) -> None:
+        self._file.writelines(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+class InMemorySpanExporter:
+    """Guarda los spans exportados en memoria"""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
+
+    def shutdown(self) -> None:
+        pass
+
+
+class BatchSpanProcessor:
+    """Agrupa los spans terminados y los exporta en un hilo en segundo plano"""
+
+    def __init__(self, exporter: SpanExporter, max_queue_size: int = 2048,
+                 max_batch_size: int = 512, schedule_delay: float = 5.0):
+        self.exporter = exporter
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._max_batch_size = max_batch_size
+        self._schedule_delay = schedule_delay
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._export_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._stopped.clear()
+            self._worker = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._worker.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            tracing_dropped_spans_total.inc()
+            return
+        if self._queue.qsize() >= self._max_batch_size:
+            self._wakeup.set()
+
+    def force_flush(self) -> None:
+        """Exporta en el hilo llamante todo lo que haya en la cola"""
+        with self._export_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return
+                self._export(batch)
+
+    def shutdown(self) -> None:
+        """Detiene el hilo, exporta lo pendiente y cierra el exporter"""
+        if self._worker is not None:
+            self._stopped.set()
+            self._wakeup.set()
+            self._worker.join()
+            self._worker = None
+        self.force_flush()
+        self.exporter.shutdown()
+
+    def _take_batch(self) -> list[Span]:
+        batch = []
+        while len(batch) < self._max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _export(self, batch: list[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+            tracing_exported_spans_total.inc(len(batch))
+        except Exception:
+            logger.exception("Span export failed")
+            tracing_dropped_spans_total.inc(len(batch))
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._schedule_delay)
+            self._wakeup.clear()
+            self.force_flush()
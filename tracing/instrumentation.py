@@ -0,0 +1,117 @@
+"""
+Instrumentación de las capas de la aplicación.
+
+El span de cada petición lo abre TracingMiddleware; dentro de él:
+
+- ``TracedRoute`` (``route_class`` de los routers) abre un span por fase del
+  endpoint: validación de la petición, ejecución del handler y
+  serialización de la respuesta.
+- ``traced`` decora los métodos async de controladores y servicios.
+
+Ambos solo abren spans dentro de una traza activa, así que con el tracing
+desactivado el coste es una lectura de ContextVar por llamada.
+"""
+
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+import asyncio
+import functools
+
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .tracer import current_span, tracer
+
+
+F = TypeVar("F", bound=Callable[..., Awaitable])
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorador que ejecuta una corrutina dentro de un span ``name``"""
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if current_span.get() is None:
+                return await func(*args, **kwargs)
+            with tracer.start_span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _RoutePhases:
+    """Span de la fase en curso de un endpoint; abrir una fase cierra la anterior"""
+
+    def __init__(self):
+        self._scope = None
+        self._span = None
+
+    def start(self, name: str) -> None:
+        self.end()
+        self._scope = tracer.start_span(name)
+        self._span = self._scope.__enter__()
+
+    def end(self, exc: Optional[BaseException] = None) -> None:
+        scope, self._scope = self._scope, None
+        if scope is None:
+            return
+        # Un 422 es un error del cliente: queda como atributo, sin estado ERROR
+        if exc is None or isinstance(exc, RequestValidationError):
+            if exc is not None:
+                self._span.set_attribute("exception.type", type(exc).__name__)
+            scope.__exit__(None, None, None)
+        else:
+            scope.__exit__(type(exc), exc, exc.__traceback__)
+
+
+_route_phases: ContextVar[Optional[_RoutePhases]] = ContextVar("route_phases", default=None)
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute que abre spans ``validate request``, ``route handler`` y
+    ``serialize response`` como hijos del span de la petición.
+
+    Las fronteras entre fases son la llamada al endpoint: lo anterior
+    (lectura del body, dependencias y validación) es la validación y lo
+    posterior (``response_model`` y la respuesta) la serialización. Los
+    endpoints síncronos corren en otro hilo y solo tienen el span de ruta.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        endpoint = self.dependant.call
+        if not asyncio.iscoroutinefunction(endpoint):
+            return super().get_route_handler()
+
+        @functools.wraps(endpoint)
+        async def phased_endpoint(*args, **kwargs) -> Any:
+            phases = _route_phases.get()
+            if phases is None:
+                return await endpoint(*args, **kwargs)
+            phases.start("route handler")
+            result = await endpoint(*args, **kwargs)
+            phases.start("serialize response")
+            return result
+
+        self.dependant.call = phased_endpoint
+        route_handler = super().get_route_handler()
+
+        async def handler(request: Request) -> Response:
+            if current_span.get() is None:
+                return await route_handler(request)
+            phases = _RoutePhases()
+            token = _route_phases.set(phases)
+            phases.start("validate request")
+            try:
+                response = await route_handler(request)
+            except BaseException as exc:
+                phases.end(exc)
+                raise
+            finally:
+                _route_phases.reset(token)
+            phases.end()
+            return response
+
+        return handler
@@ -0,0 +1,36 @@
+"""
+Arranque y parada del pipeline de exportación según config.settings.
+"""
+
+from typing import Optional
+
+from config.settings import settings
+from .export import BatchSpanProcessor, FileSpanExporter, InMemorySpanExporter, SpanExporter
+from .tracer import tracer
+
+
+def _build_exporter() -> SpanExporter:
+    if settings.TRACING_EXPORTER == "memory":
+        return InMemorySpanExporter()
+    return FileSpanExporter(settings.TRACING_FILE)
+
+
+def start_tracing(exporter: Optional[SpanExporter] = None) -> BatchSpanProcessor:
+    """Conecta el tracer global a un BatchSpanProcessor y arranca su hilo"""
+    processor = BatchSpanProcessor(
+        exporter or _build_exporter(),
+        max_queue_size=settings.TRACING_QUEUE_SIZE,
+        max_batch_size=settings.TRACING_BATCH_SIZE,
+        schedule_delay=settings.TRACING_EXPORT_INTERVAL_SECONDS,
+    )
+    tracer.processor = processor
+    processor.start()
+    return processor
+
+
+def stop_tracing() -> None:
+    """Desconecta el processor del tracer y exporta los spans pendientes"""
+    processor = tracer.processor
+    tracer.processor = None
+    if processor is not None:
+        processor.shutdown()
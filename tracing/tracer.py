@@ -0,0 +1,246 @@
+"""
+Tracer compatible con W3C Trace Context y el modelo de spans de OpenTelemetry.
+
+Los ids (trace de 16 bytes, span de 8 bytes), el header ``traceparent``,
+los kinds y los nombres de atributos siguen las convenciones de
+OpenTelemetry, de modo que los spans exportados se pueden reenviar a un
+collector OTLP sin transformaciones de fondo.
+
+El span activo vive en una ContextVar: se hereda en las tareas asyncio y en
+los hilos de run_in_threadpool. ``start_span`` solo crea spans hijos cuando
+hay una traza activa (la abre TracingMiddleware con ``root=True``); fuera
+de una petición trazada devuelve un span nulo sin coste de registro.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional, Protocol
+import random
+import re
+import time
+
+from config.settings import settings
+
+
+SPAN_KIND_INTERNAL = "INTERNAL"
+SPAN_KIND_SERVER = "SERVER"
+SPAN_KIND_CLIENT = "CLIENT"
+
+STATUS_UNSET = "UNSET"
+STATUS_OK = "OK"
+STATUS_ERROR = "ERROR"
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+class SpanContext:
+    """Identidad de un span tal como viaja en ``traceparent``"""
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """Interpreta un header ``traceparent`` versión 00; None si es inválido"""
+    if not value:
+        return None
+    match = _TRACEPARENT_RE.match(value.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 0x01))
+
+
+class Span:
+    """Operación con inicio, fin, atributos y estado"""
+
+    __slots__ = (
+        "name", "context", "parent_span_id", "kind", "attributes",
+        "start_time_ns", "end_time_ns", "status", "status_message", "_tracer",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, context: SpanContext,
+                 parent_span_id: Optional[str], kind: str, attributes: Optional[dict]):
+        self._tracer = tracer
+        self.name = name
+        self.context = context
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes = dict(attributes) if attributes else {}
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.status = STATUS_UNSET
+        self.status_message: Optional[str] = None
+
+    @property
+    def recording(self) -> bool:
+        return self.context.sampled
+
+    @property
+    def traceparent(self) -> str:
+        return self.context.traceparent
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.recording:
+            self.attributes[key] = value
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    def set_status(self, status: str, message: Optional[str] = None) -> None:
+        self.status = status
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.set_attribute("exception.type", type(exc).__name__)
+        # Las respuestas 4xx (HTTPException) son errores del cliente, no del span
+        status_code = getattr(exc, "status_code", None)
+        if isinstance(status_code, int) and status_code < 500:
+            return
+        self.set_status(STATUS_ERROR, f"{type(exc).__name__}: {exc}")
+
+    def end(self) -> None:
+        if self.end_time_ns is None:
+            self.end_time_ns = time.time_ns()
+            if self.recording:
+                self._tracer._on_end(self)
+
+    def to_dict(self) -> dict:
+        """Representación con los nombres de campo de OTLP/JSON"""
+        return {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "parentSpanId": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_time_ns,
+            "endTimeUnixNano": self.end_time_ns,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.status_message},
+        }
+
+
+class _NonRecordingSpan:
+    """Span nulo devuelto fuera de una traza activa"""
+
+    recording = False
+    traceparent = None
+    context = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def update_name(self, name: str) -> None:
+        pass
+
+    def set_status(self, status: str, message: Optional[str] = None) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NON_RECORDING_SPAN = _NonRecordingSpan()
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class SpanProcessor(Protocol):
+    """Recibe cada span muestreado al terminar"""
+
+    def on_end(self, span: Span) -> None: ...
+
+
+class Tracer:
+    """Crea spans y decide el muestreo de las trazas nuevas"""
+
+    def __init__(self, sample_rate: float = 1.0):
+        self.sample_rate = sample_rate
+        self.processor: Optional[SpanProcessor] = None
+        self._random = random.Random()
+
+    def _new_trace_id(self) -> str:
+        return f"{self._random.getrandbits(128):032x}"
+
+    def _new_span_id(self) -> str:
+        return f"{self._random.getrandbits(64):016x}"
+
+    def _should_sample(self, trace_id: str) -> bool:
+        # Igual que TraceIdRatioBased: decisión determinista por trace id
+        return int(trace_id[16:], 16) < self.sample_rate * (1 << 64)
+
+    def _on_end(self, span: Span) -> None:
+        if self.processor is not None:
+            self.processor.on_end(span)
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: str = SPAN_KIND_INTERNAL,
+        attributes: Optional[dict] = None,
+        root: bool = False,
+        parent: Optional[SpanContext] = None,
+    ) -> Iterator[Span]:
+        """
+        Abre un span como hijo del span activo y lo activa en el bloque.
+
+        Args:
+            name: Nombre del span
+            kind: SPAN_KIND_INTERNAL, SPAN_KIND_SERVER o SPAN_KIND_CLIENT
+            attributes: Atributos iniciales
+            root: Abrir el span aunque no haya traza activa
+            parent: Contexto remoto (``traceparent`` entrante) a continuar
+
+        Yields:
+            Span: El span creado, o un span nulo si no hay traza que continuar
+        """
+        active = current_span.get()
+        if active is not None:
+            parent = active.context
+        elif not root:
+            yield NON_RECORDING_SPAN
+            return
+
+        if parent is not None:
+            context = SpanContext(parent.trace_id, self._new_span_id(), parent.sampled)
+            parent_span_id = parent.span_id
+        else:
+            trace_id = self._new_trace_id()
+            context = SpanContext(trace_id, self._new_span_id(), self._should_sample(trace_id))
+            parent_span_id = None
+
+        span = Span(self, name, context, parent_span_id, kind, attributes if context.sampled else None)
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            current_span.reset(token)
+            span.end()
+
+
+def get_current_span() -> Optional[Span]:
+    """Span activo en el contexto actual (None fuera de una traza)"""
+    return current_span.get()
+
+
+# Tracer global de la aplicación (Singleton)
+tracer = Tracer(settings.TRACING_SAMPLE_RATE)